@@ -0,0 +1,132 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import pathlib
+import shutil
+import statistics
+import tempfile
+import time
+
+from xxhash import xxh3_128
+
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_file
+
+"""
+A micro-benchmark for hashing a single file with hash_file, across a range of file sizes.
+For each size, a file of random data is created and hashed several times. The throughput is
+compared with the previous implementation, which read the file in io.DEFAULT_BUFFER_SIZE chunks,
+and the digests are checked to be identical.
+
+Note that after the first run, the file is usually in the OS page cache, so this measures the
+CPU cost of hashing rather than the speed of the disk. Files larger than the available disk
+space in the chosen directory are skipped.
+
+Example usage:
+
+- Benchmark the default sizes, from 1 KiB to 1 GiB:
+  python3 hash_file_benchmark.py
+
+- Benchmark up to 50 GiB, writing the test files to a directory with enough space:
+  python3 hash_file_benchmark.py --dir /mnt/scratch --max-size 50GiB --runs 1
+"""
+
+UNITS = {"KiB": 1024, "MiB": 1024**2, "GiB": 1024**3}
+
+
+def parse_size(size: str) -> int:
+    for unit, multiplier in UNITS.items():
+        if size.endswith(unit):
+            return int(size[: -len(unit)]) * multiplier
+    return int(size)
+
+
+def format_size(size: int) -> str:
+    for unit, multiplier in reversed(UNITS.items()):
+        if size >= multiplier:
+            return f"{size / multiplier:g} {unit}"
+    return f"{size} B"
+
+
+def hash_file_default_buffer_size(file_path: str) -> str:
+    """The previous implementation of hash_file, for comparison."""
+    hasher = xxh3_128()
+    with open(file_path, "rb") as file:
+        while True:
+            chunk = file.read(io.DEFAULT_BUFFER_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+
+def write_random_file(file_path: pathlib.Path, size: int) -> None:
+    # Repeat a block of random data so that creating very large files is quick.
+    block = os.urandom(min(size, 64 * 1024 * 1024))
+    with file_path.open("wb") as f:
+        remaining = size
+        while remaining > 0:
+            f.write(block[:remaining])
+            remaining -= len(block)
+
+
+def time_hashing(hash_function, file_path: str, runs: int) -> tuple[float, str]:
+    timings = []
+    digest = ""
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        digest = hash_function(file_path)
+        timings.append(time.perf_counter() - start_time)
+    return statistics.median(timings), digest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--dir", type=str, help="Directory to write the test files to.", default=None
+    )
+    parser.add_argument("--min-size", type=str, help="Smallest file size.", default="1KiB")
+    parser.add_argument("--max-size", type=str, help="Largest file size.", default="1GiB")
+    parser.add_argument("--runs", type=int, help="Number of runs for each size.", default=5)
+    args = parser.parse_args()
+
+    min_size = parse_size(args.min_size)
+    max_size = parse_size(args.max_size)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as temp_dir:
+        file_path = pathlib.Path(temp_dir) / "hash_file_benchmark.bin"
+        print(f"{'size':>10} {'previous':>14} {'hash_file':>14} {'speedup':>8}")
+
+        # Step up by a factor of 8, always ending on the maximum size.
+        sizes = []
+        size = min_size
+        while size < max_size:
+            sizes.append(size)
+            size *= 8
+        sizes.append(max_size)
+
+        for size in sizes:
+            if size > shutil.disk_usage(temp_dir).free:
+                print(f"{format_size(size):>10} skipped, not enough disk space")
+                break
+            write_random_file(file_path, size)
+
+            previous_time, previous_digest = time_hashing(
+                hash_file_default_buffer_size, str(file_path), args.runs
+            )
+            new_time, new_digest = time_hashing(
+                lambda path: hash_file(path, HashAlgorithm.XXH128), str(file_path), args.runs
+            )
+            assert previous_digest == new_digest, f"Digests differ for size {size}!"
+
+            print(
+                f"{format_size(size):>10}"
+                f" {size / (1024 ** 2) / previous_time:>9.1f} MB/s"
+                f" {size / (1024 ** 2) / new_time:>9.1f} MB/s"
+                f" {previous_time / new_time:>7.2f}x"
+            )
+            file_path.unlink()
@@ -0,0 +1,113 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import statistics
+import tempfile
+import time
+
+from deadline.job_attachments.caches import HashCache
+from deadline.job_attachments.models import HashingEngine
+from deadline.job_attachments.upload import S3AssetManager
+
+"""
+A benchmark comparing the hashing engines used to create asset manifests for job attachments.
+Creates a synthetic tree of small, medium and large files, then times creating the manifest
+for that tree with each hashing engine. A fresh hash cache is used for every run, so every
+file is hashed each time.
+
+No AWS resources are needed to run this benchmark.
+
+Example usage:
+
+- Compare the engines on the default synthetic tree:
+  python3 hashing_engine_benchmark.py
+
+- Compare the engines on a larger tree, reusing the files between invocations:
+  python3 hashing_engine_benchmark.py --root /tmp/hashing_benchmark --small-files 200000 --runs 3
+"""
+
+
+def make_test_files(
+    root_path: pathlib.Path,
+    num_small_files: int,
+    num_medium_files: int,
+    num_large_files: int,
+) -> list[pathlib.Path]:
+    """Creates the synthetic tree of files if they don't exist, spreading them across subdirectories."""
+    files = []
+    for prefix, count, size in [
+        ("small", num_small_files, 4 * 1024),
+        ("medium", num_medium_files, 1024 * 1024),
+        ("large", num_large_files, 256 * 1024 * 1024),
+    ]:
+        for i in range(count):
+            file_path = root_path / prefix / f"dir{i // 1000}" / f"{prefix}_test{i}.bin"
+            if not file_path.exists():
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                with file_path.open("wb") as f:
+                    # Write the data in chunks so that large files don't need to fit in memory.
+                    remaining = size
+                    while remaining > 0:
+                        chunk_size = min(remaining, 8 * 1024 * 1024)
+                        f.write(os.urandom(chunk_size))
+                        remaining -= chunk_size
+            files.append(file_path)
+    return files
+
+
+def time_hashing_engine(
+    hashing_engine: HashingEngine, files: list[pathlib.Path], root_path: pathlib.Path
+) -> tuple[float, str]:
+    """Returns the time taken to create the manifest, and the encoded manifest."""
+    asset_manager = S3AssetManager(hashing_engine=hashing_engine)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with HashCache(cache_dir) as hash_cache:
+            start_time = time.perf_counter()
+            manifest = asset_manager._create_manifest_file(files, str(root_path), hash_cache)
+            elapsed = time.perf_counter() - start_time
+    return elapsed, manifest.encode()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--root",
+        type=str,
+        help="Directory to create the synthetic tree in. Defaults to a temporary directory.",
+        default=None,
+    )
+    parser.add_argument("--small-files", type=int, help="Number of 4 KB files.", default=20000)
+    parser.add_argument("--medium-files", type=int, help="Number of 1 MB files.", default=500)
+    parser.add_argument("--large-files", type=int, help="Number of 256 MB files.", default=4)
+    parser.add_argument("--runs", type=int, help="Number of runs of each engine.", default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root_path = pathlib.Path(args.root or temp_dir)
+        root_path.mkdir(parents=True, exist_ok=True)
+
+        print(f"Setting up the synthetic tree in {root_path}...")
+        files = make_test_files(root_path, args.small_files, args.medium_files, args.large_files)
+        total_bytes = sum(file.stat().st_size for file in files)
+        print(f"{len(files)} files, {total_bytes / (1024 ** 2):.1f} MB, {os.cpu_count()} CPUs")
+
+        encoded_manifests = set()
+        for hashing_engine in HashingEngine:
+            timings = []
+            for _ in range(args.runs):
+                elapsed, encoded_manifest = time_hashing_engine(hashing_engine, files, root_path)
+                timings.append(elapsed)
+                encoded_manifests.add(encoded_manifest)
+            median = statistics.median(timings)
+            print(
+                f"{hashing_engine.value:>8}: median {median:.2f}s over {args.runs} runs"
+                f" ({total_bytes / (1024 ** 2) / median:.1f} MB/s, {len(files) / median:.0f} files/s)"
+            )
+
+        assert len(encoded_manifests) == 1, "The hashing engines created different manifests!"
+        print("All hashing engines created identical manifests.")
@@ -0,0 +1,151 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path, PurePosixPath
+
+from deadline.client.cli._groups.click_logger import ClickLogger
+from deadline.job_attachments._diff import _fast_file_list_to_manifest_diff
+from deadline.job_attachments.asset_manifests import (
+    BaseAssetManifest,
+    BaseManifestPath,
+    HashAlgorithm,
+    ManifestModelRegistry,
+    ManifestVersion,
+)
+from deadline.job_attachments.models import FileStatus
+
+"""
+A benchmark of how the time of the fast diff of a directory with a manifest, as done by
+`deadline manifest diff` and `deadline manifest snapshot --diff`, scales with the number of files.
+Builds a directory of files, then for each number of files, builds a manifest in which a tenth
+of the files changed size, and a tenth are missing (new files), with as many paths that are
+missing from the directory instead (deleted files). Times `_fast_file_list_to_manifest_diff`, and
+the list-based diff it used to do, which takes quadratic time, up to `--max-list-files` files.
+Checks that both find the same differences.
+
+Example usage:
+
+- Measure with 10,000, 100,000 and 1,000,000 files in a temporary directory:
+  python3 manifest_diff_benchmark.py
+
+- Measure with up to 200,000 files, comparing with the list-based diff up to 50,000 files:
+  python3 manifest_diff_benchmark.py --files 20000 50000 200000 --max-list-files 50000
+"""
+
+
+def make_files(directory: Path, num_files: int) -> list[str]:
+    files = []
+    for i in range(num_files):
+        file_path = directory / f"shot{i // 1000:04d}" / f"frame{i % 1000:04d}.exr"
+        if i % 1000 == 0:
+            file_path.parent.mkdir(parents=True)
+        file_path.write_bytes(b"x" * (i % 100))
+        files.append(str(file_path))
+    return files
+
+
+def make_manifest(root: Path, files: list[str]) -> BaseAssetManifest:
+    manifest_model = ManifestModelRegistry.get_manifest_model(version=ManifestVersion.v2023_03_03)
+    paths: list[BaseManifestPath] = []
+    for i, file in enumerate(files):
+        relative_path = PurePosixPath(*Path(file).relative_to(root).parts).as_posix()
+        if i % 10 == 1:
+            # A new file, which is deleted from the manifest's point of view.
+            relative_path = f"deleted/{relative_path}"
+        file_stat = os.stat(file)
+        paths.append(
+            manifest_model.Path(
+                path=relative_path,
+                hash=f"{i:032x}",
+                size=file_stat.st_size + (1 if i % 10 == 2 else 0),
+                mtime=file_stat.st_mtime_ns // 1000,
+            )
+        )
+    return manifest_model.AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(path.size for path in paths),
+    )
+
+
+def diff_with_lists(
+    root: str, current_files: list[str], diff_manifest: BaseAssetManifest
+) -> list[tuple[str, FileStatus]]:
+    changed_paths = []
+    input_files_map = {
+        Path(os.path.normpath(input_file.path)).as_posix(): input_file
+        for input_file in diff_manifest.paths
+    }
+    root_relative_paths = []
+    for local_file in current_files:
+        local_file_path = Path(local_file)
+        file_stat = local_file_path.stat()
+        root_relative_path = str(PurePosixPath(*local_file_path.relative_to(root).parts).as_posix())
+        root_relative_paths.append(root_relative_path)
+        if root_relative_path not in input_files_map:
+            changed_paths.append((root_relative_path, FileStatus.NEW))
+        else:
+            input_file = input_files_map[root_relative_path]
+            if file_stat.st_size != input_file.size:
+                changed_paths.append((root_relative_path, FileStatus.MODIFIED))
+            elif int(file_stat.st_mtime_ns // 1000) != input_file.mtime:
+                changed_paths.append((root_relative_path, FileStatus.MODIFIED))
+    for manifest_file_path in diff_manifest.paths:
+        if manifest_file_path.path not in root_relative_paths:
+            changed_paths.append((manifest_file_path.path, FileStatus.DELETED))
+    return changed_paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--files",
+        type=int,
+        nargs="+",
+        help="Numbers of files to diff.",
+        default=[10000, 100000, 1000000],
+    )
+    parser.add_argument(
+        "--max-list-files",
+        type=int,
+        help="Largest number of files to diff with the list-based diff.",
+        default=20000,
+    )
+    parser.add_argument(
+        "--dir",
+        type=str,
+        help="Directory to build the files in. Defaults to a temporary directory.",
+        default=None,
+    )
+    args = parser.parse_args()
+
+    # The JSON logger doesn't echo each difference.
+    logger = ClickLogger(is_json=True)
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp_dir:
+        root = Path(tmp_dir)
+        print(f"Building {max(args.files)} files in {root}...")
+        all_files = make_files(root, max(args.files))
+
+        for num_files in sorted(args.files):
+            files = all_files[:num_files]
+            manifest = make_manifest(root, files)
+
+            start_time = time.perf_counter()
+            differences = _fast_file_list_to_manifest_diff(str(root), files, manifest, logger)
+            duration = time.perf_counter() - start_time
+            message = f"{num_files:>8} files: {duration:7.2f}s"
+
+            if num_files <= args.max_list_files:
+                start_time = time.perf_counter()
+                list_differences = diff_with_lists(str(root), files, manifest)
+                message += f", list-based diff {time.perf_counter() - start_time:7.2f}s"
+                assert sorted(differences) == sorted(
+                    list_differences
+                ), "The diffs found different differences."
+            print(f"{message} ({len(differences)} differences)")
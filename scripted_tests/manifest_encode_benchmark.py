@@ -0,0 +1,93 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import random
+import statistics
+import time
+
+from deadline.job_attachments.asset_manifests import (
+    BaseAssetManifest,
+    BaseManifestPath,
+    HashAlgorithm,
+    ManifestModelRegistry,
+    ManifestVersion,
+)
+from deadline.job_attachments.asset_manifests._canonical_json import canonical_path_comparator
+
+"""
+A benchmark of the time it takes to encode a large asset manifest to its canonical JSON, which is
+done every time a manifest is uploaded, hashed, or written to disk. Builds a synthetic manifest
+with its paths shuffled, then times encoding it with `AssetManifest.encode`, and with the
+`json.dumps` of `dataclasses.asdict` it used to be encoded with, and checks that both produce the
+same JSON.
+
+Example usage:
+
+- Compare the two with a manifest of 1,000,000 ASCII paths:
+  python3 manifest_encode_benchmark.py
+
+- Compare the two with a manifest of 200,000 paths, some of them not ASCII:
+  python3 manifest_encode_benchmark.py --files 200000 --non-ascii
+"""
+
+
+def make_manifest(num_files: int, non_ascii: bool) -> BaseAssetManifest:
+    manifest_model = ManifestModelRegistry.get_manifest_model(version=ManifestVersion.v2023_03_03)
+    directory = "renders/planète" if non_ascii else "renders/planet"
+    paths: list[BaseManifestPath] = [
+        manifest_model.Path(
+            path=f"{directory}/shot{i // 1000:04d}/frame{i % 1000:04d}.exr",
+            hash=f"{i:032x}",
+            size=1024 + i,
+            mtime=1234000000 + i,
+        )
+        for i in range(num_files)
+    ]
+    random.Random(0).shuffle(paths)
+    return manifest_model.AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(path.size for path in paths),
+    )
+
+
+def encode_with_json_dumps(manifest: BaseAssetManifest) -> str:
+    manifest.paths.sort(key=canonical_path_comparator)
+    return json.dumps(
+        dataclasses.asdict(manifest), sort_keys=True, separators=(",", ":"), ensure_ascii=True
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--files", type=int, help="Number of files in the manifest.", default=1000000
+    )
+    parser.add_argument(
+        "--non-ascii", action="store_true", help="Include non-ASCII characters in the paths."
+    )
+    parser.add_argument("--runs", type=int, help="Number of runs of each encoder.", default=3)
+    args = parser.parse_args()
+
+    print(f"Building a manifest of {args.files} files...")
+    manifest = make_manifest(args.files, args.non_ascii)
+
+    results = {}
+    for name, encode in [
+        ("json.dumps", encode_with_json_dumps),
+        ("encode", lambda manifest: manifest.encode()),
+    ]:
+        timings = []
+        for _ in range(args.runs):
+            random.Random(0).shuffle(manifest.paths)
+            start_time = time.perf_counter()
+            results[name] = encode(manifest)
+            timings.append(time.perf_counter() - start_time)
+        print(f"{name:>10}: median {statistics.median(timings):.2f}s over {args.runs} runs")
+
+    assert results["json.dumps"] == results["encode"], "The encoders produced different JSON."
@@ -0,0 +1,98 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from deadline.job_attachments.asset_manifests import (
+    BaseAssetManifest,
+    BaseManifestPath,
+    HashAlgorithm,
+    ManifestModelRegistry,
+    ManifestVersion,
+)
+from deadline.job_attachments.asset_manifests.decode import decode_manifest
+from deadline.job_attachments.download import merge_asset_manifests
+
+"""
+A benchmark of the memory and time it takes to work with large asset manifests, such as the
+manifests of the step dependencies of a job with a million output files. Builds synthetic
+manifests, then measures the peak memory allocated by, the memory retained by, and the time of
+decoding a manifest (with the fast validation, and with the strict jsonschema validation),
+merging manifests, and encoding the merged manifest.
+
+Example usage:
+
+- Measure with manifests of 1,000,000 files:
+  python3 manifest_memory_benchmark.py
+
+- Measure with manifests of 100,000 files, merging 20 of them:
+  python3 manifest_memory_benchmark.py --files 100000 --manifests 20
+"""
+
+
+def make_manifest(num_files: int, seed: int) -> BaseAssetManifest:
+    manifest_model = ManifestModelRegistry.get_manifest_model(version=ManifestVersion.v2023_03_03)
+    paths: list[BaseManifestPath] = [
+        manifest_model.Path(
+            path=f"renders/shot{i // 1000:04d}/frame{i % 1000:04d}.exr",
+            hash=f"{seed:016x}{i:016x}",
+            size=1024 + i,
+            mtime=1234000000 + i,
+        )
+        for i in range(num_files)
+    ]
+    return manifest_model.AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(path.size for path in paths),
+    )
+
+
+def measure(name: str, operation: Callable[[], Any]) -> Any:
+    """
+    Prints the time of the operation, and the peak and retained memory allocated by it. The memory
+    is measured in a second run, since tracing the allocations slows the operation down.
+    """
+    gc.collect()
+    start_time = time.perf_counter()
+    result = operation()
+    duration = time.perf_counter() - start_time
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = operation()
+    (retained, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:>15}: {duration:6.2f}s, peak {peak / 1024**2:7.1f} MB,"
+        f" retained {retained / 1024**2:7.1f} MB"
+    )
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, help="Number of files per manifest.", default=1000000)
+    parser.add_argument("--manifests", type=int, help="Number of manifests to merge.", default=3)
+    args = parser.parse_args()
+
+    print(f"Building {args.manifests} manifests of {args.files} files...")
+    manifests = [make_manifest(args.files, seed) for seed in range(args.manifests)]
+    encoded_manifest = manifests[0].encode()
+
+    decoded_manifest = measure("decode", lambda: decode_manifest(encoded_manifest))
+    del decoded_manifest
+    decoded_manifest = measure(
+        "decode (strict)", lambda: decode_manifest(encoded_manifest, strict=True)
+    )
+    del decoded_manifest
+    merged_manifest = measure("merge", lambda: merge_asset_manifests(manifests))
+    assert merged_manifest is not None
+    measure("encode", merged_manifest.encode)
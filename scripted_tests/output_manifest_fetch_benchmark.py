@@ -0,0 +1,159 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Optional
+
+import boto3
+from moto import mock_aws
+
+from deadline.job_attachments._aws.aws_clients import get_s3_client
+from deadline.job_attachments.asset_manifests import (
+    BaseAssetManifest,
+    BaseManifestPath,
+    HashAlgorithm,
+    ManifestModelRegistry,
+    ManifestVersion,
+)
+from deadline.job_attachments.download import (
+    _get_asset_root_from_s3,
+    _get_output_manifest_prefix,
+    _get_tasks_manifests_keys_from_s3,
+    get_manifest_from_s3,
+    get_output_manifests_by_asset_root,
+)
+from deadline.job_attachments.models import JobAttachmentS3Settings
+
+"""
+A benchmark of fetching the output manifests of a job with many tasks, as done by
+`deadline job download-output` and by syncing the outputs of step dependencies.
+Stores a synthetic output manifest for each task in a stubbed S3 (moto), with a simulated
+round-trip latency for every request, then times fetching the manifests and their asset roots
+one at a time with a get and a head request each (as it used to be done), and with
+`get_output_manifests_by_asset_root`.
+
+No AWS resources are needed to run this benchmark.
+
+Example usage:
+
+- Compare the two approaches with 2000 tasks and 20 ms of latency per request:
+  python3 output_manifest_fetch_benchmark.py
+
+- Compare them with 10000 tasks:
+  python3 output_manifest_fetch_benchmark.py --tasks 10000 --runs 1
+"""
+
+BUCKET = "benchmark-bucket"
+FARM_ID = "farm-1234567890abcdefghijklmnopqrstuv"
+QUEUE_ID = "queue-1234567890abcdefghijklmnopqrstuv"
+JOB_ID = "job-1234567890abcdefghijklmnopqrstuv"
+STEP_ID = "step-1234567890abcdefghijklmnopqrstuv"
+
+
+def make_output_manifest(task_index: int, files_per_task: int) -> str:
+    manifest_model = ManifestModelRegistry.get_manifest_model(version=ManifestVersion.v2023_03_03)
+    paths = [
+        BaseManifestPath(
+            path=f"renders/task{task_index}/frame{i}.exr",
+            hash=f"{task_index:016x}{i:016x}",
+            size=1024,
+            mtime=1234000000,
+        )
+        for i in range(files_per_task)
+    ]
+    return manifest_model.AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=1024 * files_per_task,
+    ).encode()
+
+
+def put_output_manifests(
+    s3_settings: JobAttachmentS3Settings, num_tasks: int, files_per_task: int
+) -> None:
+    """Stores an output manifest with an asset root in its metadata for each task."""
+    s3_client = boto3.client("s3", region_name="us-west-2")
+    s3_client.create_bucket(
+        Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+    )
+    manifest_prefix = _get_output_manifest_prefix(s3_settings, FARM_ID, QUEUE_ID, JOB_ID)
+    for task_index in range(num_tasks):
+        s3_client.put_object(
+            Bucket=BUCKET,
+            Key=(
+                f"{manifest_prefix}/{STEP_ID}/task-{task_index}/"
+                f"2024-01-01T00:00:00.000000Z_sessionaction-{task_index}-0/"
+                "0123456789abcdef0123456789abcdef_output"
+            ),
+            Body=make_output_manifest(task_index, files_per_task).encode("utf-8"),
+            Metadata={"asset-root-json": json.dumps(f"/renders/root{task_index % 4}")},
+        )
+
+
+def fetch_one_at_a_time(s3_settings: JobAttachmentS3Settings) -> dict[str, list[BaseAssetManifest]]:
+    """Fetches the manifests the way it used to be done, with a get and a head request each."""
+    outputs: dict[str, list[BaseAssetManifest]] = {}
+    manifest_keys = _get_tasks_manifests_keys_from_s3(
+        _get_output_manifest_prefix(s3_settings, FARM_ID, QUEUE_ID, JOB_ID), BUCKET
+    )
+    for key in manifest_keys:
+        asset_manifest = get_manifest_from_s3(manifest_key=key, s3_bucket=BUCKET)
+        asset_root: Optional[str] = _get_asset_root_from_s3(key, BUCKET)
+        assert asset_root
+        outputs.setdefault(asset_root, []).append(asset_manifest)
+    return outputs
+
+
+def fetch_concurrently(s3_settings: JobAttachmentS3Settings) -> dict[str, list[BaseAssetManifest]]:
+    return get_output_manifests_by_asset_root(s3_settings, FARM_ID, QUEUE_ID, JOB_ID)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, help="Number of task output manifests.", default=2000)
+    parser.add_argument(
+        "--files-per-task", type=int, help="Number of files in each manifest.", default=10
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, help="Simulated latency of each S3 request.", default=20.0
+    )
+    parser.add_argument("--runs", type=int, help="Number of runs of each approach.", default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-west-2")
+    with mock_aws():
+        s3_settings = JobAttachmentS3Settings(s3BucketName=BUCKET, rootPrefix="assetRoot")
+        print(f"Setting up {args.tasks} task output manifests in the stubbed S3...")
+        put_output_manifests(s3_settings, args.tasks, args.files_per_task)
+
+        # Simulate the round trip to S3 for each request made by the job attachments client.
+        def simulate_latency(**kwargs) -> None:
+            time.sleep(args.latency_ms / 1000)
+
+        get_s3_client().meta.events.register("before-sign.s3", simulate_latency)
+
+        results = []
+        for name, fetch in [
+            ("one at a time", fetch_one_at_a_time),
+            ("concurrent", fetch_concurrently),
+        ]:
+            timings = []
+            for _ in range(args.runs):
+                start_time = time.perf_counter()
+                outputs = fetch(s3_settings)
+                timings.append(time.perf_counter() - start_time)
+            results.append(outputs)
+            median = statistics.median(timings)
+            print(
+                f"{name:>14}: median {median:.2f}s over {args.runs} runs"
+                f" ({args.tasks / median:.0f} manifests/s)"
+            )
+
+        assert results[0] == results[1], "The two approaches fetched different manifests!"
+        print("Both approaches fetched identical manifests.")
@@ -0,0 +1,111 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from deadline.job_attachments._scan import (
+    _get_directory_prefix,
+    _is_within_directory_prefix,
+    _scan_directory,
+)
+
+"""
+A benchmark of the time it takes to find the output files of a session action, which is done
+for every output directory when the outputs are synced. Builds a synthetic output tree in a
+session directory, with symlinks to files inside and outside of the session directory, then
+times listing the files with `Path.glob`, resolving and checking each file the way
+`AssetSync._get_output_files` used to, and with `_scan_directory` and a prefix check of the
+resolved session directory, as it does now. Checks that both find the same files.
+
+Example usage:
+
+- Compare the two with an output tree of 100,000 files in a temporary directory:
+  python3 output_scan_benchmark.py
+
+- Compare the two with an output tree of 20,000 files in a directory on a network file system:
+  python3 output_scan_benchmark.py --files 20000 --dir /mnt/nfs/benchmark
+"""
+
+
+def make_output_tree(session_dir: Path, num_files: int) -> Path:
+    output_root = session_dir / "assetroot" / "renders"
+    for i in range(num_files):
+        file_path = output_root / f"shot{i // 1000:04d}" / f"frame{i % 1000:04d}.exr"
+        if i % 1000 == 0:
+            file_path.parent.mkdir(parents=True)
+        file_path.write_bytes(b"x" * (i % 100))
+
+    outside_file = session_dir.parent / f"{session_dir.name}-outside.txt"
+    outside_file.write_bytes(b"outside")
+    (output_root / "link_inside.exr").symlink_to(output_root / "shot0000" / "frame0001.exr")
+    (output_root / "link_outside.txt").symlink_to(outside_file)
+    return output_root
+
+
+def is_file_within_directory(file_path: Path, directory_path: Path) -> bool:
+    real_file_path = file_path.resolve()
+    real_directory_path = directory_path.resolve()
+    common_path = os.path.commonpath([real_file_path, real_directory_path])
+    return common_path.startswith(str(real_directory_path))
+
+
+def find_with_glob(output_root: Path, session_dir: Path) -> set[tuple[str, str, int]]:
+    found_files = set()
+    for file_path in output_root.glob("**/*"):
+        file_path.stat()
+        file_real_path = file_path.resolve()
+        if not is_file_within_directory(file_real_path, session_dir):
+            continue
+        if not file_real_path.is_dir() and file_real_path.exists():
+            file_size = file_real_path.resolve().lstat().st_size
+            found_files.add((str(file_path), str(file_real_path), file_size))
+    return found_files
+
+
+def find_with_scan(output_root: Path, session_dir: Path) -> set[tuple[str, str, int]]:
+    found_files = set()
+    session_dir_prefix = _get_directory_prefix(str(session_dir))
+    for file_path, scanned_file in _scan_directory(str(output_root)).items():
+        if scanned_file is None:
+            continue
+        if not _is_within_directory_prefix(scanned_file.resolved_path, session_dir_prefix):
+            continue
+        found_files.add((file_path, scanned_file.resolved_path, scanned_file.stat.st_size))
+    return found_files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, help="Number of output files.", default=100000)
+    parser.add_argument(
+        "--dir",
+        type=str,
+        help="Directory to build the output tree in. Defaults to a temporary directory.",
+        default=None,
+    )
+    parser.add_argument("--runs", type=int, help="Number of runs of each scanner.", default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp_dir:
+        session_dir = Path(tmp_dir) / "session"
+        print(f"Building an output tree of {args.files} files in {session_dir}...")
+        output_root = make_output_tree(session_dir, args.files)
+
+        results = {}
+        for name, find in [("glob", find_with_glob), ("scandir", find_with_scan)]:
+            timings = []
+            for _ in range(args.runs):
+                start_time = time.perf_counter()
+                results[name] = find(output_root, session_dir)
+                timings.append(time.perf_counter() - start_time)
+            print(f"{name:>8}: median {statistics.median(timings):.2f}s over {args.runs} runs")
+
+        assert results["glob"] == results["scandir"], "The scanners found different files."
+        print(f"Both found {len(results['scandir'])} files.")
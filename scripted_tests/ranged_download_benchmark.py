@@ -0,0 +1,138 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import boto3
+from moto import mock_aws
+
+from deadline.job_attachments import download
+from deadline.job_attachments._aws.aws_clients import get_s3_client
+from deadline.job_attachments.asset_manifests import (
+    BaseAssetManifest,
+    BaseManifestPath,
+    HashAlgorithm,
+    ManifestModelRegistry,
+    ManifestVersion,
+    hash_data,
+)
+from deadline.job_attachments.download import download_files_from_manifests
+
+"""
+A benchmark of the time it takes to download the inputs of a job whose inputs include very large
+files, such as simulation caches, which is the time a worker waits before it can start the job's
+first task. Stores a few large files and many small files in a stubbed S3 (moto), with a simulated
+round-trip latency for every request and a simulated bandwidth for every connection, then times
+downloading them with the large files downloaded by the transfer manager (as it used to be done),
+and with the large files downloaded in ranged parts written in place.
+
+No AWS resources are needed to run this benchmark. The stubbed S3 keeps the objects in memory,
+so keep the total size of the large files within the memory of the host.
+
+Example usage:
+
+- Compare the two approaches with 2 large files of 256 MB and 500 small files:
+  python3 ranged_download_benchmark.py
+
+- Compare them with a single 1 GB file and slower connections:
+  python3 ranged_download_benchmark.py --large-files 1 --large-file-mb 1024 --connection-mbps 100
+"""
+
+BUCKET = "benchmark-bucket"
+CAS_PREFIX = "Data"
+
+
+def put_files(num_large_files: int, large_file_mb: int, num_small_files: int) -> BaseAssetManifest:
+    """Stores the files in the stubbed S3, and returns a manifest of them."""
+    s3_client = boto3.client("s3", region_name="us-west-2")
+    s3_client.create_bucket(
+        Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+    )
+    contents = [
+        (f"caches/sim{i}.vdb", os.urandom(1024) * (large_file_mb * 1024))
+        for i in range(num_large_files)
+    ] + [(f"textures/tex{i}.png", os.urandom(64 * 1024)) for i in range(num_small_files)]
+    paths = []
+    for path, data in contents:
+        file_hash = hash_data(data, HashAlgorithm.XXH128)
+        s3_client.put_object(Bucket=BUCKET, Key=f"{CAS_PREFIX}/{file_hash}.xxh128", Body=data)
+        paths.append(BaseManifestPath(path=path, hash=file_hash, size=len(data), mtime=1234000000))
+
+    manifest_model = ManifestModelRegistry.get_manifest_model(version=ManifestVersion.v2023_03_03)
+    return manifest_model.AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(len(data) for _, data in contents),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--large-files", type=int, help="Number of large files.", default=2)
+    parser.add_argument(
+        "--large-file-mb", type=int, help="Size of each large file in MB.", default=256
+    )
+    parser.add_argument("--small-files", type=int, help="Number of 64 KB files.", default=500)
+    parser.add_argument(
+        "--latency-ms", type=float, help="Simulated latency of each S3 request.", default=20.0
+    )
+    parser.add_argument(
+        "--connection-mbps",
+        type=float,
+        help="Simulated bandwidth of each connection to S3, in megabits per second.",
+        default=400.0,
+    )
+    parser.add_argument("--runs", type=int, help="Number of runs of each approach.", default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-west-2")
+    with mock_aws():
+        print(
+            f"Setting up {args.large_files} files of {args.large_file_mb} MB and"
+            f" {args.small_files} small files in the stubbed S3..."
+        )
+        manifest = put_files(args.large_files, args.large_file_mb, args.small_files)
+        total_mb = manifest.totalSize / (1024**2)  # type: ignore[attr-defined]
+
+        # Simulate the round trip to S3 for each request made by the job attachments client, and
+        # the time to receive the body of each response over a single connection.
+        def simulate_latency(**kwargs) -> None:
+            time.sleep(args.latency_ms / 1000)
+
+        def simulate_bandwidth(http_response, **kwargs) -> None:
+            content_length = int(http_response.headers.get("Content-Length", 0))
+            time.sleep(content_length * 8 / (args.connection_mbps * 1000**2))
+
+        s3_client = get_s3_client()
+        s3_client.meta.events.register("before-sign.s3", simulate_latency)
+        s3_client.meta.events.register("after-call.s3.GetObject", simulate_bandwidth)
+
+        ranged_download_min_size = download.RANGED_DOWNLOAD_MIN_SIZE
+        for name, min_size in [
+            ("transfer manager", sys.maxsize),
+            ("ranged parts", ranged_download_min_size),
+        ]:
+            download.RANGED_DOWNLOAD_MIN_SIZE = min_size
+            timings = []
+            for _ in range(args.runs):
+                with tempfile.TemporaryDirectory() as session_dir:
+                    start_time = time.perf_counter()
+                    download_files_from_manifests(
+                        s3_bucket=BUCKET,
+                        manifests_by_root={session_dir: manifest},
+                        cas_prefix=CAS_PREFIX,
+                    )
+                    timings.append(time.perf_counter() - start_time)
+            median = statistics.median(timings)
+            print(
+                f"{name:>16}: median {median:.2f}s over {args.runs} runs"
+                f" ({total_mb / median:.0f} MB/s)"
+            )
+        download.RANGED_DOWNLOAD_MIN_SIZE = ranged_download_min_size
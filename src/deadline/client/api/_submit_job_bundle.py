@@ -34,6 +34,7 @@ from ..job_bundle.parameters import (
     JobParameter,
 )
 from ..job_bundle.submission import AssetReferences, split_parameter_args
+from ...job_attachments._scan import ScannedFile, _scan_directory
 from ...job_attachments.exceptions import MisconfiguredInputsError
 from ...job_attachments.models import (
     JobAttachmentsFileSystem,
@@ -222,6 +223,7 @@ def create_job_from_job_bundle(
     if asset_references and "jobAttachmentSettings" in queue:
         # Extend input_filenames with all the files in the input_directories
         missing_directories: set[str] = set()
+        scanned_files: dict[str, ScannedFile] = {}
         for directory in asset_references.input_directories:
             if not os.path.isdir(directory):
                 if require_paths_exist:
@@ -233,14 +235,14 @@ def create_job_from_job_bundle(
                     asset_references.referenced_paths.add(directory)
                 continue
 
-            is_dir_empty = True
-            for root, _, files in os.walk(directory):
-                if not files:
-                    continue
-                is_dir_empty = False
-                asset_references.input_filenames.update(
-                    os.path.normpath(os.path.join(root, file)) for file in files
-                )
+            directory_files = _scan_directory(directory)
+            is_dir_empty = not directory_files
+            asset_references.input_filenames.update(directory_files)
+            scanned_files.update(
+                (path, scanned_file)
+                for (path, scanned_file) in directory_files.items()
+                if scanned_file is not None
+            )
             # Empty directories just become references since there's nothing to upload
             if is_dir_empty:
                 logger.info(f"Input directory '{directory}' is empty. Adding to referenced paths.")
@@ -278,24 +280,37 @@ def create_job_from_job_bundle(
             referenced_paths=sorted(asset_references.referenced_paths),
             storage_profile=storage_profile,
             require_paths_exist=require_paths_exist,
+            scanned_files=scanned_files,
         )
         if upload_group.asset_groups:
             if decide_cancel_submission_callback(upload_group):
                 print_function_callback("Job submission canceled.")
                 return None
 
-            _, asset_manifests = _hash_attachments(
-                asset_manager=asset_manager,
-                asset_groups=upload_group.asset_groups,
-                total_input_files=upload_group.total_input_files,
-                total_input_bytes=upload_group.total_input_bytes,
-                print_function_callback=print_function_callback,
-                hashing_progress_callback=hashing_progress_callback,
-            )
+            if config_file.str2bool(get_setting("settings.pipelined_upload", config=config)):
+                attachment_settings = _hash_and_upload_attachments(  # type: ignore
+                    asset_manager,
+                    upload_group,
+                    print_function_callback,
+                    hashing_progress_callback,
+                    upload_progress_callback,
+                )
+            else:
+                _, asset_manifests = _hash_attachments(
+                    asset_manager=asset_manager,
+                    asset_groups=upload_group.asset_groups,
+                    total_input_files=upload_group.total_input_files,
+                    total_input_bytes=upload_group.total_input_bytes,
+                    print_function_callback=print_function_callback,
+                    hashing_progress_callback=hashing_progress_callback,
+                )
 
-            attachment_settings = _upload_attachments(  # type: ignore
-                asset_manager, asset_manifests, print_function_callback, upload_progress_callback
-            )
+                attachment_settings = _upload_attachments(  # type: ignore
+                    asset_manager,
+                    asset_manifests,
+                    print_function_callback,
+                    upload_progress_callback,
+                )
             attachment_settings["fileSystem"] = JobAttachmentsFileSystem(
                 job_attachments_file_system
             )
@@ -436,3 +451,47 @@ def _upload_attachments(
     print_function_callback(textwrap.indent(str(upload_summary), "    "))
 
     return attachment_settings.to_dict()
+
+
+@api.record_success_fail_telemetry_event(metric_name="cli_asset_upload")  # type: ignore
+def _hash_and_upload_attachments(
+    asset_manager: S3AssetManager,
+    upload_group: AssetUploadGroup,
+    print_function_callback: Callable = lambda msg: None,
+    hashing_progress_callback: Optional[Callable] = None,
+    upload_progress_callback: Optional[Callable] = None,
+    config: Optional[ConfigParser] = None,
+) -> Dict[str, Any]:
+    """
+    Starts the job attachments hashing and upload as a pipeline, uploading files while others
+    are hashed, and handles both progress reporting callbacks.
+    Returns the attachment settings from the upload.
+    """
+
+    def _default_update_progress(progress_metadata: Dict[str, str]) -> bool:
+        return True
+
+    if not hashing_progress_callback:
+        hashing_progress_callback = _default_update_progress
+    if not upload_progress_callback:
+        upload_progress_callback = _default_update_progress
+
+    hashing_summary, upload_summary, attachment_settings = asset_manager.hash_and_upload_assets(
+        asset_groups=upload_group.asset_groups,
+        total_input_files=upload_group.total_input_files,
+        total_input_bytes=upload_group.total_input_bytes,
+        hash_cache_dir=config_file.get_cache_directory(),
+        s3_check_cache_dir=config_file.get_cache_directory(),
+        on_preparing_to_submit=hashing_progress_callback,
+        on_uploading_assets=upload_progress_callback,
+    )
+    telemetry_client = api.get_deadline_cloud_library_telemetry_client(config=config)
+    telemetry_client.record_hashing_summary(hashing_summary)
+    telemetry_client.record_upload_summary(upload_summary)
+
+    print_function_callback("Hashing Summary:")
+    print_function_callback(textwrap.indent(str(hashing_summary), "    "))
+    print_function_callback("Upload Summary:")
+    print_function_callback(textwrap.indent(str(upload_summary), "    "))
+
+    return attachment_settings.to_dict()
@@ -23,7 +23,7 @@ from typing import Any, Dict, List, Optional
 import tempfile
 
 import boto3
-from deadline.job_attachments.models import FileConflictResolution
+from deadline.job_attachments.models import FileConflictResolution, HashingEngine, TransferEngine
 
 from ..exceptions import DeadlineOperationError
 import re
@@ -41,6 +41,8 @@ DEFAULT_DEADLINE_ENDPOINT_URL = os.getenv(
 # The default directory within which to save the history of created jobs.
 DEFAULT_JOB_HISTORY_DIR = os.path.join("~", ".deadline", "job_history", "{aws_profile_name}")
 DEFAULT_CACHE_DIR = os.path.join("~", ".deadline", "cache")
+# The default directory of the local cache of downloaded job attachment files.
+DEFAULT_DOWNLOAD_CACHE_DIR = os.path.join("~", ".deadline", "job_attachments", "download_cache")
 
 _TRUE_VALUES = {"yes", "on", "true", "1"}
 _FALSE_VALUES = {"no", "off", "false", "0"}
@@ -125,6 +127,87 @@ SETTINGS: Dict[str, Dict[str, Any]] = {
             "This multiplier is used to calculate the size threshold. (Small files are defined as those smaller than or equal to the chunk size multiplied by this factor.)"
         ),
     },
+    "settings.large_file_upload_max_in_flight_mb": {
+        "default": "1024",
+        "description": (
+            "When uploading job attachments, 'large' files are uploaded several at a time, largest first, as long as the total size "
+            "of the large files in flight stays within this many megabytes. A single file larger than this is uploaded on its own. "
+            "This bounds how much upload bandwidth is wasted if the upload is cancelled."
+        ),
+    },
+    "settings.large_file_upload_max_parts_in_flight": {
+        "default": "50",
+        "description": (
+            "The maximum number of parts of 'large' job attachment files that are uploaded at the same time, across all the large "
+            "files in flight. It is capped at 's3_max_pool_connections'."
+        ),
+    },
+    "settings.hashing_engine": {
+        "default": HashingEngine.THREAD.value,
+        "description": (
+            "How job attachment input files are hashed before upload. 'THREAD' hashes files on a thread pool in the submitting process. "
+            "'PROCESS' spreads files across a process pool, grouping small files into batches, which is faster on hosts with many cores."
+        ),
+    },
+    "settings.pack_small_files": {
+        "default": "false",
+        "description": (
+            "Whether to pack small job attachment input files into larger objects when uploading them. "
+            "This makes uploading and downloading many tiny files faster, but the packed files can only be read by "
+            "versions of Deadline Cloud that support packing, and virtual file system downloads are not used for them."
+        ),
+    },
+    "settings.compress_manifests": {
+        "default": "false",
+        "description": (
+            "Whether to gzip-compress the job attachment manifests that are uploaded to S3, which makes manifests of "
+            "jobs with many files much smaller to download. Compressed manifests can only be read by versions of "
+            "Deadline Cloud that support them."
+        ),
+    },
+    "settings.pipelined_upload": {
+        "default": "false",
+        "description": (
+            "Whether to upload job attachment input files while they are being hashed when submitting a job, "
+            "instead of hashing all the files first and then uploading them. Hashing and upload progress are reported at the same time."
+        ),
+    },
+    "settings.adaptive_concurrency": {
+        "default": "false",
+        "description": (
+            "Whether to adjust the number of concurrent job attachment uploads and downloads at runtime, based on the "
+            "latency of transfers and on throttling by S3. The worker counts derived from 's3_max_pool_connections' "
+            "become upper bounds."
+        ),
+    },
+    "settings.download_cache": {
+        "default": "false",
+        "description": (
+            "Whether to keep a local cache of downloaded job attachment files, shared by the sessions on the host that "
+            "download from the same S3 bucket and root prefix. "
+            "Files that are in the cache are copied from it instead of being downloaded again, so repeated tasks of the "
+            "same job barely use the network."
+        ),
+    },
+    "settings.download_cache_dir": {
+        "default": DEFAULT_DOWNLOAD_CACHE_DIR,
+        "description": "The directory of the local cache of downloaded job attachment files.",
+    },
+    "settings.download_cache_max_size_mb": {
+        "default": "10240",
+        "description": (
+            "The maximum size of the local cache of downloaded job attachment files, in megabytes. The least recently "
+            "used files are removed from the cache when it grows larger."
+        ),
+    },
+    "settings.transfer_engine": {
+        "default": TransferEngine.THREAD.value,
+        "description": (
+            "How job attachment files are transferred to and from S3. 'THREAD' uses thread pools. 'ASYNCIO' runs all "
+            "the requests on an event loop in a single thread, which uses far fewer threads and less memory for transfers "
+            "of many files. 'ASYNCIO' requires the aiobotocore package, which is installed with 'pip install \"deadline[async]\"'."
+        ),
+    },
 }
 
 
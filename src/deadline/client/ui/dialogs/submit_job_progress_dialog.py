@@ -61,6 +61,7 @@ from deadline.job_attachments.models import (
 )
 from deadline.job_attachments.progress_tracker import ProgressReportMetadata, SummaryStatistics
 from deadline.job_attachments.upload import S3AssetManager
+from deadline.job_attachments._scan import ScannedFile, _scan_directory
 from deadline.job_attachments._utils import _human_readable_file_size
 
 __all__ = ["SubmitJobProgressDialog"]
@@ -248,6 +249,7 @@ class SubmitJobProgressDialog(QDialog):
         ):
             # Extend input_filenames with all the files in the input_directories
             missing_directories: set[str] = set()
+            scanned_files: dict[str, ScannedFile] = {}
             for directory in self.asset_references.input_directories:
                 if not os.path.isdir(directory):
                     if self._require_paths_exist:
@@ -259,14 +261,14 @@ class SubmitJobProgressDialog(QDialog):
                         self.asset_references.referenced_paths.add(directory)
                     continue
 
-                is_dir_empty = True
-                for root, _, files in os.walk(directory):
-                    if not files:
-                        continue
-                    is_dir_empty = False
-                    self.asset_references.input_filenames.update(
-                        os.path.normpath(os.path.join(root, file)) for file in files
-                    )
+                directory_files = _scan_directory(directory)
+                is_dir_empty = not directory_files
+                self.asset_references.input_filenames.update(directory_files)
+                scanned_files.update(
+                    (path, scanned_file)
+                    for (path, scanned_file) in directory_files.items()
+                    if scanned_file is not None
+                )
                 # Empty directories just become references since there's nothing to upload
                 if is_dir_empty:
                     logging.info(
@@ -307,6 +309,7 @@ class SubmitJobProgressDialog(QDialog):
                 referenced_paths=sorted(self.asset_references.referenced_paths),
                 storage_profile=self._storage_profile,
                 require_paths_exist=self._require_paths_exist,
+                scanned_files=scanned_files,
             )
             # If we find any Job Attachments, start a background thread
             if upload_group.asset_groups:
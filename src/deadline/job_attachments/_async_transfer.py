@@ -0,0 +1,428 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+An asyncio engine for transferring job attachment files to and from S3.
+
+The thread engine uses a thread for each file in flight, on top of the threads of the S3 transfer
+manager. This engine instead runs all the requests of a transfer on an event loop in the calling
+thread, multiplexed over a bounded pool of connections, so the number of threads stays flat no
+matter how many files are transferred.
+
+It requires the optional aiobotocore dependency, which is only imported when the engine is used.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, List, Optional, Sequence, TypeVar
+from uuid import uuid4
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+
+from . import version
+from ._aws.aws_clients import get_s3_endpoint_url
+from ._aws.aws_config import S3_CONNECT_TIMEOUT_IN_SECS, S3_READ_TIMEOUT_IN_SECS, S3_RETRIES_MODE
+from .exceptions import (
+    COMMON_ERROR_GUIDANCE_FOR_S3,
+    AssetSyncCancelledError,
+    AssetSyncError,
+    JobAttachmentS3BotoCoreError,
+    JobAttachmentsS3ClientError,
+)
+from .progress_tracker import ProgressTracker
+
+logger = logging.getLogger("deadline.job_attachments")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Files larger than this are uploaded with multi-part uploads, in parts of this size.
+ASYNC_UPLOAD_PART_SIZE: int = 8 * 1024 * 1024  # 8 MB
+# The parts of a multi-part upload are uploaded concurrently, with at most this many parts of each
+# file read into memory and in flight at a time.
+ASYNC_UPLOAD_MAX_PARTS_IN_FLIGHT: int = 4
+# Downloads are read from the response and written to the file in chunks of this size.
+ASYNC_DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024  # 1 MB
+# The lifetime that the credentials passed to aiobotocore are given. aiobotocore reads them again
+# from the boto3 session, which refreshes them before they actually expire, once they're within
+# 15 minutes of this lifetime, so a long transfer keeps working with temporary credentials.
+ASYNC_CREDENTIALS_LIFETIME_IN_SECS: int = 20 * 60
+
+
+def _import_aiobotocore() -> tuple[Any, Any]:
+    """
+    Imports the aiobotocore session factory and config class.
+    Raises AssetSyncError if aiobotocore is not installed.
+    """
+    try:
+        from aiobotocore.config import AioConfig
+        from aiobotocore.session import get_session
+    except ImportError as ie:
+        raise AssetSyncError(
+            "The ASYNCIO transfer engine requires the aiobotocore package. Install it with "
+            "'pip install \"deadline[async]\"', or set 'settings.transfer_engine' to 'THREAD'."
+        ) from ie
+    return (get_session, AioConfig)
+
+
+def _get_aio_session(session: boto3.Session, get_session: Callable[[], Any]) -> Any:
+    """
+    Returns an aiobotocore session that gets its credentials from the given boto3 session. The
+    credentials are read again periodically rather than copied once, since temporary credentials,
+    such as those of a role or a queue, expire while a long transfer runs.
+    """
+    from aiobotocore.credentials import AioCredentialResolver, AioDeferredRefreshableCredentials
+    from botocore.credentials import CredentialProvider
+
+    aio_session = get_session()
+    credentials = session.get_credentials()
+    if credentials is None:
+        return aio_session
+
+    async def refresh() -> Dict[str, Any]:
+        # The boto3 credentials refresh themselves, which can block, if they're about to expire.
+        frozen_credentials = await run_in_thread(credentials.get_frozen_credentials)
+        expiry_time = datetime.now(timezone.utc) + timedelta(
+            seconds=ASYNC_CREDENTIALS_LIFETIME_IN_SECS
+        )
+        return {
+            "access_key": frozen_credentials.access_key,
+            "secret_key": frozen_credentials.secret_key,
+            "token": frozen_credentials.token,
+            "expiry_time": expiry_time.isoformat(),
+        }
+
+    class Boto3SessionProvider(CredentialProvider):
+        METHOD = "boto3-session"
+
+        async def load(self) -> Any:
+            return AioDeferredRefreshableCredentials(refresh_using=refresh, method=self.METHOD)
+
+    aio_session.register_component(
+        "credential_provider", AioCredentialResolver(providers=[Boto3SessionProvider()])
+    )
+    return aio_session
+
+
+async def run_in_thread(func: Callable[..., T], *args: Any) -> T:
+    """
+    Runs a blocking function, such as a file read or a cache lookup, on the default thread pool of
+    the event loop, so that it doesn't hold up the other transfers.
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+
+async def _run_in_thread_to_completion(
+    func: Callable[..., T], *args: Any, on_cancelled: Optional[Callable[[T], None]] = None
+) -> T:
+    """
+    Runs a blocking function on the default thread pool like `run_in_thread`, but if the task is
+    cancelled, waits for the function to finish before the cancellation is raised, since it can't
+    be stopped once it has started. This makes sure that a cancelled download doesn't create or
+    write its file after cleaning up. `on_cancelled` is called with the result of a function that
+    finished after the task was cancelled.
+    """
+    future = asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        if on_cancelled is not None and not future.cancelled() and future.exception() is None:
+            on_cancelled(future.result())
+        raise
+
+
+def _get_client_error(
+    exc: ClientError,
+    action: str,
+    bucket: str,
+    key: str,
+    permission: str,
+    local_path: Path,
+) -> JobAttachmentsS3ClientError:
+    status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+    status_code_guidance = {
+        **COMMON_ERROR_GUIDANCE_FOR_S3,
+        403: (
+            "Forbidden or Access denied. Please check your AWS credentials, and ensure that "
+            f"your AWS IAM Role or User has the '{permission}' permission for this bucket. "
+        ),
+        404: (
+            "Not found. Please check your bucket name and object key, and ensure that they exist in the AWS account."
+        ),
+    }
+    return JobAttachmentsS3ClientError(
+        action=action,
+        status_code=status_code,
+        bucket_name=bucket,
+        key_or_prefix=key,
+        message=f"{status_code_guidance.get(status_code, '')} {str(exc)} ({str(local_path)})",
+    )
+
+
+class AsyncS3Transfer:
+    """
+    Makes the S3 requests of a transfer with an aiobotocore client, and reports the transferred
+    bytes to the progress tracker. Instances are created by `run_transfers`.
+    """
+
+    def __init__(self, s3_client: Any, progress_tracker: Optional[ProgressTracker] = None) -> None:
+        self._s3 = s3_client
+        self.progress_tracker = progress_tracker
+
+    def _track_progress(self, num_bytes: int, cancelled_message: str) -> None:
+        """
+        Reports the transferred bytes, and raises AssetSyncCancelledError if the progress
+        callback asked to cancel the transfer.
+        """
+        if self.progress_tracker and not self.progress_tracker.track_progress_callback(num_bytes):
+            raise AssetSyncCancelledError(
+                cancelled_message, self.progress_tracker.get_summary_statistics()
+            )
+
+    async def object_exists(self, bucket: str, key: str) -> bool:
+        """
+        Checks whether the object exists with a head-object request.
+        """
+        try:
+            await self._s3.head_object(Bucket=bucket, Key=key)
+            return True
+        except ClientError as exc:
+            status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+            if status_code == 403:
+                raise JobAttachmentsS3ClientError(
+                    "checking if object exists",
+                    status_code,
+                    bucket,
+                    key,
+                    "Access denied. Ensure that the bucket is in your account, "
+                    "and your AWS IAM Role or User has the 's3:ListBucket' permission for this bucket.",
+                ) from exc
+            return False
+        except BotoCoreError as bce:
+            raise JobAttachmentS3BotoCoreError(
+                action="checking for the existence of an object in the S3 bucket",
+                error_details=str(bce),
+            ) from bce
+
+    async def upload_file(
+        self, file_obj: BinaryIO, file_size: int, bucket: str, key: str, local_path: Path
+    ) -> None:
+        """
+        Uploads the contents of the open file to the given key. Files of up to one part are
+        uploaded with a single put-object request, and larger files with a multi-part upload whose
+        parts are uploaded concurrently, with at most `ASYNC_UPLOAD_MAX_PARTS_IN_FLIGHT` parts
+        read into memory at a time. The file is read on the thread pool of the event loop.
+        """
+        try:
+            if file_size <= ASYNC_UPLOAD_PART_SIZE:
+                data = await run_in_thread(file_obj.read)
+                await self._s3.put_object(Bucket=bucket, Key=key, Body=data)
+                self._track_progress(len(data), "File upload cancelled.")
+            else:
+                await self._upload_file_multipart(file_obj, file_size, bucket, key)
+        except ClientError as exc:
+            raise _get_client_error(
+                exc, "uploading file", bucket, key, "s3:PutObject", local_path
+            ) from exc
+        except BotoCoreError as bce:
+            raise JobAttachmentS3BotoCoreError(
+                action="uploading file",
+                error_details=str(bce),
+            ) from bce
+
+    async def _upload_file_multipart(
+        self, file_obj: BinaryIO, file_size: int, bucket: str, key: str
+    ) -> None:
+        upload_id = (await self._s3.create_multipart_upload(Bucket=bucket, Key=key))["UploadId"]
+        # The parts share the file object, so each of them seeks and reads under the lock.
+        read_lock = threading.Lock()
+        parts_in_flight = asyncio.Semaphore(ASYNC_UPLOAD_MAX_PARTS_IN_FLIGHT)
+
+        def read_part(part_number: int) -> bytes:
+            with read_lock:
+                file_obj.seek((part_number - 1) * ASYNC_UPLOAD_PART_SIZE)
+                return file_obj.read(ASYNC_UPLOAD_PART_SIZE)
+
+        async def upload_part(part_number: int) -> Dict[str, Any]:
+            async with parts_in_flight:
+                data = await run_in_thread(read_part, part_number)
+                response = await self._s3.upload_part(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=data,
+                )
+                self._track_progress(len(data), "File upload cancelled.")
+                return {"ETag": response["ETag"], "PartNumber": part_number}
+
+        num_parts = -(-file_size // ASYNC_UPLOAD_PART_SIZE)
+        part_tasks = [
+            asyncio.ensure_future(upload_part(part_number))
+            for part_number in range(1, num_parts + 1)
+        ]
+        try:
+            parts: List[Dict[str, Any]] = await asyncio.gather(*part_tasks)
+            await self._s3.complete_multipart_upload(
+                Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            for part_task in part_tasks:
+                part_task.cancel()
+            await asyncio.gather(*part_tasks, return_exceptions=True)
+            # Don't leave the parts of a failed or cancelled upload behind in the bucket.
+            try:
+                await self._s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            except Exception as e:
+                logger.warning(f"Failed to abort the multi-part upload of s3://{bucket}/{key}: {e}")
+            raise
+
+    async def download_file(
+        self,
+        bucket: str,
+        key: str,
+        local_path: Path,
+        byte_range: Optional[str] = None,
+        expected_size: Optional[int] = None,
+    ) -> int:
+        """
+        Downloads the object, or the given byte range of it, to the local path, streaming it in
+        chunks. The object is written to a temporary file next to the local path, which is then
+        renamed, so that a failed or cancelled download leaves no partial file behind. The file
+        is opened, written and renamed on the thread pool, to keep the event loop responsive.
+        Returns the number of bytes downloaded.
+        """
+        temp_path = local_path.with_name(f"{local_path.name}.{uuid4().hex[:8]}")
+        get_object_args = {"Bucket": bucket, "Key": key}
+        if byte_range:
+            get_object_args["Range"] = byte_range
+        num_bytes = 0
+        try:
+            response = await self._s3.get_object(**get_object_args)
+            async with response["Body"] as body:
+                file_obj: BinaryIO = await _run_in_thread_to_completion(
+                    open, temp_path, "wb", on_cancelled=lambda file_obj: file_obj.close()
+                )
+                try:
+                    while True:
+                        chunk = await body.read(ASYNC_DOWNLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        await _run_in_thread_to_completion(file_obj.write, chunk)
+                        num_bytes += len(chunk)
+                        self._track_progress(len(chunk), "File download cancelled.")
+                finally:
+                    await _run_in_thread_to_completion(file_obj.close)
+            if expected_size is not None and num_bytes != expected_size:
+                raise AssetSyncError(
+                    f"Downloaded {num_bytes} bytes of s3://{bucket}/{key} for {str(local_path)}, "
+                    f"but expected {expected_size} bytes."
+                )
+            await _run_in_thread_to_completion(os.replace, temp_path, local_path)
+        except ClientError as exc:
+            raise _get_client_error(
+                exc, "downloading file", bucket, key, "s3:GetObject", local_path
+            ) from exc
+        except BotoCoreError as bce:
+            raise JobAttachmentS3BotoCoreError(
+                action="downloading file",
+                error_details=str(bce),
+            ) from bce
+        finally:
+            # A single call, so that the file is removed even if the task is cancelled meanwhile.
+            await _run_in_thread_to_completion(functools.partial(temp_path.unlink, missing_ok=True))
+        return num_bytes
+
+
+def run_transfers(
+    items: Sequence[T],
+    transfer: Callable[[AsyncS3Transfer, T], Awaitable[R]],
+    session: boto3.Session,
+    max_concurrency: int,
+    progress_tracker: Optional[ProgressTracker] = None,
+    expected_bucket_owner: Optional[str] = None,
+) -> List[R]:
+    """
+    Runs the `transfer` coroutine for each of the items on an event loop in the calling thread,
+    with at most `max_concurrency` of them in flight over a pool of as many connections.
+    Returns the results in the order of the items. If a transfer fails, or is cancelled through
+    the progress tracker, the other transfers are cancelled and the error is raised.
+    """
+    if not items:
+        return []
+    (get_session, aio_config) = _import_aiobotocore()
+    return asyncio.run(
+        _run_transfers(
+            items,
+            transfer,
+            session,
+            max_concurrency,
+            progress_tracker,
+            expected_bucket_owner,
+            get_session,
+            aio_config,
+        )
+    )
+
+
+async def _run_transfers(
+    items: Sequence[T],
+    transfer: Callable[[AsyncS3Transfer, T], Awaitable[R]],
+    session: boto3.Session,
+    max_concurrency: int,
+    progress_tracker: Optional[ProgressTracker],
+    expected_bucket_owner: Optional[str],
+    get_session: Callable[[], Any],
+    aio_config: Any,
+) -> List[R]:
+    async with _get_aio_session(session, get_session).create_client(
+        "s3",
+        region_name=session.region_name,
+        endpoint_url=get_s3_endpoint_url(session),
+        config=aio_config(
+            signature_version="s3v4",
+            connect_timeout=S3_CONNECT_TIMEOUT_IN_SECS,
+            read_timeout=S3_READ_TIMEOUT_IN_SECS,
+            retries={"mode": S3_RETRIES_MODE},
+            user_agent_extra=f"S3A/Deadline/NA/JobAttachments/{version}",
+            max_pool_connections=max_concurrency,
+        ),
+    ) as s3_client:
+        if expected_bucket_owner:
+
+            def add_expected_bucket_owner(params, model, **kwargs):
+                if "ExpectedBucketOwner" in model.input_shape.members:
+                    params["ExpectedBucketOwner"] = expected_bucket_owner
+
+            s3_client.meta.events.register("provide-client-params.s3.*", add_expected_bucket_owner)
+
+        async_transfer = AsyncS3Transfer(s3_client, progress_tracker)
+        results: List[Any] = [None] * len(items)
+        # The workers share one iterator over the items, so at most `max_concurrency` transfers
+        # exist at any time, however many items there are.
+        indexes = iter(range(len(items)))
+
+        async def worker() -> None:
+            for index in indexes:
+                results[index] = await transfer(async_transfer, items[index])
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(max_concurrency, len(items)))]
+        try:
+            (done, _) = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for worker_task in workers:
+                worker_task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        for worker_task in workers:
+            if worker_task in done and worker_task.exception() is not None:
+                raise worker_task.exception()  # type: ignore[misc]
+
+    return results
@@ -3,8 +3,9 @@
 """Functions for handling and retrieving AWS clients."""
 from __future__ import annotations
 
+import os
 from functools import lru_cache
-from typing import Optional
+from typing import Optional, Tuple
 
 import boto3
 import botocore
@@ -15,6 +16,7 @@ from deadline.client.config import config_file
 
 from .. import version
 from ..exceptions import AssetSyncError
+from ..models import TransferEngine
 from .aws_config import (
     S3_CONNECT_TIMEOUT_IN_SECS,
     S3_READ_TIMEOUT_IN_SECS,
@@ -71,7 +73,7 @@ def get_s3_client(session: Optional[boto3.Session] = None) -> BaseClient:
             user_agent_extra=f"S3A/Deadline/NA/JobAttachments/{version}",
             max_pool_connections=s3_max_pool_connections,
         ),
-        endpoint_url=f"https://s3.{session.region_name}.amazonaws.com",
+        endpoint_url=get_s3_endpoint_url(session),
     )
 
     def add_expected_bucket_owner(params, model, **kwargs):
@@ -86,6 +88,13 @@ def get_s3_client(session: Optional[boto3.Session] = None) -> BaseClient:
     return client
 
 
+def get_s3_endpoint_url(session: boto3.Session) -> str:
+    """
+    Returns the regional endpoint of S3 for the given session.
+    """
+    return f"https://s3.{session.region_name}.amazonaws.com"
+
+
 def get_s3_max_pool_connections() -> int:
     try:
         s3_max_pool_connections = int(config_file.get_setting("settings.s3_max_pool_connections"))
@@ -101,9 +110,73 @@ def get_s3_max_pool_connections() -> int:
     return s3_max_pool_connections
 
 
+def get_transfer_engine() -> TransferEngine:
+    """
+    Returns how job attachment files are transferred to and from S3.
+    """
+    transfer_engine = config_file.get_setting("settings.transfer_engine")
+    try:
+        return TransferEngine(transfer_engine.upper())
+    except ValueError as ve:
+        raise AssetSyncError(
+            "Nonvalid value for configuration setting: "
+            f"'transfer_engine' ({transfer_engine}) must be one of "
+            f"{', '.join(engine.value for engine in TransferEngine)}."
+        ) from ve
+
+
+def get_adaptive_concurrency() -> bool:
+    """
+    Returns whether the number of concurrent S3 transfers is adjusted at runtime.
+    """
+    adaptive_concurrency = config_file.get_setting("settings.adaptive_concurrency")
+    try:
+        return config_file.str2bool(adaptive_concurrency)
+    except ValueError as ve:
+        raise AssetSyncError(
+            f"Nonvalid value for configuration setting: 'adaptive_concurrency' ({adaptive_concurrency}) must be true or false."
+        ) from ve
+
+
+def get_download_cache_settings() -> Optional[Tuple[str, int]]:
+    """
+    Returns the directory and the maximum size in bytes of the local cache of downloaded files,
+    or None if the cache is not enabled.
+    """
+    download_cache = config_file.get_setting("settings.download_cache")
+    try:
+        if not config_file.str2bool(download_cache):
+            return None
+    except ValueError as ve:
+        raise AssetSyncError(
+            f"Nonvalid value for configuration setting: 'download_cache' ({download_cache}) must be true or false."
+        ) from ve
+    try:
+        max_size_mb = int(config_file.get_setting("settings.download_cache_max_size_mb"))
+    except ValueError as ve:
+        raise AssetSyncError(
+            "Failed to parse configuration settings. Please ensure that the following settings in the config file are integers: "
+            "'download_cache_max_size_mb'"
+        ) from ve
+    if max_size_mb <= 0:
+        raise AssetSyncError(
+            f"Nonvalid value for configuration setting: 'download_cache_max_size_mb' ({max_size_mb}) must be positive integer."
+        )
+    cache_dir = os.path.expanduser(config_file.get_setting("settings.download_cache_dir"))
+    return (cache_dir, max_size_mb * 1024 * 1024)
+
+
 @lru_cache(maxsize=MAX_SIZE_CACHE)
-def get_s3_transfer_manager(s3_client: BaseClient):
-    transfer_config = boto3.s3.transfer.TransferConfig()
+def get_s3_transfer_manager(s3_client: BaseClient, max_concurrency: Optional[int] = None):
+    """
+    Get a transfer manager for the S3 client. All the transfers of a transfer manager share its
+    pool of request threads, so `max_concurrency` bounds the number of parts in flight across
+    all of them. If it is not given, the boto3 default is used.
+    """
+    if max_concurrency is None:
+        transfer_config = boto3.s3.transfer.TransferConfig()
+    else:
+        transfer_config = boto3.s3.transfer.TransferConfig(max_concurrency=max_concurrency)
     return create_transfer_manager(client=s3_client, config=transfer_config)
 
 
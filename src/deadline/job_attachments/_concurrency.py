@@ -0,0 +1,211 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Adaptive control of the number of concurrent S3 transfers."""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from botocore.client import BaseClient
+
+# The error codes with which S3 asks the client to slow down its requests.
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "SlowDown",
+        "503",
+        "Throttling",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+        "RequestThrottled",
+        "TooManyRequestsException",
+    }
+)
+# Throttled requests within this many seconds of a decrease are part of the same congestion
+# event, since the requests that were already in flight at the time of the decrease can still
+# be throttled. They do not decrease the concurrency again.
+DECREASE_COOLDOWN = 1.0  # in seconds
+# While the smoothed latency per byte of transfers is above this multiple of the lowest smoothed
+# latency per byte seen so far, the link is treated as congested and the concurrency does not grow.
+LATENCY_CONGESTION_FACTOR = 3.0
+# The weight of the latest transfer in the exponentially weighted moving average of latencies.
+LATENCY_SMOOTHING = 0.2
+# The latency of a transfer is divided by its number of bytes, so that a mix of file sizes does
+# not look like congestion. The time of transfers smaller than this is dominated by the fixed
+# cost of a request, so they are counted as transfers of this many bytes.
+LATENCY_MIN_BYTES = 1024 * 1024
+
+
+class TransferSlot:
+    """
+    A slot of an AdaptiveConcurrencyController that is held for the duration of a transfer.
+    """
+
+    def __init__(self) -> None:
+        self.transferred_bytes: Optional[int] = None
+
+    def transferred(self, num_bytes: int) -> None:
+        """
+        Records that the transfer moved the given number of bytes. Slots that are released
+        without a transfer, for example because the object was already uploaded, don't affect
+        the concurrency.
+        """
+        self.transferred_bytes = num_bytes
+
+
+class AdaptiveConcurrencyController:
+    """
+    Limits the number of concurrent S3 transfers, and adjusts the limit at runtime with
+    additive increase and multiplicative decrease (AIMD), in the way TCP congestion control does:
+    - Each time as many transfers as the current concurrency complete, the concurrency grows by
+      one, up to `max_concurrency`.
+    - When S3 throttles a request with a 503 SlowDown error, the concurrency is halved, down to
+      `min_concurrency`.
+    - While the latency per byte of transfers is far above the lowest latency per byte seen,
+      the concurrency holds steady instead of growing.
+
+    Worker pools are sized to `max_concurrency`, and each worker holds a slot of the controller
+    for the duration of each transfer. Throttling is observed through the retry events of the S3
+    client that is passed to `watch`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        initial_concurrency: Optional[int] = None,
+        min_concurrency: int = 1,
+        decrease_cooldown: float = DECREASE_COOLDOWN,
+    ) -> None:
+        if max_concurrency <= 0:
+            raise ValueError(f"The max concurrency ({max_concurrency}) must be positive.")
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = max(1, min(min_concurrency, max_concurrency))
+        if initial_concurrency is None:
+            initial_concurrency = max_concurrency // 2
+        self._concurrency = max(self.min_concurrency, min(initial_concurrency, max_concurrency))
+        self.decrease_cooldown = decrease_cooldown
+
+        self._condition = threading.Condition()
+        self._active_transfers = 0
+        self._completed_since_change = 0
+        self._last_decrease_time: Optional[float] = None
+        self._smoothed_latency: Optional[float] = None
+        self._lowest_smoothed_latency: Optional[float] = None
+
+        self.peak_concurrency = self._concurrency
+        self.completed_transfers = 0
+        self.transferred_bytes = 0
+        self.throttled_requests = 0
+        self._transfer_time = 0.0
+
+    @property
+    def concurrency(self) -> int:
+        """The number of transfers that are currently allowed to run at the same time."""
+        return self._concurrency
+
+    @property
+    def average_latency(self) -> float:
+        """The average time (in seconds) taken by the completed transfers."""
+        return self._transfer_time / self.completed_transfers if self.completed_transfers else 0.0
+
+    @contextmanager
+    def slot(self) -> Iterator[TransferSlot]:
+        """
+        Waits until fewer transfers than the current concurrency are running, and holds a slot
+        while the body runs. Call `transferred` on the slot to record a completed transfer.
+        """
+        with self._condition:
+            while self._active_transfers >= self._concurrency:
+                self._condition.wait()
+            self._active_transfers += 1
+
+        transfer_slot = TransferSlot()
+        start_time = time.perf_counter()
+        succeeded = False
+        try:
+            yield transfer_slot
+            succeeded = True
+        finally:
+            latency = time.perf_counter() - start_time
+            with self._condition:
+                self._active_transfers -= 1
+                if succeeded and transfer_slot.transferred_bytes is not None:
+                    self._on_transfer_completed(latency, transfer_slot.transferred_bytes)
+                self._condition.notify_all()
+
+    def on_throttled(self) -> None:
+        """
+        Halves the concurrency, unless it was already decreased within the cooldown period.
+        """
+        with self._condition:
+            self.throttled_requests += 1
+            current_time = time.monotonic()
+            if (
+                self._last_decrease_time is not None
+                and current_time - self._last_decrease_time < self.decrease_cooldown
+            ):
+                return
+            self._last_decrease_time = current_time
+            self._concurrency = max(self.min_concurrency, self._concurrency // 2)
+            self._completed_since_change = 0
+
+    def _on_transfer_completed(self, latency: float, num_bytes: int) -> None:
+        """
+        Records a completed transfer, and grows the concurrency by one once a full window of
+        transfers has completed without signs of congestion. Must be called with the lock held.
+        """
+        self.completed_transfers += 1
+        self.transferred_bytes += num_bytes
+        self._transfer_time += latency
+
+        latency_per_byte = latency / max(num_bytes, LATENCY_MIN_BYTES)
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency_per_byte
+        else:
+            self._smoothed_latency += LATENCY_SMOOTHING * (
+                latency_per_byte - self._smoothed_latency
+            )
+        if (
+            self._lowest_smoothed_latency is None
+            or self._smoothed_latency < self._lowest_smoothed_latency
+        ):
+            self._lowest_smoothed_latency = self._smoothed_latency
+        if self._smoothed_latency > LATENCY_CONGESTION_FACTOR * self._lowest_smoothed_latency:
+            return
+
+        self._completed_since_change += 1
+        if (
+            self._completed_since_change >= self._concurrency
+            and self._concurrency < self.max_concurrency
+        ):
+            self._concurrency += 1
+            self._completed_since_change = 0
+            self.peak_concurrency = max(self.peak_concurrency, self._concurrency)
+
+    def _on_needs_retry(self, response: Optional[Any] = None, **kwargs: Any) -> None:
+        """
+        Handles the botocore event that is emitted after each attempt of a request, to observe
+        the requests that S3 throttled. Returns None so that the retry decision is left to the
+        client's retry handler.
+        """
+        if response is None:
+            return None
+        (http_response, parsed) = response
+        error_code = parsed.get("Error", {}).get("Code") if isinstance(parsed, dict) else None
+        if error_code in THROTTLING_ERROR_CODES or getattr(http_response, "status_code", 0) == 503:
+            self.on_throttled()
+        return None
+
+    @contextmanager
+    def watch(self, s3_client: BaseClient) -> Iterator[AdaptiveConcurrencyController]:
+        """
+        Observes the requests that the given S3 client makes while the body runs, and decreases
+        the concurrency whenever one of them is throttled.
+        """
+        unique_id = f"adaptive-concurrency-{id(self)}"
+        s3_client.meta.events.register("needs-retry.s3", self._on_needs_retry, unique_id=unique_id)
+        try:
+            yield self
+        finally:
+            s3_client.meta.events.unregister("needs-retry.s3", unique_id=unique_id)
@@ -3,8 +3,9 @@ import concurrent.futures
 
 import logging
 import os
+from collections import deque
 from pathlib import Path, PurePosixPath
-from typing import Dict, List, Tuple
+from typing import Deque, Dict, Iterator, List, Set, Tuple
 from deadline.client.cli._groups.click_logger import ClickLogger
 from deadline.client.config import config_file
 from deadline.client.exceptions import NonValidInputError
@@ -16,6 +17,11 @@ from deadline.job_attachments.caches.hash_cache import HashCache
 from deadline.job_attachments.models import AssetRootManifest, FileStatus, ManifestDiff
 from deadline.job_attachments.upload import S3AssetManager
 
+# The number of files stat-ed per task, and the number of threads stat-ing them, when diffing a
+# list of files with a manifest. Stat calls are I/O bound, especially on network file systems.
+STAT_CHUNK_SIZE = 1000
+STAT_MAX_WORKERS = 16
+
 
 def diff_manifest(
     asset_manager: S3AssetManager,
@@ -133,12 +139,37 @@ def _fast_file_list_to_manifest_diff(
     :param logger: logger.
     :return List[Tuple[str, FileStatus]]: List of Tuple containing the file path and FileStatus pair.
     """
+    return list(
+        _iter_file_list_to_manifest_diff(
+            root=root,
+            current_files=current_files,
+            diff_manifest=diff_manifest,
+            logger=logger,
+            return_root_relative_path=return_root_relative_path,
+        )
+    )
+
+
+def _iter_file_list_to_manifest_diff(
+    root: str,
+    current_files: List[str],
+    diff_manifest: BaseAssetManifest,
+    logger: ClickLogger,
+    return_root_relative_path: bool = True,
+) -> Iterator[Tuple[str, FileStatus]]:
+    """
+    Same as `_fast_file_list_to_manifest_diff`, but yields each difference as soon as it is found,
+    so that the caller can start printing the differences right away. The new and modified files
+    are yielded in the order of `current_files`, then the deleted files.
+
+    The files are stat-ed on a thread pool, and the paths are compared with sets and dictionaries
+    of paths, so that the diff takes linear time in the number of files.
+    """
 
     # Select either relative or absolut path for results.
     def select_path(full_path: str, relative_path: str, return_root_relative_path: bool):
         return relative_path if return_root_relative_path else full_path
 
-    changed_paths: List[Tuple[str, FileStatus]] = []
     input_files_map: Dict[str, BaseManifestPath] = {}
     for input_file in diff_manifest.paths:
         # Normalize paths so we can compare different OSes
@@ -146,53 +177,87 @@ def _fast_file_list_to_manifest_diff(
         input_files_map[normalized_path] = input_file
 
     # Iterate for each file that we found in glob.
-    root_relative_paths: List[str] = []
-    for local_file in current_files:
-        # Get the file's time stamp and size. We want to compare both.
-        # From enabling CRT, sometimes timestamp update can fail.
-        local_file_path = Path(local_file)
-        file_stat = local_file_path.stat()
-
+    # Save the relative paths to a set so we can look for deleted files.
+    root_relative_paths: Set[str] = set()
+    root_prefix = os.path.join(os.path.normpath(root), "")
+    for local_file, file_stat in _stat_files(current_files):
         # Compare the glob against the relative path we store in the manifest.
-        # Save it to a list so we can look for deleted files.
-        root_relative_path = str(PurePosixPath(*local_file_path.relative_to(root).parts).as_posix())
-        root_relative_paths.append(root_relative_path)
+        if local_file.startswith(root_prefix) and os.path.normpath(local_file) == local_file:
+            # Slicing a normalized path is much faster than the same with pathlib.
+            root_relative_path = local_file[len(root_prefix) :].replace(os.sep, "/")
+        else:
+            local_file_path = Path(local_file)
+            root_relative_path = str(
+                PurePosixPath(*local_file_path.relative_to(root).parts).as_posix()
+            )
+        root_relative_paths.add(root_relative_path)
 
         return_path = select_path(
             full_path=local_file,
             relative_path=root_relative_path,
             return_root_relative_path=return_root_relative_path,
         )
-        if root_relative_path not in input_files_map:
+        manifest_file = input_files_map.get(root_relative_path)
+        if manifest_file is None:
             # This is a new file
             logger.echo(f"Found difference at: {root_relative_path}, Status: FileStatus.NEW")
-            changed_paths.append((return_path, FileStatus.NEW))
-        else:
-            # This is a modified file, compare with manifest relative timestamp.
-            input_file = input_files_map[root_relative_path]
-            # Check file size first as it is easier to test. Usually modified files will also have size diff.
-            if file_stat.st_size != input_file.size:
-                changed_paths.append((return_path, FileStatus.MODIFIED))
-                logger.echo(
-                    f"Found size difference at: {root_relative_path}, Status: FileStatus.MODIFIED"
-                )
-            elif int(file_stat.st_mtime_ns // 1000) != input_file.mtime:
-                changed_paths.append((return_path, FileStatus.MODIFIED))
-                logger.echo(
-                    f"Found time difference at: {root_relative_path}, Status: FileStatus.MODIFIED"
-                )
+            yield (return_path, FileStatus.NEW)
+        # This is a modified file, compare with manifest relative timestamp.
+        # Check file size first as it is easier to test. Usually modified files will also have size diff.
+        elif file_stat.st_size != manifest_file.size:
+            logger.echo(
+                f"Found size difference at: {root_relative_path}, Status: FileStatus.MODIFIED"
+            )
+            yield (return_path, FileStatus.MODIFIED)
+        elif int(file_stat.st_mtime_ns // 1000) != manifest_file.mtime:
+            logger.echo(
+                f"Found time difference at: {root_relative_path}, Status: FileStatus.MODIFIED"
+            )
+            yield (return_path, FileStatus.MODIFIED)
 
     # Find deleted files. Manifest store files in relative form.
-    for manifest_file_path in diff_manifest.paths:
-        if manifest_file_path.path not in root_relative_paths:
+    for normalized_path, manifest_file_path in input_files_map.items():
+        if normalized_path not in root_relative_paths:
             full_path = os.path.join(root, manifest_file_path.path)
             return_path = select_path(
                 full_path=full_path,
                 relative_path=manifest_file_path.path,
                 return_root_relative_path=return_root_relative_path,
             )
-            changed_paths.append((return_path, FileStatus.DELETED))
-    return changed_paths
+            yield (return_path, FileStatus.DELETED)
+
+
+def _stat_files(files: List[str]) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Stats the files on a thread pool, a chunk of files per task, and yields each file with its
+    stat in the order of the given files. Only a few chunks are stat-ed ahead of the caller, so
+    that the stats of a large list of files aren't all held in memory at once.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=STAT_MAX_WORKERS) as executor:
+        chunks = (
+            files[index : index + STAT_CHUNK_SIZE]
+            for index in range(0, len(files), STAT_CHUNK_SIZE)
+        )
+        in_flight: Deque[Tuple[List[str], concurrent.futures.Future[List[os.stat_result]]]] = (
+            deque()
+        )
+        try:
+            for chunk in chunks:
+                in_flight.append((chunk, executor.submit(_stat_chunk, chunk)))
+                if len(in_flight) >= STAT_MAX_WORKERS * 2:
+                    (done_chunk, stats_future) = in_flight.popleft()
+                    yield from zip(done_chunk, stats_future.result())
+            while in_flight:
+                (done_chunk, stats_future) = in_flight.popleft()
+                yield from zip(done_chunk, stats_future.result())
+        finally:
+            # Don't stat the chunks that are still queued if the caller stops early.
+            for _, stats_future in in_flight:
+                stats_future.cancel()
+
+
+def _stat_chunk(files: List[str]) -> List[os.stat_result]:
+    return [os.stat(file) for file in files]
 
 
 def pretty_print_cli(root: str, all_files: List[str], manifest_diff: ManifestDiff):
@@ -261,13 +326,18 @@ def pretty_print_cli(root: str, all_files: List[str], manifest_diff: ManifestDif
             message = f"{prefix}{symbol}{COLORS['UNCHANGED']}. {COLORS['RESET']}"
             logger.info(message)
 
+    # Sets of the differences, so that looking up the status of each file takes constant time.
+    new_files = set(manifest_diff.new)
+    modified_files = set(manifest_diff.modified)
+    deleted_files = set(manifest_diff.deleted)
+
     def get_file_status(file: str, manifest_diff: ManifestDiff):
         print(file)
-        if file in manifest_diff.new:
+        if file in new_files:
             return FileStatus.NEW
-        elif file in manifest_diff.modified:
+        elif file in modified_files:
             return FileStatus.MODIFIED
-        elif file in manifest_diff.deleted:
+        elif file in deleted_files:
             return FileStatus.DELETED
         else:
             # Default, not in any diff list.
@@ -0,0 +1,121 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Watching of output directories while a session action runs, so that output files can be synced
+as soon as they are written, instead of all at once after the action.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+from logging import Logger, LoggerAdapter
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from ._scan import ScannedFile, _scan_directory
+
+# The default number of seconds between two scans of the output directories.
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+class OutputWatcher:
+    """
+    Polls directories with `os.scandir`, and calls `on_stable_file` on a thread pool for each file
+    that is stable, that is, whose size and modification time are the same in two consecutive
+    scans. A file is passed to `on_stable_file` again if it changes and becomes stable again.
+
+    `on_stable_file` is called with the watched directory, the path of the file in it, and the
+    scanned file. It should check whether `is_stopping` returns True to abandon long operations.
+    Its exceptions are logged, and don't stop the watcher.
+    """
+
+    def __init__(
+        self,
+        directories: List[str],
+        on_stable_file: Callable[[str, str, ScannedFile], None],
+        logger: Union[Logger, LoggerAdapter],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.directories = directories
+        self.on_stable_file = on_stable_file
+        self.logger = logger
+        self.poll_interval = poll_interval
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="OutputWatcher", daemon=True)
+        # The (size, modification time) of each file in the last scan, by path
+        self._last_seen: Dict[str, Tuple[int, int]] = {}
+        # The (size, modification time) of each file when it was passed to `on_stable_file`
+        self._submitted: Dict[str, Tuple[int, int]] = {}
+        self._futures: List[concurrent.futures.Future] = []
+
+    def __enter__(self) -> OutputWatcher:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Starts polling the directories on a background thread, if it isn't started yet."""
+        if self._thread.ident is None:
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops polling the directories. The files that are queued are dropped, and the calls of
+        `on_stable_file` in progress are waited for.
+        """
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+
+    def is_stopping(self) -> bool:
+        """Returns whether the watcher is stopping."""
+        return self._stop_event.is_set()
+
+    def _watch(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.warning(f"Failed to scan output directories: {e}")
+            self._stop_event.wait(self.poll_interval)
+
+    def poll(self) -> None:
+        """
+        Scans the directories once, and submits the files that are stable since the last scan.
+        """
+        self._futures = [future for future in self._futures if not future.done()]
+        seen: Dict[str, Tuple[int, int]] = {}
+        for directory in self.directories:
+            for file_path, scanned_file in _scan_directory(directory).items():
+                if scanned_file is None:
+                    continue
+                file_stat = (scanned_file.stat.st_size, scanned_file.stat.st_mtime_ns)
+                seen[file_path] = file_stat
+                if (
+                    self._last_seen.get(file_path) == file_stat
+                    and self._submitted.get(file_path) != file_stat
+                ):
+                    self._submitted[file_path] = file_stat
+                    self._futures.append(
+                        self._executor.submit(
+                            self._call_on_stable_file, directory, file_path, scanned_file
+                        )
+                    )
+        self._last_seen = seen
+
+    def _call_on_stable_file(
+        self, directory: str, file_path: str, scanned_file: ScannedFile
+    ) -> None:
+        if self._stop_event.is_set():
+            return
+        try:
+            self.on_stable_file(directory, file_path, scanned_file)
+        except Exception as e:
+            self.logger.warning(f"Failed to sync output file {file_path} early: {e}")
@@ -0,0 +1,93 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Scanning of input directories. The files are listed and stat-ed in a single pass with
+`os.scandir`, and their stats are carried through grouping, hashing and manifest creation, so
+that each file is only stat-ed once. On network file systems each stat is a round trip.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from typing import NamedTuple, Optional
+
+
+class ScannedFile(NamedTuple):
+    """
+    A file found when its directory was scanned: its path with all symlinks resolved, as
+    returned by `Path.resolve()`, and its stat, following symlinks, as returned by `Path.stat()`.
+    """
+
+    resolved_path: str
+    stat: os.stat_result
+
+
+def _scan_directory(directory: str) -> dict[str, Optional[ScannedFile]]:
+    """
+    Lists the files under the directory, including its subdirectories, the same way as `os.walk`:
+    symlinks to directories are not followed, and symlinks to files are listed as files.
+
+    Returns a dictionary from the path of each file, normalized and joined to the directory as it
+    was given, to its stat. Files that can't be stat-ed, such as broken symlinks, map to None.
+    """
+    scanned_files: dict[str, Optional[ScannedFile]] = {}
+    # (directory to scan, the directory with all symlinks resolved)
+    directories = [(directory, os.path.realpath(directory))]
+    while directories:
+        (current_directory, resolved_directory) = directories.pop()
+        try:
+            with os.scandir(current_directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Like os.walk, don't walk into symlinks to directories. On Windows,
+                        # directories can also be junctions, which do need to be resolved.
+                        if not entry.is_symlink():
+                            resolved_subdirectory = (
+                                os.path.realpath(entry.path)
+                                if sys.platform == "win32"
+                                else os.path.join(resolved_directory, entry.name)
+                            )
+                            directories.append((entry.path, resolved_subdirectory))
+                        continue
+
+                    file_path = os.path.normpath(entry.path)
+                    try:
+                        # Only symlinks need to be resolved, other files are in the resolved
+                        # directory. The stat follows symlinks, and on Windows, it comes from the
+                        # directory listing for files that aren't symlinks.
+                        resolved_path = (
+                            os.path.realpath(entry.path)
+                            if entry.is_symlink()
+                            else os.path.join(resolved_directory, entry.name)
+                        )
+                        scanned_files[file_path] = ScannedFile(resolved_path, entry.stat())
+                    except OSError:
+                        scanned_files[file_path] = None
+        except OSError:
+            # Like os.walk, skip the directories that can't be listed.
+            continue
+    return scanned_files
+
+
+def _get_directory_prefix(directory: str) -> str:
+    """
+    Returns the path of the directory with all symlinks resolved, normalized for case on Windows,
+    and ending with a separator, for `_is_within_directory_prefix`.
+    """
+    resolved_directory = os.path.normcase(os.path.realpath(directory))
+    if resolved_directory.endswith(os.sep):
+        return resolved_directory
+    return resolved_directory + os.sep
+
+
+def _is_within_directory_prefix(resolved_path: str, directory_prefix: str) -> bool:
+    """
+    Returns whether the path, with all symlinks resolved, is inside of the directory with the
+    given prefix, as returned by `_get_directory_prefix`. Resolving the directory once and
+    comparing prefixes saves resolving both paths for each file.
+    """
+    return os.path.normcase(resolved_path).startswith(directory_prefix)
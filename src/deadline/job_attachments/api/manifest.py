@@ -4,13 +4,13 @@ import datetime
 from io import BytesIO
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import boto3
 
 from deadline.client.api._session import _get_queue_user_boto3_session, get_default_client_config
 from deadline.client.cli._groups.click_logger import ClickLogger
-from deadline.job_attachments._diff import _fast_file_list_to_manifest_diff, compare_manifest
+from deadline.job_attachments._diff import _iter_file_list_to_manifest_diff, compare_manifest
 from deadline.job_attachments._glob import _process_glob_inputs, _glob_paths
 from deadline.job_attachments.asset_manifests._create_manifest import (
     _create_manifest_for_single_root,
@@ -127,14 +127,13 @@ def _manifest_snapshot(
 
         # Fast comparison using time stamps and sizes.
         if not force_rehash:
-            diff_list: List[Tuple[str, FileStatus]] = _fast_file_list_to_manifest_diff(
+            for diff_file in _iter_file_list_to_manifest_diff(
                 root=root,
                 current_files=current_files,
                 diff_manifest=source_manifest,
                 logger=logger,
                 return_root_relative_path=False,
-            )
-            for diff_file in diff_list:
+            ):
                 # Add all new and modified
                 if diff_file[1] != FileStatus.DELETED:
                     changed_paths.append(diff_file[0])
@@ -196,6 +195,7 @@ def _manifest_diff(
     include_exclude_config: Optional[str] = None,
     force_rehash=False,
     logger: ClickLogger = ClickLogger(False),
+    on_diff_item: Optional[Callable[[FileStatus, str], None]] = None,
 ) -> ManifestDiff:
     """
     BETA API - This API is still evolving but will be made public in the near future.
@@ -206,6 +206,7 @@ def _manifest_diff(
     :param exclude: Exclude glob to exclude files from the manifest.
     :param include_exclude_config: Config JSON or file containeing input and exclude config.
     :param logger: Click Logger instance to print to CLI as test or JSON.
+    :param on_diff_item: Called with the status and path of each difference as soon as it's found.
     :returns: ManifestDiff object containing all new changed, deleted files.
     """
 
@@ -234,6 +235,10 @@ def _manifest_diff(
             output_diff.new.append(path)
         elif status == FileStatus.DELETED:
             output_diff.deleted.append(path)
+        else:
+            return
+        if on_diff_item:
+            on_diff_item(status, path)
 
     if force_rehash:
         # hash and create manifest of local directory
@@ -249,14 +254,18 @@ def _manifest_diff(
         )
         # Map to output datastructure.
         for item in differences:
+            if item[0] != FileStatus.UNCHANGED:
+                logger.echo(f"Found difference at: {item[1].path}, Status: {item[0]}")
             process_output(item[0], item[1].path, output)
 
     else:
         # File based comparisons.
-        fast_diff: List[Tuple[str, FileStatus]] = _fast_file_list_to_manifest_diff(
+        for fast_diff_item in _iter_file_list_to_manifest_diff(
             root=root, current_files=input_files, diff_manifest=local_manifest_object, logger=logger
-        )
-        for fast_diff_item in fast_diff:
+        ):
+            # The new and modified files are already logged as they're found.
+            if fast_diff_item[1] == FileStatus.DELETED:
+                logger.echo(f"Found difference at: {fast_diff_item[0]}, Status: FileStatus.DELETED")
             process_output(fast_diff_item[1], fast_diff_item[0], output)
 
     return output
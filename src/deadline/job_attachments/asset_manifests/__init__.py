@@ -1,7 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 from .base_manifest import BaseAssetManifest, BaseManifestPath
-from .hash_algorithms import HashAlgorithm, hash_data, hash_file
+from .hash_algorithms import HashAlgorithm, hash_data, hash_file, hash_files
 from .manifest_model import BaseManifestModel, ManifestModelRegistry
 from .versions import ManifestVersion
 
@@ -14,6 +14,7 @@ __all__ = [
     "HashAlgorithm",
     "hash_data",
     "hash_file",
+    "hash_files",
 ]
 
 ManifestModelRegistry.register()
@@ -5,6 +5,9 @@ from __future__ import annotations
 
 import dataclasses
 import json
+from json.encoder import encode_basestring_ascii
+from operator import attrgetter
+from typing import IO, Iterable, Iterator, Optional, Tuple
 
 from .base_manifest import BaseAssetManifest, BaseManifestPath
 
@@ -20,6 +23,18 @@ def canonical_path_comparator(path: BaseManifestPath):
     return path.path.encode("utf-16_be", errors="surrogatepass")
 
 
+def sort_paths_canonically(paths: list[BaseManifestPath]) -> None:
+    """
+    Sorts the paths in place, in the order of `canonical_path_comparator`.
+    """
+    # For ASCII paths, the order of the UTF-16 values is the order of the strings themselves,
+    # so the paths can be sorted without encoding each of them.
+    if all(path.path.isascii() for path in paths):
+        paths.sort(key=attrgetter("path"))
+    else:
+        paths.sort(key=canonical_path_comparator)
+
+
 def manifest_to_canonical_json_string(manifest: BaseAssetManifest) -> str:
     """
     Return a canonicalized JSON string based on the following:
@@ -31,7 +46,69 @@ def manifest_to_canonical_json_string(manifest: BaseAssetManifest) -> str:
             It implicitly follows the spec as the object keys all fall within the ASCII range of characters
             and this version of the Asset Manifest only serializes strings and integers.
     * The paths array *MUST* be in lexicographical order by path.
+
+    The JSON is the same as `json.dumps(dataclasses.asdict(manifest), sort_keys=True, ...)`, but
+    the paths are written directly from their fields, as manifests can hold millions of paths.
+    """
+    fields = []
+    for name_json, value_json in _canonical_json_fields(manifest):
+        if value_json is None:
+            value_json = "[" + ",".join(map(path_to_canonical_json_string, manifest.paths)) + "]"
+        fields.append(f"{name_json}:{value_json}")
+    return "{" + ",".join(fields) + "}"
+
+
+def write_manifest_canonical_json(
+    manifest: BaseAssetManifest,
+    file: IO[str],
+    paths: Optional[Iterable[BaseManifestPath]] = None,
+) -> None:
+    """
+    Writes the same JSON as `manifest_to_canonical_json_string` to the file, one path at a time,
+    so that the JSON of the manifest is never built in memory. The given `paths`, which must be in
+    canonical order, are written instead of the paths of the manifest, if any.
+    """
+    file.write("{")
+    for index, (name_json, value_json) in enumerate(_canonical_json_fields(manifest)):
+        if index > 0:
+            file.write(",")
+        file.write(f"{name_json}:")
+        if value_json is not None:
+            file.write(value_json)
+            continue
+        file.write("[")
+        for path_index, path in enumerate(manifest.paths if paths is None else paths):
+            if path_index > 0:
+                file.write(",")
+            file.write(path_to_canonical_json_string(path))
+        file.write("]")
+    file.write("}")
+
+
+def _canonical_json_fields(manifest: BaseAssetManifest) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yields the JSON of the name and of the value of each field of the manifest, in the sorted
+    order of their names. The value of the paths is None, for the caller to write.
+    """
+    for field in sorted(dataclasses.fields(manifest), key=attrgetter("name")):
+        if field.name == "paths":
+            yield (encode_basestring_ascii(field.name), None)
+        else:
+            value = getattr(manifest, field.name)
+            yield (
+                encode_basestring_ascii(field.name),
+                json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=True),
+            )
+
+
+def path_to_canonical_json_string(path: BaseManifestPath) -> str:
+    """
+    Return a canonicalized JSON string of a single path of a manifest, as it appears in the paths
+    array of `manifest_to_canonical_json_string`.
     """
-    return json.dumps(
-        dataclasses.asdict(manifest), sort_keys=True, separators=(",", ":"), ensure_ascii=True
+    # The fields of a path are written in the sorted order of their names, with the strings
+    # escaped the same way as `json.dumps(..., ensure_ascii=True)` escapes them.
+    return (
+        f'{{"hash":{encode_basestring_ascii(path.hash)},"mtime":{path.mtime},'
+        f'"path":{encode_basestring_ascii(path.path)},"size":{path.size}}}'
     )
@@ -15,8 +15,13 @@ from .versions import ManifestVersion
 class BaseManifestPath(ABC):
     """
     Data class for paths in the Asset Manifest
+
+    Manifests can hold millions of paths, so paths have slots instead of a `__dict__` to keep
+    their memory to a minimum. Subclasses must declare `__slots__` too.
     """
 
+    __slots__ = ("path", "hash", "size", "mtime")
+
     path: str
     hash: str
     size: int
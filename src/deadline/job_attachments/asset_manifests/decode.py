@@ -3,10 +3,11 @@
 """ Contains methods for decoding and validating Asset Manifests. """
 from __future__ import annotations
 
+import gzip
 import json
 import re
 from pathlib import Path
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Optional, Tuple
 
 import jsonschema
 
@@ -17,6 +18,11 @@ from .versions import ManifestVersion
 
 alphanum_regex = re.compile("[a-zA-Z0-9]+")
 
+# The content encoding of compressed manifests, set on the S3 objects of compressed manifests.
+MANIFEST_CONTENT_ENCODING = "gzip"
+# The first bytes of gzip-compressed data, which can't be the start of a JSON document.
+_GZIP_MAGIC = b"\x1f\x8b"
+
 
 def _get_schema(version) -> dict[str, Any]:
     schema_filename = Path(__file__).parent.joinpath("schemas", version + ".json").resolve()
@@ -41,11 +47,61 @@ def validate_manifest(
     return True, None
 
 
-def decode_manifest(manifest: str) -> BaseAssetManifest:
+# The hash algorithms allowed by the v2023-03-03 schema.
+_SCHEMA_HASH_ALGS_V2023_03_03 = ("xxh128",)
+
+
+def _validate_manifest_v2023_03_03(manifest: Any) -> Tuple[bool, Optional[str]]:
+    """
+    Checks the structure of a v2023-03-03 manifest against its schema, and the alphabet of its
+    hashes, in a single pass over its paths. This is much faster than validating with jsonschema,
+    and is at least as strict: any manifest it finds structurally valid is valid for the schema.
+    Returns a tuple of (1) whether the structure is valid, and (2) an error string for the first
+    hash that isn't alphanumeric, if any.
+    """
+    if type(manifest) is not dict:
+        return (False, None)
+    if (
+        manifest.get("manifestVersion") != ManifestVersion.v2023_03_03.value
+        or manifest.get("hashAlg") not in _SCHEMA_HASH_ALGS_V2023_03_03
+        or type(manifest.get("totalSize")) is not int
+    ):
+        return (False, None)
+    paths = manifest.get("paths")
+    if type(paths) is not list or len(paths) == 0:
+        return (False, None)
+
+    hash_error: Optional[str] = None
+    for path in paths:
+        if (
+            type(path) is not dict
+            or type(path.get("path")) is not str
+            or type(path.get("hash")) is not str
+            or type(path.get("size")) is not int
+            or type(path.get("mtime")) is not int
+        ):
+            return (False, None)
+        file_hash = path["hash"]
+        if hash_error is None and not (file_hash.isascii() and file_hash.isalnum()):
+            hash_error = f"The hash {file_hash} for path {path['path']} is not alphanumeric"
+    return (True, hash_error)
+
+
+_FAST_VALIDATORS: dict[ManifestVersion, Callable[[Any], Tuple[bool, Optional[str]]]] = {
+    ManifestVersion.v2023_03_03: _validate_manifest_v2023_03_03,
+}
+
+
+def decode_manifest(manifest: str, strict: bool = False) -> BaseAssetManifest:
     """
     Takes in a manifest string and returns an Asset Manifest object.
     A ManifestDecodeValidationError will be raised if the manifest version is unknown or
     the manifest is not valid.
+
+    By default, the manifest is validated by a fast check of its structure and hashes. If that
+    check fails, the manifest is validated with its jsonschema to report the error, so the
+    manifests that are accepted and the errors that are raised are the same as with `strict`,
+    which always validates with the jsonschema.
     """
     document: dict[str, Any] = json.loads(manifest)
 
@@ -65,19 +121,42 @@ def decode_manifest(manifest: str) -> BaseAssetManifest:
             'Manifest is missing the required "manifestVersion" field'
         )
 
-    manifest_valid, error_string = validate_manifest(document, version)
+    fast_validator = None if strict else _FAST_VALIDATORS.get(version)
+    structure_valid = False
+    hash_error: Optional[str] = None
+    if fast_validator is not None:
+        (structure_valid, hash_error) = fast_validator(document)
 
-    if not manifest_valid:
-        raise ManifestDecodeValidationError(error_string)
+    if not structure_valid:
+        manifest_valid, error_string = validate_manifest(document, version)
+
+        if not manifest_valid:
+            raise ManifestDecodeValidationError(error_string)
+    elif hash_error is not None:
+        raise ManifestDecodeValidationError(hash_error)
 
     manifest_model = ManifestModelRegistry.get_manifest_model(version=version)
     decoded_manifest = manifest_model.AssetManifest.decode(manifest_data=document)
 
-    # Validate hashes are alphanumeric
-    for path in decoded_manifest.paths:
-        if alphanum_regex.fullmatch(path.hash) is None:
-            raise ManifestDecodeValidationError(
-                f"The hash {path.hash} for path {path.path} is not alphanumeric"
-            )
+    if not structure_valid:
+        # Validate hashes are alphanumeric
+        for path in decoded_manifest.paths:
+            if alphanum_regex.fullmatch(path.hash) is None:
+                raise ManifestDecodeValidationError(
+                    f"The hash {path.hash} for path {path.path} is not alphanumeric"
+                )
 
     return decoded_manifest
+
+
+def decode_manifest_bytes(manifest: bytes, strict: bool = False) -> BaseAssetManifest:
+    """
+    Takes in the bytes of a manifest object or file, which are either its canonical JSON or the
+    gzip-compressed canonical JSON, and returns an Asset Manifest object. See `decode_manifest`.
+    """
+    if manifest[: len(_GZIP_MAGIC)] == _GZIP_MAGIC:
+        try:
+            manifest = gzip.decompress(manifest)
+        except (OSError, EOFError) as e:
+            raise ManifestDecodeValidationError(f"The compressed manifest is not valid: {e}")
+    return decode_manifest(manifest.decode("utf-8"), strict=strict)
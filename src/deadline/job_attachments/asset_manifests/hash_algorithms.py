@@ -2,12 +2,16 @@
 
 """ Module that defines the hashing algorithms supported by this library. """
 
-import io
+import os
 
 from enum import Enum
+from typing import List
 
 from ..exceptions import UnsupportedHashingAlgorithmError
 
+# The size of the reads done when hashing a file. Files up to this size are read in a single call.
+HASH_FILE_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
 
 class HashAlgorithm(str, Enum):
     """
@@ -32,15 +36,34 @@ def hash_file(file_path: str, hash_alg: HashAlgorithm) -> str:
             f"Unsupported hashing algorithm provided: {hash_alg}"
         )
 
-    with open(file_path, "rb") as file:
-        while True:
-            chunk = file.read(io.DEFAULT_BUFFER_SIZE)
-            if not chunk:
-                break
-            hasher.update(chunk)
+    # Open the file unbuffered, since every read is already at least HASH_FILE_CHUNK_SIZE bytes.
+    with open(file_path, "rb", buffering=0) as file:
+        if os.fstat(file.fileno()).st_size <= HASH_FILE_CHUNK_SIZE:
+            # Small files are read with a single call. The read continues to the end of the file,
+            # so a file that grew after the size check is still hashed in full.
+            hasher.update(file.readall())
+        else:
+            # Read large files into a single reusable buffer, rather than allocating a new bytes
+            # object for every chunk.
+            buffer = bytearray(HASH_FILE_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                bytes_read = file.readinto(buffer)
+                if not bytes_read:
+                    break
+                hasher.update(view[:bytes_read])
         return hasher.hexdigest()
 
 
+def hash_files(file_paths: List[str], hash_alg: HashAlgorithm) -> List[str]:
+    """
+    Hashes each of the given files using the given hashing algorithm, returning the hashes in the
+    same order as the given paths. This lets a batch of small files be hashed as a single unit of
+    work, e.g. when hashing is spread across a process pool.
+    """
+    return [hash_file(file_path, hash_alg) for file_path in file_paths]
+
+
 def hash_data(data: bytes, hash_alg: HashAlgorithm) -> str:
     """Hashes the given data bytes using the given hashing algorithm."""
     if hash_alg == HashAlgorithm.XXH128:
@@ -6,7 +6,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Type
 
-from .._canonical_json import canonical_path_comparator, manifest_to_canonical_json_string
+from .._canonical_json import manifest_to_canonical_json_string, sort_paths_canonically
 from ..base_manifest import BaseAssetManifest, BaseManifestPath
 from ..hash_algorithms import HashAlgorithm
 from ..manifest_model import BaseManifestModel
@@ -24,6 +24,8 @@ class ManifestPath(BaseManifestPath):
     Extension for version v2023-03-03 of the asset manifest.
     """
 
+    __slots__ = ()
+
     manifest_version = ManifestVersion.v2023_03_03
 
     def __init__(self, *, path: str, hash: str, size: int, mtime: int) -> None:
@@ -81,7 +83,7 @@ class AssetManifest(BaseAssetManifest):
         """
         Return a canonicalized JSON string of the manifest
         """
-        self.paths.sort(key=canonical_path_comparator)
+        sort_paths_canonically(self.paths)
         return manifest_to_canonical_json_string(manifest=self)
 
 
@@ -2,13 +2,14 @@
 
 """ Module for File Attachment synching """
 from __future__ import annotations
+import concurrent.futures
 from dataclasses import asdict
 import os
 import shutil
 import sys
+import tempfile
 import time
 import json
-from io import BytesIO
 from logging import Logger, LoggerAdapter, getLogger
 from math import trunc
 from pathlib import Path, PurePosixPath
@@ -16,7 +17,10 @@ from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple, Type
 
 import boto3
 
+from deadline.client.config import config_file
+
 from .progress_tracker import (
+    DownloadSummaryStatistics,
     ProgressReportMetadata,
     ProgressStatus,
     ProgressTracker,
@@ -38,20 +42,30 @@ from ._aws.deadline import get_job, get_queue
 from .download import (
     merge_asset_manifests,
     download_files_from_manifests,
-    get_manifest_from_s3,
+    _get_input_manifest_and_pack_index_name_from_s3,
     get_output_manifests_by_asset_root,
+    get_pack_index_from_s3,
     mount_vfs_from_manifests,
 )
 
 from .exceptions import (
+    AssetSyncCancelledError,
     AssetSyncError,
     VFSExecutableMissingError,
     JobAttachmentsS3ClientError,
     VFSOSUserNotSetError,
 )
 from .vfs import VFSProcessManager
+from ._scan import (
+    ScannedFile,
+    _get_directory_prefix,
+    _is_within_directory_prefix,
+    _scan_directory,
+)
 from .models import (
     Attachments,
+    FileConflictResolution,
+    HashingEngine,
     JobAttachmentsFileSystem,
     JobAttachmentS3Settings,
     ManifestProperties,
@@ -59,7 +73,10 @@ from .models import (
     PathFormat,
     PathMappingRule,
 )
-from .upload import S3AssetUploader
+from ._output_watcher import DEFAULT_POLL_INTERVAL, OutputWatcher
+from .caches.download_cache import _clone_or_copy_file
+from .packs import PackIndex
+from .upload import HASHING_MAX_PROCESSES_WINDOWS, S3AssetUploader
 from .os_file_permission import FileSystemPermissionSettings, PosixFileSystemPermissionSettings
 from ._utils import (
     _float_to_iso_datetime_string,
@@ -83,6 +100,7 @@ class AssetSync:
         manifest_version: ManifestVersion = ManifestVersion.v2023_03_03,
         deadline_endpoint_url: Optional[str] = None,
         session_id: Optional[str] = None,
+        hashing_engine: Optional[HashingEngine] = None,
     ) -> None:
         self.farm_id = farm_id
 
@@ -105,11 +123,33 @@ class AssetSync:
         # A dictionary mapping absolute file paths to their last modification times in microseconds.
         # This is used to determine if an asset has been modified since it was last synced.
         self.synced_assets_mtime: dict[str, int] = dict()
+        # A dictionary mapping absolute paths of synced input files to their hashes. This is used
+        # by incremental syncs to skip the files that are already in the session directory.
+        self._synced_input_hashes: dict[str, str] = dict()
+        # A dictionary mapping resolved paths of output files that the output watcher uploaded to
+        # their (size, modification time in nanoseconds, hash) when they were hashed. This is used
+        # by `sync_outputs` to skip the files that haven't changed since.
+        self._pre_synced_outputs: dict[str, Tuple[int, int, str]] = dict()
 
         self.hash_alg: HashAlgorithm = self.manifest_model.AssetManifest.get_default_hash_alg()
 
+        if hashing_engine is None:
+            hashing_engine_setting = config_file.get_setting("settings.hashing_engine")
+            try:
+                hashing_engine = HashingEngine(hashing_engine_setting.upper())
+            except ValueError as ve:
+                raise AssetSyncError(
+                    "Nonvalid value for configuration setting: "
+                    f"'hashing_engine' ({hashing_engine_setting}) must be one of "
+                    f"{', '.join(engine.value for engine in HashingEngine)}."
+                ) from ve
+        self.hashing_engine: HashingEngine = hashing_engine
+
         self._local_root_to_src_map: dict[str, str] = dict()
 
+        # The merged pack index of the input manifests that have packed files, if any.
+        self._pack_index: Optional[PackIndex] = None
+
     @staticmethod
     def generate_dynamic_path_mapping(
         session_dir: Path,
@@ -193,6 +233,7 @@ class AssetSync:
         Returns: a dictionary of manifest file stored in the session directory.
         """
         grouped_manifests_by_root: DefaultDict[str, list[BaseAssetManifest]] = DefaultDict(list)
+        self._pack_index = None
 
         for manifest_properties in attachments.manifests:
             local_root: str = AssetSync.get_local_destination(
@@ -206,11 +247,13 @@ class AssetSync:
                     manifest_properties.inputManifestPath
                 )
                 # s3 call to get manifests
-                manifest = get_manifest_from_s3(
+                manifest, pack_index_name = _get_input_manifest_and_pack_index_name_from_s3(
                     manifest_key=manifest_s3_key,
                     s3_bucket=s3_settings.s3BucketName,
                     session=self.session,
                 )
+                if pack_index_name:
+                    self._add_pack_index(pack_index_name, s3_settings)
                 self._local_root_to_src_map[local_root] = manifest_properties.rootPath
                 grouped_manifests_by_root[local_root].append(manifest)
 
@@ -244,6 +287,35 @@ class AssetSync:
 
         return merged_manifests_by_root
 
+    def _add_pack_index(self, pack_index_name: str, s3_settings: JobAttachmentS3Settings) -> None:
+        """
+        Merges the pack index with the given name, of an input manifest with packed files, into
+        the pack index used to download the inputs.
+        """
+        pack_index = get_pack_index_from_s3(
+            pack_index_name=pack_index_name,
+            s3_bucket=s3_settings.s3BucketName,
+            cas_prefix=s3_settings.full_cas_prefix(),
+            session=self.session,
+        )
+        if self._pack_index is None:
+            self._pack_index = pack_index
+        else:
+            self._pack_index.update(pack_index)
+
+    def _can_use_vfs_with_packed_files(self) -> bool:
+        """
+        The Virtual File System reads each file from its own object in the CAS, so it can't be
+        used when some of the input files are packed. In that case, the inputs are copied instead.
+        """
+        if self._pack_index:
+            self.logger.warning(
+                "Some input files were packed when they were uploaded, which the Virtual File System doesn't support. "
+                f"Falling back to {JobAttachmentsFileSystem.COPIED} for JobAttachmentsFileSystem."
+            )
+            return False
+        return True
+
     def _launch_vfs(
         self,
         s3_settings: JobAttachmentS3Settings,
@@ -288,6 +360,9 @@ class AssetSync:
         fs_permission_settings: Optional[FileSystemPermissionSettings] = None,
         merged_manifests_by_root: dict[str, BaseAssetManifest] = dict(),
         on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
+        file_conflict_resolution: Optional[
+            FileConflictResolution
+        ] = FileConflictResolution.CREATE_COPY,
     ) -> SummaryStatistics:
         """
         Args:
@@ -297,6 +372,8 @@ class AssetSync:
                                     to be set on the downloaded (synchronized) input files and directories.
             merged_manifests_by_root: Merged manifests produced by _aggregate_asset_root_manifests()
             on_downloading_files: Callback when download files from S3.
+            file_conflict_resolution: How to resolve a conflict with a file that already exists
+                                      in the session directory.
 
         Returns:
             The download summary statistics.
@@ -310,7 +387,7 @@ class AssetSync:
                 total_input_size += merged_manifest.totalSize  # type: ignore[attr-defined]
             self._ensure_disk_capacity(Path(session_dir), total_input_size)
 
-            return download_files_from_manifests(
+            download_summary_statistics = download_files_from_manifests(
                 s3_bucket=s3_settings.s3BucketName,
                 manifests_by_root=merged_manifests_by_root,
                 cas_prefix=s3_settings.full_cas_prefix(),
@@ -318,7 +395,11 @@ class AssetSync:
                 session=self.session,
                 on_downloading_files=on_downloading_files,
                 logger=self.logger,
-            ).convert_to_summary_statistics()
+                pack_index=self._pack_index,
+                file_conflict_resolution=file_conflict_resolution,
+            )
+            self._log_download_cache_statistics(download_summary_statistics)
+            return download_summary_statistics.convert_to_summary_statistics()
         except JobAttachmentsS3ClientError as exc:
             if exc.status_code == 404:
                 raise JobAttachmentsS3ClientError(
@@ -382,6 +463,8 @@ class AssetSync:
         step_dependencies: Optional[list[str]] = None,
         on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
         os_env_vars: Dict[str, str] | None = None,
+        incremental: bool = False,
+        verify_hashes: bool = False,
     ) -> Tuple[SummaryStatistics, List[Dict[str, str]]]:
         """
         Depending on the fileSystem in the Attachments this will perform two
@@ -407,6 +490,13 @@ class AssetSync:
                 for each file being downloaded. If the function returns False, the download will be
                 cancelled. If it returns True, the download will continue.
             os_env_vars: environment variables to set for launched subprocesses
+            incremental: With the COPIED file system, only download the files that are missing from
+                the session directory, or that changed since they were synced by this AssetSync.
+                A synced file is unchanged if its hash in the manifest, its size and its modification
+                time are the same as when it was synced. Changed files are overwritten.
+            verify_hashes: With `incremental`, hash the files in the session directory to check
+                whether they're unchanged, instead of relying on their modification times. This also
+                reuses files that weren't synced by this AssetSync, such as outputs of earlier tasks.
 
         Returns:
             COPIED / None : a tuple of (1) final summary statistics for file downloads,
@@ -455,6 +545,7 @@ class AssetSync:
             and os_env_vars is not None
             and "AWS_PROFILE" in os_env_vars
             and isinstance(fs_permission_settings, PosixFileSystemPermissionSettings)
+            and self._can_use_vfs_with_packed_files()
         ):
             # Virtual Download Flow
             self._launch_vfs(
@@ -464,6 +555,27 @@ class AssetSync:
                 merged_manifests_by_root=merged_manifests_by_root,
                 os_env_vars=os_env_vars,
             )
+        elif incremental:
+            # Copied Download flow, of only the files that changed since the last sync
+            (changed_manifests_by_root, unchanged_files, unchanged_bytes) = (
+                self._get_changed_manifests_by_root(merged_manifests_by_root, verify_hashes)
+            )
+            self.logger.info(
+                f"Reusing {unchanged_files} input file{'' if unchanged_files == 1 else 's'}"
+                f" totaling {_human_readable_file_size(unchanged_bytes)} already in the session directory."
+            )
+            summary_statistics = self.copied_download(
+                s3_settings=s3_settings,
+                session_dir=session_dir,
+                fs_permission_settings=fs_permission_settings,
+                merged_manifests_by_root=changed_manifests_by_root,
+                on_downloading_files=on_downloading_files,
+                file_conflict_resolution=FileConflictResolution.OVERWRITE,
+            )
+            summary_statistics.total_files += unchanged_files
+            summary_statistics.total_bytes += unchanged_bytes
+            summary_statistics.skipped_files += unchanged_files
+            summary_statistics.skipped_bytes += unchanged_bytes
         else:
             # Copied Download flow
             summary_statistics = self.copied_download(
@@ -502,18 +614,9 @@ class AssetSync:
 
         start_time = time.perf_counter()
 
-        for file in output_files:
-            if file.in_s3:
-                progress_tracker.increase_skipped(1, file.file_size)
-                continue
-
-            self.s3_uploader.upload_file_to_s3(
-                local_path=Path(file.full_path),
-                s3_bucket=s3_settings.s3BucketName,
-                s3_upload_key=file.s3_key,
-                progress_tracker=progress_tracker,
-                base_dir_path=Path(file.base_dir) if file.base_dir else None,
-            )
+        self.s3_uploader.upload_output_files(
+            output_files, s3_settings.s3BucketName, progress_tracker
+        )
 
         progress_tracker.total_time = time.perf_counter() - start_time
         return progress_tracker.get_summary_statistics()
@@ -551,8 +654,8 @@ class AssetSync:
 
         self.logger.info(f"Uploading output manifest to {manifest_path}")
 
-        self.s3_uploader.upload_bytes_to_s3(
-            BytesIO(manifest_bytes),
+        self.s3_uploader.upload_manifest_bytes_to_s3(
+            manifest_bytes,
             s3_settings.s3BucketName,
             manifest_path,
             extra_args=metadata,
@@ -589,86 +692,141 @@ class AssetSync:
         """
         Walks the output directories for this asset root for any output files that have been created or modified
         since the start time provided. Hashes and checks if the output files already exist in the CAS.
-        """
-        output_files: List[OutputFile] = []
-
-        source_path_format = manifest_properties.rootPathFormat
-        current_path_format = PathFormat.get_host_path_format()
-
-        for output_dir in manifest_properties.outputRelativeDirectories or []:
-            if source_path_format != current_path_format:
-                if source_path_format == PathFormat.WINDOWS:
-                    output_dir = output_dir.replace("\\", "/")
-                elif source_path_format == PathFormat.POSIX:
-                    output_dir = output_dir.replace("/", "\\")
-            output_root: Path = local_root / output_dir
-
-            total_file_count = 0
-            total_file_size = 0
-
-            # Don't fail if output dir hasn't been created yet; another task might be working on it
-            if not output_root.is_dir():
-                self.logger.info(f"Found 0 files (Output directory {output_root} does not exist.)")
-                continue
-
-            # Get all files in this directory (includes sub-directories)
-            for file_path in output_root.glob("**/*"):
-                # Files that are new or have been modified since the last sync will be added to the output list.
-                mtime_when_synced = self.synced_assets_mtime.get(str(file_path), None)
-                file_mtime = file_path.stat().st_mtime_ns
-                is_modified = False
-                if mtime_when_synced:
-                    if file_mtime > int(mtime_when_synced):
-                        # This file has been modified during this session action.
-                        is_modified = True
-                else:
-                    # This is a new file created during this session action.
-                    self.synced_assets_mtime[str(file_path)] = int(file_mtime)
-                    is_modified = True
-
-                # Resolve the real path to prevent time-of-check/time-of-use vulnerability
-                file_real_path = file_path.resolve()
 
-                # validate that the file resolves inside of the session working directory.
-                is_file_path_under_session_dir = self._is_file_within_directory(
-                    file_real_path, session_dir
-                )
-                if is_file_path_under_session_dir is False:
+        The files are hashed on a pool, as set by the hashing engine, as soon as they are found, so that walking
+        the directories and hashing overlap. Whether each hash is already in the CAS is checked on a thread pool
+        as soon as the hash is known. The output files are returned in the order they were found.
+        """
+        session_dir_prefix = _get_directory_prefix(str(session_dir))
+        output_roots: List[Path] = []
+        # (index of the output root, file path, resolved file path, file size, future of the file hash)
+        found_files: List[Tuple[int, Path, Path, int, concurrent.futures.Future[str]]] = []
+        # Futures of whether the object is in the CAS, by S3 key
+        in_s3_futures: Dict[str, concurrent.futures.Future[bool]] = {}
+
+        hashing_executor = self._create_hashing_executor()
+        existence_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.s3_uploader.num_upload_workers
+        )
+        try:
+            for output_root in self._get_output_roots(manifest_properties, local_root):
+                # Don't fail if output dir hasn't been created yet; another task might be working on it
+                if not output_root.is_dir():
                     self.logger.info(
-                        f"Skipping file '{file_path}' as its resolved path '{file_real_path}' is"
-                        f" outside the session directory '{session_dir}'"
+                        f"Found 0 files (Output directory {output_root} does not exist.)"
                     )
                     continue
+                output_roots.append(output_root)
+
+                # Get all files in this directory (includes sub-directories). Scanning lists and
+                # stats the files in a single pass, and resolves only the symlinks.
+                for file_path_str, scanned_file in _scan_directory(str(output_root)).items():
+                    if scanned_file is None:
+                        # The file can't be stat-ed, such as a broken symlink.
+                        continue
+                    file_path = Path(file_path_str)
+
+                    # Files that are new or have been modified since the last sync will be added to the output list.
+                    mtime_when_synced = self.synced_assets_mtime.get(file_path_str, None)
+                    file_mtime = scanned_file.stat.st_mtime_ns
+                    is_modified = False
+                    if mtime_when_synced:
+                        if file_mtime > int(mtime_when_synced):
+                            # This file has been modified during this session action.
+                            is_modified = True
+                    else:
+                        # This is a new file created during this session action.
+                        self.synced_assets_mtime[file_path_str] = int(file_mtime)
+                        is_modified = True
 
-                if (
-                    not file_real_path.is_dir()
-                    and file_real_path.exists()
-                    and is_modified
-                    and is_file_path_under_session_dir
-                ):
-                    file_size = file_real_path.resolve().lstat().st_size
-                    file_hash = hash_file(str(file_real_path), self.hash_alg)
-                    s3_key = f"{file_hash}.{self.hash_alg.value}"
-
-                    if s3_settings.full_cas_prefix():
-                        s3_key = _join_s3_paths(s3_settings.full_cas_prefix(), s3_key)
-                    in_s3 = self.s3_uploader.file_already_uploaded(s3_settings.s3BucketName, s3_key)
-
-                    total_file_count += 1
-                    total_file_size += file_size
-
-                    output_files.append(
-                        OutputFile(
-                            file_size=file_size,
-                            file_hash=file_hash,
-                            rel_path=str(PurePosixPath(*file_path.relative_to(local_root).parts)),
-                            full_path=str(file_real_path),
-                            s3_key=s3_key,
-                            in_s3=in_s3,
-                            base_dir=str(session_dir),
+                    # Use the real path to prevent time-of-check/time-of-use vulnerability
+                    file_real_path = Path(scanned_file.resolved_path)
+
+                    # validate that the file resolves inside of the session working directory.
+                    if not _is_within_directory_prefix(
+                        scanned_file.resolved_path, session_dir_prefix
+                    ):
+                        self.logger.info(
+                            f"Skipping file '{file_path}' as its resolved path '{file_real_path}' is"
+                            f" outside the session directory '{session_dir}'"
+                        )
+                        continue
+
+                    if is_modified:
+                        file_size = scanned_file.stat.st_size
+                        pre_synced_hash = self._get_pre_synced_output_hash(
+                            str(file_real_path), file_size, file_mtime
+                        )
+                        hash_future: concurrent.futures.Future[str]
+                        if pre_synced_hash is None:
+                            hash_future = hashing_executor.submit(
+                                hash_file, str(file_real_path), self.hash_alg
+                            )
+                        else:
+                            # The file was uploaded by the output watcher, and hasn't changed since.
+                            hash_future = concurrent.futures.Future()
+                            hash_future.set_result(pre_synced_hash)
+                            in_s3_future: concurrent.futures.Future[bool] = (
+                                concurrent.futures.Future()
+                            )
+                            in_s3_future.set_result(True)
+                            in_s3_futures[self._get_output_s3_key(pre_synced_hash, s3_settings)] = (
+                                in_s3_future
+                            )
+                        found_files.append(
+                            (
+                                len(output_roots) - 1,
+                                file_path,
+                                file_real_path,
+                                file_size,
+                                hash_future,
+                            )
                         )
+
+            # Check if each object is already in the CAS as soon as its hash is known.
+            hash_futures = [found_file[4] for found_file in found_files]
+            for hash_future in concurrent.futures.as_completed(hash_futures):
+                s3_key = self._get_output_s3_key(hash_future.result(), s3_settings)
+                if s3_key not in in_s3_futures:
+                    in_s3_futures[s3_key] = existence_executor.submit(
+                        self.s3_uploader.file_already_uploaded, s3_settings.s3BucketName, s3_key
                     )
 
+            output_files: List[OutputFile] = []
+            total_file_counts = [0] * len(output_roots)
+            total_file_sizes = [0] * len(output_roots)
+            for root_index, file_path, file_real_path, file_size, hash_future in found_files:
+                file_hash = hash_future.result()
+                s3_key = self._get_output_s3_key(file_hash, s3_settings)
+
+                total_file_counts[root_index] += 1
+                total_file_sizes[root_index] += file_size
+
+                output_files.append(
+                    OutputFile(
+                        file_size=file_size,
+                        file_hash=file_hash,
+                        rel_path=str(PurePosixPath(*file_path.relative_to(local_root).parts)),
+                        full_path=str(file_real_path),
+                        s3_key=s3_key,
+                        in_s3=in_s3_futures[s3_key].result(),
+                        base_dir=str(session_dir),
+                    )
+                )
+        except BaseException:
+            # Don't start hashing or checking any files that are still queued.
+            for found_file in found_files:
+                found_file[4].cancel()
+            for in_s3_future in in_s3_futures.values():
+                in_s3_future.cancel()
+            raise
+        finally:
+            hashing_executor.shutdown()
+            existence_executor.shutdown()
+
+        for output_root, total_file_count, total_file_size in zip(
+            output_roots, total_file_counts, total_file_sizes
+        ):
             self.logger.info(
                 f"Found {total_file_count} file{'' if total_file_count == 1 else 's'}"
                 f" totaling {_human_readable_file_size(total_file_size)}"
@@ -677,6 +835,42 @@ class AssetSync:
 
         return output_files
 
+    def _get_output_roots(
+        self, manifest_properties: ManifestProperties, local_root: Path
+    ) -> List[Path]:
+        """
+        Returns the output directories of the asset root, in the path format of this host.
+        """
+        source_path_format = manifest_properties.rootPathFormat
+        current_path_format = PathFormat.get_host_path_format()
+
+        output_roots: List[Path] = []
+        for output_dir in manifest_properties.outputRelativeDirectories or []:
+            if source_path_format != current_path_format:
+                if source_path_format == PathFormat.WINDOWS:
+                    output_dir = output_dir.replace("\\", "/")
+                elif source_path_format == PathFormat.POSIX:
+                    output_dir = output_dir.replace("/", "\\")
+            output_roots.append(local_root / output_dir)
+        return output_roots
+
+    def _create_hashing_executor(self) -> concurrent.futures.Executor:
+        """
+        Creates the pool that output files are hashed on, as set by the hashing engine.
+        """
+        if self.hashing_engine == HashingEngine.PROCESS:
+            num_workers = os.cpu_count() or 1
+            if sys.platform == "win32":
+                num_workers = min(num_workers, HASHING_MAX_PROCESSES_WINDOWS)
+            return concurrent.futures.ProcessPoolExecutor(max_workers=num_workers)
+        return concurrent.futures.ThreadPoolExecutor()
+
+    def _get_output_s3_key(self, file_hash: str, s3_settings: JobAttachmentS3Settings) -> str:
+        s3_key = f"{file_hash}.{self.hash_alg.value}"
+        if s3_settings.full_cas_prefix():
+            s3_key = _join_s3_paths(s3_settings.full_cas_prefix(), s3_key)
+        return s3_key
+
     def _is_file_within_directory(self, file_path: Path, directory_path: Path) -> bool:
         """
         Checks if the given file path is within the given directory path.
@@ -721,6 +915,63 @@ class AssetSync:
             for manifest_path in merged_manifest.paths:
                 abs_path = str(Path(local_root) / manifest_path.path)
                 self.synced_assets_mtime[abs_path] = Path(abs_path).stat().st_mtime_ns
+                self._synced_input_hashes[abs_path] = manifest_path.hash
+
+    def _get_changed_manifests_by_root(
+        self, merged_manifests_by_root: dict[str, BaseAssetManifest], verify_hashes: bool
+    ) -> Tuple[dict[str, BaseAssetManifest], int, int]:
+        """
+        Compares the merged manifests with the files in the session directory, and returns a tuple
+        of (1) manifests of only the files that are missing or changed, for the roots that have
+        any, (2) the number of unchanged files, and (3) their total size.
+        """
+        changed_manifests_by_root: dict[str, BaseAssetManifest] = dict()
+        unchanged_files = 0
+        unchanged_bytes = 0
+        for local_root, merged_manifest in merged_manifests_by_root.items():
+            changed_paths: list[RelativeFilePath] = []
+            for manifest_path in merged_manifest.paths:
+                abs_path = str(Path(local_root) / manifest_path.path)
+                if self._is_input_file_unchanged(
+                    abs_path, manifest_path, merged_manifest.hashAlg, verify_hashes
+                ):
+                    unchanged_files += 1
+                    unchanged_bytes += manifest_path.size
+                else:
+                    changed_paths.append(manifest_path)
+
+            if changed_paths:
+                manifest_args: dict[str, Any] = {
+                    "hash_alg": merged_manifest.hashAlg,
+                    "paths": changed_paths,
+                    "total_size": sum(path.size for path in changed_paths),
+                }
+                changed_manifests_by_root[local_root] = merged_manifest.__class__(**manifest_args)
+
+        return (changed_manifests_by_root, unchanged_files, unchanged_bytes)
+
+    def _is_input_file_unchanged(
+        self,
+        abs_path: str,
+        manifest_path: RelativeFilePath,
+        hash_alg: HashAlgorithm,
+        verify_hashes: bool,
+    ) -> bool:
+        """
+        Returns whether the file in the session directory has the contents of the manifest path.
+        """
+        try:
+            stat_result = os.stat(abs_path)
+        except OSError:
+            return False
+        if stat_result.st_size != manifest_path.size:
+            return False
+        if verify_hashes:
+            return hash_file(abs_path, hash_alg) == manifest_path.hash
+        return (
+            self._synced_input_hashes.get(abs_path) == manifest_path.hash
+            and self.synced_assets_mtime.get(abs_path) == stat_result.st_mtime_ns
+        )
 
     def _ensure_disk_capacity(self, session_dir: Path, total_input_bytes: int) -> None:
         """
@@ -792,6 +1043,7 @@ class AssetSync:
 
         grouped_manifests_by_root: DefaultDict[str, list[BaseAssetManifest]] = DefaultDict(list)
         pathmapping_rules: Dict[str, Dict[str, str]] = {}
+        self._pack_index = None
 
         storage_profiles_source_paths = list(storage_profiles_path_mapping_rules.keys())
 
@@ -821,11 +1073,13 @@ class AssetSync:
                 manifest_s3_key = s3_settings.add_root_and_manifest_folder_prefix(
                     manifest_properties.inputManifestPath
                 )
-                manifest = get_manifest_from_s3(
+                manifest, pack_index_name = _get_input_manifest_and_pack_index_name_from_s3(
                     manifest_key=manifest_s3_key,
                     s3_bucket=s3_settings.s3BucketName,
                     session=self.session,
                 )
+                if pack_index_name:
+                    self._add_pack_index(pack_index_name, s3_settings)
                 grouped_manifests_by_root[local_root].append(manifest)
 
         # Handle step-step dependencies.
@@ -863,6 +1117,7 @@ class AssetSync:
             and os_env_vars is not None
             and "AWS_PROFILE" in os_env_vars
             and isinstance(fs_permission_settings, PosixFileSystemPermissionSettings)
+            and self._can_use_vfs_with_packed_files()
         ):
             try:
                 VFSProcessManager.find_vfs()
@@ -894,6 +1149,7 @@ class AssetSync:
                 session=self.session,
                 on_downloading_files=on_downloading_files,
                 logger=self.logger,
+                pack_index=self._pack_index,
             )
         except JobAttachmentsS3ClientError as exc:
             if exc.status_code == 404:
@@ -912,12 +1168,163 @@ class AssetSync:
                 raise
 
         self._record_attachment_mtimes(merged_manifests_by_root)
+        self._log_download_cache_statistics(download_summary_statistics)
 
         return (
             download_summary_statistics.convert_to_summary_statistics(),
             list(pathmapping_rules.values()),
         )
 
+    def _log_download_cache_statistics(
+        self, download_summary_statistics: DownloadSummaryStatistics
+    ) -> None:
+        """
+        Logs how many files were copied from the download cache, since the summary statistics
+        returned to the caller don't include the download cache statistics.
+        """
+        download_cache_message = download_summary_statistics.get_download_cache_message()
+        if download_cache_message:
+            self.logger.info(download_cache_message.rstrip())
+
+    def watch_outputs(
+        self,
+        s3_settings: Optional[JobAttachmentS3Settings],
+        attachments: Optional[Attachments],
+        session_dir: Path,
+        storage_profiles_path_mapping_rules: dict[str, str] = {},
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> Optional[OutputWatcher]:
+        """
+        Starts watching the output directories while the session action runs. Output files are
+        hashed and uploaded to the CAS as soon as they are stable, that is, their size and
+        modification time are the same in two consecutive scans of the output directories, so
+        that `sync_outputs` only has to hash and upload the files that changed since. A stable file
+        may still be written to, so each one is uploaded from a copy that is hashed after copying,
+        and a file that changes while it's copied is left to `sync_outputs`. Stop the
+        returned watcher, or use it as a context manager, before calling `sync_outputs`.
+
+        The output manifests are still only uploaded by `sync_outputs`, which reports the output
+        files uploaded by the watcher as skipped.
+
+        Returns the started watcher, or None if there are no outputs to watch.
+        """
+        if not s3_settings or not attachments:
+            return None
+
+        # The directory that the output files must resolve inside of, by output directory
+        session_roots: dict[str, Path] = dict()
+        for manifest_properties in attachments.manifests:
+            (local_root, session_root) = self._get_output_local_root(
+                manifest_properties, session_dir, storage_profiles_path_mapping_rules
+            )
+            for output_root in self._get_output_roots(manifest_properties, local_root):
+                session_roots[str(output_root)] = session_root
+        if not session_roots:
+            return None
+
+        watcher: OutputWatcher
+
+        def on_stable_file(directory: str, file_path: str, scanned_file: ScannedFile) -> None:
+            self._pre_sync_output_file(
+                s3_settings,
+                session_roots[directory],
+                file_path,
+                scanned_file,
+                watcher.is_stopping,
+            )
+
+        watcher = OutputWatcher(
+            list(session_roots),
+            on_stable_file,
+            self.logger,
+            poll_interval=poll_interval,
+            max_workers=self.s3_uploader.num_upload_workers,
+        )
+        watcher.start()
+        return watcher
+
+    def _pre_sync_output_file(
+        self,
+        s3_settings: JobAttachmentS3Settings,
+        session_root: Path,
+        file_path: str,
+        scanned_file: ScannedFile,
+        is_stopping: Callable[[], bool],
+    ) -> None:
+        """
+        Uploads an output file found by the output watcher to the CAS, if it isn't there already.
+        The task may still be writing the file, so it's copied first (as a reflink if the file
+        system supports them), and the copy is hashed and uploaded. What's uploaded then always
+        matches the hash in its key, and nothing is ever removed from the CAS, which is shared by
+        all the jobs of the queue. Files that are unmodified inputs, that resolve outside of the
+        session root, or that change while they're copied are skipped, and left to `sync_outputs`.
+        """
+        file_stat = scanned_file.stat
+        mtime_when_synced = self.synced_assets_mtime.get(file_path, None)
+        if mtime_when_synced and file_stat.st_mtime_ns <= int(mtime_when_synced):
+            return
+        resolved_path = scanned_file.resolved_path
+        if not self._is_file_within_directory(Path(resolved_path), session_root):
+            return
+        pre_synced = self._pre_synced_outputs.get(resolved_path)
+        if pre_synced and pre_synced[:2] == (file_stat.st_size, file_stat.st_mtime_ns):
+            return
+
+        with tempfile.TemporaryDirectory(prefix="deadline-output-") as snapshot_dir:
+            snapshot_path = os.path.join(snapshot_dir, "snapshot")
+            _clone_or_copy_file(resolved_path, snapshot_path)
+            stat_after_copying = os.stat(resolved_path)
+            if (stat_after_copying.st_size, stat_after_copying.st_mtime_ns) != (
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+            ):
+                return
+            file_hash = hash_file(snapshot_path, self.hash_alg)
+
+            s3_key = self._get_output_s3_key(file_hash, s3_settings)
+            if not self.s3_uploader.file_already_uploaded(s3_settings.s3BucketName, s3_key):
+                if is_stopping():
+                    return
+                # Cancels the upload if the watcher is stopped.
+                progress_tracker = ProgressTracker(
+                    status=ProgressStatus.UPLOAD_IN_PROGRESS,
+                    total_files=1,
+                    total_bytes=file_stat.st_size,
+                    on_progress_callback=lambda _: not is_stopping(),
+                )
+                try:
+                    self.s3_uploader.upload_file_to_s3(
+                        local_path=Path(snapshot_path),
+                        s3_bucket=s3_settings.s3BucketName,
+                        s3_upload_key=s3_key,
+                        progress_tracker=progress_tracker,
+                        base_dir_path=Path(snapshot_dir),
+                    )
+                except AssetSyncCancelledError:
+                    return
+                if progress_tracker.processed_files == 0:
+                    return
+
+        # The hash is of the contents at the stat taken before copying, so `sync_outputs` only
+        # reuses it if the file still has that size and modification time.
+        self._pre_synced_outputs[resolved_path] = (
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            file_hash,
+        )
+
+    def _get_pre_synced_output_hash(
+        self, resolved_path: str, file_size: int, file_mtime: int
+    ) -> Optional[str]:
+        """
+        Returns the hash of the output file if the output watcher uploaded it, and it hasn't
+        changed since.
+        """
+        pre_synced = self._pre_synced_outputs.get(resolved_path)
+        if pre_synced is None or pre_synced[:2] != (file_size, file_mtime):
+            return None
+        return pre_synced[2]
+
     def sync_outputs(
         self,
         s3_settings: Optional[JobAttachmentS3Settings],
@@ -944,31 +1351,10 @@ class AssetSync:
 
         all_output_files: List[OutputFile] = []
 
-        storage_profiles_source_paths = list(storage_profiles_path_mapping_rules.keys())
-
         for manifest_properties in attachments.manifests:
-            session_root = session_dir
-            local_root: Path = Path()
-            if (
-                len(storage_profiles_path_mapping_rules) > 0
-                and manifest_properties.fileSystemLocationName
-            ):
-                if manifest_properties.rootPath in storage_profiles_source_paths:
-                    local_root = Path(
-                        storage_profiles_path_mapping_rules[manifest_properties.rootPath]
-                    )
-                    # We use session_root to filter out any files resolved to a location outside
-                    # of that directory. If storage profile's path mapping rules are available,
-                    # we can consider the session_root to be the mapped-storage profile path.
-                    session_root = local_root
-                else:
-                    raise AssetSyncError(
-                        "Error occurred while attempting to sync output files: "
-                        f"No path mapping rule found for the source path {manifest_properties.rootPath}"
-                    )
-            else:
-                dir_name: str = _get_unique_dest_dir_name(manifest_properties.rootPath)
-                local_root = session_dir.joinpath(dir_name)
+            (local_root, session_root) = self._get_output_local_root(
+                manifest_properties, session_dir, storage_profiles_path_mapping_rules
+            )
 
             output_files: List[OutputFile] = self._get_output_files(
                 manifest_properties,
@@ -1011,6 +1397,35 @@ class AssetSync:
             summary_stats = SummaryStatistics()
         return summary_stats
 
+    def _get_output_local_root(
+        self,
+        manifest_properties: ManifestProperties,
+        session_dir: Path,
+        storage_profiles_path_mapping_rules: dict[str, str],
+    ) -> Tuple[Path, Path]:
+        """
+        Returns a tuple of (1) the local root of the asset root on this host, and (2) the directory
+        that its output files must resolve inside of.
+        """
+        if (
+            len(storage_profiles_path_mapping_rules) > 0
+            and manifest_properties.fileSystemLocationName
+        ):
+            if manifest_properties.rootPath in storage_profiles_path_mapping_rules:
+                local_root = Path(storage_profiles_path_mapping_rules[manifest_properties.rootPath])
+                # We use session_root to filter out any files resolved to a location outside
+                # of that directory. If storage profile's path mapping rules are available,
+                # we can consider the session_root to be the mapped-storage profile path.
+                return (local_root, local_root)
+            else:
+                raise AssetSyncError(
+                    "Error occurred while attempting to sync output files: "
+                    f"No path mapping rule found for the source path {manifest_properties.rootPath}"
+                )
+
+        dir_name: str = _get_unique_dest_dir_name(manifest_properties.rootPath)
+        return (session_dir.joinpath(dir_name), session_dir)
+
     def cleanup_session(
         self,
         session_dir: Path,
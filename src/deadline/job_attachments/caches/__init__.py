@@ -1,6 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 from .cache_db import CacheDB, CONFIG_ROOT, COMPONENT_NAME
+from .download_cache import DownloadCache
 from .hash_cache import HashCache, HashCacheEntry
 from .s3_check_cache import S3CheckCache, S3CheckCacheEntry
 
@@ -8,6 +9,7 @@ __all__ = [
     "CacheDB",
     "CONFIG_ROOT",
     "COMPONENT_NAME",
+    "DownloadCache",
     "HashCache",
     "HashCacheEntry",
     "S3CheckCache",
@@ -69,6 +69,18 @@ class CacheDB(ABC):
                     f"Could not access cache file in {self.cache_dir}"
                 ) from oe
 
+            try:
+                # Write-ahead logging lets readers continue while a write is in progress, and with
+                # synchronous=NORMAL a commit no longer waits for an fsync. The cache can always be
+                # rebuilt, so losing the last few commits on power loss is acceptable.
+                self.db_connection.execute("PRAGMA journal_mode=WAL")
+                self.db_connection.execute("PRAGMA synchronous=NORMAL")
+                self.db_connection.execute("PRAGMA temp_store=MEMORY")
+            except sqlite3.DatabaseError as de:
+                # e.g. the database is locked by another process, or the file system doesn't
+                # support WAL. The cache still works with the default settings.
+                logger.info(f"Could not configure {self.cache_name}, using defaults: {de}")
+
             try:
                 self.db_connection.execute(f"SELECT * FROM {self.table_name}")
             except Exception:
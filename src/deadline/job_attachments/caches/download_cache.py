@@ -0,0 +1,207 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Module for the local cache of downloaded content-addressed storage (CAS) objects.
+"""
+
+import logging
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional, Tuple
+from uuid import uuid4
+
+from ..asset_manifests import HashAlgorithm, hash_data, hash_file
+
+logger = logging.getLogger("Deadline")
+
+# The ioctl request that clones a file on Linux file systems that support it, such as Btrfs and XFS.
+FICLONE = 0x40049409
+
+# Temporary files older than this were left behind by a process that stopped while adding an entry.
+STALE_TEMP_FILE_AGE_IN_SECS = 60 * 60
+
+TEMP_FILE_SUFFIX = ".tmp"
+
+_VALID_HASH_PATTERN = re.compile(r"^[0-9A-Za-z]+$")
+
+
+def _clone_or_copy_file(src: str, dst: str) -> None:
+    """
+    Copies the file, cloning it (a reflink, which shares the data blocks until either copy is
+    modified) if the file system supports it.
+    """
+    if sys.platform == "linux":
+        import fcntl
+
+        try:
+            with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+                fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            return
+        except OSError:
+            pass  # The file system doesn't support cloning, so fall back to a copy.
+    shutil.copyfile(src, dst)
+
+
+class DownloadCache:
+    """
+    A size-bounded cache of CAS objects on the local disk, keyed by `{hash}.{hashAlg}`, that is
+    shared by all the sessions on the host. Files are copied out of the cache (as reflinks if the
+    file system supports them) rather than hardlinked, since downloaded files get their own
+    modification times and permissions, and may be modified by the tasks that use them.
+
+    The entries of each CAS (S3 bucket and CAS prefix) are kept in their own subdirectory, so that
+    a session only gets cached objects from the CAS that it downloads from, which its credentials
+    can read. An object is only added to the cache if its contents match its hash.
+
+    It is safe to use the cache from multiple threads and processes at the same time. Entries are
+    written to a temporary file and renamed into place, so an entry is never seen partially
+    written, and an entry that disappears (because another process evicted it) is a cache miss.
+    The least recently used entries are evicted by `evict`, which is called after downloading.
+    """
+
+    def __init__(
+        self, cache_dir: str, max_size_bytes: int, s3_bucket: str, cas_prefix: Optional[str]
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        # The bucket and prefix are hashed, since the prefix may not be a valid directory name.
+        self.cas_dir = os.path.join(
+            cache_dir,
+            hash_data(f"{s3_bucket}/{cas_prefix or ''}".encode("utf-8"), HashAlgorithm.XXH128),
+        )
+        os.makedirs(self.cas_dir, exist_ok=True)
+
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def _get_entry_path(self, file_hash: str, hash_algorithm: HashAlgorithm) -> Optional[str]:
+        """
+        Returns the path of the cache entry for the object, or None if the hash can't be cached.
+        Entries are spread across subdirectories by the first two characters of their hash.
+        """
+        if not _VALID_HASH_PATTERN.match(file_hash):
+            # Never build a path out of a hash that could point outside of the cache directory.
+            return None
+        return os.path.join(self.cas_dir, file_hash[:2], f"{file_hash}.{hash_algorithm.value}")
+
+    def get(
+        self, file_hash: str, hash_algorithm: HashAlgorithm, file_size: int, local_path: Path
+    ) -> bool:
+        """
+        Copies the cached object to the local path, and marks it as recently used.
+        Returns whether the object was in the cache. An entry of the wrong size is corrupted,
+        so it is removed from the cache.
+        """
+        entry_path = self._get_entry_path(file_hash, hash_algorithm)
+        is_hit = False
+        if entry_path is not None:
+            try:
+                if os.stat(entry_path).st_size == file_size:
+                    _clone_or_copy_file(entry_path, str(local_path))
+                    os.utime(entry_path)
+                    is_hit = True
+                else:
+                    logger.warning(
+                        f"Removing corrupted entry {entry_path} from the download cache."
+                    )
+                    self._remove(entry_path)
+            except OSError as e:
+                # The entry doesn't exist, or was evicted by another process while reading it.
+                if not isinstance(e, FileNotFoundError):
+                    logger.debug(f"Could not read {entry_path} from the download cache: {e}")
+
+        with self._lock:
+            if is_hit:
+                self.hits += 1
+                self.bytes_saved += file_size
+            else:
+                self.misses += 1
+        return is_hit
+
+    def put(self, file_hash: str, hash_algorithm: HashAlgorithm, local_path: Path) -> None:
+        """
+        Adds a copy of the downloaded object to the cache, unless it's already cached or the
+        copy doesn't match the hash. Failures are logged and ignored, since the cache is only an
+        optimization.
+        """
+        entry_path = self._get_entry_path(file_hash, hash_algorithm)
+        if entry_path is None or os.path.exists(entry_path):
+            return
+
+        temp_path = f"{entry_path}.{uuid4().hex[:8]}{TEMP_FILE_SUFFIX}"
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            _clone_or_copy_file(str(local_path), temp_path)
+            # Hash the copy rather than the downloaded file, which the task may already be
+            # modifying, so that only the contents that match the hash are ever cached.
+            if hash_file(temp_path, hash_algorithm) != file_hash:
+                logger.warning(
+                    f"Not adding {str(local_path)} to the download cache, since it doesn't match"
+                    f" its hash {file_hash}."
+                )
+                os.remove(temp_path)
+                return
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            logger.debug(f"Could not add {str(local_path)} to the download cache: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def evict(self) -> int:
+        """
+        Removes the least recently used entries until the size of the cache is within its limit,
+        along with temporary files left behind by processes that stopped while adding an entry.
+        Returns the number of bytes removed.
+        """
+        entries: List[Tuple[float, int, str]] = []
+        total_size = 0
+        removed_size = 0
+        now = time.time()
+        # The size limit is for the whole cache, so the entries of every CAS are evicted together.
+        subdirs = [
+            subdir
+            for cas_dir in os.scandir(self.cache_dir)
+            if cas_dir.is_dir(follow_symlinks=False)
+            for subdir in os.scandir(cas_dir.path)
+        ]
+        for subdir in subdirs:
+            if not subdir.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(subdir.path):
+                try:
+                    stat_result = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue  # Removed by another process.
+                if entry.name.endswith(TEMP_FILE_SUFFIX):
+                    if now - stat_result.st_mtime > STALE_TEMP_FILE_AGE_IN_SECS:
+                        self._remove(entry.path)
+                    continue
+                entries.append((stat_result.st_mtime, stat_result.st_size, entry.path))
+                total_size += stat_result.st_size
+
+        # An entry is touched whenever it is used, so the oldest modification time is the least
+        # recently used.
+        entries.sort()
+        for _, size, path in entries:
+            if total_size - removed_size <= self.max_size_bytes:
+                break
+            if self._remove(path):
+                removed_size += size
+        return removed_size
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            # Already removed by another process, or still open on Windows.
+            return False
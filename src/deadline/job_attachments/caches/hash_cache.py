@@ -5,8 +5,8 @@ Module for accessing the local file hash cache.
 """
 
 import logging
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .cache_db import CacheDB
 from ..asset_manifests.hash_algorithms import HashAlgorithm
@@ -14,6 +14,12 @@ from ..asset_manifests.hash_algorithms import HashAlgorithm
 
 logger = logging.getLogger("Deadline")
 
+# The maximum number of file paths to look up in a single query. This stays below the lowest
+# default limit on the number of host parameters in a query across SQLite versions (999).
+HASH_CACHE_LOOKUP_BATCH_SIZE = 500
+# The number of buffered entries at which they are written to the database in one transaction.
+HASH_CACHE_WRITE_BATCH_SIZE = 1000
+
 
 @dataclass
 class HashCacheEntry:
@@ -44,6 +50,10 @@ class HashCache(CacheDB):
 
     This class also automatically locks when doing writes, so it can be called
     by multiple threads.
+
+    Entries put into the cache are buffered and written in batched transactions. They are
+    visible to `get_entry` right away, and are written to the database at the latest when
+    `flush` is called or the context manager exits.
     """
 
     CACHE_NAME = "hash_cache"
@@ -60,6 +70,18 @@ class HashCache(CacheDB):
             create_query=create_query,
             cache_dir=cache_dir,
         )
+        # Entries waiting to be written to the database, by file path.
+        self._pending_entries: Dict[str, HashCacheEntry] = {}
+        # Entries looked up in bulk by `prefetch_entries`, by file path and hash algorithm.
+        # A value of None means the path is known to not be in the cache.
+        self._prefetched_entries: Dict[Tuple[str, HashAlgorithm], Optional[HashCacheEntry]] = {}
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Called when exiting the context manager."""
+        if self.enabled:
+            self.flush()
+            self._prefetched_entries = {}
+        super().__exit__(exc_type, exc_value, exc_traceback)
 
     def get_entry(
         self, file_path_key: str, hash_algorithm: HashAlgorithm
@@ -70,6 +92,19 @@ class HashCache(CacheDB):
         if not self.enabled:
             return None
 
+        # Callers are free to modify the entries they get, so only hand out copies of the
+        # entries kept in memory.
+        with self.db_lock:
+            pending_entry = self._pending_entries.get(file_path_key)
+            if pending_entry is not None:
+                if pending_entry.hash_algorithm == hash_algorithm:
+                    return replace(pending_entry)
+                return None
+
+            if (file_path_key, hash_algorithm) in self._prefetched_entries:
+                prefetched_entry = self._prefetched_entries[(file_path_key, hash_algorithm)]
+                return replace(prefetched_entry) if prefetched_entry is not None else None
+
         with self.db_lock, self.db_connection:
             entry_vals = self.db_connection.execute(
                 f"SELECT * FROM {self.table_name} WHERE file_path=? AND hash_algorithm=?",
@@ -79,24 +114,113 @@ class HashCache(CacheDB):
                 ],
             ).fetchone()
             if entry_vals:
-                return HashCacheEntry(
-                    file_path=str(entry_vals[0], encoding="utf-8", errors="surrogatepass"),
-                    hash_algorithm=HashAlgorithm(entry_vals[1]),
-                    file_hash=entry_vals[2],
-                    last_modified_time=str(entry_vals[3]),
-                )
+                return self._entry_from_row(entry_vals)
             else:
                 return None
 
+    def get_entries(
+        self, file_path_keys: Iterable[str], hash_algorithm: HashAlgorithm
+    ) -> Dict[str, HashCacheEntry]:
+        """
+        Returns the entries from the hash cache for the given file paths, by file path. Paths
+        that aren't in the cache are left out. The paths are looked up with a few bulk queries
+        rather than one query per path.
+        """
+        if not self.enabled:
+            return {}
+
+        entries: Dict[str, HashCacheEntry] = {}
+        file_path_keys = list(file_path_keys)
+        with self.db_lock:
+            for i in range(0, len(file_path_keys), HASH_CACHE_LOOKUP_BATCH_SIZE):
+                batch = file_path_keys[i : i + HASH_CACHE_LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.db_connection.execute(
+                    f"SELECT * FROM {self.table_name} WHERE hash_algorithm=? AND file_path IN ({placeholders})",
+                    [
+                        hash_algorithm.value,
+                        *(
+                            file_path_key.encode(encoding="utf-8", errors="surrogatepass")
+                            for file_path_key in batch
+                        ),
+                    ],
+                ).fetchall()
+                for row in rows:
+                    entry = self._entry_from_row(row)
+                    entries[entry.file_path] = entry
+
+            for file_path_key in file_path_keys:
+                pending_entry = self._pending_entries.get(file_path_key)
+                if pending_entry is not None:
+                    if pending_entry.hash_algorithm == hash_algorithm:
+                        entries[file_path_key] = replace(pending_entry)
+                    else:
+                        entries.pop(file_path_key, None)
+
+        return entries
+
+    def prefetch_entries(
+        self, file_path_keys: Iterable[str], hash_algorithm: HashAlgorithm
+    ) -> None:
+        """
+        Looks up the entries for the given file paths in bulk and keeps them in memory, so that
+        subsequent `get_entry` calls for these paths don't need to query the database. This
+        replaces any previously prefetched entries.
+        """
+        if not self.enabled:
+            return
+
+        file_path_keys = list(file_path_keys)
+        entries = self.get_entries(file_path_keys, hash_algorithm)
+        self._prefetched_entries = {
+            (file_path_key, hash_algorithm): entries.get(file_path_key)
+            for file_path_key in file_path_keys
+        }
+
     def put_entry(self, entry: HashCacheEntry) -> None:
-        """Inserts or replaces an entry into the hash cache database after acquiring the lock."""
+        """
+        Inserts or replaces an entry into the hash cache after acquiring the lock. The entry is
+        buffered, and written to the database once enough entries are buffered.
+        """
         if self.enabled:
-            with self.db_lock, self.db_connection:
-                entry_dict = entry.to_dict()
-                entry_dict["file_path"] = entry_dict["file_path"].encode(
-                    encoding="utf-8", errors="surrogatepass"
-                )
-                self.db_connection.execute(
-                    f"INSERT OR REPLACE INTO {self.table_name} VALUES(:file_path, :hash_algorithm, :file_hash, :last_modified_time)",
-                    entry_dict,
-                )
+            with self.db_lock:
+                self._pending_entries[entry.file_path] = replace(entry)
+                # Don't serve a stale prefetched entry for this path.
+                self._prefetched_entries.pop((entry.file_path, entry.hash_algorithm), None)
+                if len(self._pending_entries) >= HASH_CACHE_WRITE_BATCH_SIZE:
+                    self._write_pending_entries()
+
+    def flush(self) -> None:
+        """Writes all of the buffered entries to the hash cache database in one transaction."""
+        if self.enabled:
+            with self.db_lock:
+                self._write_pending_entries()
+
+    def _write_pending_entries(self) -> None:
+        """Writes the buffered entries to the database. The lock must be held by the caller."""
+        if not self._pending_entries:
+            return
+
+        entry_dicts: List[Dict[str, Any]] = []
+        for entry in self._pending_entries.values():
+            entry_dict = entry.to_dict()
+            entry_dict["file_path"] = entry_dict["file_path"].encode(
+                encoding="utf-8", errors="surrogatepass"
+            )
+            entry_dicts.append(entry_dict)
+
+        with self.db_connection:
+            self.db_connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table_name} VALUES(:file_path, :hash_algorithm, :file_hash, :last_modified_time)",
+                entry_dicts,
+            )
+        self._pending_entries = {}
+
+    @staticmethod
+    def _entry_from_row(entry_vals: Tuple[Any, ...]) -> HashCacheEntry:
+        return HashCacheEntry(
+            file_path=str(entry_vals[0], encoding="utf-8", errors="surrogatepass"),
+            hash_algorithm=HashAlgorithm(entry_vals[1]),
+            file_hash=entry_vals[2],
+            last_modified_time=str(entry_vals[3]),
+        )
@@ -4,28 +4,47 @@
 from __future__ import annotations
 
 import concurrent.futures
+import heapq
 import io
 import json
 import os
 import re
 import sys
+import threading
 import time
 from collections import defaultdict
+from contextlib import nullcontext
 from datetime import datetime
 from itertools import chain
 from logging import Logger, LoggerAdapter, getLogger
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Any, Callable, DefaultDict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    DefaultDict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from uuid import uuid4
 
 import boto3
 from boto3.s3.transfer import ProgressCallbackInvoker
 from botocore.client import BaseClient
 from botocore.exceptions import BotoCoreError, ClientError
 
+from .asset_manifests._canonical_json import (
+    canonical_path_comparator,
+    write_manifest_canonical_json,
+)
 from .asset_manifests.base_manifest import BaseAssetManifest, BaseManifestPath as RelativeFilePath
 from .asset_manifests.hash_algorithms import HashAlgorithm
-from .asset_manifests.decode import decode_manifest
+from .asset_manifests.decode import decode_manifest_bytes
+from .caches import DownloadCache
 from .exceptions import (
     COMMON_ERROR_GUIDANCE_FOR_S3,
     AssetSyncError,
@@ -49,7 +68,9 @@ from .models import (
     FileConflictResolution,
     JobAttachmentS3Settings,
     ManifestPathGroup,
+    TransferEngine,
 )
+from .packs import PACK_INDEX_METADATA_KEY, PackedObject, PackIndex
 from .progress_tracker import (
     DownloadSummaryStatistics,
     ProgressReportMetadata,
@@ -58,10 +79,16 @@ from .progress_tracker import (
 )
 from ._aws.aws_clients import (
     get_account_id,
+    get_adaptive_concurrency,
+    get_boto3_session,
+    get_download_cache_settings,
     get_s3_client,
     get_s3_max_pool_connections,
     get_s3_transfer_manager,
+    get_transfer_engine,
 )
+from ._async_transfer import AsyncS3Transfer, run_transfers
+from ._concurrency import AdaptiveConcurrencyController
 from .os_file_permission import (
     FileSystemPermissionSettings,
     PosixFileSystemPermissionSettings,
@@ -74,6 +101,11 @@ from ._utils import _is_relative_to, _join_s3_paths, _is_windows_file_path_limit
 download_logger = getLogger("deadline.job_attachments.download")
 
 S3_DOWNLOAD_MAX_CONCURRENCY = 10
+# Files at least this large are downloaded with concurrent ranged requests of this part size.
+RANGED_DOWNLOAD_MIN_SIZE = 128 * (1024**2)  # 128 MB
+RANGED_DOWNLOAD_PART_SIZE = 16 * (1024**2)  # 16 MB
+# The size of the chunks that the parts of a ranged download are written to the file in.
+RANGED_DOWNLOAD_CHUNK_SIZE = 1024**2  # 1 MB
 WINDOWS_MAX_PATH_LENGTH = 260
 TEMP_DOWNLOAD_ADDED_CHARS_LENGTH = 9
 
@@ -90,9 +122,7 @@ def get_manifest_from_s3(
             file_buffer,
             ExtraArgs={"ExpectedBucketOwner": get_account_id(session=session)},
         )
-        byte_value = file_buffer.getvalue()
-        string_value = byte_value.decode("utf-8")
-        asset_manifest = decode_manifest(string_value)
+        asset_manifest = decode_manifest_bytes(file_buffer.getvalue())
         file_buffer.close()
         return asset_manifest
     except ClientError as exc:
@@ -355,6 +385,7 @@ def download_files_in_directory(
     )
 
     num_download_workers = _get_num_download_workers()
+    concurrency_controller = _get_download_concurrency_controller(num_download_workers)
 
     start_time = time.perf_counter()
 
@@ -367,6 +398,7 @@ def download_files_in_directory(
             s3_settings.s3BucketName,
             s3_settings.full_cas_prefix(),
             progress_tracker=progress_tracker,
+            concurrency_controller=concurrency_controller,
         )
 
     progress_tracker.total_time = time.perf_counter() - start_time
@@ -376,6 +408,39 @@ def download_files_in_directory(
     )
 
 
+def _get_local_file_name(
+    file: RelativeFilePath,
+    local_download_dir: str,
+    file_conflict_resolution: Optional[FileConflictResolution],
+) -> Optional[Path]:
+    """
+    Returns the local path to download the file to, resolving a conflict with an existing file
+    based on the `file_conflict_resolution`. Returns None if the file should be skipped.
+    """
+    # Python will handle the path separator '/' correctly on every platform.
+    local_file_name = Path(local_download_dir).joinpath(file.path)
+
+    # If the file name already exists, resolve the conflict based on the file_conflict_resolution
+    if local_file_name.is_file():
+        if file_conflict_resolution == FileConflictResolution.SKIP:
+            return None
+        elif file_conflict_resolution == FileConflictResolution.OVERWRITE:
+            pass
+        elif file_conflict_resolution == FileConflictResolution.CREATE_COPY:
+            # This loop resolves filename conflicts by appending " (1)"
+            # to the stem of the filename until a unique name is found.
+            while local_file_name.is_file():
+                local_file_name = local_file_name.parent.joinpath(
+                    local_file_name.stem + " (1)" + local_file_name.suffix
+                )
+        else:
+            raise ValueError(
+                f"Unknown choice for file conflict resolution: {file_conflict_resolution}"
+            )
+
+    return local_file_name
+
+
 def download_file(
     file: RelativeFilePath,
     hash_algorithm: HashAlgorithm,
@@ -387,10 +452,16 @@ def download_file(
     modified_time_override: Optional[float] = None,
     progress_tracker: Optional[ProgressTracker] = None,
     file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    pack_index: Optional[PackIndex] = None,
+    download_cache: Optional[DownloadCache] = None,
+    ranged_download_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None,
 ) -> Tuple[int, Optional[Path]]:
     """
     Downloads a file from the S3 bucket to the local directory. `modified_time_override` is ignored if the manifest
-    version used supports timestamps.
+    version used supports timestamps. If the file's hash is in the given `pack_index`, the file is downloaded from
+    its byte range of the pack that holds it. If a `download_cache` is given, the file is copied from it if it's
+    cached, and added to it otherwise. If a `ranged_download_executor` is given and the file is at least
+    `RANGED_DOWNLOAD_MIN_SIZE`, its parts are downloaded with concurrent ranged requests on the executor.
     Returns a tuple of (size in bytes, filename) of the downloaded file.
     - The file size of 0 means that this file comes from a manifest version that does not provide file sizes.
     - The filename of None indicates that this file has been skipped or has not been downloaded.
@@ -405,35 +476,46 @@ def download_file(
 
     file_bytes = file.size
 
-    # Python will handle the path separator '/' correctly on every platform.
-    local_file_name = Path(local_download_dir).joinpath(file.path)
-
     s3_key = (
         f"{cas_prefix}/{file.hash}.{hash_algorithm.value}"
         if cas_prefix
         else f"{file.hash}.{hash_algorithm.value}"
     )
 
-    # If the file name already exists, resolve the conflict based on the file_conflict_resolution
-    if local_file_name.is_file():
-        if file_conflict_resolution == FileConflictResolution.SKIP:
-            return (file_bytes, None)
-        elif file_conflict_resolution == FileConflictResolution.OVERWRITE:
-            pass
-        elif file_conflict_resolution == FileConflictResolution.CREATE_COPY:
-            # This loop resolves filename conflicts by appending " (1)"
-            # to the stem of the filename until a unique name is found.
-            while local_file_name.is_file():
-                local_file_name = local_file_name.parent.joinpath(
-                    local_file_name.stem + " (1)" + local_file_name.suffix
-                )
-        else:
-            raise ValueError(
-                f"Unknown choice for file conflict resolution: {file_conflict_resolution}"
-            )
+    local_file_name = _get_local_file_name(file, local_download_dir, file_conflict_resolution)
+    if local_file_name is None:
+        return (file_bytes, None)
 
     local_file_name.parent.mkdir(parents=True, exist_ok=True)
 
+    if download_cache is not None and download_cache.get(
+        file.hash, hash_algorithm, file_bytes, local_file_name
+    ):
+        download_logger.debug(
+            f"Copied {file.path} to {str(local_file_name)} from the download cache"
+        )
+        if progress_tracker and not progress_tracker.track_progress_callback(file_bytes):
+            raise AssetSyncCancelledError("File download cancelled.")
+        os.utime(local_file_name, (modified_time_override, modified_time_override))  # type: ignore[arg-type]
+        return (file_bytes, local_file_name)
+
+    packed_object = pack_index.get(file.hash) if pack_index else None
+    if packed_object is not None:
+        _download_packed_object(
+            packed_object,
+            local_file_name,
+            s3_bucket,
+            cas_prefix,
+            s3_client,
+            session,
+            progress_tracker,
+        )
+        download_logger.debug(f"Downloaded {file.path} to {str(local_file_name)} from a pack")
+        if download_cache is not None:
+            download_cache.put(file.hash, hash_algorithm, local_file_name)
+        os.utime(local_file_name, (modified_time_override, modified_time_override))  # type: ignore[arg-type]
+        return (file_bytes, local_file_name)
+
     future: concurrent.futures.Future
 
     def handler(bytes_downloaded):
@@ -447,13 +529,25 @@ def download_file(
 
     subscribers = [ProgressCallbackInvoker(handler)]
 
-    future = transfer_manager.download(
-        bucket=s3_bucket,
-        key=s3_key,
-        fileobj=str(local_file_name),
-        extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
-        subscribers=subscribers,
-    )
+    if ranged_download_executor is not None and file_bytes >= RANGED_DOWNLOAD_MIN_SIZE:
+        future = _start_ranged_download(
+            s3_client,
+            s3_bucket,
+            s3_key,
+            local_file_name,
+            file_bytes,
+            ranged_download_executor,
+            get_account_id(session=session),
+            progress_tracker,
+        )
+    else:
+        future = transfer_manager.download(
+            bucket=s3_bucket,
+            key=s3_key,
+            fileobj=str(local_file_name),
+            extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
+            subscribers=subscribers,
+        )
 
     try:
         future.result()
@@ -542,11 +636,233 @@ def download_file(
         raise AssetSyncError(e) from e
 
     download_logger.debug(f"Downloaded {file.path} to {str(local_file_name)}")
+    if download_cache is not None:
+        download_cache.put(file.hash, hash_algorithm, local_file_name)
     os.utime(local_file_name, (modified_time_override, modified_time_override))  # type: ignore[arg-type]
 
     return (file_bytes, local_file_name)
 
 
+# Serializes the seeks and writes of `_write_at` on platforms without pwrite.
+_write_at_lock = threading.Lock()
+
+
+def _write_at(fd: int, data: bytes, offset: int) -> None:
+    """
+    Writes all the data to the file at the offset, without changing the file's position, so that
+    multiple threads can write to different parts of the file at the same time.
+    """
+    view = memoryview(data)
+    while view:
+        if hasattr(os, "pwrite"):
+            written = os.pwrite(fd, view, offset)
+        else:
+            # Windows has no pwrite, so the seek and the write can't be interleaved with another
+            # thread's.
+            with _write_at_lock:
+                os.lseek(fd, offset, os.SEEK_SET)
+                written = os.write(fd, view)
+        view = view[written:]
+        offset += written
+
+
+def _set_future_exception(future: concurrent.futures.Future, exception: BaseException) -> bool:
+    """
+    Fails the future with the exception, unless it's already done or cancelled.
+    Returns whether the future was failed.
+    """
+    try:
+        future.set_exception(exception)
+        return True
+    except concurrent.futures.InvalidStateError:
+        return False
+
+
+def _start_ranged_download(
+    s3_client: BaseClient,
+    s3_bucket: str,
+    s3_key: str,
+    local_file_name: Path,
+    file_size: int,
+    executor: concurrent.futures.ThreadPoolExecutor,
+    expected_bucket_owner: str,
+    progress_tracker: Optional[ProgressTracker] = None,
+) -> concurrent.futures.Future:
+    """
+    Starts downloading the object with concurrent ranged get-object requests on the executor, one
+    for each part of `RANGED_DOWNLOAD_PART_SIZE`. The parts are written in place into a temporary
+    file that is preallocated (sparsely, on file systems that support it) to the size of the
+    object, and that is renamed to the local file name once all the parts are written.
+    Returns a future of the whole download. Cancelling the future stops the remaining parts, and
+    if a part fails, the future fails with its exception.
+    """
+    temp_file_name = local_file_name.with_name(f"{local_file_name.name}.{uuid4().hex[:8]}")
+    fd = os.open(
+        temp_file_name, os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666
+    )
+    try:
+        os.ftruncate(fd, file_size)
+    except OSError:
+        os.close(fd)
+        os.remove(temp_file_name)
+        raise
+
+    download_future: concurrent.futures.Future = concurrent.futures.Future()
+    # Reentrant, since a part's done callback is called right away if it's already done.
+    lock = threading.RLock()
+    part_futures: list[concurrent.futures.Future] = []
+    parts_remaining = 0
+
+    def download_part(start: int, end: int) -> None:
+        if download_future.done():
+            return
+        response = s3_client.get_object(
+            Bucket=s3_bucket,
+            Key=s3_key,
+            Range=f"bytes={start}-{end}",
+            ExpectedBucketOwner=expected_bucket_owner,
+        )
+        offset = start
+        for chunk in response["Body"].iter_chunks(RANGED_DOWNLOAD_CHUNK_SIZE):
+            if download_future.done():
+                # Cancelled, or another part failed.
+                return
+            _write_at(fd, chunk, offset)
+            offset += len(chunk)
+            if progress_tracker and not progress_tracker.track_progress_callback(len(chunk)):
+                download_future.cancel()
+                return
+        if offset != end + 1:
+            raise AssetSyncError(
+                f"Downloaded {offset - start} bytes from offset {start} of s3://{s3_bucket}/{s3_key} "
+                f"for {str(local_file_name)}, but expected {end + 1 - start} bytes."
+            )
+
+    def on_part_done(part_future: concurrent.futures.Future) -> None:
+        nonlocal parts_remaining
+        with lock:
+            part_exception = None if part_future.cancelled() else part_future.exception()
+            if part_exception is not None and _set_future_exception(
+                download_future, part_exception
+            ):
+                for other_future in part_futures:
+                    other_future.cancel()
+            parts_remaining -= 1
+            if parts_remaining > 0:
+                return
+            os.close(fd)
+            if not download_future.done():
+                try:
+                    os.replace(temp_file_name, local_file_name)
+                except OSError as e:
+                    _set_future_exception(download_future, e)
+                else:
+                    try:
+                        download_future.set_result(None)
+                    except concurrent.futures.InvalidStateError:
+                        pass  # Cancelled after the last part was written.
+                    return
+            os.remove(temp_file_name)
+
+    def on_download_done(future: concurrent.futures.Future) -> None:
+        if future.cancelled():
+            for part_future in part_futures:
+                part_future.cancel()
+
+    download_future.add_done_callback(on_download_done)
+
+    part_ranges = [
+        (start, min(start + RANGED_DOWNLOAD_PART_SIZE, file_size) - 1)
+        for start in range(0, file_size, RANGED_DOWNLOAD_PART_SIZE)
+    ]
+    with lock:
+        parts_remaining = len(part_ranges)
+        for start, end in part_ranges:
+            part_futures.append(executor.submit(download_part, start, end))
+        for part_future in part_futures:
+            # Called right away for parts that are already done.
+            part_future.add_done_callback(on_part_done)
+    return download_future
+
+
+def _download_packed_object(
+    packed_object: PackedObject,
+    local_file_name: Path,
+    s3_bucket: str,
+    cas_prefix: Optional[str],
+    s3_client: BaseClient,
+    session: Optional[boto3.Session] = None,
+    progress_tracker: Optional[ProgressTracker] = None,
+) -> None:
+    """
+    Downloads a packed object to the given local file, with a ranged get-object request for the
+    object's byte range of its pack.
+    """
+    s3_key = (
+        _join_s3_paths(cas_prefix, packed_object.pack_name)
+        if cas_prefix
+        else packed_object.pack_name
+    )
+
+    if packed_object.size == 0:
+        # An empty range can't be requested, and there's nothing to download.
+        data = b""
+    else:
+        byte_range = f"bytes={packed_object.offset}-{packed_object.offset + packed_object.size - 1}"
+        try:
+            response = s3_client.get_object(
+                Bucket=s3_bucket,
+                Key=s3_key,
+                Range=byte_range,
+                ExpectedBucketOwner=get_account_id(session=session),
+            )
+            data = response["Body"].read()
+        except ClientError as exc:
+            status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+            status_code_guidance = {
+                **COMMON_ERROR_GUIDANCE_FOR_S3,
+                403: (
+                    (
+                        "Forbidden or Access denied. Please check your AWS credentials, and ensure that "
+                        "your AWS IAM Role or User has the 's3:GetObject' permission for this bucket. "
+                    )
+                    if "kms:" not in str(exc)
+                    else (
+                        "Forbidden or Access denied. Please check your AWS credentials and Job Attachments S3 bucket "
+                        "encryption settings. If a customer-managed KMS key is set, confirm that your AWS IAM Role or "
+                        "User has the 'kms:Decrypt' and 'kms:DescribeKey' permissions for the key used to encrypt the bucket."
+                    )
+                ),
+                404: (
+                    "Not found. Please check your bucket name and object key, and ensure that they exist in the AWS account."
+                ),
+            }
+            raise JobAttachmentsS3ClientError(
+                action="downloading packed file",
+                status_code=status_code,
+                bucket_name=s3_bucket,
+                key_or_prefix=s3_key,
+                message=f"{status_code_guidance.get(status_code, '')} {str(exc)} (Failed to download the file to {str(local_file_name)})",
+            ) from exc
+        except BotoCoreError as bce:
+            raise JobAttachmentS3BotoCoreError(
+                action="downloading packed file",
+                error_details=str(bce),
+            ) from bce
+
+    if len(data) != packed_object.size:
+        raise AssetSyncError(
+            f"Downloaded {len(data)} bytes from offset {packed_object.offset} of s3://{s3_bucket}/{s3_key} "
+            f"for {str(local_file_name)}, but expected {packed_object.size} bytes."
+        )
+
+    with open(local_file_name, "wb") as file_obj:
+        file_obj.write(data)
+
+    if progress_tracker and not progress_tracker.track_progress_callback(len(data)):
+        raise AssetSyncCancelledError("File download cancelled.")
+
+
 def _download_files_parallel(
     files: List[RelativeFilePath],
     hash_algorithm: HashAlgorithm,
@@ -559,17 +875,89 @@ def _download_files_parallel(
     file_mod_time: Optional[float] = None,
     progress_tracker: Optional[ProgressTracker] = None,
     file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    pack_index: Optional[PackIndex] = None,
+    concurrency_controller: Optional[AdaptiveConcurrencyController] = None,
+    download_cache: Optional[DownloadCache] = None,
 ) -> list[str]:
     """
-    Downloads files in parallel using thread pool.
+    Downloads files in parallel using thread pool, or on an event loop in this thread if the
+    asyncio transfer engine is configured.
+    If a `concurrency_controller` is given, `num_download_workers` is an upper bound, and the
+    controller decides how many files are downloaded at the same time.
+    If a `download_cache` is given, files are copied from it if they're cached.
+    With the thread pool, files of at least `RANGED_DOWNLOAD_MIN_SIZE` are downloaded in parts
+    with concurrent ranged requests, sharing the S3 connection pool with the other files as
+    planned by `_plan_download_workers`.
     Returns a list of local paths of downloaded files.
     """
     downloaded_file_names: list[str] = []
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=num_download_workers) as executor:
+    def record_downloaded_file(file_bytes: int, local_file_name: Optional[Path]) -> None:
+        if local_file_name:
+            downloaded_file_names.append(str(local_file_name.resolve()))
+            if progress_tracker:
+                progress_tracker.increase_processed(1, 0)
+                progress_tracker.report_progress()
+        else:
+            if progress_tracker:
+                progress_tracker.increase_skipped(1, file_bytes)
+                progress_tracker.report_progress()
+
+    if get_transfer_engine() == TransferEngine.ASYNCIO:
+        _download_files_asyncio(
+            files,
+            hash_algorithm,
+            local_download_dir,
+            s3_bucket,
+            cas_prefix,
+            session,
+            progress_tracker,
+            file_conflict_resolution,
+            pack_index,
+            on_file_downloaded=record_downloaded_file,
+            download_cache=download_cache,
+        )
+        # to report progress 100% at the end
+        if progress_tracker:
+            progress_tracker.report_progress()
+        return downloaded_file_names
+
+    def download_file_in_slot(*args: Any) -> Tuple[int, Optional[Path]]:
+        assert concurrency_controller is not None
+        with concurrency_controller.slot() as transfer_slot:
+            (file_bytes, local_file_name) = download_file(*args)
+            if local_file_name:
+                transfer_slot.transferred(file_bytes)
+        return (file_bytes, local_file_name)
+
+    watch_concurrency: ContextManager[Any] = nullcontext()
+    if concurrency_controller is not None:
+        watch_concurrency = concurrency_controller.watch(
+            s3_client or get_s3_client(session=session)
+        )
+
+    (num_download_workers, num_ranged_download_workers) = _plan_download_workers(
+        files, num_download_workers
+    )
+    num_ranged_files = sum(1 for file in files if file.size >= RANGED_DOWNLOAD_MIN_SIZE)
+
+    # The parts of large files are downloaded by their own workers. Each large file is downloaded
+    # by a worker that waits for its parts, so that large files don't hold up the workers of the
+    # other files. The executor of the parts is shut down last, as the others submit to it.
+    with watch_concurrency, concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, num_ranged_download_workers)
+    ) as ranged_download_executor, concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(num_ranged_files, num_ranged_download_workers))
+    ) as ranged_file_executor, concurrent.futures.ThreadPoolExecutor(
+        max_workers=num_download_workers
+    ) as executor:
         futures = {
-            executor.submit(
-                download_file,
+            (
+                ranged_file_executor
+                if num_ranged_download_workers > 0 and file.size >= RANGED_DOWNLOAD_MIN_SIZE
+                else executor
+            ).submit(
+                download_file if concurrency_controller is None else download_file_in_slot,
                 file,
                 hash_algorithm,
                 local_download_dir,
@@ -580,29 +968,114 @@ def _download_files_parallel(
                 file_mod_time,
                 progress_tracker,
                 file_conflict_resolution,
+                pack_index,
+                download_cache,
+                ranged_download_executor if num_ranged_download_workers > 0 else None,
             ): file
             for file in files
         }
         # surfaces any exceptions in the thread
         for future in concurrent.futures.as_completed(futures):
             (file_bytes, local_file_name) = future.result()
-            if local_file_name:
-                downloaded_file_names.append(str(local_file_name.resolve()))
-                if progress_tracker:
-                    progress_tracker.increase_processed(1, 0)
-                    progress_tracker.report_progress()
-            else:
-                if progress_tracker:
-                    progress_tracker.increase_skipped(1, file_bytes)
-                    progress_tracker.report_progress()
+            record_downloaded_file(file_bytes, local_file_name)
 
     # to report progress 100% at the end
     if progress_tracker:
+        if concurrency_controller is not None:
+            progress_tracker.concurrency = concurrency_controller.concurrency
         progress_tracker.report_progress()
 
     return downloaded_file_names
 
 
+def _download_files_asyncio(
+    files: List[RelativeFilePath],
+    hash_algorithm: HashAlgorithm,
+    local_download_dir: str,
+    s3_bucket: str,
+    cas_prefix: Optional[str],
+    session: Optional[boto3.Session] = None,
+    progress_tracker: Optional[ProgressTracker] = None,
+    file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    pack_index: Optional[PackIndex] = None,
+    on_file_downloaded: Optional[Callable[[int, Optional[Path]], None]] = None,
+    download_cache: Optional[DownloadCache] = None,
+) -> list[Tuple[int, Optional[Path]]]:
+    """
+    Downloads files in the same way as `download_file`, but with the asyncio transfer engine,
+    which runs all the requests on an event loop in this thread. `on_file_downloaded` is called
+    with the result of each file as soon as it is downloaded or skipped.
+    Returns a list of tuples of (size in bytes, filename), one per file.
+    """
+    if session is None:
+        session = get_boto3_session()
+
+    async def download_object(
+        transfer: AsyncS3Transfer, file: RelativeFilePath
+    ) -> Tuple[int, Optional[Path]]:
+        local_file_name = _get_local_file_name(file, local_download_dir, file_conflict_resolution)
+        if local_file_name is not None:
+            local_file_name.parent.mkdir(parents=True, exist_ok=True)
+
+            packed_object = pack_index.get(file.hash) if pack_index else None
+            is_cached = download_cache is not None and download_cache.get(
+                file.hash, hash_algorithm, file.size, local_file_name
+            )
+            if is_cached:
+                if progress_tracker and not progress_tracker.track_progress_callback(file.size):
+                    raise AssetSyncCancelledError("File download cancelled.")
+            elif packed_object is not None and packed_object.size == 0:
+                # An empty range can't be requested, and there's nothing to download.
+                local_file_name.write_bytes(b"")
+            elif packed_object is not None:
+                await transfer.download_file(
+                    s3_bucket,
+                    (
+                        _join_s3_paths(cas_prefix, packed_object.pack_name)
+                        if cas_prefix
+                        else packed_object.pack_name
+                    ),
+                    local_file_name,
+                    byte_range=f"bytes={packed_object.offset}-{packed_object.offset + packed_object.size - 1}",
+                    expected_size=packed_object.size,
+                )
+            else:
+                s3_key = (
+                    f"{cas_prefix}/{file.hash}.{hash_algorithm.value}"
+                    if cas_prefix
+                    else f"{file.hash}.{hash_algorithm.value}"
+                )
+                try:
+                    await transfer.download_file(s3_bucket, s3_key, local_file_name)
+                except JobAttachmentsS3ClientError as exc:
+                    # TODO: Temporary to prevent breaking backwards-compatibility; if file not found, try again without hash alg postfix
+                    if exc.status_code != 404:
+                        raise
+                    await transfer.download_file(
+                        s3_bucket, s3_key.rsplit(".", 1)[0], local_file_name
+                    )
+
+            if download_cache is not None and not is_cached:
+                download_cache.put(file.hash, hash_algorithm, local_file_name)
+            download_logger.debug(f"Downloaded {file.path} to {str(local_file_name)}")
+            # The modified time in the manifest is in microseconds, but utime requires the time be expressed in seconds.
+            modified_time = file.mtime / 1000000  # type: ignore[attr-defined]
+            os.utime(local_file_name, (modified_time, modified_time))
+
+        if on_file_downloaded:
+            on_file_downloaded(file.size, local_file_name)
+        return (file.size, local_file_name)
+
+    return run_transfers(
+        files,
+        download_object,
+        session,
+        get_s3_max_pool_connections(),
+        progress_tracker,
+        get_account_id(session=session),
+    )
+
+
 def download_files(
     files: list[RelativeFilePath],
     hash_algorithm: HashAlgorithm,
@@ -611,13 +1084,16 @@ def download_files(
     session: Optional[boto3.Session] = None,
     progress_tracker: Optional[ProgressTracker] = None,
     file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    pack_index: Optional[PackIndex] = None,
 ) -> list[str]:
     """
     Downloads all files from the S3 bucket in the Job Attachment settings to the specified directory.
+    Files whose hashes are in the given `pack_index` are downloaded from the packs that hold them.
     Returns a list of local paths of downloaded files.
     """
     s3_client = get_s3_client(session=session)
     num_download_workers = _get_num_download_workers()
+    concurrency_controller = _get_download_concurrency_controller(num_download_workers)
 
     file_mod_time: float = datetime.now().timestamp()
 
@@ -633,6 +1109,8 @@ def download_files(
         file_mod_time,
         progress_tracker,
         file_conflict_resolution,
+        pack_index,
+        concurrency_controller,
     )
 
 
@@ -671,10 +1149,162 @@ def _get_asset_root_from_s3(
     except Exception as e:
         raise AssetSyncError(e) from e
 
-    if "asset-root-json" in head["Metadata"]:
-        return json.loads(head["Metadata"]["asset-root-json"])
+    return _get_asset_root_from_metadata(head["Metadata"])
+
+
+def _get_asset_root_from_metadata(metadata: dict[str, str]) -> Optional[str]:
+    """
+    Gets asset root from the metadata of an output manifest.
+    If neither of the keys "asset-root-json" or "asset-root" exist in the metadata, returns None.
+    """
+    if "asset-root-json" in metadata:
+        return json.loads(metadata["asset-root-json"])
     else:
-        return head["Metadata"].get("asset-root", None)
+        return metadata.get("asset-root", None)
+
+
+def _get_output_manifest_and_asset_root_from_s3(
+    manifest_key: str, s3_bucket: str, session: Optional[boto3.Session] = None
+) -> Tuple[BaseAssetManifest, Optional[str]]:
+    """
+    Gets an output manifest and its asset root with a single get-object request, taking the
+    asset root from the metadata of the response instead of a separate head-object request.
+    If neither of the keys "asset-root-json" or "asset-root" exist in the metadata, the asset
+    root is None.
+    """
+    s3_client = get_s3_client(session=session)
+    try:
+        response = s3_client.get_object(
+            Bucket=s3_bucket,
+            Key=manifest_key,
+            ExpectedBucketOwner=get_account_id(session=session),
+        )
+        asset_manifest = decode_manifest_bytes(response["Body"].read())
+    except ClientError as exc:
+        status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+        status_code_guidance = {
+            **COMMON_ERROR_GUIDANCE_FOR_S3,
+            403: (
+                "Forbidden or Access denied. Please check your AWS credentials, and ensure that "
+                "your AWS IAM Role or User has the 's3:GetObject' permission for this bucket. "
+            ),
+            404: "Not found. Please check your bucket name and object key, and ensure that they exist in the AWS account.",
+        }
+        raise JobAttachmentsS3ClientError(
+            action="downloading output manifest",
+            status_code=status_code,
+            bucket_name=s3_bucket,
+            key_or_prefix=manifest_key,
+            message=f"{status_code_guidance.get(status_code, '')} {str(exc)}",
+        ) from exc
+    except BotoCoreError as bce:
+        raise JobAttachmentS3BotoCoreError(
+            action="downloading output manifest",
+            error_details=str(bce),
+        ) from bce
+    except Exception as e:
+        raise AssetSyncError(e) from e
+
+    return (asset_manifest, _get_asset_root_from_metadata(response.get("Metadata", {})))
+
+
+def _get_input_manifest_and_pack_index_name_from_s3(
+    manifest_key: str, s3_bucket: str, session: Optional[boto3.Session] = None
+) -> Tuple[BaseAssetManifest, Optional[str]]:
+    """
+    Gets an input manifest and the name of its pack index with a single get-object request,
+    taking the pack index name from the metadata of the response instead of a separate
+    head-object request. If the manifest's metadata doesn't have a pack index, its name is None.
+    """
+    s3_client = get_s3_client(session=session)
+    try:
+        response = s3_client.get_object(
+            Bucket=s3_bucket,
+            Key=manifest_key,
+            ExpectedBucketOwner=get_account_id(session=session),
+        )
+        asset_manifest = decode_manifest_bytes(response["Body"].read())
+    except ClientError as exc:
+        status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+        status_code_guidance = {
+            **COMMON_ERROR_GUIDANCE_FOR_S3,
+            403: (
+                (
+                    "Forbidden or Access denied. Please check your AWS credentials, and ensure that "
+                    "your AWS IAM Role or User has the 's3:GetObject' permission for this bucket. "
+                )
+                if "kms:" not in str(exc)
+                else (
+                    "Forbidden or Access denied. Please check your AWS credentials and Job Attachments S3 bucket "
+                    "encryption settings. If a customer-managed KMS key is set, confirm that your AWS IAM Role or "
+                    "User has the 'kms:Decrypt' and 'kms:DescribeKey' permissions for the key used to encrypt the bucket."
+                )
+            ),
+            404: "Not found. Please check your bucket name and object key, and ensure that they exist in the AWS account.",
+        }
+        raise JobAttachmentsS3ClientError(
+            action="downloading binary file",
+            status_code=status_code,
+            bucket_name=s3_bucket,
+            key_or_prefix=manifest_key,
+            message=f"{status_code_guidance.get(status_code, '')} {str(exc)}",
+        ) from exc
+    except BotoCoreError as bce:
+        raise JobAttachmentS3BotoCoreError(
+            action="downloading binary file",
+            error_details=str(bce),
+        ) from bce
+    except Exception as e:
+        raise AssetSyncError(e) from e
+
+    return (asset_manifest, response.get("Metadata", {}).get(PACK_INDEX_METADATA_KEY) or None)
+
+
+def get_pack_index_from_s3(
+    pack_index_name: str,
+    s3_bucket: str,
+    cas_prefix: str,
+    session: Optional[boto3.Session] = None,
+) -> PackIndex:
+    """
+    Gets the pack index with the given name, which is stored in the metadata of the manifest
+    whose files were packed when it was uploaded.
+    """
+    s3_client = get_s3_client(session=session)
+    pack_index_key = _join_s3_paths(cas_prefix, pack_index_name)
+    try:
+        response = s3_client.get_object(
+            Bucket=s3_bucket,
+            Key=pack_index_key,
+            ExpectedBucketOwner=get_account_id(session=session),
+        )
+        pack_index_bytes = response["Body"].read()
+    except ClientError as exc:
+        status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+        status_code_guidance = {
+            **COMMON_ERROR_GUIDANCE_FOR_S3,
+            403: (
+                "Forbidden or Access denied. Please check your AWS credentials, and ensure that "
+                "your AWS IAM Role or User has the 's3:GetObject' permission for this bucket. "
+            ),
+            404: "Not found. Please check your bucket name and object key, and ensure that they exist in the AWS account.",
+        }
+        raise JobAttachmentsS3ClientError(
+            action="downloading pack index",
+            status_code=status_code,
+            bucket_name=s3_bucket,
+            key_or_prefix=pack_index_key,
+            message=f"{status_code_guidance.get(status_code, '')} {str(exc)}",
+        ) from exc
+    except BotoCoreError as bce:
+        raise JobAttachmentS3BotoCoreError(
+            action="downloading pack index",
+            error_details=str(bce),
+        ) from bce
+    except Exception as e:
+        raise AssetSyncError(e) from e
+
+    return PackIndex.decode(pack_index_bytes.decode("utf-8"))
 
 
 def get_job_output_paths_by_asset_root(
@@ -731,18 +1361,36 @@ def get_output_manifests_by_asset_root(
     except JobAttachmentsError:
         return outputs
 
-    for key in manifests_keys:
-        asset_manifest = get_manifest_from_s3(
-            manifest_key=key,
-            s3_bucket=s3_settings.s3BucketName,
-            session=session,
-        )
-        asset_root = _get_asset_root_from_s3(key, s3_settings.s3BucketName, session)
-        if not asset_root:
-            raise MissingAssetRootError(
-                f"Failed to get asset root from metadata of output manifest: {key}"
+    if not manifests_keys:
+        return outputs
+
+    # Fetch and decode the manifests concurrently, since a job can have thousands of them.
+    # The results are consumed in the order of the keys, so the lists of manifests for each
+    # asset root are in the same order as if they had been fetched one at a time.
+    max_workers = min(len(manifests_keys), get_s3_max_pool_connections())
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _get_output_manifest_and_asset_root_from_s3,
+                key,
+                s3_settings.s3BucketName,
+                session,
             )
-        outputs[asset_root].append(asset_manifest)
+            for key in manifests_keys
+        ]
+        try:
+            for key, future in zip(manifests_keys, futures):
+                (asset_manifest, asset_root) = future.result()
+                if not asset_root:
+                    raise MissingAssetRootError(
+                        f"Failed to get asset root from metadata of output manifest: {key}"
+                    )
+                outputs[asset_root].append(asset_manifest)
+        except BaseException:
+            # Don't fetch the rest of the manifests if one of them failed.
+            for future in futures:
+                future.cancel()
+            raise
 
     return outputs
 
@@ -755,6 +1403,8 @@ def download_files_from_manifests(
     session: Optional[boto3.Session] = None,
     on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
     logger: Optional[Union[Logger, LoggerAdapter]] = None,
+    pack_index: Optional[PackIndex] = None,
+    file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
 ) -> DownloadSummaryStatistics:
     """
     Given manifests, downloads all files from a CAS in each manifest.
@@ -766,12 +1416,15 @@ def download_files_from_manifests(
         session: The boto3 session to use.
         on_downloading_files: a callback to be called to periodically report progress to the caller.
             The callback returns True if the operation should continue as normal, or False to cancel.
+        pack_index: The pack index of the packed files in the manifests, if any.
+        file_conflict_resolution: How to resolve a conflict with a file that already exists locally.
 
     Returns:
         The download summary statistics.
     """
     s3_client = get_s3_client(session=session)
     num_download_workers = _get_num_download_workers()
+    concurrency_controller = _get_download_concurrency_controller(num_download_workers)
     file_mod_time = datetime.now().timestamp()
 
     # Sets up progress tracker to report download progress back to the caller.
@@ -787,35 +1440,52 @@ def download_files_from_manifests(
         on_progress_callback=on_downloading_files,
         logger=logger,
     )
+    download_cache = _get_download_cache(s3_bucket, cas_prefix)
     start_time = time.perf_counter()
 
     downloaded_files_paths_by_root: DefaultDict[str, list[str]] = DefaultDict(list)
 
-    for local_download_dir, manifest in manifests_by_root.items():
-        downloaded_files_paths = _download_files_parallel(
-            manifest.paths,
-            manifest.hashAlg,
-            num_download_workers,
-            local_download_dir,
-            s3_bucket,
-            cas_prefix,
-            s3_client,
-            session,
-            file_mod_time,
-            progress_tracker=progress_tracker,
-        )
-
-        if fs_permission_settings is not None:
-            _set_fs_group(
-                file_paths=downloaded_files_paths,
-                local_root=local_download_dir,
-                fs_permission_settings=fs_permission_settings,
+    try:
+        for local_download_dir, manifest in manifests_by_root.items():
+            downloaded_files_paths = _download_files_parallel(
+                manifest.paths,
+                manifest.hashAlg,
+                num_download_workers,
+                local_download_dir,
+                s3_bucket,
+                cas_prefix,
+                s3_client,
+                session,
+                file_mod_time,
+                progress_tracker=progress_tracker,
+                file_conflict_resolution=file_conflict_resolution,
+                pack_index=pack_index,
+                concurrency_controller=concurrency_controller,
+                download_cache=download_cache,
             )
 
-        downloaded_files_paths_by_root[local_download_dir].extend(downloaded_files_paths)
+            if fs_permission_settings is not None:
+                _set_fs_group(
+                    file_paths=downloaded_files_paths,
+                    local_root=local_download_dir,
+                    fs_permission_settings=fs_permission_settings,
+                )
+
+            downloaded_files_paths_by_root[local_download_dir].extend(downloaded_files_paths)
+    finally:
+        if download_cache is not None:
+            # Keep the cache within its size limit, even if the download failed part way.
+            download_cache.evict()
 
     progress_tracker.total_time = time.perf_counter() - start_time
-    return progress_tracker.get_download_summary_statistics(downloaded_files_paths_by_root)
+    summary_statistics = progress_tracker.get_download_summary_statistics(
+        downloaded_files_paths_by_root
+    )
+    if download_cache is not None:
+        summary_statistics.cache_hits = download_cache.hits
+        summary_statistics.cache_misses = download_cache.misses
+        summary_statistics.cache_bytes_saved = download_cache.bytes_saved
+    return summary_statistics
 
 
 def _get_num_download_workers() -> int:
@@ -831,6 +1501,59 @@ def _get_num_download_workers() -> int:
     return num_download_workers
 
 
+def _plan_download_workers(
+    files: List[RelativeFilePath], num_download_workers: int
+) -> Tuple[int, int]:
+    """
+    Plans how the S3 connection pool is shared between downloading whole files, and downloading
+    the parts of large files (of at least `RANGED_DOWNLOAD_MIN_SIZE`) with ranged requests.
+    If there are both, each gets half of the pool, so that neither starves the other. If all the
+    files are large, their parts get the whole pool.
+    Returns a tuple of (1) the number of workers that download whole files, up to the given
+    `num_download_workers`, and (2) the number of workers that download parts, which is 0 if
+    there are no large files.
+    """
+    num_ranged_files = sum(1 for file in files if file.size >= RANGED_DOWNLOAD_MIN_SIZE)
+    if num_ranged_files == 0:
+        return (num_download_workers, 0)
+    max_pool_connections = get_s3_max_pool_connections()
+    if num_ranged_files == len(files):
+        return (num_download_workers, max_pool_connections)
+    num_ranged_download_workers = max(1, max_pool_connections // 2)
+    num_download_workers = min(
+        num_download_workers,
+        max(
+            1,
+            (max_pool_connections - num_ranged_download_workers) // S3_DOWNLOAD_MAX_CONCURRENCY,
+        ),
+    )
+    return (num_download_workers, num_ranged_download_workers)
+
+
+def _get_download_concurrency_controller(
+    num_download_workers: int,
+) -> Optional[AdaptiveConcurrencyController]:
+    """
+    Returns a controller that adjusts the number of concurrent downloads at runtime, up to the
+    given number of download workers, if adaptive concurrency is enabled. Otherwise, returns None.
+    """
+    if not get_adaptive_concurrency():
+        return None
+    return AdaptiveConcurrencyController(num_download_workers)
+
+
+def _get_download_cache(s3_bucket: str, cas_prefix: Optional[str]) -> Optional[DownloadCache]:
+    """
+    Returns the local cache of the files downloaded from the given CAS by the sessions on this
+    host, if the download cache is enabled. Otherwise, returns None.
+    """
+    download_cache_settings = get_download_cache_settings()
+    if download_cache_settings is None:
+        return None
+    (cache_dir, max_size_bytes) = download_cache_settings
+    return DownloadCache(cache_dir, max_size_bytes, s3_bucket, cas_prefix)
+
+
 def _set_fs_group(
     file_paths: list[str],
     local_root: str,
@@ -869,6 +1592,9 @@ def merge_asset_manifests(manifests: list[BaseAssetManifest]) -> BaseAssetManife
     is unique by keeping the one from the last encountered manifest. (Thus, the steps'
     outputs are downloaded over the input job attachments.)
 
+    The paths are merged in canonical order with a k-way merge of the manifests' sorted paths,
+    so the merged manifest holds one reference per unique path and nothing else is built.
+
     Args:
         manifests (list[AssetManifest]): A list of manifests to be merged.
 
@@ -885,38 +1611,76 @@ def merge_asset_manifests(manifests: list[BaseAssetManifest]) -> BaseAssetManife
 
     first_manifest = manifests[0]
 
-    hash_alg: HashAlgorithm = first_manifest.hashAlg
-    merged_paths: dict[str, RelativeFilePath] = dict()
+    merged_paths: list[RelativeFilePath] = []
     total_size: int = 0
+    for path in _iter_merged_manifest_paths(manifests):
+        merged_paths.append(path)
+        total_size += path.size
 
-    # Loop each manifest
+    manifest_args: dict[str, Any] = {
+        "hash_alg": first_manifest.hashAlg,
+        "paths": merged_paths,
+        "total_size": total_size,
+    }
+
+    output_manifest: BaseAssetManifest = first_manifest.__class__(**manifest_args)
+
+    return output_manifest
+
+
+def _iter_merged_manifest_paths(manifests: list[BaseAssetManifest]) -> Iterator[RelativeFilePath]:
+    """
+    Yields the paths of the manifests in canonical order, merged with a k-way merge of each
+    manifest's sorted paths. When a path is in more than one manifest, only the one from the last
+    of those manifests is yielded.
+
+    Raises:
+        NotImplementedError: When two manifests have different hash algorithms.
+    """
+    hash_alg: HashAlgorithm = manifests[0].hashAlg
     for manifest in manifests:
         if manifest.hashAlg != hash_alg:
             raise NotImplementedError(
                 f"Merging manifests with different hash algorithms is not supported.  {manifest.hashAlg.value} does not match {hash_alg.value}"
             )
 
-        for path in manifest.paths:
-            merged_paths[path.path] = path
+    # The merge is stable, so the paths that are equal are yielded in the order of their manifests.
+    previous_path: Optional[RelativeFilePath] = None
+    for path in heapq.merge(
+        *(_get_sorted_manifest_paths(manifest) for manifest in manifests),
+        key=canonical_path_comparator,
+    ):
+        if previous_path is not None and previous_path.path != path.path:
+            yield previous_path
+        previous_path = path
+    if previous_path is not None:
+        yield previous_path
 
-    manifest_args: dict[str, Any] = {
-        "hash_alg": hash_alg,
-        "paths": list(merged_paths.values()),
-    }
-
-    total_size = sum([path.size for path in merged_paths.values()])  # type: ignore
-    manifest_args["total_size"] = total_size
-
-    output_manifest: BaseAssetManifest = first_manifest.__class__(**manifest_args)
 
-    return output_manifest
+def _get_sorted_manifest_paths(manifest: BaseAssetManifest) -> list[RelativeFilePath]:
+    """
+    Returns the paths of the manifest in canonical order. Manifests decoded from their canonical
+    JSON are already in this order, so their list of paths is returned as is.
+    """
+    previous_key: Optional[bytes] = None
+    for path in manifest.paths:
+        key = canonical_path_comparator(path)
+        if previous_key is not None and key < previous_key:
+            return sorted(manifest.paths, key=canonical_path_comparator)
+        previous_key = key
+    return manifest.paths
 
 
 def _write_manifest_to_temp_file(manifest: BaseAssetManifest, dir: Path) -> str:
+    """
+    Writes the manifest to a temporary file in the directory, in the same canonical JSON as its
+    `encode`, one path at a time, so that the JSON of the manifest isn't built in memory. Returns
+    the name of the file.
+    """
     with NamedTemporaryFile(
         suffix=".json", prefix="deadline-merged-manifest-", delete=False, mode="w", dir=dir
     ) as file:
-        file.write(manifest.encode())
+        write_manifest_canonical_json(manifest, file, _get_sorted_manifest_paths(manifest))
         return file.name
 
 
@@ -928,8 +1692,8 @@ def _read_manifest_file(input_manifest_path: Path):
     Returns:
         BaseAssetManifest : Single decoded manifest
     """
-    with open(input_manifest_path) as input_manifest_file:
-        return decode_manifest(input_manifest_file.read())
+    with open(input_manifest_path, "rb") as input_manifest_file:
+        return decode_manifest_bytes(input_manifest_file.read())
 
 
 def handle_existing_vfs(
@@ -9,7 +9,7 @@ import sys
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 from urllib.parse import urlparse
 
 from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data
@@ -23,6 +23,7 @@ from deadline.job_attachments.exceptions import (
     MalformedAttachmentSettingError,
 )
 
+from ._scan import ScannedFile
 from ._utils import (
     _generate_random_guid,
     _join_s3_paths,
@@ -52,6 +53,9 @@ class AssetRootGroup:
     inputs: Set[Path] = field(default_factory=set)
     outputs: Set[Path] = field(default_factory=set)
     references: Set[Path] = field(default_factory=set)
+    # The stats of the inputs that were found by scanning their directories, so that they don't
+    # need to be stat-ed again.
+    scanned_inputs: Dict[Path, ScannedFile] = field(default_factory=dict, compare=False, repr=False)
 
 
 @dataclass
@@ -364,6 +368,32 @@ class FileConflictResolution(Enum):
     CREATE_COPY = 3
 
 
+class HashingEngine(str, Enum):
+    """
+    How input files are hashed when creating an asset manifest.
+
+    THREAD - Hash files on a thread pool in the current process.
+    PROCESS - Hash files on a process pool, batching small files together so that hashing
+              is not limited by the GIL on hosts with many cores.
+    """
+
+    THREAD = "THREAD"
+    PROCESS = "PROCESS"
+
+
+class TransferEngine(str, Enum):
+    """
+    How job attachment files are transferred to and from S3.
+
+    THREAD - Transfer files on thread pools, with the S3 transfer manager.
+    ASYNCIO - Transfer files on an asyncio event loop in a single thread, multiplexing the requests
+              over a bounded pool of connections. Requires the optional aiobotocore dependency.
+    """
+
+    THREAD = "THREAD"
+    ASYNCIO = "ASYNCIO"
+
+
 def default_glob_all() -> List[str]:
     return ["**/*"]
 
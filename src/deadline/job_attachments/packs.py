@@ -0,0 +1,145 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Classes for the packed layout of the content-addressable storage (CAS).
+
+In the packed layout, small objects are not stored as one S3 object each. Instead, their contents
+are appended into larger pack objects, and a pack index maps the hash of each packed object to the
+pack and byte range that holds it. Packs and pack indexes are themselves content-addressed, and
+are stored under the "packs" folder of the CAS prefix. A manifest whose files were packed refers
+to its pack index through the manifest's S3 object metadata.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+from .asset_manifests import HashAlgorithm, hash_data
+from .exceptions import JobAttachmentsError
+
+# The version of the pack index format. Readers reject indexes with any other version, so that a
+# change to the format can never be misread as a byte range of the wrong object.
+PACK_INDEX_VERSION: str = "2024-06-01"
+# The folder under the CAS prefix that holds the packs and pack indexes.
+PACKS_FOLDER_NAME: str = "packs"
+# The key of the manifest's S3 object metadata that holds the name of its pack index.
+PACK_INDEX_METADATA_KEY: str = "pack-index"
+# Only objects of at most this size are packed. Larger objects are cheap enough to upload and
+# download on their own.
+PACK_MAX_OBJECT_SIZE: int = 64 * 1024  # 64 KB
+# Objects are appended into a pack until it reaches this size, and then a new pack is started.
+PACK_TARGET_SIZE: int = 8 * 1024 * 1024  # 8 MB
+
+
+@dataclass(frozen=True)
+class PackedObject:
+    """The location of a packed object's contents: a byte range of a pack."""
+
+    pack_name: str
+    """The name of the pack, relative to the CAS prefix"""
+    offset: int
+    size: int
+
+
+class PackIndex:
+    """
+    Maps the hashes of packed objects to their locations in packs.
+    """
+
+    def __init__(
+        self,
+        hash_alg: HashAlgorithm,
+        objects: Optional[Dict[str, PackedObject]] = None,
+    ) -> None:
+        self.hash_alg = hash_alg
+        self._objects: Dict[str, PackedObject] = dict(objects) if objects else {}
+
+    def __contains__(self, file_hash: object) -> bool:
+        return file_hash in self._objects
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._objects)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackIndex):
+            return NotImplemented
+        return self.hash_alg == other.hash_alg and self._objects == other._objects
+
+    def get(self, file_hash: str) -> Optional[PackedObject]:
+        return self._objects.get(file_hash)
+
+    def add(self, file_hash: str, packed_object: PackedObject) -> None:
+        self._objects[file_hash] = packed_object
+
+    def update(self, other: PackIndex) -> None:
+        """
+        Adds all the objects of the other pack index to this one. An object that is in both
+        indexes has the same contents in both, so either location can be used.
+        """
+        if other.hash_alg != self.hash_alg:
+            raise JobAttachmentsError(
+                f"Cannot merge a pack index with hash algorithm {other.hash_alg.value} "
+                f"into a pack index with hash algorithm {self.hash_alg.value}."
+            )
+        self._objects.update(other._objects)
+
+    def encode(self) -> str:
+        """
+        Returns the canonical JSON representation of the pack index. Objects are grouped by pack
+        as [hash, offset, size] lists, sorted so that the same index always encodes the same way.
+        """
+        packs: Dict[str, list] = {}
+        for file_hash, packed_object in self._objects.items():
+            packs.setdefault(packed_object.pack_name, []).append(
+                [file_hash, packed_object.offset, packed_object.size]
+            )
+        for entries in packs.values():
+            entries.sort(key=lambda entry: entry[1])
+        return json.dumps(
+            {
+                "hashAlg": self.hash_alg.value,
+                "packIndexVersion": PACK_INDEX_VERSION,
+                "packs": packs,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+    def get_name(self) -> str:
+        """
+        Returns the content-addressed name of the encoded pack index, relative to the CAS prefix.
+        """
+        index_hash = hash_data(self.encode().encode("utf-8"), self.hash_alg)
+        return f"{PACKS_FOLDER_NAME}/{index_hash}.index"
+
+    @classmethod
+    def decode(cls, index: str) -> PackIndex:
+        """
+        Returns a pack index from its JSON representation.
+        Raises JobAttachmentsError if the index is malformed or has an unknown version.
+        """
+        try:
+            document: Dict[str, Any] = json.loads(index)
+        except json.JSONDecodeError as jde:
+            raise JobAttachmentsError(f"The pack index is not valid JSON: {jde}") from jde
+
+        version = document.get("packIndexVersion") if isinstance(document, dict) else None
+        if version != PACK_INDEX_VERSION:
+            raise JobAttachmentsError(
+                f"Unsupported pack index version {version!r}. "
+                f"The supported version is {PACK_INDEX_VERSION!r}."
+            )
+
+        try:
+            pack_index = cls(HashAlgorithm(document["hashAlg"]))
+            for pack_name, entries in document["packs"].items():
+                for file_hash, offset, size in entries:
+                    pack_index.add(file_hash, PackedObject(pack_name, int(offset), int(size)))
+        except (KeyError, TypeError, ValueError) as e:
+            raise JobAttachmentsError(f"The pack index is malformed: {e!r}") from e
+
+        return pack_index
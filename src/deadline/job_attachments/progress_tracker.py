@@ -28,6 +28,8 @@ class SummaryStatistics:
     skipped by the hash cache.
     - if this statistics is for uploading operation: the number of files that have already
     been uploaded to S3 bucket and thus skipped uploading.
+    The `concurrency` is the number of concurrent transfers that adaptive concurrency control
+    settled on, or 0 if the concurrency was not adjusted at runtime.
     """
 
     total_time: float = 0.0  # time (in fractional seconds) taken to perform hashing or uploading
@@ -38,6 +40,7 @@ class SummaryStatistics:
     skipped_files: int = 0
     skipped_bytes: int = 0
     transfer_rate: float = 0.0  # bytes/second
+    concurrency: int = 0
 
     def aggregate(self, other: SummaryStatistics) -> SummaryStatistics:
         """
@@ -53,6 +56,7 @@ class SummaryStatistics:
         self.skipped_files += other.skipped_files
         self.skipped_bytes += other.skipped_bytes
         self.transfer_rate = self.processed_bytes / self.total_time if self.total_time else 0.0
+        self.concurrency = max(self.concurrency, other.concurrency)
 
         return self
 
@@ -64,6 +68,11 @@ class SummaryStatistics:
             + f" {_human_readable_file_size(self.skipped_bytes)}.\n"
             + f"Total processing time of {round(self.total_time, ndigits=5)} seconds"
             + f" at {_human_readable_file_size(int(self.transfer_rate))}/s.\n"
+            + (
+                f"Adjusted concurrency to {self.concurrency} transfers.\n"
+                if self.concurrency
+                else ""
+            )
         )
 
 
@@ -72,10 +81,14 @@ class DownloadSummaryStatistics(SummaryStatistics):
     """
     A summary statistics metadata to be returned to the client when the downloading files has
     completed. In addition to the general statistics, includes a dict mapping download locations
-    to the number of downloaded files in each of those locations.
+    to the number of downloaded files in each of those locations, and the number of files that
+    were (or were not) copied from the local download cache, if it is enabled.
     """
 
     file_counts_by_root_directory: Dict[str, int] = field(default_factory=dict)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_bytes_saved: int = 0
 
     def aggregate(self, other: SummaryStatistics) -> SummaryStatistics:
         """
@@ -91,15 +104,37 @@ class DownloadSummaryStatistics(SummaryStatistics):
                 Counter(self.file_counts_by_root_directory)
                 + Counter(other.file_counts_by_root_directory)
             )
+        if isinstance(other, DownloadSummaryStatistics):
+            self.cache_hits += other.cache_hits
+            self.cache_misses += other.cache_misses
+            self.cache_bytes_saved += other.cache_bytes_saved
 
         return self
 
+    def get_download_cache_message(self) -> str:
+        """
+        Returns a message about the files copied from the download cache, or an empty string if
+        the download cache wasn't used.
+        """
+        if not self.cache_hits and not self.cache_misses:
+            return ""
+        return (
+            f"Copied {self.cache_hits} of {self.cache_hits + self.cache_misses} files"
+            f" totaling {_human_readable_file_size(self.cache_bytes_saved)} from the download cache.\n"
+        )
+
+    def __str__(self):
+        return super().__str__() + self.get_download_cache_message()
+
     def convert_to_summary_statistics(self) -> SummaryStatistics:
         """
         Converts this DownloadSummaryStatistics to a SummaryStatistics.
         """
         download_summary_statistics_dict = asdict(self)
         del download_summary_statistics_dict["file_counts_by_root_directory"]
+        del download_summary_statistics_dict["cache_hits"]
+        del download_summary_statistics_dict["cache_misses"]
+        del download_summary_statistics_dict["cache_bytes_saved"]
         return SummaryStatistics(**download_summary_statistics_dict)
 
 
@@ -191,6 +226,8 @@ class ProgressTracker:
         self.skipped_files = 0
         self.skipped_bytes = 0
         self.total_time = 0.0  # total time (in fractional seconds) taken for the process
+        # the number of concurrent transfers chosen by adaptive concurrency control, if used
+        self.concurrency = 0
 
         self._lock = Lock()
 
@@ -333,6 +370,7 @@ class ProgressTracker:
             skipped_files=self.skipped_files,
             skipped_bytes=self.skipped_bytes,
             transfer_rate=transfer_rate,
+            concurrency=self.concurrency,
         )
 
     def get_download_summary_statistics(
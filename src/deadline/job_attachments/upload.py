@@ -6,11 +6,16 @@ Classes for handling uploading of assets.
 from __future__ import annotations
 
 import concurrent.futures
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 import errno
+import functools
+import gzip
 import logging
 import os
+import queue
+import stat
 import sys
+import threading
 import time
 from datetime import datetime
 from io import BufferedReader, BytesIO
@@ -19,7 +24,7 @@ from pathlib import Path, PurePath
 from typing import Any, Callable, Generator, Optional, Tuple, Type, Union
 
 import boto3
-from boto3.s3.transfer import ProgressCallbackInvoker
+from boto3.s3.transfer import ProgressCallbackInvoker, TransferManager
 from botocore.exceptions import BotoCoreError, ClientError
 
 from deadline.client.config import config_file
@@ -30,15 +35,19 @@ from .asset_manifests import (
     HashAlgorithm,
     hash_data,
     hash_file,
+    hash_files,
     ManifestModelRegistry,
     ManifestVersion,
     base_manifest,
 )
+from .asset_manifests.decode import MANIFEST_CONTENT_ENCODING
 from ._aws.aws_clients import (
     get_account_id,
+    get_adaptive_concurrency,
     get_boto3_session,
     get_s3_client,
     get_s3_transfer_manager,
+    get_transfer_engine,
 )
 from .exceptions import (
     COMMON_ERROR_GUIDANCE_FOR_S3,
@@ -51,6 +60,9 @@ from .exceptions import (
     MissingS3BucketError,
     MissingS3RootPrefixError,
 )
+from ._async_transfer import AsyncS3Transfer, run_in_thread, run_transfers
+from ._concurrency import AdaptiveConcurrencyController
+from ._scan import ScannedFile
 from .caches import HashCache, HashCacheEntry, S3CheckCache, S3CheckCacheEntry
 from .models import (
     AssetRootGroup,
@@ -59,10 +71,21 @@ from .models import (
     Attachments,
     FileStatus,
     FileSystemLocationType,
+    HashingEngine,
     JobAttachmentS3Settings,
     ManifestProperties,
+    OutputFile,
     PathFormat,
     StorageProfile,
+    TransferEngine,
+)
+from .packs import (
+    PACK_INDEX_METADATA_KEY,
+    PACK_MAX_OBJECT_SIZE,
+    PACK_TARGET_SIZE,
+    PACKS_FOLDER_NAME,
+    PackedObject,
+    PackIndex,
 )
 from .progress_tracker import (
     ProgressStatus,
@@ -82,6 +105,24 @@ S3_MULTIPART_UPLOAD_CHUNK_SIZE: int = 8388608  # 8 MB
 # The maximum number of concurrency for multipart uploads. This is used to determine the max number
 # of thread workers for uploading multiple small files in parallel.
 S3_UPLOAD_MAX_CONCURRENCY: int = 10
+# When hashing with the process engine, small files are grouped into batches of at most this many
+# bytes or files, so that each task sent to the process pool does enough work to be worth the
+# inter-process overhead. Files at least this large are hashed as their own task.
+HASHING_BATCH_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MB
+HASHING_BATCH_MAX_FILES: int = 512
+# ProcessPoolExecutor on Windows does not support more than 61 workers.
+HASHING_MAX_PROCESSES_WINDOWS: int = 61
+# A list-objects request returns up to 1000 keys, so checking whether many objects exist in the CAS
+# prefix is usually cheaper by listing than with a head-object request per object. A list request
+# is counted as costing this many head-object requests, which gives the budget of list requests to
+# spend on the objects to check before falling back to head-object requests.
+S3_LIST_OBJECTS_COST_IN_HEAD_REQUESTS: int = 10
+# The number of leading characters of the hash used to split the CAS prefix into shards, so that
+# only the shards that the manifest touches are listed, in parallel.
+S3_CAS_LIST_SHARD_PREFIX_LENGTH: int = 2
+# When hashing and uploading are pipelined, hashed files wait in a queue of at most this many files
+# per upload worker. When the uploads fall behind, hashing waits for the queue to have space.
+UPLOAD_PIPELINE_QUEUE_SIZE_PER_WORKER: int = 100
 
 
 class S3AssetUploader:
@@ -119,14 +160,57 @@ class S3AssetUploader:
             if self.num_upload_workers <= 0:
                 # This can result in triggering "Connection pool is full" warning messages during uploads.
                 self.num_upload_workers = 1
+            # The asyncio transfer engine makes one request per connection at a time, so it can have
+            # as many requests in flight as there are connections in the pool.
+            self.max_async_requests = max(1, s3_max_pool_connections)
+
+            # Large files are uploaded several at a time, within a budget of bytes and parts in flight.
+            large_file_max_in_flight_mb = int(
+                config_file.get_setting("settings.large_file_upload_max_in_flight_mb")
+            )
+            self.large_file_max_bytes_in_flight = large_file_max_in_flight_mb * 1024 * 1024
+            large_file_max_parts_in_flight = int(
+                config_file.get_setting("settings.large_file_upload_max_parts_in_flight")
+            )
+            self.large_file_max_parts_in_flight = max(
+                1, min(large_file_max_parts_in_flight, s3_max_pool_connections)
+            )
         except ValueError as ve:
             raise AssetSyncError(
                 "Failed to parse configuration settings. Please ensure that the following settings in the config file are integers: "
-                "'s3_max_pool_connections', 'small_file_threshold_multiplier'"
+                "'s3_max_pool_connections', 'small_file_threshold_multiplier', "
+                "'large_file_upload_max_in_flight_mb', 'large_file_upload_max_parts_in_flight'"
+            ) from ve
+
+        pack_small_files_setting = config_file.get_setting("settings.pack_small_files")
+        try:
+            self.pack_small_files = config_file.str2bool(pack_small_files_setting)
+        except ValueError as ve:
+            raise AssetSyncError(
+                "Nonvalid value for configuration setting: "
+                f"'pack_small_files' ({pack_small_files_setting}) must be true or false."
+            ) from ve
+
+        compress_manifests_setting = config_file.get_setting("settings.compress_manifests")
+        try:
+            self.compress_manifests = config_file.str2bool(compress_manifests_setting)
+        except ValueError as ve:
+            raise AssetSyncError(
+                "Nonvalid value for configuration setting: "
+                f"'compress_manifests' ({compress_manifests_setting}) must be true or false."
             ) from ve
 
+        self.transfer_engine: TransferEngine = get_transfer_engine()
+
         self._s3 = get_s3_client(self._session)  # pylint: disable=invalid-name
 
+        # With adaptive concurrency, the number of upload workers is an upper bound, and the
+        # controller decides how many small files are uploaded at the same time. The controller is
+        # kept for the lifetime of the uploader, so that what it learns carries over between uploads.
+        self.concurrency_controller: Optional[AdaptiveConcurrencyController] = None
+        if get_adaptive_concurrency():
+            self.concurrency_controller = AdaptiveConcurrencyController(self.num_upload_workers)
+
         # Confirm that the settings values are all positive.
         error_msg = ""
         if small_file_threshold_multiplier <= 0:
@@ -135,6 +219,10 @@ class S3AssetUploader:
             error_msg = (
                 f"'s3_max_pool_connections' ({s3_max_pool_connections}) must be positive integer."
             )
+        elif large_file_max_in_flight_mb <= 0:
+            error_msg = f"'large_file_upload_max_in_flight_mb' ({large_file_max_in_flight_mb}) must be positive integer."
+        elif large_file_max_parts_in_flight <= 0:
+            error_msg = f"'large_file_upload_max_parts_in_flight' ({large_file_max_parts_in_flight}) must be positive integer."
         if error_msg:
             raise AssetSyncError("Nonvalid value for configuration setting: " + error_msg)
 
@@ -173,7 +261,55 @@ class S3AssetUploader:
             A tuple of (the partial key for the manifest on S3, the hash of input manifest).
         """
 
-        # Upload asset manifest
+        # Upload assets
+        # Packed files can only be found through the pack index referenced by the uploaded
+        # manifest, so files are only packed when the manifest is uploaded.
+        pack_index = self.upload_input_files(
+            manifest=manifest,
+            s3_bucket=job_attachment_settings.s3BucketName,
+            source_root=asset_root if asset_root else source_root,
+            s3_cas_prefix=job_attachment_settings.full_cas_prefix(),
+            progress_tracker=progress_tracker,
+            s3_check_cache_dir=s3_check_cache_dir,
+            pack_small_files=self.pack_small_files and bool(partial_manifest_prefix),
+        )
+
+        # Upload asset manifest, after the assets so that every object it refers to exists.
+        return self.upload_manifest(
+            job_attachment_settings=job_attachment_settings,
+            manifest=manifest,
+            source_root=source_root,
+            partial_manifest_prefix=partial_manifest_prefix,
+            file_system_location_name=file_system_location_name,
+            manifest_write_dir=manifest_write_dir,
+            manifest_name_suffix=manifest_name_suffix,
+            manifest_metadata=manifest_metadata,
+            manifest_file_name=manifest_file_name,
+            pack_index=pack_index,
+        )
+
+    def upload_manifest(
+        self,
+        job_attachment_settings: JobAttachmentS3Settings,
+        manifest: BaseAssetManifest,
+        source_root: Path,
+        partial_manifest_prefix: Optional[str] = None,
+        file_system_location_name: Optional[str] = None,
+        manifest_write_dir: Optional[str] = None,
+        manifest_name_suffix: str = "input",
+        manifest_metadata: dict[str, dict[str, str]] = dict(),
+        manifest_file_name: Optional[str] = None,
+        pack_index: Optional[PackIndex] = None,
+    ) -> tuple[str, str]:
+        """
+        Uploads an asset manifest whose assets have been uploaded, and writes it locally if
+        `manifest_write_dir` is given. The manifest is only uploaded if `partial_manifest_prefix`
+        is given. If `pack_index` is given and not empty, it is uploaded too, and referenced in
+        the manifest's metadata. See `upload_assets` for the other arguments.
+
+        Returns:
+            A tuple of (the partial key for the manifest on S3, the hash of input manifest).
+        """
         (hash_alg, manifest_bytes, manifest_name) = S3AssetUploader._gather_upload_metadata(
             manifest=manifest,
             source_root=source_root,
@@ -200,25 +336,53 @@ class S3AssetUploader:
             )
 
         if partial_manifest_prefix:
-            self.upload_bytes_to_s3(
-                bytes=BytesIO(manifest_bytes),
+            if pack_index:
+                pack_index_name = pack_index.get_name()
+                self.upload_bytes_to_s3(
+                    bytes=BytesIO(pack_index.encode().encode("utf-8")),
+                    bucket=job_attachment_settings.s3BucketName,
+                    key=_join_s3_paths(job_attachment_settings.full_cas_prefix(), pack_index_name),
+                )
+                manifest_metadata = {
+                    **manifest_metadata,
+                    "Metadata": {
+                        **manifest_metadata.get("Metadata", {}),
+                        PACK_INDEX_METADATA_KEY: pack_index_name,
+                    },
+                }
+
+            self.upload_manifest_bytes_to_s3(
+                manifest_bytes=manifest_bytes,
                 bucket=job_attachment_settings.s3BucketName,
                 key=full_manifest_key,
                 extra_args=manifest_metadata,
             )
 
-        # Upload assets
-        self.upload_input_files(
-            manifest=manifest,
-            s3_bucket=job_attachment_settings.s3BucketName,
-            source_root=asset_root if asset_root else source_root,
-            s3_cas_prefix=job_attachment_settings.full_cas_prefix(),
-            progress_tracker=progress_tracker,
-            s3_check_cache_dir=s3_check_cache_dir,
-        )
-
         return (partial_manifest_key, hash_data(manifest_bytes, hash_alg))
 
+    def upload_manifest_bytes_to_s3(
+        self,
+        manifest_bytes: bytes,
+        bucket: str,
+        key: str,
+        extra_args: dict[str, Any] = dict(),
+    ) -> None:
+        """
+        Uploads the canonical JSON of a manifest. If `compress_manifests` is set, the manifest is
+        gzip-compressed, and the object's content encoding is set to mark it as compressed.
+        The manifest's hash is always the hash of its canonical JSON, whether compressed or not.
+        """
+        if self.compress_manifests:
+            # The mtime is fixed, so that the same manifest is always compressed to the same bytes.
+            manifest_bytes = gzip.compress(manifest_bytes, mtime=0)
+            extra_args = {**extra_args, "ContentEncoding": MANIFEST_CONTENT_ENCODING}
+        self.upload_bytes_to_s3(
+            bytes=BytesIO(manifest_bytes),
+            bucket=bucket,
+            key=key,
+            extra_args=extra_args,
+        )
+
     @staticmethod
     def _gather_upload_metadata(
         manifest: BaseAssetManifest,
@@ -302,70 +466,493 @@ class S3AssetUploader:
         s3_cas_prefix: str,
         progress_tracker: Optional[ProgressTracker] = None,
         s3_check_cache_dir: Optional[str] = None,
-    ) -> None:
+        pack_small_files: bool = False,
+    ) -> Optional[PackIndex]:
         """
         Uploads all of the files listed in the given manifest to S3 if they don't exist in the
         given S3 prefix already.
 
         The local 'S3 check cache' is used to note if we've seen an object in S3 before so we
         can save the S3 API calls.
+
+        If `pack_small_files` is True, small files whose objects don't exist in the CAS prefix
+        yet are packed into larger pack objects instead of being uploaded one object each, and
+        the pack index of the packed files is returned. Otherwise, None is returned.
         """
 
+        # Paths with the same hash have the same content, so only one object per hash needs to be
+        # checked and uploaded. The other paths with that hash are reported as skipped.
+        (unique_files, duplicate_files) = self._separate_files_by_hash(manifest.paths)
+        if progress_tracker and duplicate_files:
+            progress_tracker.increase_skipped(
+                len(duplicate_files), sum(file.size for file in duplicate_files)
+            )
+
         # Split into a separate 'large file' and 'small file' queues.
         # Separate 'large' files from 'small' files so that we can process 'large' files serially.
         # This wastes less bandwidth if uploads are cancelled, as it's better to use the multi-threaded
         # multi-part upload for a single large file than multiple large files at the same time.
         (small_file_queue, large_file_queue) = self._separate_files_by_size(
-            manifest.paths, self.small_file_threshold
+            unique_files, self.small_file_threshold
         )
 
         with S3CheckCache(s3_check_cache_dir) as s3_cache:
-            # First, process the whole 'small file' queue with parallel object uploads.
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=self.num_upload_workers
-            ) as executor:
-                futures = {
-                    executor.submit(
-                        self.upload_object_to_cas,
-                        file,
+            # Check which objects already exist in the CAS prefix up front, if listing the prefix
+            # is cheaper than a head-object request per object.
+            existing_cas_keys = self._list_existing_cas_keys(
+                unique_files, manifest.hashAlg, s3_bucket, s3_cas_prefix, s3_cache
+            )
+
+            pack_index: Optional[PackIndex] = None
+            if pack_small_files:
+                (files_to_pack, small_file_queue) = self._separate_files_to_pack(
+                    small_file_queue,
+                    manifest.hashAlg,
+                    s3_bucket,
+                    s3_cas_prefix,
+                    s3_cache,
+                    existing_cas_keys,
+                )
+                if files_to_pack:
+                    pack_index = self.upload_packed_files(
+                        files_to_pack,
                         manifest.hashAlg,
                         s3_bucket,
                         source_root,
                         s3_cas_prefix,
                         s3_cache,
                         progress_tracker,
-                    ): file
-                    for file in small_file_queue
-                }
-                # surfaces any exceptions in the thread
-                for future in concurrent.futures.as_completed(futures):
-                    (is_uploaded, file_size) = future.result()
+                    )
+
+            if self.transfer_engine == TransferEngine.ASYNCIO:
+                # The asyncio engine uploads all the files on one event loop, small and large alike.
+                upload_results = self._upload_objects_to_cas_asyncio(
+                    small_file_queue + large_file_queue,
+                    manifest.hashAlg,
+                    s3_bucket,
+                    source_root,
+                    s3_cas_prefix,
+                    s3_cache,
+                    progress_tracker,
+                    existing_cas_keys,
+                )
+                for is_uploaded, file_size in upload_results:
                     if progress_tracker and not is_uploaded:
                         progress_tracker.increase_skipped(1, file_size)
+            else:
+                # First, process the whole 'small file' queue with parallel object uploads.
+                with self.watch_concurrency(), concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.num_upload_workers
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            self.upload_small_object_to_cas,
+                            file,
+                            manifest.hashAlg,
+                            s3_bucket,
+                            source_root,
+                            s3_cas_prefix,
+                            s3_cache,
+                            progress_tracker,
+                            existing_cas_keys,
+                        ): file
+                        for file in small_file_queue
+                    }
+                    # surfaces any exceptions in the thread
+                    for future in concurrent.futures.as_completed(futures):
+                        (is_uploaded, file_size) = future.result()
+                        if progress_tracker and not is_uploaded:
+                            progress_tracker.increase_skipped(1, file_size)
 
-            # Now process the whole 'large file' queue with serial object uploads (but still parallel multi-part upload.)
-            for file in large_file_queue:
-                (is_uploaded, file_size) = self.upload_object_to_cas(
-                    file,
+                # Now process the whole 'large file' queue, a few files at a time within the
+                # budget of bytes and parts in flight (with parallel multi-part uploads.)
+                self.upload_large_files(
+                    large_file_queue,
                     manifest.hashAlg,
                     s3_bucket,
                     source_root,
                     s3_cas_prefix,
                     s3_cache,
                     progress_tracker,
+                    existing_cas_keys,
                 )
+
+        # to report progress 100% at the end, and
+        # to check if the job submission was canceled in the middle of processing the last batch of files.
+        if progress_tracker:
+            if self.concurrency_controller is not None:
+                progress_tracker.concurrency = self.concurrency_controller.concurrency
+            progress_tracker.report_progress()
+            if not progress_tracker.continue_reporting:
+                raise AssetSyncCancelledError(
+                    "File upload cancelled.", progress_tracker.get_summary_statistics()
+                )
+
+        return pack_index
+
+    def watch_concurrency(self):
+        """
+        Returns a context manager that lets the adaptive concurrency controller observe the
+        throttling of this uploader's S3 requests, if adaptive concurrency is enabled.
+        """
+        if self.concurrency_controller is None:
+            return nullcontext()
+        return self.concurrency_controller.watch(self._s3)
+
+    def upload_small_object_to_cas(
+        self,
+        file: base_manifest.BaseManifestPath,
+        hash_algorithm: HashAlgorithm,
+        s3_bucket: str,
+        source_root: Path,
+        s3_cas_prefix: str,
+        s3_check_cache: S3CheckCache,
+        progress_tracker: Optional[ProgressTracker] = None,
+        existing_cas_keys: Optional[set[str]] = None,
+    ) -> Tuple[bool, int]:
+        """
+        Uploads a small file to the CAS with `upload_object_to_cas`. If adaptive concurrency is
+        enabled, waits for a slot of the concurrency controller first, and holds it during the
+        upload.
+        """
+        return self._upload_small_file(
+            lambda: self.upload_object_to_cas(
+                file,
+                hash_algorithm,
+                s3_bucket,
+                source_root,
+                s3_cas_prefix,
+                s3_check_cache,
+                progress_tracker,
+                existing_cas_keys,
+            )
+        )
+
+    def _upload_small_file(self, upload: Callable[[], Tuple[bool, int]]) -> Tuple[bool, int]:
+        """
+        Runs the given upload of a small file, which returns whether the file has been uploaded
+        and its size. If adaptive concurrency is enabled, waits for a slot of the concurrency
+        controller first, and holds it during the upload.
+        """
+        if self.concurrency_controller is None:
+            return upload()
+
+        with self.concurrency_controller.slot() as transfer_slot:
+            (is_uploaded, file_size) = upload()
+            if is_uploaded:
+                transfer_slot.transferred(file_size)
+        return (is_uploaded, file_size)
+
+    def upload_large_files(
+        self,
+        files: list[base_manifest.BaseManifestPath],
+        hash_algorithm: HashAlgorithm,
+        s3_bucket: str,
+        source_root: Path,
+        s3_cas_prefix: str,
+        s3_check_cache: S3CheckCache,
+        progress_tracker: Optional[ProgressTracker] = None,
+        existing_cas_keys: Optional[set[str]] = None,
+    ) -> None:
+        """
+        Uploads large files to the CAS with `upload_object_to_cas`, within the budget of bytes and
+        parts in flight. See `_upload_large_files_within_budget`.
+        """
+
+        def upload_large_file(
+            file: base_manifest.BaseManifestPath, transfer_manager: TransferManager
+        ) -> Tuple[bool, int]:
+            return self.upload_object_to_cas(
+                file,
+                hash_algorithm,
+                s3_bucket,
+                source_root,
+                s3_cas_prefix,
+                s3_check_cache,
+                progress_tracker,
+                existing_cas_keys,
+                transfer_manager=transfer_manager,
+            )
+
+        self._upload_large_files_within_budget(
+            [(file.size, functools.partial(upload_large_file, file)) for file in files],
+            progress_tracker,
+        )
+
+    def _upload_large_files_within_budget(
+        self,
+        uploads: list[Tuple[int, Callable[[TransferManager], Tuple[bool, int]]]],
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> None:
+        """
+        Runs the given uploads of large files, each given as the file size and a function that
+        uploads the file with a transfer manager and returns whether the file has been uploaded
+        and its size.
+
+        The files are uploaded largest first, so that the biggest transfers don't end up as a long
+        tail. As many files are uploaded at the same time as fit within the budget of
+        `large_file_max_bytes_in_flight`, and their parts share a transfer manager that uploads at
+        most `large_file_max_parts_in_flight` parts at a time. A file larger than the byte budget is
+        uploaded on its own. Bounding the bytes in flight bounds how much upload bandwidth is
+        wasted if the upload is cancelled, as uploading the large files serially did.
+        """
+        if not uploads:
+            return
+
+        transfer_manager = get_s3_transfer_manager(
+            s3_client=self._s3, max_concurrency=self.large_file_max_parts_in_flight
+        )
+        budget = threading.Condition()
+        in_flight = {"files": 0, "bytes": 0}
+        upload_failed = threading.Event()
+
+        def upload_large_file(
+            file_size: int, upload: Callable[[TransferManager], Tuple[bool, int]]
+        ) -> Tuple[bool, int]:
+            try:
+                return upload(transfer_manager)
+            except BaseException:
+                upload_failed.set()
+                raise
+            finally:
+                with budget:
+                    in_flight["files"] -= 1
+                    in_flight["bytes"] -= file_size
+                    budget.notify_all()
+
+        def is_cancelled() -> bool:
+            return upload_failed.is_set() or (
+                progress_tracker is not None and not progress_tracker.continue_reporting
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(uploads), self.large_file_max_parts_in_flight)
+        ) as executor:
+            futures = []
+            for file_size, upload in sorted(uploads, key=lambda upload: upload[0], reverse=True):
+                with budget:
+                    # Wait until the file fits in the budget. Files are started strictly in order,
+                    # so that a large file is never overtaken by the smaller files after it.
+                    while in_flight["files"] > 0 and not is_cancelled():
+                        if (
+                            in_flight["bytes"] + file_size <= self.large_file_max_bytes_in_flight
+                            and in_flight["files"] < self.large_file_max_parts_in_flight
+                        ):
+                            break
+                        budget.wait()
+                    if is_cancelled():
+                        break
+                    in_flight["files"] += 1
+                    in_flight["bytes"] += file_size
+                futures.append(executor.submit(upload_large_file, file_size, upload))
+
+            # surfaces any exceptions in the thread
+            for future in concurrent.futures.as_completed(futures):
+                (is_uploaded, file_size) = future.result()
                 if progress_tracker and not is_uploaded:
                     progress_tracker.increase_skipped(1, file_size)
 
+    def upload_output_files(
+        self,
+        output_files: list[OutputFile],
+        s3_bucket: str,
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> None:
+        """
+        Uploads the given output files to S3, with the same scheduling as `upload_input_files`:
+        the small files are uploaded in parallel first, then the large files within the budget of
+        bytes and parts in flight. Files that are already in S3 are reported as skipped, and files
+        with the same S3 key as another file are only uploaded once. Each file is only uploaded if
+        it is within its base directory, as checked by `upload_file_to_s3`.
+        """
+        files_to_upload: dict[str, OutputFile] = {}
+        for file in output_files:
+            if file.in_s3 or file.s3_key in files_to_upload:
+                if progress_tracker:
+                    progress_tracker.increase_skipped(1, file.file_size)
+            else:
+                files_to_upload[file.s3_key] = file
+
+        def upload_output_file(
+            file: OutputFile, transfer_manager: Optional[TransferManager] = None
+        ) -> Tuple[bool, int]:
+            self.upload_file_to_s3(
+                local_path=Path(file.full_path),
+                s3_bucket=s3_bucket,
+                s3_upload_key=file.s3_key,
+                progress_tracker=progress_tracker,
+                base_dir_path=Path(file.base_dir) if file.base_dir else None,
+                transfer_manager=transfer_manager,
+            )
+            return (True, file.file_size)
+
+        small_files = [
+            file for file in files_to_upload.values() if file.file_size <= self.small_file_threshold
+        ]
+        large_files = [
+            file for file in files_to_upload.values() if file.file_size > self.small_file_threshold
+        ]
+
+        # First, process the small files with parallel uploads.
+        with self.watch_concurrency(), concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.num_upload_workers
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._upload_small_file, functools.partial(upload_output_file, file)
+                )
+                for file in small_files
+            ]
+            # surfaces any exceptions in the thread
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+
+        # Now process the large files, a few at a time within the budget of bytes and parts in
+        # flight (with parallel multi-part uploads.)
+        self._upload_large_files_within_budget(
+            [(file.file_size, functools.partial(upload_output_file, file)) for file in large_files],
+            progress_tracker,
+        )
+
         # to report progress 100% at the end, and
-        # to check if the job submission was canceled in the middle of processing the last batch of files.
+        # to check if the upload was canceled in the middle of processing the last batch of files.
         if progress_tracker:
+            if self.concurrency_controller is not None:
+                progress_tracker.concurrency = self.concurrency_controller.concurrency
             progress_tracker.report_progress()
             if not progress_tracker.continue_reporting:
                 raise AssetSyncCancelledError(
                     "File upload cancelled.", progress_tracker.get_summary_statistics()
                 )
 
+    def _get_cas_key(
+        self, file_hash: str, hash_algorithm: HashAlgorithm, s3_cas_prefix: str
+    ) -> str:
+        s3_upload_key = f"{file_hash}.{hash_algorithm.value}"
+        if s3_cas_prefix:
+            s3_upload_key = _join_s3_paths(s3_cas_prefix, s3_upload_key)
+        return s3_upload_key
+
+    def _list_existing_cas_keys(
+        self,
+        files: list[base_manifest.BaseManifestPath],
+        hash_algorithm: HashAlgorithm,
+        s3_bucket: str,
+        s3_cas_prefix: str,
+        s3_check_cache: S3CheckCache,
+    ) -> Optional[set[str]]:
+        """
+        Checks which of the CAS objects for the given files already exist in S3, by listing the
+        shards of the CAS prefix (the first few characters of the hash) that the files touch.
+        Objects that are in the S3 check cache are not checked.
+
+        Returns the set of the checked keys that exist in S3, or None if the objects should be
+        checked with a head-object request each instead. That's the case when there are too few
+        objects to check for listing to pay off, when the listing runs over its budget of list
+        requests, or when listing the bucket is not permitted.
+        """
+        keys_to_check: set[str] = set()
+        shard_prefixes: set[str] = set()
+        for file in files:
+            s3_key = self._get_cas_key(file.hash, hash_algorithm, s3_cas_prefix)
+            if s3_key not in keys_to_check and not s3_check_cache.get_entry(
+                s3_key=f"{s3_bucket}/{s3_key}"
+            ):
+                keys_to_check.add(s3_key)
+                shard_prefix = file.hash[:S3_CAS_LIST_SHARD_PREFIX_LENGTH]
+                if s3_cas_prefix:
+                    shard_prefix = _join_s3_paths(s3_cas_prefix, shard_prefix)
+                shard_prefixes.add(shard_prefix)
+
+        max_list_requests = len(keys_to_check) // S3_LIST_OBJECTS_COST_IN_HEAD_REQUESTS
+        if not shard_prefixes or len(shard_prefixes) > max_list_requests:
+            logger.debug(
+                f"Checking {len(keys_to_check)} objects in s3://{s3_bucket}/{s3_cas_prefix} with head-object requests."
+            )
+            return None
+
+        logger.debug(
+            f"Checking {len(keys_to_check)} objects in s3://{s3_bucket}/{s3_cas_prefix} by listing "
+            f"{len(shard_prefixes)} prefixes with up to {max_list_requests} requests."
+        )
+        existing_keys: set[str] = set()
+        list_requests = 0
+        lock = threading.Lock()
+        over_budget = threading.Event()
+
+        def list_shard(shard_prefix: str) -> None:
+            nonlocal list_requests
+            if over_budget.is_set():
+                return
+            paginator = self._s3.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=s3_bucket, Prefix=shard_prefix):
+                found_keys = [
+                    obj["Key"] for obj in page.get("Contents", []) if obj["Key"] in keys_to_check
+                ]
+                with lock:
+                    existing_keys.update(found_keys)
+                    list_requests += 1
+                    if list_requests >= max_list_requests and page.get("IsTruncated"):
+                        over_budget.set()
+                if over_budget.is_set():
+                    return
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.num_upload_workers
+            ) as executor:
+                futures = [
+                    executor.submit(list_shard, shard_prefix) for shard_prefix in shard_prefixes
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+        except ClientError as exc:
+            status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+            if status_code == 403:
+                # Listing needs the 's3:ListBucket' permission on the whole CAS prefix, which may
+                # be narrower than what's needed for the head-object requests.
+                logger.debug(
+                    f"Listing s3://{s3_bucket}/{s3_cas_prefix} was not permitted, using head-object requests instead: {exc}"
+                )
+                return None
+            raise JobAttachmentsS3ClientError(
+                action="listing objects in the CAS prefix",
+                status_code=status_code,
+                bucket_name=s3_bucket,
+                key_or_prefix=s3_cas_prefix,
+            ) from exc
+        except BotoCoreError as bce:
+            raise JobAttachmentS3BotoCoreError(
+                action="listing objects in the CAS prefix",
+                error_details=str(bce),
+            ) from bce
+
+        if over_budget.is_set():
+            logger.debug(
+                f"Listing s3://{s3_bucket}/{s3_cas_prefix} took more than {max_list_requests} requests, "
+                "using head-object requests instead."
+            )
+            return None
+
+        return existing_keys
+
+    def _separate_files_by_hash(
+        self,
+        files_to_upload: list[base_manifest.BaseManifestPath],
+    ) -> Tuple[list[base_manifest.BaseManifestPath], list[base_manifest.BaseManifestPath]]:
+        """
+        Splits the given list of files into two lists: the first file for each hash, and the rest
+        of the files, whose content duplicates a file in the first list.
+        """
+        unique_files: dict[str, base_manifest.BaseManifestPath] = {}
+        duplicate_files: list[base_manifest.BaseManifestPath] = []
+        for file in files_to_upload:
+            if file.hash in unique_files:
+                duplicate_files.append(file)
+            else:
+                unique_files[file.hash] = file
+        return (list(unique_files.values()), duplicate_files)
+
     def _separate_files_by_size(
         self,
         files_to_upload: list[base_manifest.BaseManifestPath],
@@ -383,6 +970,156 @@ class S3AssetUploader:
                 large_file_queue.append(file)
         return (small_file_queue, large_file_queue)
 
+    def _separate_files_to_pack(
+        self,
+        files: list[base_manifest.BaseManifestPath],
+        hash_algorithm: HashAlgorithm,
+        s3_bucket: str,
+        s3_cas_prefix: str,
+        s3_check_cache: S3CheckCache,
+        existing_cas_keys: Optional[set[str]] = None,
+    ) -> Tuple[list[base_manifest.BaseManifestPath], list[base_manifest.BaseManifestPath]]:
+        """
+        Splits the given list of files into two lists: the files to pack, and the rest of the
+        files. Files are packed if they are small enough and their objects are not known to
+        exist in the CAS prefix, from the S3 check cache or from listing the CAS prefix.
+        """
+        files_to_pack: list[base_manifest.BaseManifestPath] = []
+        other_files: list[base_manifest.BaseManifestPath] = []
+        for file in files:
+            s3_key = self._get_cas_key(file.hash, hash_algorithm, s3_cas_prefix)
+            if (
+                file.size > PACK_MAX_OBJECT_SIZE
+                or (existing_cas_keys is not None and s3_key in existing_cas_keys)
+                or s3_check_cache.get_entry(s3_key=f"{s3_bucket}/{s3_key}")
+            ):
+                other_files.append(file)
+            else:
+                files_to_pack.append(file)
+        return (files_to_pack, other_files)
+
+    def upload_packed_files(
+        self,
+        files: list[base_manifest.BaseManifestPath],
+        hash_algorithm: HashAlgorithm,
+        s3_bucket: str,
+        source_root: Path,
+        s3_cas_prefix: str,
+        s3_check_cache: S3CheckCache,
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> PackIndex:
+        """
+        Appends the contents of the given files into pack objects of about PACK_TARGET_SIZE,
+        and uploads the packs to the "packs" folder of the CAS prefix in parallel. Files are
+        packed in order of their hashes, so the same files always give the same packs, and a
+        pack that exists in S3 already is not uploaded again.
+        Returns the pack index of the packed files.
+        """
+        file_groups: list[list[base_manifest.BaseManifestPath]] = []
+        group_size = 0
+        for file in sorted(files, key=lambda file: file.hash):
+            if not file_groups or group_size + file.size > PACK_TARGET_SIZE:
+                file_groups.append([])
+                group_size = 0
+            file_groups[-1].append(file)
+            group_size += file.size
+
+        pack_index = PackIndex(hash_algorithm)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_upload_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._upload_pack,
+                    file_group,
+                    hash_algorithm,
+                    s3_bucket,
+                    source_root,
+                    s3_cas_prefix,
+                    s3_check_cache,
+                    progress_tracker,
+                )
+                for file_group in file_groups
+            ]
+            # surfaces any exceptions in the thread
+            for future in concurrent.futures.as_completed(futures):
+                pack_index.update(future.result())
+
+        return pack_index
+
+    def _upload_pack(
+        self,
+        files: list[base_manifest.BaseManifestPath],
+        hash_algorithm: HashAlgorithm,
+        s3_bucket: str,
+        source_root: Path,
+        s3_cas_prefix: str,
+        s3_check_cache: S3CheckCache,
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> PackIndex:
+        """
+        Builds a single pack from the contents of the given files and uploads it, unless it
+        exists in S3 already. Returns the pack index of the files in the pack.
+        """
+        if progress_tracker and not progress_tracker.continue_reporting:
+            raise AssetSyncCancelledError(
+                "File upload cancelled.", progress_tracker.get_summary_statistics()
+            )
+
+        pack_buffer = BytesIO()
+        packed_files: list[Tuple[str, int, int]] = []
+        for file in files:
+            real_path = source_root.joinpath(file.path).resolve()
+            # Skip the file if it's a directory or doesn't exist, as for files uploaded on their own.
+            if real_path.is_dir() or not real_path.exists():
+                continue
+            with self._open_non_symlink_file_binary(str(real_path)) as file_obj:
+                if file_obj is None:
+                    continue
+                offset = pack_buffer.tell()
+                pack_buffer.write(file_obj.read())
+                packed_files.append((file.hash, offset, pack_buffer.tell() - offset))
+
+        if not packed_files:
+            return PackIndex(hash_algorithm)
+
+        pack_bytes = pack_buffer.getvalue()
+        pack_name = f"{PACKS_FOLDER_NAME}/{hash_data(pack_bytes, hash_algorithm)}.pack"
+        s3_upload_key = _join_s3_paths(s3_cas_prefix, pack_name) if s3_cas_prefix else pack_name
+
+        def handler(bytes_uploaded: int) -> None:
+            if progress_tracker:
+                progress_tracker.track_progress_callback(bytes_uploaded)
+
+        if s3_check_cache.get_entry(
+            s3_key=f"{s3_bucket}/{s3_upload_key}"
+        ) or self.file_already_uploaded(s3_bucket, s3_upload_key):
+            logger.debug(f"skipping pack s3://{s3_bucket}/{s3_upload_key} because it exists")
+            if progress_tracker:
+                progress_tracker.increase_skipped(len(packed_files), len(pack_bytes))
+        else:
+            self.upload_bytes_to_s3(
+                bytes=BytesIO(pack_bytes),
+                bucket=s3_bucket,
+                key=s3_upload_key,
+                progress_handler=handler,
+            )
+            if progress_tracker:
+                progress_tracker.increase_processed(len(packed_files), 0)
+
+        s3_check_cache.put_entry(
+            S3CheckCacheEntry(
+                s3_key=f"{s3_bucket}/{s3_upload_key}",
+                last_seen_time=self._get_current_timestamp(),
+            )
+        )
+
+        return PackIndex(
+            hash_algorithm,
+            {
+                file_hash: PackedObject(pack_name, offset, size)
+                for (file_hash, offset, size) in packed_files
+            },
+        )
+
     def _get_current_timestamp(self) -> str:
         return str(datetime.now().timestamp())
 
@@ -395,16 +1132,19 @@ class S3AssetUploader:
         s3_cas_prefix: str,
         s3_check_cache: S3CheckCache,
         progress_tracker: Optional[ProgressTracker] = None,
+        existing_cas_keys: Optional[set[str]] = None,
+        transfer_manager: Optional[TransferManager] = None,
     ) -> Tuple[bool, int]:
         """
         Uploads an object to the S3 content-addressable storage (CAS) prefix. Optionally,
         does a head-object check and only uploads the file if it doesn't exist in S3 already.
+        If `existing_cas_keys` is given, it is the set of keys found by listing the CAS prefix,
+        and is used instead of the head-object check.
+        If `transfer_manager` is given, the file is uploaded with it instead of the default one.
         Returns a tuple (whether it has been uploaded, the file size).
         """
         local_path = source_root.joinpath(file.path)
-        s3_upload_key = f"{file.hash}.{hash_algorithm.value}"
-        if s3_cas_prefix:
-            s3_upload_key = _join_s3_paths(s3_cas_prefix, s3_upload_key)
+        s3_upload_key = self._get_cas_key(file.hash, hash_algorithm, s3_cas_prefix)
         is_uploaded = False
         file_size = local_path.resolve().stat().st_size
 
@@ -414,7 +1154,12 @@ class S3AssetUploader:
             )
             return (is_uploaded, file_size)
 
-        if self.file_already_uploaded(s3_bucket, s3_upload_key):
+        if existing_cas_keys is not None:
+            already_uploaded = s3_upload_key in existing_cas_keys
+        else:
+            already_uploaded = self.file_already_uploaded(s3_bucket, s3_upload_key)
+
+        if already_uploaded:
             logger.debug(
                 f"skipping {local_path} because it has already been uploaded to s3://{s3_bucket}/{s3_upload_key}"
             )
@@ -424,6 +1169,7 @@ class S3AssetUploader:
                 s3_bucket=s3_bucket,
                 s3_upload_key=s3_upload_key,
                 progress_tracker=progress_tracker,
+                transfer_manager=transfer_manager,
             )
             is_uploaded = True
 
@@ -436,6 +1182,80 @@ class S3AssetUploader:
 
         return (is_uploaded, file_size)
 
+    def _upload_objects_to_cas_asyncio(
+        self,
+        files: list[base_manifest.BaseManifestPath],
+        hash_algorithm: HashAlgorithm,
+        s3_bucket: str,
+        source_root: Path,
+        s3_cas_prefix: str,
+        s3_check_cache: S3CheckCache,
+        progress_tracker: Optional[ProgressTracker] = None,
+        existing_cas_keys: Optional[set[str]] = None,
+    ) -> list[Tuple[bool, int]]:
+        """
+        Uploads objects to the S3 content-addressable storage (CAS) prefix in the same way as
+        `upload_object_to_cas`, but with the asyncio transfer engine, which runs all the requests
+        on an event loop in this thread.
+        Returns a list of tuples (whether it has been uploaded, the file size), one per file.
+        """
+
+        async def upload_object(
+            transfer: AsyncS3Transfer, file: base_manifest.BaseManifestPath
+        ) -> Tuple[bool, int]:
+            local_path = source_root.joinpath(file.path)
+            s3_upload_key = self._get_cas_key(file.hash, hash_algorithm, s3_cas_prefix)
+            is_uploaded = False
+            # The file system and the S3 check cache are used from the thread pool of the event
+            # loop, so that they don't block the other transfers.
+            real_path = await run_in_thread(local_path.resolve)
+            file_stat = await run_in_thread(real_path.stat)
+            file_size = file_stat.st_size
+
+            if await run_in_thread(s3_check_cache.get_entry, f"{s3_bucket}/{s3_upload_key}"):
+                logger.debug(
+                    f"skipping {local_path} because {s3_bucket}/{s3_upload_key} exists in the cache"
+                )
+                return (is_uploaded, file_size)
+
+            if existing_cas_keys is not None:
+                already_uploaded = s3_upload_key in existing_cas_keys
+            else:
+                already_uploaded = await transfer.object_exists(s3_bucket, s3_upload_key)
+
+            if already_uploaded:
+                logger.debug(
+                    f"skipping {local_path} because it has already been uploaded to s3://{s3_bucket}/{s3_upload_key}"
+                )
+            elif not stat.S_ISDIR(file_stat.st_mode):
+                with self._open_non_symlink_file_binary(str(real_path)) as file_obj:
+                    if file_obj is not None:
+                        await transfer.upload_file(
+                            file_obj, file_size, s3_bucket, s3_upload_key, local_path
+                        )
+                        is_uploaded = True
+                        if progress_tracker:
+                            progress_tracker.increase_processed(1, 0)
+
+            await run_in_thread(
+                s3_check_cache.put_entry,
+                S3CheckCacheEntry(
+                    s3_key=f"{s3_bucket}/{s3_upload_key}",
+                    last_seen_time=self._get_current_timestamp(),
+                ),
+            )
+
+            return (is_uploaded, file_size)
+
+        return run_transfers(
+            files,
+            upload_object,
+            self._session,
+            self.max_async_requests,
+            progress_tracker,
+            get_account_id(session=self._session),
+        )
+
     def upload_file_to_s3(
         self,
         local_path: Path,
@@ -443,6 +1263,7 @@ class S3AssetUploader:
         s3_upload_key: str,
         progress_tracker: Optional[ProgressTracker] = None,
         base_dir_path: Optional[Path] = None,
+        transfer_manager: Optional[TransferManager] = None,
     ) -> None:
         """
         Uploads a single file to an S3 bucket using TransferManager, allowing mid-way
@@ -450,7 +1271,8 @@ class S3AssetUploader:
         which also checks if the upload should continue or not. If the `progress_tracker`
         signals to stop, the ongoing upload is cancelled.
         """
-        transfer_manager = get_s3_transfer_manager(s3_client=self._s3)
+        if transfer_manager is None:
+            transfer_manager = get_s3_transfer_manager(s3_client=self._s3)
 
         future: concurrent.futures.Future
 
@@ -759,6 +1581,7 @@ class S3AssetManager:
         asset_uploader: Optional[S3AssetUploader] = None,
         session: Optional[boto3.Session] = None,
         asset_manifest_version: ManifestVersion = ManifestVersion.v2023_03_03,
+        hashing_engine: Optional[HashingEngine] = None,
     ) -> None:
         self.farm_id = farm_id
         self.queue_id = queue_id
@@ -782,6 +1605,42 @@ class S3AssetManager:
 
         self.manifest_version: ManifestVersion = asset_manifest_version
 
+        if hashing_engine is None:
+            hashing_engine_setting = config_file.get_setting("settings.hashing_engine")
+            try:
+                hashing_engine = HashingEngine(hashing_engine_setting.upper())
+            except ValueError as ve:
+                raise AssetSyncError(
+                    "Nonvalid value for configuration setting: "
+                    f"'hashing_engine' ({hashing_engine_setting}) must be one of "
+                    f"{', '.join(engine.value for engine in HashingEngine)}."
+                ) from ve
+        self.hashing_engine: HashingEngine = hashing_engine
+
+    def _get_input_file_stat(
+        self,
+        path: Path,
+        scanned_file: Optional[ScannedFile],
+        hash_cache: HashCache,
+        hash_alg: HashAlgorithm,
+    ) -> Tuple[str, os.stat_result, Optional[HashCacheEntry]]:
+        """
+        Returns the resolved path and the stat of an input file, along with its hash cache entry.
+        A scanned file is stat-ed again with a single `os.stat` of its resolved path, since the
+        scan may be from before the submission was confirmed, and the file may have been saved
+        since. The hash, size and modification time in the manifest must all be of the current
+        contents.
+        """
+        if scanned_file is None:
+            full_path = str(path.resolve())
+            return (full_path, path.stat(), hash_cache.get_entry(full_path, hash_alg))
+
+        return (
+            scanned_file.resolved_path,
+            os.stat(scanned_file.resolved_path),
+            hash_cache.get_entry(scanned_file.resolved_path, hash_alg),
+        )
+
     def _process_input_path(
         self,
         path: Path,
@@ -789,6 +1648,7 @@ class S3AssetManager:
         hash_cache: HashCache,
         progress_tracker: Optional[ProgressTracker] = None,
         update: bool = True,
+        scanned_file: Optional[ScannedFile] = None,
     ) -> Tuple[FileStatus, int, base_manifest.BaseManifestPath]:
         # If it's cancelled, raise an AssetSyncCancelledError exception
         if progress_tracker and not progress_tracker.continue_reporting:
@@ -801,11 +1661,12 @@ class S3AssetManager:
         )
         hash_alg: HashAlgorithm = manifest_model.AssetManifest.get_default_hash_alg()
 
-        full_path = str(path.resolve())
+        full_path, file_stat, entry = self._get_input_file_stat(
+            path, scanned_file, hash_cache, hash_alg
+        )
         file_status: FileStatus = FileStatus.UNCHANGED
-        actual_modified_time = str(datetime.fromtimestamp(path.stat().st_mtime))
+        actual_modified_time = str(datetime.fromtimestamp(file_stat.st_mtime))
 
-        entry: Optional[HashCacheEntry] = hash_cache.get_entry(full_path, hash_alg)
         if entry is not None:
             # If the file was modified, we need to rehash it
             if actual_modified_time != entry.last_modified_time:
@@ -825,7 +1686,7 @@ class S3AssetManager:
         if file_status != FileStatus.UNCHANGED and update:
             hash_cache.put_entry(entry)
 
-        file_size = path.resolve().stat().st_size
+        file_size = file_stat.st_size
         path_args: dict[str, Any] = {
             "path": path.relative_to(root_path).as_posix(),
             "hash": entry.file_hash,
@@ -833,18 +1694,167 @@ class S3AssetManager:
 
         # stat().st_mtime_ns returns an int that represents the time in nanoseconds since the epoch.
         # The asset manifest spec requires the mtime to be represented as an integer in microseconds.
-        path_args["mtime"] = trunc(path.stat().st_mtime_ns // 1000)
+        path_args["mtime"] = trunc(file_stat.st_mtime_ns // 1000)
         path_args["size"] = file_size
 
         return (file_status, file_size, manifest_model.Path(**path_args))
 
+    def _process_input_paths_in_process_pool(
+        self,
+        input_paths: list[Path],
+        root_path: str,
+        hash_cache: HashCache,
+        progress_tracker: Optional[ProgressTracker] = None,
+        on_path_hashed: Optional[Callable[[base_manifest.BaseManifestPath], None]] = None,
+        scanned_inputs: Optional[dict[Path, ScannedFile]] = None,
+    ) -> list[base_manifest.BaseManifestPath]:
+        """
+        Creates the manifest paths for the given input paths, hashing any new or modified files
+        on a process pool. The hash cache is only read and written in this process; the worker
+        processes only hash files. Small files are grouped into batches so that the cost of
+        sending work to the pool is amortized, while large files are hashed as their own tasks.
+        `on_path_hashed` is called with each manifest path as soon as its hash is known.
+        """
+        manifest_model: Type[BaseManifestModel] = ManifestModelRegistry.get_manifest_model(
+            version=self.manifest_version
+        )
+        hash_alg: HashAlgorithm = manifest_model.AssetManifest.get_default_hash_alg()
+        scanned_inputs = scanned_inputs or {}
+
+        paths: list[base_manifest.BaseManifestPath] = []
+        # (full path, modified time for the hash cache, manifest path arguments without the hash)
+        files_to_hash: list[Tuple[str, str, dict[str, Any]]] = []
+
+        for path in input_paths:
+            if progress_tracker and not progress_tracker.continue_reporting:
+                raise AssetSyncCancelledError(
+                    "File hashing cancelled.", progress_tracker.get_summary_statistics()
+                )
+
+            full_path, file_stat, entry = self._get_input_file_stat(
+                path, scanned_inputs.get(path), hash_cache, hash_alg
+            )
+            actual_modified_time = str(datetime.fromtimestamp(file_stat.st_mtime))
+            # stat().st_mtime_ns returns an int that represents the time in nanoseconds since the epoch.
+            # The asset manifest spec requires the mtime to be represented as an integer in microseconds.
+            path_args: dict[str, Any] = {
+                "path": path.relative_to(root_path).as_posix(),
+                "mtime": trunc(file_stat.st_mtime_ns // 1000),
+                "size": file_stat.st_size,
+            }
+
+            if entry is not None and entry.last_modified_time == actual_modified_time:
+                paths.append(manifest_model.Path(hash=entry.file_hash, **path_args))
+                if on_path_hashed:
+                    on_path_hashed(paths[-1])
+                if progress_tracker:
+                    progress_tracker.increase_skipped(1, file_stat.st_size)
+                    progress_tracker.report_progress()
+            else:
+                files_to_hash.append((full_path, actual_modified_time, path_args))
+
+        if not files_to_hash:
+            return paths
+
+        num_workers = os.cpu_count() or 1
+        if sys.platform == "win32":
+            num_workers = min(num_workers, HASHING_MAX_PROCESSES_WINDOWS)
+        batches = self._batch_files_for_hashing(files_to_hash, num_workers)
+        num_workers = min(num_workers, len(batches))
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = {
+                executor.submit(hash_files, [file[0] for file in batch], hash_alg): batch
+                for batch in batches
+            }
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    batch = futures[future]
+                    for (full_path, actual_modified_time, path_args), file_hash in zip(
+                        batch, future.result()
+                    ):
+                        hash_cache.put_entry(
+                            HashCacheEntry(
+                                file_path=full_path,
+                                hash_algorithm=hash_alg,
+                                file_hash=file_hash,
+                                last_modified_time=actual_modified_time,
+                            )
+                        )
+                        paths.append(manifest_model.Path(hash=file_hash, **path_args))
+                        if on_path_hashed:
+                            on_path_hashed(paths[-1])
+                        if progress_tracker:
+                            progress_tracker.increase_processed(1, path_args["size"])
+                    if progress_tracker and not progress_tracker.report_progress():
+                        raise AssetSyncCancelledError(
+                            "File hashing cancelled.", progress_tracker.get_summary_statistics()
+                        )
+            except BaseException:
+                # Don't start hashing any batches that are still queued.
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return paths
+
+    @staticmethod
+    def _batch_files_for_hashing(
+        files_to_hash: list[Tuple[str, str, dict[str, Any]]], num_workers: int
+    ) -> list[list[Tuple[str, str, dict[str, Any]]]]:
+        """
+        Groups the files to hash into batches to submit to the process pool, largest files first.
+        Files that are at least as large as the batch size limit are put into their own batches.
+        The batch limits are reduced for small workloads so that every worker gets some work.
+        """
+        total_bytes = sum(file[2]["size"] for file in files_to_hash)
+        # Aim for a few batches per worker so that the workers finish at roughly the same time.
+        target_num_batches = num_workers * 4
+        max_batch_bytes = max(1, min(HASHING_BATCH_MAX_BYTES, total_bytes // target_num_batches))
+        max_batch_files = max(
+            1, min(HASHING_BATCH_MAX_FILES, -(-len(files_to_hash) // target_num_batches))
+        )
+
+        batches: list[list[Tuple[str, str, dict[str, Any]]]] = []
+        current_batch: list[Tuple[str, str, dict[str, Any]]] = []
+        current_batch_bytes = 0
+        for file in sorted(files_to_hash, key=lambda file: file[2]["size"], reverse=True):
+            file_size = file[2]["size"]
+            if file_size >= max_batch_bytes:
+                batches.append([file])
+                continue
+            if current_batch and (
+                current_batch_bytes + file_size > max_batch_bytes
+                or len(current_batch) >= max_batch_files
+            ):
+                batches.append(current_batch)
+                current_batch = []
+                current_batch_bytes = 0
+            current_batch.append(file)
+            current_batch_bytes += file_size
+        if current_batch:
+            batches.append(current_batch)
+
+        return batches
+
     def _create_manifest_file(
         self,
         input_paths: list[Path],
         root_path: str,
         hash_cache: HashCache,
         progress_tracker: Optional[ProgressTracker] = None,
+        on_path_hashed: Optional[Callable[[base_manifest.BaseManifestPath], None]] = None,
+        scanned_inputs: Optional[dict[Path, ScannedFile]] = None,
     ) -> BaseAssetManifest:
+        """
+        Creates the manifest of the given input paths, hashing the files that aren't in the hash
+        cache or were modified since. If `on_path_hashed` is given, it is called with each
+        manifest path as soon as its hash is known, in the order that files finish hashing.
+        The input paths found in `scanned_inputs` are already resolved, so they're only stat-ed
+        once more right before their hash cache entries are compared. The paths of the returned
+        manifest are in canonical order.
+        """
+        scanned_inputs = scanned_inputs or {}
         manifest_model: Type[BaseManifestModel] = ManifestModelRegistry.get_manifest_model(
             version=self.manifest_version
         )
@@ -853,22 +1863,53 @@ class S3AssetManager:
         }:
             paths: list[base_manifest.BaseManifestPath] = []
 
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = {
-                    executor.submit(
-                        self._process_input_path, path, root_path, hash_cache, progress_tracker
-                    ): path
+            # Look up all of the input paths in the hash cache with a few bulk queries, rather than
+            # one query per file while hashing.
+            hash_cache.prefetch_entries(
+                [
+                    (
+                        scanned_inputs[path].resolved_path
+                        if path in scanned_inputs
+                        else str(path.resolve())
+                    )
                     for path in input_paths
-                }
-                for future in concurrent.futures.as_completed(futures):
-                    (file_status, file_size, path_to_put_in_manifest) = future.result()
-                    paths.append(path_to_put_in_manifest)
-                    if progress_tracker:
-                        if file_status == FileStatus.NEW or file_status == FileStatus.MODIFIED:
-                            progress_tracker.increase_processed(1, file_size)
-                        else:
-                            progress_tracker.increase_skipped(1, file_size)
-                        progress_tracker.report_progress()
+                ],
+                manifest_model.AssetManifest.get_default_hash_alg(),
+            )
+
+            if self.hashing_engine == HashingEngine.PROCESS:
+                paths = self._process_input_paths_in_process_pool(
+                    input_paths,
+                    root_path,
+                    hash_cache,
+                    progress_tracker,
+                    on_path_hashed,
+                    scanned_inputs,
+                )
+            else:
+                with concurrent.futures.ThreadPoolExecutor() as executor:
+                    futures = {
+                        executor.submit(
+                            self._process_input_path,
+                            path,
+                            root_path,
+                            hash_cache,
+                            progress_tracker,
+                            scanned_file=scanned_inputs.get(path),
+                        ): path
+                        for path in input_paths
+                    }
+                    for future in concurrent.futures.as_completed(futures):
+                        (file_status, file_size, path_to_put_in_manifest) = future.result()
+                        paths.append(path_to_put_in_manifest)
+                        if on_path_hashed:
+                            on_path_hashed(path_to_put_in_manifest)
+                        if progress_tracker:
+                            if file_status == FileStatus.NEW or file_status == FileStatus.MODIFIED:
+                                progress_tracker.increase_processed(1, file_size)
+                            else:
+                                progress_tracker.increase_skipped(1, file_size)
+                            progress_tracker.report_progress()
 
             # Need to sort the list to keep it canonical
             paths.sort(key=lambda x: x.path, reverse=True)
@@ -894,10 +1935,13 @@ class S3AssetManager:
         local_type_locations: dict[str, str] = {},
         shared_type_locations: dict[str, str] = {},
         require_paths_exist: bool = False,
+        scanned_files: Optional[dict[str, ScannedFile]] = None,
     ) -> list[AssetRootGroup]:
         """
         For the given input paths and output paths, a list of groups is returned, where paths sharing
         the same root path are grouped together. Note that paths can be files or directories.
+        The input paths found in `scanned_files` are known to be files, so they aren't stat-ed again,
+        and their stats are kept in the `scanned_inputs` of their groups.
 
         The returned list satisfies the following conditions:
         - If a path is relative to any of the paths in the given `shared_type_locations` paths, it is
@@ -908,6 +1952,7 @@ class S3AssetManager:
         - The referenced paths may have no files or directories associated, but they always live
           relative to one of the AssetRootGroup objects returned.
         """
+        scanned_files = scanned_files or {}
         groupings: dict[str, AssetRootGroup] = {}
         missing_input_paths = set()
         misconfigured_directories = set()
@@ -916,7 +1961,8 @@ class S3AssetManager:
         for _path in input_paths:
             # Need to use absolute to not resolve symlinks, but need normpath to get rid of relative paths, i.e. '..'
             abs_path = Path(os.path.normpath(Path(_path).absolute()))
-            if not abs_path.exists():
+            scanned_file = scanned_files.get(_path)
+            if scanned_file is None and not abs_path.exists():
                 if require_paths_exist:
                     missing_input_paths.add(abs_path)
                 else:
@@ -925,7 +1971,7 @@ class S3AssetManager:
                     )
                     referenced_paths.add(_path)
                 continue
-            if abs_path.is_dir():
+            if scanned_file is None and abs_path.is_dir():
                 misconfigured_directories.add(abs_path)
                 continue
 
@@ -943,6 +1989,8 @@ class S3AssetManager:
             )
             matched_group = self._get_matched_group(matched_root, groupings)
             matched_group.inputs.add(abs_path)
+            if scanned_file is not None:
+                matched_group.scanned_inputs[abs_path] = scanned_file
 
         if missing_input_paths or misconfigured_directories:
             all_misconfigured_inputs = ""
@@ -1095,9 +2143,14 @@ class S3AssetManager:
         total_files = 0
         total_bytes = 0
         for group in groups:
-            input_paths = [str(input) for input in group.inputs]
+            input_paths = [
+                str(input) for input in group.inputs if input not in group.scanned_inputs
+            ]
             total_bytes += self._get_total_size_of_files(input_paths)
-            total_files += len(input_paths)
+            total_bytes += sum(
+                scanned_file.stat.st_size for scanned_file in group.scanned_inputs.values()
+            )
+            total_files += len(group.inputs)
         return (total_files, total_bytes)
 
     def _get_file_system_locations_by_type(
@@ -1125,6 +2178,7 @@ class S3AssetManager:
         referenced_paths: list[str],
         storage_profile: Optional[StorageProfile] = None,
         require_paths_exist: bool = False,
+        scanned_files: Optional[dict[str, ScannedFile]] = None,
     ) -> list[AssetRootGroup]:
         """
         Resolves all of the paths that will be uploaded, sorting by storage profile location.
@@ -1145,6 +2199,7 @@ class S3AssetManager:
             local_type_locations,
             shared_type_locations,
             require_paths_exist,
+            scanned_files,
         )
 
         return asset_groups
@@ -1156,11 +2211,14 @@ class S3AssetManager:
         referenced_paths: list[str],
         storage_profile: Optional[StorageProfile] = None,
         require_paths_exist: bool = False,
+        scanned_files: Optional[dict[str, ScannedFile]] = None,
     ) -> AssetUploadGroup:
         """
         Processes all of the paths required for upload, grouping them by asset root and local storage profile locations.
         Returns an object containing the grouped paths, which also includes a dictionary of input directories and file counts
         for files that were not under the root path or any local storage profile locations.
+        `scanned_files` are the stats of input paths found by scanning their directories, which are used instead of
+        stat-ing those paths again.
         """
         asset_groups = self._group_asset_paths(
             input_paths,
@@ -1168,6 +2226,7 @@ class S3AssetManager:
             referenced_paths,
             storage_profile,
             require_paths_exist,
+            scanned_files or {},
         )
         (input_file_count, input_bytes) = self._get_total_input_size_from_asset_group(asset_groups)
         return AssetUploadGroup(
@@ -1216,7 +2275,11 @@ class S3AssetManager:
                 # Create manifest, using local hash cache
                 with HashCache(hash_cache_dir) as hash_cache:
                     asset_manifest = self._create_manifest_file(
-                        sorted(list(group.inputs)), group.root_path, hash_cache, progress_tracker
+                        sorted(list(group.inputs)),
+                        group.root_path,
+                        hash_cache,
+                        progress_tracker,
+                        scanned_inputs=group.scanned_inputs,
                     )
 
             asset_root_manifests.append(
@@ -1319,3 +2382,249 @@ class S3AssetManager:
             progress_tracker.get_summary_statistics(),
             Attachments(manifests=manifest_properties_list),
         )
+
+    def hash_and_upload_assets(
+        self,
+        asset_groups: list[AssetRootGroup],
+        total_input_files: int,
+        total_input_bytes: int,
+        hash_cache_dir: Optional[str] = None,
+        s3_check_cache_dir: Optional[str] = None,
+        manifest_write_dir: Optional[str] = None,
+        on_preparing_to_submit: Optional[Callable[[Any], bool]] = None,
+        on_uploading_assets: Optional[Callable[[Any], bool]] = None,
+    ) -> tuple[SummaryStatistics, SummaryStatistics, Attachments]:
+        """
+        Does the work of `hash_assets_and_create_manifest` followed by `upload_assets`, but as a
+        pipeline: each file is queued for upload as soon as it's hashed, so that files are read
+        for hashing while others are being uploaded. Once all the files of an asset root have been
+        hashed and uploaded, its manifest is created in canonical order and uploaded.
+
+        Hashing and upload progress are reported at the same time, through their own callbacks.
+        If either callback returns False, or either stage fails, both stages are stopped.
+        Small files are not packed in this mode, even if the uploader is set to pack them.
+
+        Args:
+            asset_groups: the groups of paths to hash and upload, from `prepare_paths_for_upload`.
+            total_input_files: the total number of input files in the asset groups.
+            total_input_bytes: the total size of the input files in the asset groups.
+            hash_cache_dir: a path to local hash cache directory. If it's None, use default path.
+            s3_check_cache_dir: a path to local S3 check cache directory. If it's None, use default path.
+            on_preparing_to_submit: a callback to be called to periodically report hashing progress.
+            on_uploading_assets: a callback to be called to periodically report upload progress.
+            The callbacks return True if the operation should continue as normal, or False to cancel.
+
+        Returns:
+            a tuple with (1) the summary statistics of the hash operation, (2) the summary
+            statistics of the upload operation, and (3) the attachments of the uploaded manifests.
+        """
+        # This is a programming error if the user did not construct the object with Farm and Queue IDs.
+        if not self.farm_id or not self.queue_id:
+            logger.error("hash_and_upload_assets: Farm or Fleet ID is missing.")
+            raise JobAttachmentsError("hash_and_upload_assets: Farm or Fleet ID is missing.")
+
+        hashing_progress_tracker = ProgressTracker(
+            status=ProgressStatus.PREPARING_IN_PROGRESS,
+            total_files=total_input_files,
+            total_bytes=total_input_bytes,
+            on_progress_callback=on_preparing_to_submit,
+        )
+        upload_progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS,
+            total_files=total_input_files,
+            total_bytes=total_input_bytes,
+            on_progress_callback=on_uploading_assets,
+        )
+
+        start_time = time.perf_counter()
+
+        manifest_properties_list: list[ManifestProperties] = []
+
+        with S3CheckCache(s3_check_cache_dir) as s3_check_cache:
+            for group in asset_groups:
+                manifest_properties = ManifestProperties(
+                    fileSystemLocationName=group.file_system_location_name,
+                    rootPath=group.root_path,
+                    rootPathFormat=PathFormat.get_host_path_format(),
+                    outputRelativeDirectories=[
+                        str(path.relative_to(group.root_path)) for path in sorted(group.outputs)
+                    ],
+                )
+
+                # Might have output directories, but no inputs for this group
+                if group.inputs:
+                    asset_manifest = self._hash_and_upload_input_files(
+                        group,
+                        hash_cache_dir,
+                        s3_check_cache,
+                        hashing_progress_tracker,
+                        upload_progress_tracker,
+                    )
+                    (partial_manifest_key, asset_manifest_hash) = (
+                        self.asset_uploader.upload_manifest(
+                            job_attachment_settings=self.job_attachment_settings,  # type: ignore[arg-type]
+                            manifest=asset_manifest,
+                            source_root=Path(group.root_path),
+                            partial_manifest_prefix=self.job_attachment_settings.partial_manifest_prefix(  # type: ignore[union-attr]
+                                self.farm_id, self.queue_id
+                            ),
+                            file_system_location_name=group.file_system_location_name,
+                            manifest_write_dir=manifest_write_dir,
+                        )
+                    )
+                    manifest_properties.inputManifestPath = partial_manifest_key
+                    manifest_properties.inputManifestHash = asset_manifest_hash
+
+                manifest_properties_list.append(manifest_properties)
+
+        # to report progress 100% at the end
+        if self.asset_uploader.concurrency_controller is not None:
+            upload_progress_tracker.concurrency = (
+                self.asset_uploader.concurrency_controller.concurrency
+            )
+        upload_progress_tracker.report_progress()
+
+        hashing_progress_tracker.total_time = time.perf_counter() - start_time
+        upload_progress_tracker.total_time = hashing_progress_tracker.total_time
+
+        return (
+            hashing_progress_tracker.get_summary_statistics(),
+            upload_progress_tracker.get_summary_statistics(),
+            Attachments(manifests=manifest_properties_list),
+        )
+
+    def _hash_and_upload_input_files(
+        self,
+        group: AssetRootGroup,
+        hash_cache_dir: Optional[str],
+        s3_check_cache: S3CheckCache,
+        hashing_progress_tracker: ProgressTracker,
+        upload_progress_tracker: ProgressTracker,
+    ) -> BaseAssetManifest:
+        """
+        Hashes the input files of the given group and uploads them to the CAS as they are hashed.
+        Hashed files flow through bounded queues to upload worker threads: one queue for small
+        files, uploaded in parallel, and one for large files, uploaded one at a time with parallel
+        multi-part uploads, as in `S3AssetUploader.upload_input_files`. Returns the manifest.
+        """
+        asset_uploader = self.asset_uploader
+        manifest_model: Type[BaseManifestModel] = ManifestModelRegistry.get_manifest_model(
+            version=self.manifest_version
+        )
+        hash_alg: HashAlgorithm = manifest_model.AssetManifest.get_default_hash_alg()
+        s3_bucket: str = self.job_attachment_settings.s3BucketName  # type: ignore[union-attr]
+        s3_cas_prefix: str = self.job_attachment_settings.full_cas_prefix()  # type: ignore[union-attr]
+        source_root = Path(group.root_path)
+
+        num_small_file_workers = asset_uploader.num_upload_workers
+        small_file_queue: queue.Queue[Optional[base_manifest.BaseManifestPath]] = queue.Queue(
+            maxsize=num_small_file_workers * UPLOAD_PIPELINE_QUEUE_SIZE_PER_WORKER
+        )
+        large_file_queue: queue.Queue[Optional[base_manifest.BaseManifestPath]] = queue.Queue(
+            maxsize=UPLOAD_PIPELINE_QUEUE_SIZE_PER_WORKER
+        )
+        # Set when either stage fails or is cancelled. The upload workers then drain their queues
+        # without uploading, so that the hashing stage never waits on a full queue.
+        stop = threading.Event()
+        upload_errors: list[BaseException] = []
+        queued_hashes: set[str] = set()
+
+        def upload_worker(
+            file_queue: queue.Queue[Optional[base_manifest.BaseManifestPath]],
+            upload_function: Callable[..., Tuple[bool, int]],
+        ) -> None:
+            while True:
+                file = file_queue.get()
+                if file is None:
+                    return
+                if stop.is_set():
+                    continue
+                try:
+                    (is_uploaded, file_size) = upload_function(
+                        file,
+                        hash_alg,
+                        s3_bucket,
+                        source_root,
+                        s3_cas_prefix,
+                        s3_check_cache,
+                        upload_progress_tracker,
+                    )
+                    if not is_uploaded:
+                        upload_progress_tracker.increase_skipped(1, file_size)
+                    if not upload_progress_tracker.report_progress():
+                        raise AssetSyncCancelledError(
+                            "File upload cancelled.",
+                            upload_progress_tracker.get_summary_statistics(),
+                        )
+                except BaseException as e:
+                    upload_errors.append(e)
+                    stop.set()
+                    # Stop hashing the files that haven't been hashed yet.
+                    hashing_progress_tracker.continue_reporting = False
+
+        def queue_for_upload(file: base_manifest.BaseManifestPath) -> None:
+            if stop.is_set():
+                raise upload_errors[0]
+            # Paths with the same hash have the same content, so only one object per hash
+            # is uploaded. The other paths with that hash are reported as skipped.
+            if file.hash in queued_hashes:
+                upload_progress_tracker.increase_skipped(1, file.size)
+                return
+            queued_hashes.add(file.hash)
+
+            file_queue = (
+                small_file_queue
+                if file.size <= asset_uploader.small_file_threshold
+                else large_file_queue
+            )
+            while True:
+                try:
+                    file_queue.put(file, timeout=0.1)
+                    return
+                except queue.Full:
+                    if stop.is_set():
+                        raise upload_errors[0]
+
+        with asset_uploader.watch_concurrency(), concurrent.futures.ThreadPoolExecutor(
+            max_workers=num_small_file_workers + 1
+        ) as executor:
+            futures = [
+                executor.submit(
+                    upload_worker, small_file_queue, asset_uploader.upload_small_object_to_cas
+                )
+                for _ in range(num_small_file_workers)
+            ]
+            futures.append(
+                executor.submit(
+                    upload_worker, large_file_queue, asset_uploader.upload_object_to_cas
+                )
+            )
+
+            try:
+                with HashCache(hash_cache_dir) as hash_cache:
+                    asset_manifest = self._create_manifest_file(
+                        sorted(list(group.inputs)),
+                        group.root_path,
+                        hash_cache,
+                        hashing_progress_tracker,
+                        on_path_hashed=queue_for_upload,
+                        scanned_inputs=group.scanned_inputs,
+                    )
+            except BaseException:
+                stop.set()
+                if upload_errors:
+                    raise upload_errors[0]
+                raise
+            finally:
+                for _ in range(num_small_file_workers):
+                    small_file_queue.put(None)
+                large_file_queue.put(None)
+
+            # surfaces any exceptions in the threads
+            for future in futures:
+                future.result()
+
+        if upload_errors:
+            raise upload_errors[0]
+
+        return asset_manifest
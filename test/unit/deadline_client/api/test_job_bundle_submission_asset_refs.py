@@ -381,6 +381,7 @@ def test_create_job_from_job_bundle_with_all_asset_ref_variants(
             referenced_paths=referenced_paths,
             storage_profile=None,
             require_paths_exist=False,
+            scanned_files=ANY,
         )
         mock_hash_assets.assert_called_once_with(
             asset_groups=[AssetRootGroup()],
@@ -35,7 +35,7 @@ def test_cli_config_show_defaults(fresh_deadline_config):
     assert fresh_deadline_config in result.output
 
     # Assert the expected number of settings
-    assert len(settings.keys()) == 15
+    assert len(settings.keys()) == 26
 
     for setting_name in settings.keys():
         assert setting_name in result.output
@@ -104,6 +104,17 @@ def test_cli_config_show_modified_config(fresh_deadline_config):
     config.set_setting("telemetry.identifier", "user-id-123abc-456def")
     config.set_setting("settings.s3_max_pool_connections", "100")
     config.set_setting("settings.small_file_threshold_multiplier", "15")
+    config.set_setting("settings.hashing_engine", "PROCESS")
+    config.set_setting("settings.pack_small_files", "true")
+    config.set_setting("settings.compress_manifests", "on")
+    config.set_setting("settings.pipelined_upload", "true")
+    config.set_setting("settings.adaptive_concurrency", "true")
+    config.set_setting("settings.transfer_engine", "ASYNCIO")
+    config.set_setting("settings.large_file_upload_max_in_flight_mb", "2048")
+    config.set_setting("settings.large_file_upload_max_parts_in_flight", "25")
+    config.set_setting("settings.download_cache", "yes")
+    config.set_setting("settings.download_cache_dir", "/mnt/cache/downloads")
+    config.set_setting("settings.download_cache_max_size_mb", "4096")
 
     runner = CliRunner()
     result = runner.invoke(main, ["config", "show"])
@@ -122,6 +133,7 @@ def test_cli_config_show_modified_config(fresh_deadline_config):
     assert "job-239u40234jkl234nkl23" in result.output
     assert "CREATE_COPY" in result.output
     assert "DEBUG" in result.output
+    assert "PROCESS" in result.output
     assert "user-id-123abc-456def" in result.output
     # It shouldn't say anywhere that there is a default setting
     assert "(default)" not in result.output
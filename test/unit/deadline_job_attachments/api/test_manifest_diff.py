@@ -4,9 +4,9 @@ import json
 import os
 from pathlib import Path
 import tempfile
-from typing import Optional
+from typing import List, Optional, Tuple
 from deadline.job_attachments.api.manifest import _manifest_diff, _manifest_snapshot
-from deadline.job_attachments.models import ManifestDiff, ManifestSnapshot
+from deadline.job_attachments.models import FileStatus, ManifestDiff, ManifestSnapshot
 import pytest
 
 
@@ -128,3 +128,27 @@ class TestDiffAPI:
         assert len(manifest_diff.deleted) == 0
         assert len(manifest_diff.modified) == 1
         assert TEST_FILE in manifest_diff.modified
+
+    def test_diff_reports_each_difference(self, temp_dir):
+        """
+        Diff with the same folder, with a new and a deleted file. Each difference should be passed
+        to the callback as it's found, and also be in the returned result.
+        """
+        # Given
+        root_dir = os.path.join(temp_dir, "snapshot")
+        manifest_file = self._snapshot_folder_helper(temp_dir=temp_dir, root_dir=root_dir)
+        os.remove(os.path.join(root_dir, TEST_FILE))
+        Path(os.path.join(root_dir, "new_file")).touch()
+        reported: List[Tuple[FileStatus, str]] = []
+
+        # When
+        manifest_diff: ManifestDiff = _manifest_diff(
+            root=root_dir,
+            manifest=manifest_file,
+            on_diff_item=lambda status, path: reported.append((status, path)),
+        )
+
+        # Then
+        assert reported == [(FileStatus.NEW, "new_file"), (FileStatus.DELETED, TEST_FILE)]
+        assert manifest_diff.new == ["new_file"]
+        assert manifest_diff.deleted == [TEST_FILE]
@@ -0,0 +1,138 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+""" Tests for the asset_manifests._canonical_json module """
+from __future__ import annotations
+
+import dataclasses
+import io
+import json
+import os
+import random
+
+import pytest
+
+from deadline.job_attachments.asset_manifests import BaseManifestPath, HashAlgorithm, decode
+from deadline.job_attachments.asset_manifests._canonical_json import (
+    canonical_path_comparator,
+    path_to_canonical_json_string,
+    sort_paths_canonically,
+    write_manifest_canonical_json,
+)
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest, ManifestPath
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+
+@pytest.mark.parametrize(
+    "golden_file_name",
+    [
+        "manifest_v2023_03_03.json",
+        "manifest_v2023_03_03_escapes.json",
+    ],
+)
+def test_encode_matches_golden_file(golden_file_name: str):
+    """
+    Test that a manifest encodes to the exact bytes of its canonical golden file, whatever the
+    order of its paths. The golden files were written by encoding the manifests with
+    `json.dumps(dataclasses.asdict(manifest), sort_keys=True, ...)`.
+    """
+    with open(os.path.join(DATA_DIR, golden_file_name), encoding="utf-8") as golden_file:
+        golden = golden_file.read()
+    manifest = decode.decode_manifest(golden)
+    random.Random(0).shuffle(manifest.paths)
+
+    assert manifest.encode() == golden
+
+
+@pytest.mark.parametrize(
+    "paths",
+    [
+        pytest.param(["b.txt", "a/b.txt", "a.txt", "A.txt", "a b.txt"], id="ascii"),
+        pytest.param(["\U0001f600.txt", ".txt", "\ud83d.txt", "é.txt", "e.txt"], id="non-ascii"),
+        pytest.param([], id="empty"),
+    ],
+)
+def test_encode_matches_json_dumps(paths: list[str]):
+    """
+    Test that a manifest encodes to the same JSON as `json.dumps` of its fields, in the order of
+    `canonical_path_comparator`.
+    """
+    manifest = AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=[
+            ManifestPath(path=path, hash=f"hash{i}", size=i, mtime=1234000000 + i)
+            for (i, path) in enumerate(paths)
+        ],
+        total_size=sum(range(len(paths))),
+    )
+
+    encoded = manifest.encode()
+
+    assert [path.path for path in manifest.paths] == [
+        path.path for path in sorted(manifest.paths, key=canonical_path_comparator)
+    ]
+    assert encoded == json.dumps(
+        dataclasses.asdict(manifest), sort_keys=True, separators=(",", ":"), ensure_ascii=True
+    )
+
+
+@pytest.mark.parametrize(
+    "golden_file_name",
+    [
+        "manifest_v2023_03_03.json",
+        "manifest_v2023_03_03_escapes.json",
+    ],
+)
+def test_write_manifest_canonical_json(golden_file_name: str):
+    """
+    Test that the JSON written to a file is the same as the encoded manifest, and that the given
+    paths are written instead of the paths of the manifest.
+    """
+    with open(os.path.join(DATA_DIR, golden_file_name), "r", encoding="utf-8") as f:
+        manifest = decode.decode_manifest(f.read())
+    file = io.StringIO()
+    empty_manifest = AssetManifest(hash_alg=manifest.hashAlg, paths=[], total_size=0)
+    empty_manifest_file = io.StringIO()
+
+    write_manifest_canonical_json(manifest, file)
+    write_manifest_canonical_json(empty_manifest, empty_manifest_file, paths=manifest.paths)
+
+    assert file.getvalue() == manifest.encode()
+    assert (
+        json.loads(empty_manifest_file.getvalue())["paths"]
+        == json.loads(manifest.encode())["paths"]
+    )
+
+
+def test_path_to_canonical_json_string():
+    """
+    Test that a path is written with the same escaping as `json.dumps`.
+    """
+    path = ManifestPath(path='dir/"quoted"\\\t \udc80.txt', hash="abc", size=0, mtime=1)
+
+    assert path_to_canonical_json_string(path) == json.dumps(
+        dataclasses.asdict(path), sort_keys=True, separators=(",", ":"), ensure_ascii=True
+    )
+
+
+def test_sort_paths_canonically_ascii_matches_comparator():
+    """
+    Test that ASCII paths, which are sorted without encoding them, are sorted in the order of
+    `canonical_path_comparator`.
+    """
+    rng = random.Random(0)
+    paths: list[BaseManifestPath] = [
+        ManifestPath(
+            path="".join(chr(rng.randrange(0, 128)) for _ in range(rng.randrange(1, 8))),
+            hash="abc",
+            size=0,
+            mtime=0,
+        )
+        for _ in range(1000)
+    ]
+
+    sort_paths_canonically(paths)
+
+    assert [path.path for path in paths] == [
+        path.path for path in sorted(paths, key=canonical_path_comparator)
+    ]
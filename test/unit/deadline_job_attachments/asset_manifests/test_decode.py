@@ -4,6 +4,7 @@
 from __future__ import annotations
 from enum import Enum
 
+import gzip
 import json
 from dataclasses import dataclass
 import re
@@ -203,3 +204,101 @@ def test_decode_manifest_hash_not_alphanumeric():
                 "}"
             )
             decode.decode_manifest(manifest_str)
+
+
+VALID_PATH_V2023_03_03 = {"hash": "a", "mtime": 1679079744833848, "path": "a.txt", "size": 1}
+
+
+@pytest.mark.parametrize(
+    "manifest_data",
+    [
+        pytest.param([], id="not an object"),
+        pytest.param({"manifestVersion": "2023-03-03"}, id="missing fields"),
+        pytest.param({"hashAlg": "md5"}, id="unknown hash algorithm"),
+        pytest.param({"totalSize": "10"}, id="string total size"),
+        pytest.param({"totalSize": True}, id="boolean total size"),
+        pytest.param({"totalSize": 10.0}, id="integral float total size"),
+        pytest.param({"paths": []}, id="no paths"),
+        pytest.param({"paths": {}}, id="paths not an array"),
+        pytest.param({"paths": ["a.txt"]}, id="path not an object"),
+        pytest.param(
+            {"paths": [{"hash": "a", "path": "a.txt", "size": 1}]}, id="path missing mtime"
+        ),
+        pytest.param({"paths": [{**VALID_PATH_V2023_03_03, "size": 1.5}]}, id="float size"),
+        pytest.param({"paths": [{**VALID_PATH_V2023_03_03, "path": 1}]}, id="path not a string"),
+        pytest.param({"paths": [{**VALID_PATH_V2023_03_03, "hash": None}]}, id="null hash"),
+        pytest.param({"paths": [{**VALID_PATH_V2023_03_03, "hash": ""}]}, id="empty hash"),
+        pytest.param({"paths": [{**VALID_PATH_V2023_03_03, "hash": "ab+c"}]}, id="symbol in hash"),
+        pytest.param({"paths": [{**VALID_PATH_V2023_03_03, "hash": "ăb"}]}, id="non-ascii hash"),
+        pytest.param(
+            {"paths": [{**VALID_PATH_V2023_03_03, "size": "1", "hash": "a.b"}]},
+            id="not valid structure and hash",
+        ),
+        pytest.param({"paths": [{**VALID_PATH_V2023_03_03, "extra": 1}]}, id="extra path field"),
+        pytest.param({"extra": 1}, id="extra manifest field"),
+        pytest.param({}, id="valid"),
+    ],
+)
+def test_decode_manifest_fast_validation_matches_strict(manifest_data: Any):
+    """
+    Test that decoding a manifest with the fast validation accepts the same manifests, and raises
+    the same errors, as decoding it with the strict jsonschema validation.
+    """
+    if isinstance(manifest_data, dict):
+        manifest_data = {
+            "hashAlg": "xxh128",
+            "manifestVersion": "2023-03-03",
+            "paths": [VALID_PATH_V2023_03_03],
+            "totalSize": 1,
+            **manifest_data,
+        }
+    manifest_str = json.dumps(manifest_data)
+
+    def decode_or_error(strict: bool) -> Any:
+        try:
+            return decode.decode_manifest(manifest_str, strict=strict).encode()
+        except (ManifestDecodeValidationError, TypeError) as e:
+            return (type(e), str(e))
+
+    assert decode_or_error(strict=False) == decode_or_error(strict=True)
+
+
+def test_decode_manifest_fast_validation_skips_jsonschema(default_manifest_str_v2023_03_03: str):
+    """
+    Test that a valid manifest is decoded without validating it with jsonschema, unless strict.
+    """
+    with patch(
+        f"{deadline.__package__}.job_attachments.asset_manifests.decode.validate_manifest",
+        wraps=decode.validate_manifest,
+    ) as mock_validate_manifest:
+        fast_manifest = decode.decode_manifest(default_manifest_str_v2023_03_03)
+        mock_validate_manifest.assert_not_called()
+
+        strict_manifest = decode.decode_manifest(default_manifest_str_v2023_03_03, strict=True)
+        mock_validate_manifest.assert_called_once()
+
+    assert fast_manifest.encode() == strict_manifest.encode()
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_decode_manifest_bytes(default_manifest_str_v2023_03_03: str, compress: bool):
+    """
+    Test that the bytes of a manifest decode the same whether they are gzip-compressed or not.
+    """
+    manifest_bytes = default_manifest_str_v2023_03_03.encode("utf-8")
+    if compress:
+        manifest_bytes = gzip.compress(manifest_bytes)
+
+    manifest = decode.decode_manifest_bytes(manifest_bytes)
+
+    assert manifest.encode() == decode.decode_manifest(default_manifest_str_v2023_03_03).encode()
+
+
+def test_decode_manifest_bytes_corrupt_gzip(default_manifest_str_v2023_03_03: str):
+    """
+    Test that a truncated gzip-compressed manifest raises a ManifestDecodeValidationError.
+    """
+    manifest_bytes = gzip.compress(default_manifest_str_v2023_03_03.encode("utf-8"))
+
+    with pytest.raises(ManifestDecodeValidationError):
+        decode.decode_manifest_bytes(manifest_bytes[:-10])
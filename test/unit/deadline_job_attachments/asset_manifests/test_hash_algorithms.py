@@ -0,0 +1,58 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the hashing algorithms used by asset manifests"""
+
+import os
+from pathlib import Path
+
+import pytest
+from xxhash import xxh3_128_hexdigest
+
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_file, hash_files
+from deadline.job_attachments.asset_manifests.hash_algorithms import HASH_FILE_CHUNK_SIZE
+
+
+@pytest.mark.parametrize(
+    "file_size",
+    [
+        pytest.param(0, id="empty"),
+        pytest.param(1, id="one byte"),
+        pytest.param(HASH_FILE_CHUNK_SIZE - 1, id="just under the chunk size"),
+        pytest.param(HASH_FILE_CHUNK_SIZE, id="exactly the chunk size"),
+        pytest.param(HASH_FILE_CHUNK_SIZE + 1, id="just over the chunk size"),
+        pytest.param(3 * HASH_FILE_CHUNK_SIZE + 7, id="several chunks"),
+    ],
+)
+def test_hash_file_matches_hash_of_whole_file(tmp_path: Path, file_size: int):
+    """
+    Test that hashing a file gives the same digest as hashing its full contents at once,
+    whether the file is read in a single call or in chunks.
+    """
+    # GIVEN
+    data = os.urandom(file_size)
+    file_path = tmp_path / "file.bin"
+    file_path.write_bytes(data)
+
+    # WHEN
+    file_hash = hash_file(str(file_path), HashAlgorithm.XXH128)
+
+    # THEN
+    assert file_hash == xxh3_128_hexdigest(data)
+
+
+def test_hash_files(tmp_path: Path):
+    """
+    Test that hashing a batch of files returns their hashes in the same order as the given paths.
+    """
+    # GIVEN
+    file_paths = []
+    for i in range(5):
+        file_path = tmp_path / f"file_{i}.txt"
+        file_path.write_text(f"contents {i}")
+        file_paths.append(str(file_path))
+
+    # WHEN
+    file_hashes = hash_files(file_paths, HashAlgorithm.XXH128)
+
+    # THEN
+    assert file_hashes == [hash_file(file_path, HashAlgorithm.XXH128) for file_path in file_paths]
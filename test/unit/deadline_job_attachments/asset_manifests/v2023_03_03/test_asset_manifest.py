@@ -1,8 +1,11 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 """ Tests for the v2023-03-03 version of the manifest file. """
+import dataclasses
 import json
 
+import pytest
+
 from deadline.job_attachments.asset_manifests.v2023_03_03.asset_manifest import (
     AssetManifest,
     ManifestPath,
@@ -88,3 +91,18 @@ def test_decode(default_manifest_str_v2023_03_03: str):
     assert (
         AssetManifest.decode(manifest_data=json.loads(default_manifest_str_v2023_03_03)) == expected
     )
+
+
+def test_manifest_path_has_no_dict():
+    """
+    Test that manifest paths store their fields in slots rather than a per-instance dictionary,
+    and still behave as data classes.
+    """
+    path = ManifestPath(path="a.txt", hash="abc", size=1, mtime=2)
+
+    assert not hasattr(path, "__dict__")
+    assert dataclasses.asdict(path) == {"path": "a.txt", "hash": "abc", "size": 1, "mtime": 2}
+    path.hash = "def"
+    assert path.hash == "def"
+    with pytest.raises(AttributeError):
+        path.other = "value"  # type: ignore[attr-defined]
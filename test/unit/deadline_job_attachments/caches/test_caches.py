@@ -1,17 +1,21 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 import os
+import time
 from datetime import datetime
+from pathlib import Path
 from sqlite3 import OperationalError
+from typing import Tuple
 from unittest.mock import patch
 
 import pytest
 
 import deadline
-from deadline.job_attachments.asset_manifests import HashAlgorithm
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data
 from deadline.job_attachments.exceptions import JobAttachmentsError
 from deadline.job_attachments.caches import (
     CacheDB,
+    DownloadCache,
     HashCache,
     HashCacheEntry,
     S3CheckCache,
@@ -118,6 +122,133 @@ class TestHashCache:
             # THEN
             assert actual_entry == expected_entry
 
+    def test_enter_enables_wal_journal_mode(self, tmpdir):
+        """
+        Tests that the cache database uses write-ahead logging
+        """
+        with HashCache(tmpdir.mkdir("cache")) as hc:
+            assert hc.db_connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_put_entry_is_written_on_exit(self, tmpdir):
+        """
+        Tests that buffered entries are written to the database when the context manager exits
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        expected_entry = HashCacheEntry(
+            file_path="/some/file",
+            hash_algorithm=HashAlgorithm.XXH128,
+            file_hash="hash",
+            last_modified_time="1234.5678",
+        )
+
+        # WHEN
+        with HashCache(cache_dir) as hc:
+            hc.put_entry(expected_entry)
+            assert hc.db_connection.execute(f"SELECT * FROM {hc.table_name}").fetchall() == []
+
+        # THEN
+        with HashCache(cache_dir) as hc:
+            assert hc.get_entry("/some/file", HashAlgorithm.XXH128) == expected_entry
+
+    def test_put_entry_writes_full_batches(self, tmpdir):
+        """
+        Tests that buffered entries are written to the database once a full batch is buffered
+        """
+        with patch(
+            f"{deadline.__package__}.job_attachments.caches.hash_cache.HASH_CACHE_WRITE_BATCH_SIZE",
+            3,
+        ):
+            with HashCache(tmpdir.mkdir("cache")) as hc:
+                for i in range(4):
+                    hc.put_entry(
+                        HashCacheEntry(
+                            file_path=f"/some/file{i}",
+                            hash_algorithm=HashAlgorithm.XXH128,
+                            file_hash=f"hash{i}",
+                            last_modified_time="1234.5678",
+                        )
+                    )
+                rows = hc.db_connection.execute(f"SELECT * FROM {hc.table_name}").fetchall()
+                assert len(rows) == 3
+
+                hc.flush()
+                rows = hc.db_connection.execute(f"SELECT * FROM {hc.table_name}").fetchall()
+                assert len(rows) == 4
+
+    def test_get_entries(self, tmpdir):
+        """
+        Tests that entries are looked up in bulk, including entries that are still buffered,
+        and that paths not in the cache are left out
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        entries = [
+            HashCacheEntry(
+                file_path=f"/some/file{i}",
+                hash_algorithm=HashAlgorithm.XXH128,
+                file_hash=f"hash{i}",
+                last_modified_time="1234.5678",
+            )
+            for i in range(1200)
+        ]
+        buffered_entry = HashCacheEntry(
+            file_path="/some/buffered_file",
+            hash_algorithm=HashAlgorithm.XXH128,
+            file_hash="buffered_hash",
+            last_modified_time="1234.5678",
+        )
+        with HashCache(cache_dir) as hc:
+            for entry in entries:
+                hc.put_entry(entry)
+
+        # WHEN
+        with HashCache(cache_dir) as hc:
+            hc.put_entry(buffered_entry)
+            actual_entries = hc.get_entries(
+                [entry.file_path for entry in entries] + ["/some/buffered_file", "/not/cached"],
+                HashAlgorithm.XXH128,
+            )
+
+        # THEN
+        assert actual_entries == {
+            **{entry.file_path: entry for entry in entries},
+            "/some/buffered_file": buffered_entry,
+        }
+
+    def test_prefetch_entries(self, tmpdir):
+        """
+        Tests that prefetched entries are returned by get_entry without querying the database,
+        and that entries put after the prefetch take precedence
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        entry = HashCacheEntry(
+            file_path="/some/file",
+            hash_algorithm=HashAlgorithm.XXH128,
+            file_hash="hash",
+            last_modified_time="1234.5678",
+        )
+        updated_entry = HashCacheEntry(
+            file_path="/some/file",
+            hash_algorithm=HashAlgorithm.XXH128,
+            file_hash="new_hash",
+            last_modified_time="2345.6789",
+        )
+        with HashCache(cache_dir) as hc:
+            hc.put_entry(entry)
+
+        with HashCache(cache_dir) as hc:
+            # WHEN
+            hc.prefetch_entries(["/some/file", "/not/cached"], HashAlgorithm.XXH128)
+            hc.db_connection.execute(f"DELETE FROM {hc.table_name}")
+
+            # THEN
+            assert hc.get_entry("/some/file", HashAlgorithm.XXH128) == entry
+            assert hc.get_entry("/not/cached", HashAlgorithm.XXH128) is None
+            hc.put_entry(updated_entry)
+            assert hc.get_entry("/some/file", HashAlgorithm.XXH128) == updated_entry
+
     def test_enter_sqlite_import_error(self, tmpdir):
         """
         Tests that the cache doesn't throw errors when the SQLite module can't be found
@@ -210,3 +341,141 @@ class TestS3CheckCache:
                     )
                 )
                 assert s3c.get_entry("bucket/Data/somehash") is None
+
+
+class TestDownloadCache:
+    """
+    Tests for the local cache of downloaded CAS objects
+    """
+
+    def _download_file(self, tmp_path, data: bytes) -> Tuple[Path, str]:
+        downloaded_file = tmp_path / f"downloaded-{len(list(tmp_path.iterdir()))}.txt"
+        downloaded_file.write_bytes(data)
+        return (downloaded_file, hash_data(data, HashAlgorithm.XXH128))
+
+    def test_put_and_get(self, tmp_path):
+        """
+        Tests that a cached object is copied to the local path, and that hits, misses and the
+        bytes saved are counted.
+        """
+        # GIVEN
+        download_cache = DownloadCache(str(tmp_path / "cache"), 1024, "bucket", "root/Data")
+        (downloaded_file, file_hash) = self._download_file(tmp_path, b"contents")
+
+        # WHEN
+        assert not download_cache.get(file_hash, HashAlgorithm.XXH128, 8, tmp_path / "first.txt")
+        download_cache.put(file_hash, HashAlgorithm.XXH128, downloaded_file)
+        is_hit = download_cache.get(file_hash, HashAlgorithm.XXH128, 8, tmp_path / "second.txt")
+
+        # THEN
+        assert is_hit
+        entry_path = Path(download_cache.cas_dir) / file_hash[:2] / f"{file_hash}.xxh128"
+        assert entry_path.read_bytes() == b"contents"
+        assert entry_path.parent.parent.parent == tmp_path / "cache"
+        assert (tmp_path / "second.txt").read_bytes() == b"contents"
+        assert not (tmp_path / "first.txt").exists()
+        assert (download_cache.hits, download_cache.misses, download_cache.bytes_saved) == (
+            1,
+            1,
+            8,
+        )
+
+    @pytest.mark.parametrize(
+        "s3_bucket, cas_prefix",
+        [("other-bucket", "root/Data"), ("bucket", "other-root/Data")],
+    )
+    def test_entries_are_not_shared_between_cas(self, tmp_path, s3_bucket, cas_prefix):
+        """
+        Tests that an object cached from one bucket and CAS prefix is a miss for another, so that
+        sessions only get the objects that their credentials can download.
+        """
+        # GIVEN
+        download_cache = DownloadCache(str(tmp_path / "cache"), 1024, "bucket", "root/Data")
+        other_download_cache = DownloadCache(str(tmp_path / "cache"), 1024, s3_bucket, cas_prefix)
+        (downloaded_file, file_hash) = self._download_file(tmp_path, b"contents")
+        download_cache.put(file_hash, HashAlgorithm.XXH128, downloaded_file)
+
+        # WHEN
+        is_hit = other_download_cache.get(
+            file_hash, HashAlgorithm.XXH128, 8, tmp_path / "local.txt"
+        )
+
+        # THEN
+        assert not is_hit
+        assert not (tmp_path / "local.txt").exists()
+
+    def test_put_with_wrong_hash_is_not_cached(self, tmp_path):
+        """
+        Tests that a downloaded file that doesn't match its hash isn't added to the cache.
+        """
+        download_cache = DownloadCache(str(tmp_path / "cache"), 1024, "bucket", "root/Data")
+        (downloaded_file, _) = self._download_file(tmp_path, b"contents")
+        wrong_hash = hash_data(b"other contents", HashAlgorithm.XXH128)
+
+        download_cache.put(wrong_hash, HashAlgorithm.XXH128, downloaded_file)
+
+        assert not download_cache.get(wrong_hash, HashAlgorithm.XXH128, 8, tmp_path / "local.txt")
+        assert [path for path in (tmp_path / "cache").rglob("*") if path.is_file()] == []
+
+    def test_get_with_different_size_removes_the_entry(self, tmp_path):
+        """
+        Tests that an entry whose size doesn't match the expected size is treated as corrupted:
+        it isn't used, and it is removed from the cache.
+        """
+        download_cache = DownloadCache(str(tmp_path / "cache"), 1024, "bucket", "root/Data")
+        (downloaded_file, file_hash) = self._download_file(tmp_path, b"contents")
+        download_cache.put(file_hash, HashAlgorithm.XXH128, downloaded_file)
+
+        assert not download_cache.get(file_hash, HashAlgorithm.XXH128, 5, tmp_path / "local.txt")
+        assert not (tmp_path / "local.txt").exists()
+        assert download_cache.misses == 1
+        assert [path for path in (tmp_path / "cache").rglob("*") if path.is_file()] == []
+
+    @pytest.mark.parametrize("file_hash", ["../../escaped", "a/b", ""])
+    def test_hashes_that_are_not_paths_are_not_cached(self, tmp_path, file_hash):
+        """
+        Tests that a hash that isn't alphanumeric is never used to build a path.
+        """
+        download_cache = DownloadCache(str(tmp_path / "cache"), 1024, "bucket", "root/Data")
+        (downloaded_file, _) = self._download_file(tmp_path, b"contents")
+
+        download_cache.put(file_hash, HashAlgorithm.XXH128, downloaded_file)
+
+        assert not download_cache.get(file_hash, HashAlgorithm.XXH128, 8, tmp_path / "local.txt")
+        assert [path for path in tmp_path.rglob("*") if path.is_file()] == [downloaded_file]
+
+    def test_evict_removes_least_recently_used_entries(self, tmp_path):
+        """
+        Tests that eviction removes the least recently used entries of every CAS until the cache
+        is within its size limit, and removes stale temporary files.
+        """
+        # GIVEN
+        download_caches = [
+            DownloadCache(str(tmp_path / "cache"), 25, "bucket", "root/Data"),
+            DownloadCache(str(tmp_path / "cache"), 25, "other-bucket", "root/Data"),
+        ]
+        now = time.time()
+        entries = []
+        for i in range(4):
+            download_cache = download_caches[i % 2]
+            (downloaded_file, file_hash) = self._download_file(tmp_path, f"012345678{i}".encode())
+            download_cache.put(file_hash, HashAlgorithm.XXH128, downloaded_file)
+            entry_path = Path(download_cache.cas_dir) / file_hash[:2] / f"{file_hash}.xxh128"
+            entry_time = now - 100 + i
+            os.utime(entry_path, (entry_time, entry_time))
+            entries.append((download_cache, file_hash, entry_path))
+        # Using an entry makes it the most recently used.
+        (first_cache, first_hash, _) = entries[0]
+        assert first_cache.get(first_hash, HashAlgorithm.XXH128, 10, tmp_path / "local.txt")
+        stale_temp_file = Path(download_caches[0].cas_dir) / "ee" / "ee05.xxh128.1234abcd.tmp"
+        stale_temp_file.parent.mkdir()
+        stale_temp_file.write_bytes(b"partial")
+        os.utime(stale_temp_file, (now - 7200, now - 7200))
+
+        # WHEN
+        removed_bytes = download_caches[0].evict()
+
+        # THEN
+        assert removed_bytes == 20
+        remaining = sorted(path for path in (tmp_path / "cache").rglob("*") if path.is_file())
+        assert remaining == sorted([entries[0][2], entries[3][2]])
@@ -6,6 +6,7 @@ import json
 from logging import getLogger
 import os
 import shutil
+import time
 from math import trunc
 from pathlib import Path
 from typing import Optional, Dict
@@ -16,7 +17,9 @@ import pytest
 from moto import mock_aws
 
 import deadline
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data
 from deadline.job_attachments.asset_manifests.decode import decode_manifest
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest
 from deadline.job_attachments.asset_sync import AssetSync
 from deadline.job_attachments.os_file_permission import PosixFileSystemPermissionSettings
 
@@ -28,6 +31,8 @@ from deadline.job_attachments.exceptions import (
 )
 from deadline.job_attachments.models import (
     Attachments,
+    FileConflictResolution,
+    HashingEngine,
     Job,
     JobAttachmentsFileSystem,
     JobAttachmentS3Settings,
@@ -40,6 +45,7 @@ from deadline.job_attachments.progress_tracker import (
     ProgressStatus,
     SummaryStatistics,
 )
+from deadline.job_attachments._scan import ScannedFile, _scan_directory
 from deadline.job_attachments._utils import _human_readable_file_size
 from ..conftest import is_windows_non_admin
 
@@ -217,8 +223,8 @@ class TestAssetSync:
 
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -259,6 +265,58 @@ class TestAssetSync:
                 }
             ]
 
+    def test_sync_inputs_logs_download_cache_stats(
+        self,
+        tmp_path: Path,
+        default_queue: Queue,
+        default_job: Job,
+        test_manifest_one: dict,
+    ):
+        """
+        Asserts that sync_inputs logs the download cache hits, misses and bytes saved, which
+        aren't part of the summary statistics it returns.
+        """
+        # GIVEN
+        test_manifest = decode_manifest(json.dumps(test_manifest_one))
+        download_summary_statistics = DownloadSummaryStatistics(
+            processed_files=1,
+            cache_hits=3,
+            cache_misses=1,
+            cache_bytes_saved=300,
+            file_counts_by_root_directory={str(tmp_path): 4},
+        )
+        assert default_job.attachments
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
+        ), patch(
+            f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
+            return_value=download_summary_statistics,
+        ), patch(
+            f"{deadline.__package__}.job_attachments.asset_sync._get_unique_dest_dir_name",
+            side_effect=["assetroot-27bggh78dd2b568ab123"],
+        ), patch.object(
+            Path, "stat", MagicMock(st_mtime_ns=1234512345123451)
+        ), patch.object(
+            self.default_asset_sync, "logger"
+        ) as mock_logger:
+            (summary_statistics, _) = self.default_asset_sync.sync_inputs(
+                default_queue.jobAttachmentSettings,
+                default_job.attachments,
+                default_queue.queueId,
+                default_job.jobId,
+                tmp_path,
+                on_downloading_files=MagicMock(return_value=True),
+            )
+
+        # THEN
+        assert summary_statistics == SummaryStatistics(processed_files=1)
+        mock_logger.info.assert_any_call(
+            "Copied 3 of 4 files totaling 300.0 B from the download cache."
+        )
+
     @pytest.mark.parametrize(
         ("job_fixture_name"),
         [
@@ -298,8 +356,8 @@ class TestAssetSync:
 
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync._get_unique_dest_dir_name",
             side_effect=[dest_dir],
@@ -351,8 +409,8 @@ class TestAssetSync:
 
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -430,8 +488,8 @@ class TestAssetSync:
 
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=json.dumps(test_manifest_one),
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(json.dumps(test_manifest_one), None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -527,8 +585,8 @@ class TestAssetSync:
 
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -630,7 +688,10 @@ class TestAssetSync:
         # WHEN
         with patch(
             f"{deadline.__package__}.job_attachments.asset_sync.hash_file",
-            side_effect=["hash1", "hash2"],
+            # The files are hashed concurrently, so their hashes are keyed by name, not call order.
+            side_effect=lambda file_path, _: {"test.txt": "hash1", "test2.txt": "hash2"}[
+                Path(file_path).name
+            ],
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.hash_data", side_effect=["hash3"]
         ), patch(
@@ -724,6 +785,253 @@ class TestAssetSync:
 
             assert summary_statistics == expected_summary_statistics
 
+    @pytest.mark.parametrize("hashing_engine", [HashingEngine.THREAD, HashingEngine.PROCESS])
+    def test_get_output_files_hashes_and_checks_concurrently(
+        self,
+        farm_id: str,
+        tmp_path: Path,
+        default_job_attachment_s3_settings: JobAttachmentS3Settings,
+        hashing_engine: HashingEngine,
+    ):
+        """
+        Test that the output files are hashed and checked in the CAS concurrently, with one check
+        per distinct object, and that they're returned in the order they were found.
+        """
+        # GIVEN
+        asset_sync = AssetSync(farm_id, hashing_engine=hashing_engine)
+        local_root = tmp_path / "assetroot"
+        contents = {
+            f"renders/{directory}/frame{i}.exr": f"frame {i % 15}".encode()
+            for directory in ["beauty", "beauty/aovs", "depth"]
+            for i in range(10)
+        }
+        for file_path, data in contents.items():
+            (local_root / file_path).parent.mkdir(parents=True, exist_ok=True)
+            (local_root / file_path).write_bytes(data)
+        cas_prefix = default_job_attachment_s3_settings.full_cas_prefix()
+        existing_keys = {
+            f"{cas_prefix}/{hash_data(b'frame 0', HashAlgorithm.XXH128)}.xxh128",
+            f"{cas_prefix}/{hash_data(b'frame 7', HashAlgorithm.XXH128)}.xxh128",
+        }
+        manifest_properties = ManifestProperties(
+            rootPath=str(local_root),
+            rootPathFormat=PathFormat.get_host_path_format(),
+            outputRelativeDirectories=["renders"],
+        )
+
+        # WHEN
+        with patch.object(
+            asset_sync.s3_uploader,
+            "file_already_uploaded",
+            side_effect=lambda bucket, key: key in existing_keys,
+        ) as mock_file_already_uploaded:
+            output_files = asset_sync._get_output_files(
+                manifest_properties, default_job_attachment_s3_settings, local_root, tmp_path
+            )
+
+        # THEN
+        expected_rel_paths = [
+            Path(file_path).relative_to(local_root).as_posix()
+            for file_path in _scan_directory(str(local_root / "renders"))
+        ]
+        assert [file.rel_path for file in output_files] == expected_rel_paths
+        for file in output_files:
+            file_hash = hash_data(contents[file.rel_path], HashAlgorithm.XXH128)
+            assert file.file_hash == file_hash
+            assert file.s3_key == f"{cas_prefix}/{file_hash}.xxh128"
+            assert file.in_s3 == (file.s3_key in existing_keys)
+            assert file.file_size == len(contents[file.rel_path])
+        assert sorted(call.args[1] for call in mock_file_already_uploaded.call_args_list) == sorted(
+            {file.s3_key for file in output_files}
+        )
+
+    def test_watch_outputs_then_sync_outputs(
+        self,
+        farm_id: str,
+        queue_id: str,
+        tmp_path: Path,
+        default_job_attachment_s3_settings: JobAttachmentS3Settings,
+    ):
+        """
+        Test that the output watcher uploads the output files while they're written, and that
+        sync_outputs then only uploads the files that changed since, with all the files in the
+        output manifest.
+        """
+        # GIVEN
+        asset_sync = AssetSync(farm_id)
+        attachments = Attachments(
+            manifests=[
+                ManifestProperties(
+                    rootPath="/tmp",
+                    rootPathFormat=PathFormat.POSIX,
+                    outputRelativeDirectories=["renders"],
+                )
+            ],
+        )
+        session_dir = tmp_path / "session"
+        (local_root, _) = asset_sync._get_output_local_root(
+            attachments.manifests[0], session_dir, {}
+        )
+        (local_root / "renders").mkdir(parents=True)
+        (local_root / "renders" / "frame1.exr").write_bytes(b"frame 1")
+        (local_root / "renders" / "frame2.exr").write_bytes(b"frame 2")
+        cas_prefix = default_job_attachment_s3_settings.full_cas_prefix()
+
+        # WHEN
+        watcher = asset_sync.watch_outputs(
+            default_job_attachment_s3_settings, attachments, session_dir, poll_interval=0.01
+        )
+        assert watcher is not None
+        with watcher:
+            for _ in range(1000):
+                if len(asset_sync._pre_synced_outputs) == 2:
+                    break
+                time.sleep(0.01)
+        (local_root / "renders" / "frame2.exr").write_bytes(b"frame 2, rendered again")
+        with patch.object(
+            asset_sync.s3_uploader,
+            "upload_file_to_s3",
+            wraps=asset_sync.s3_uploader.upload_file_to_s3,
+        ) as mock_upload_file_to_s3:
+            summary_statistics = asset_sync.sync_outputs(
+                s3_settings=default_job_attachment_s3_settings,
+                attachments=attachments,
+                queue_id=queue_id,
+                job_id="job-1",
+                step_id="step-1",
+                task_id="task-1",
+                session_action_id="sessionaction-1",
+                start_time=time.time(),
+                session_dir=session_dir,
+            )
+
+        # THEN
+        assert len(asset_sync._pre_synced_outputs) == 2
+        mock_upload_file_to_s3.assert_called_once()
+        assert mock_upload_file_to_s3.call_args.kwargs["local_path"] == (
+            local_root / "renders" / "frame2.exr"
+        )
+        assert summary_statistics.processed_files == 1
+        assert summary_statistics.skipped_files == 1
+        s3 = boto3.client("s3")
+        keys = {
+            obj["Key"]
+            for obj in s3.list_objects_v2(Bucket=default_job_attachment_s3_settings.s3BucketName)[
+                "Contents"
+            ]
+        }
+        for data in [b"frame 1", b"frame 2", b"frame 2, rendered again"]:
+            assert f"{cas_prefix}/{hash_data(data, HashAlgorithm.XXH128)}.xxh128" in keys
+        (manifest_key,) = [key for key in keys if key.endswith("_output")]
+        manifest = decode_manifest(
+            s3.get_object(Bucket=default_job_attachment_s3_settings.s3BucketName, Key=manifest_key)[
+                "Body"
+            ]
+            .read()
+            .decode("utf-8")
+        )
+        assert {(path.path, path.hash) for path in manifest.paths} == {
+            ("renders/frame1.exr", hash_data(b"frame 1", HashAlgorithm.XXH128)),
+            ("renders/frame2.exr", hash_data(b"frame 2, rendered again", HashAlgorithm.XXH128)),
+        }
+
+    def test_pre_sync_output_file_modified_while_uploading(
+        self,
+        farm_id: str,
+        tmp_path: Path,
+        default_job_attachment_s3_settings: JobAttachmentS3Settings,
+    ):
+        """
+        Test that the output watcher uploads an output file from a copy, so that the uploaded
+        object matches the hash in its key even if the file changes while it's uploaded, and that
+        the file is only recorded as pre-synced with the size and modification time it was copied
+        at.
+        """
+        # GIVEN
+        asset_sync = AssetSync(farm_id)
+        output_file = tmp_path / "frame1.exr"
+        output_file.write_bytes(b"frame 1")
+        file_stat = os.stat(output_file)
+        scanned_file = ScannedFile(str(output_file.resolve()), file_stat)
+        file_hash = hash_data(b"frame 1", HashAlgorithm.XXH128)
+        s3_key = asset_sync._get_output_s3_key(file_hash, default_job_attachment_s3_settings)
+        upload_file_to_s3 = asset_sync.s3_uploader.upload_file_to_s3
+
+        def modify_then_upload(**kwargs):
+            output_file.write_bytes(b"frame 1, rendered again")
+            os.utime(output_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+            upload_file_to_s3(**kwargs)
+
+        # WHEN
+        with patch.object(
+            asset_sync.s3_uploader, "upload_file_to_s3", side_effect=modify_then_upload
+        ) as mock_upload_file_to_s3:
+            asset_sync._pre_sync_output_file(
+                default_job_attachment_s3_settings,
+                tmp_path,
+                str(output_file),
+                scanned_file,
+                lambda: False,
+            )
+
+        # THEN
+        mock_upload_file_to_s3.assert_called_once()
+        assert mock_upload_file_to_s3.call_args.kwargs["local_path"] != output_file
+        s3 = boto3.client("s3")
+        uploaded_object = s3.get_object(
+            Bucket=default_job_attachment_s3_settings.s3BucketName, Key=s3_key
+        )
+        assert uploaded_object["Body"].read() == b"frame 1"
+        assert asset_sync._pre_synced_outputs == {
+            str(output_file.resolve()): (file_stat.st_size, file_stat.st_mtime_ns, file_hash)
+        }
+        new_file_stat = os.stat(output_file)
+        assert (
+            asset_sync._get_pre_synced_output_hash(
+                str(output_file.resolve()), new_file_stat.st_size, new_file_stat.st_mtime_ns
+            )
+            is None
+        )
+
+    def test_pre_sync_output_file_modified_while_copying(
+        self,
+        farm_id: str,
+        tmp_path: Path,
+        default_job_attachment_s3_settings: JobAttachmentS3Settings,
+    ):
+        """
+        Test that an output file that changes while the output watcher copies it is neither
+        uploaded nor recorded as pre-synced, and is left to sync_outputs.
+        """
+        # GIVEN
+        asset_sync = AssetSync(farm_id)
+        output_file = tmp_path / "frame1.exr"
+        output_file.write_bytes(b"frame 1")
+        file_stat = os.stat(output_file)
+        scanned_file = ScannedFile(str(output_file.resolve()), file_stat)
+
+        def copy_then_modify(src: str, dst: str) -> None:
+            shutil.copyfile(src, dst)
+            output_file.write_bytes(b"frame 1, rendered again")
+            os.utime(output_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.asset_sync._clone_or_copy_file",
+            side_effect=copy_then_modify,
+        ), patch.object(asset_sync.s3_uploader, "upload_file_to_s3") as mock_upload_file_to_s3:
+            asset_sync._pre_sync_output_file(
+                default_job_attachment_s3_settings,
+                tmp_path,
+                str(output_file),
+                scanned_file,
+                lambda: False,
+            )
+
+        # THEN
+        mock_upload_file_to_s3.assert_not_called()
+        assert asset_sync._pre_synced_outputs == {}
+
     @pytest.mark.parametrize(
         "file_path, directory_path, expected",
         [
@@ -777,6 +1085,53 @@ class TestAssetSync:
             is False
         )
 
+    @pytest.mark.skipif(
+        is_windows_non_admin(),
+        reason="Windows requires Admin to create symlinks, skipping this test.",
+    )
+    def test_get_output_files_with_symlinks(
+        self, tmp_path: Path, default_job_attachment_s3_settings: JobAttachmentS3Settings
+    ):
+        """
+        Test that output symlinks are uploaded from their resolved paths if those are inside the
+        session directory, and skipped if they escape it, including into a sibling directory
+        whose name starts with the name of the session directory. Broken symlinks and symlinks to
+        directories are skipped.
+        """
+        # GIVEN
+        session_dir = tmp_path / "session"
+        local_root = session_dir / "assetroot"
+        output_dir = local_root / "renders"
+        output_dir.mkdir(parents=True)
+        (output_dir / "frame1.exr").write_bytes(b"frame 1")
+        (session_dir / "inside.exr").write_bytes(b"inside")
+        sibling_dir = tmp_path / "session-other"
+        sibling_dir.mkdir()
+        (sibling_dir / "secret.txt").write_bytes(b"secret")
+        (output_dir / "link_inside.exr").symlink_to(session_dir / "inside.exr")
+        (output_dir / "link_to_sibling.txt").symlink_to(sibling_dir / "secret.txt")
+        (output_dir / "link_to_dir").symlink_to(session_dir, target_is_directory=True)
+        (output_dir / "broken_link.exr").symlink_to(tmp_path / "missing.exr")
+        manifest_properties = ManifestProperties(
+            rootPath=str(local_root),
+            rootPathFormat=PathFormat.get_host_path_format(),
+            outputRelativeDirectories=["renders"],
+        )
+
+        # WHEN
+        with patch.object(
+            self.default_asset_sync.s3_uploader, "file_already_uploaded", return_value=False
+        ):
+            output_files = self.default_asset_sync._get_output_files(
+                manifest_properties, default_job_attachment_s3_settings, local_root, session_dir
+            )
+
+        # THEN
+        assert {(file.rel_path, file.full_path) for file in output_files} == {
+            ("renders/frame1.exr", str((output_dir / "frame1.exr").resolve())),
+            ("renders/link_inside.exr", str((session_dir / "inside.exr").resolve())),
+        }
+
     @pytest.mark.parametrize(
         ("job", "expected_settings"),
         [(Job(jobId="job-98765567890123456789012345678901"), None), (None, None)],
@@ -881,8 +1236,8 @@ class TestAssetSync:
 
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             return_value=DownloadSummaryStatistics(),
@@ -924,6 +1279,7 @@ class TestAssetSync:
                 session=ANY,
                 on_downloading_files=mock_on_downloading_files,
                 logger=getLogger("deadline.job_attachments"),
+                pack_index=None,
             )
 
     @pytest.mark.parametrize(
@@ -961,8 +1317,8 @@ class TestAssetSync:
 
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -1141,8 +1497,8 @@ class TestAssetSync:
         assert job.attachments
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -1220,8 +1576,8 @@ class TestAssetSync:
         assert job.attachments
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync._get_unique_dest_dir_name",
             side_effect=[dest_dir],
@@ -1270,8 +1626,8 @@ class TestAssetSync:
         step_dest_dir = "assetroot-8a7d189e9c17186fb88b"
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -1346,8 +1702,8 @@ class TestAssetSync:
         test_manifest = decode_manifest(json.dumps(test_manifest_two))
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=json.dumps(test_manifest_one),
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(json.dumps(test_manifest_one), None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -1440,8 +1796,8 @@ class TestAssetSync:
         assert job.attachments
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -1508,8 +1864,8 @@ class TestAssetSync:
         path_write_local_input_manifest = tmp_path.joinpath("manifest/hash_manifest")
 
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ) as mock_get_manifest_from_s3, patch(
             f"{deadline.__package__}.job_attachments.asset_sync.merge_asset_manifests",
             return_value=test_manifest,
@@ -1546,6 +1902,68 @@ class TestAssetSync:
             assert "/root/tmp/movie1" in manifest_paths_by_root
             assert str(tmp_path.joinpath(dest_dir)) in manifest_paths_by_root
 
+    def test_aggregate_asset_root_manifests_gets_only_named_pack_indexes(
+        self,
+        default_queue: Queue,
+        default_job: Job,
+        default_job_attachment_s3_settings: JobAttachmentS3Settings,
+        test_manifest_one: dict,
+        tmp_path: Path,
+    ):
+        """
+        Tests that the pack index of an input manifest is only downloaded when the metadata of
+        the manifest names one, without another request for the manifests that don't.
+        """
+        test_manifest = decode_manifest(json.dumps(test_manifest_one))
+        default_job.attachments = Attachments(
+            manifests=[
+                ManifestProperties(
+                    rootPath="/root/tmp",
+                    rootPathFormat=PathFormat.POSIX,
+                    inputManifestPath="manifest_input",
+                    inputManifestHash="manifesthash",
+                    outputRelativeDirectories=["test/outputs"],
+                ),
+                ManifestProperties(
+                    rootPath="/root/tmp2",
+                    rootPathFormat=PathFormat.POSIX,
+                    inputManifestPath="manifest2_input",
+                    inputManifestHash="manifest2hash",
+                    outputRelativeDirectories=["test/outputs"],
+                ),
+            ],
+        )
+        pack_index = MagicMock()
+
+        with patch(
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            side_effect=[(test_manifest, None), (test_manifest, "packindex.index")],
+        ), patch(
+            f"{deadline.__package__}.job_attachments.asset_sync.get_pack_index_from_s3",
+            return_value=pack_index,
+        ) as mock_get_pack_index_from_s3, patch(
+            f"{deadline.__package__}.job_attachments.asset_sync._get_unique_dest_dir_name",
+            side_effect=["assetroot", "assetroot2"],
+        ):
+            self.default_asset_sync._aggregate_asset_root_manifests(
+                session_dir=tmp_path,
+                s3_settings=default_job_attachment_s3_settings,
+                queue_id=default_queue.queueId,
+                job_id=default_job.jobId,
+                attachments=default_job.attachments,
+                dynamic_mapping_rules=self.default_asset_sync.generate_dynamic_path_mapping(
+                    session_dir=tmp_path, attachments=default_job.attachments
+                ),
+            )
+
+        mock_get_pack_index_from_s3.assert_called_once_with(
+            pack_index_name="packindex.index",
+            s3_bucket=default_job_attachment_s3_settings.s3BucketName,
+            cas_prefix=default_job_attachment_s3_settings.full_cas_prefix(),
+            session=self.default_asset_sync.session,
+        )
+        assert self.default_asset_sync._pack_index is pack_index
+
     def test_attachment_sync_inputs_with_storage_profiles_path_mapping_rules(
         self,
         default_queue: Queue,
@@ -1587,8 +2005,8 @@ class TestAssetSync:
 
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             return_value=DownloadSummaryStatistics(),
@@ -1632,6 +2050,8 @@ class TestAssetSync:
                 session=ANY,
                 on_downloading_files=mock_on_downloading_files,
                 logger=getLogger("deadline.job_attachments"),
+                pack_index=None,
+                file_conflict_resolution=FileConflictResolution.CREATE_COPY,
             )
 
     @pytest.mark.parametrize(
@@ -1669,8 +2089,8 @@ class TestAssetSync:
 
         # WHEN
         with patch(
-            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
-            return_value=test_manifest,
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
             side_effect=[DownloadSummaryStatistics()],
@@ -1712,3 +2132,150 @@ class TestAssetSync:
                 }
             ]
             mock_mount_vfs.assert_not_called()
+
+    def test_get_changed_manifests_by_root(self, tmp_path: Path):
+        """
+        Asserts that only the files that are missing, or that changed since they were synced, are
+        left in the manifests to download.
+        """
+        # GIVEN
+        local_root = str(tmp_path / "assetroot")
+        os.makedirs(local_root)
+        for name in ["missing.txt", "modified.txt", "new_hash.txt", "unchanged.txt"]:
+            Path(local_root, name).write_text("abc")
+        manifest = decode_manifest(
+            json.dumps(
+                {
+                    "hashAlg": "xxh128",
+                    "manifestVersion": "2023-03-03",
+                    "paths": [
+                        {"hash": "a", "mtime": 1, "path": "missing.txt", "size": 3},
+                        {"hash": "b", "mtime": 1, "path": "modified.txt", "size": 3},
+                        {"hash": "c", "mtime": 1, "path": "new_hash.txt", "size": 3},
+                        {"hash": "d", "mtime": 1, "path": "unchanged.txt", "size": 3},
+                    ],
+                    "totalSize": 12,
+                }
+            )
+        )
+        self.default_asset_sync._record_attachment_mtimes({local_root: manifest})
+        os.remove(Path(local_root, "missing.txt"))
+        os.utime(Path(local_root, "modified.txt"), ns=(0, 0))
+        manifest.paths[2].hash = "e"
+
+        # WHEN
+        (changed_manifests_by_root, unchanged_files, unchanged_bytes) = (
+            self.default_asset_sync._get_changed_manifests_by_root(
+                {local_root: manifest}, verify_hashes=False
+            )
+        )
+
+        # THEN
+        changed_manifest = changed_manifests_by_root[local_root]
+        assert isinstance(changed_manifest, AssetManifest)
+        assert [path.path for path in changed_manifest.paths] == [
+            "missing.txt",
+            "modified.txt",
+            "new_hash.txt",
+        ]
+        assert changed_manifest.totalSize == 9
+        assert unchanged_files == 1
+        assert unchanged_bytes == 3
+
+    def test_get_changed_manifests_by_root_verify_hashes(self, tmp_path: Path):
+        """
+        Asserts that verifying hashes reuses files with the contents in the manifest, even if they
+        weren't synced by the AssetSync.
+        """
+        # GIVEN
+        local_root = str(tmp_path / "assetroot")
+        os.makedirs(local_root)
+        Path(local_root, "same.txt").write_text("abc")
+        Path(local_root, "different.txt").write_text("xyz")
+        abc_hash = hash_data(b"abc", HashAlgorithm.XXH128)
+        manifest = decode_manifest(
+            json.dumps(
+                {
+                    "hashAlg": "xxh128",
+                    "manifestVersion": "2023-03-03",
+                    "paths": [
+                        {"hash": abc_hash, "mtime": 1, "path": "different.txt", "size": 3},
+                        {"hash": abc_hash, "mtime": 1, "path": "same.txt", "size": 3},
+                    ],
+                    "totalSize": 6,
+                }
+            )
+        )
+
+        # WHEN
+        (changed_manifests_by_root, unchanged_files, unchanged_bytes) = (
+            self.default_asset_sync._get_changed_manifests_by_root(
+                {local_root: manifest}, verify_hashes=True
+            )
+        )
+
+        # THEN
+        assert [path.path for path in changed_manifests_by_root[local_root].paths] == [
+            "different.txt"
+        ]
+        assert unchanged_files == 1
+        assert unchanged_bytes == 3
+
+    def test_attachment_sync_inputs_incremental(
+        self,
+        tmp_path: Path,
+        default_queue: Queue,
+        default_job: Job,
+        default_job_attachment_s3_settings: JobAttachmentS3Settings,
+        test_manifest_one: dict,
+    ):
+        """
+        Asserts that an incremental sync only downloads the changed files, overwriting them, and
+        counts the reused files as skipped.
+        """
+        # GIVEN
+        dest_dir = "assetroot-27bggh78dd2b568ab123"
+        local_root = str(tmp_path / dest_dir)
+        test_manifest = decode_manifest(json.dumps(test_manifest_one))
+        unchanged_paths = test_manifest.paths[1:]
+        unchanged_bytes = sum(path.size for path in unchanged_paths)
+        assert default_job.attachments
+
+        def is_input_file_unchanged(abs_path, manifest_path, hash_alg, verify_hashes):
+            return manifest_path in unchanged_paths
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.asset_sync._get_input_manifest_and_pack_index_name_from_s3",
+            return_value=(test_manifest, None),
+        ), patch(
+            f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
+            side_effect=[DownloadSummaryStatistics()],
+        ) as mock_download_files_from_manifests, patch(
+            f"{deadline.__package__}.job_attachments.asset_sync._get_unique_dest_dir_name",
+            side_effect=[dest_dir],
+        ), patch.object(
+            self.default_asset_sync,
+            "_is_input_file_unchanged",
+            side_effect=is_input_file_unchanged,
+        ), patch.object(
+            Path, "stat", MagicMock(st_mtime_ns=1234512345123451)
+        ):
+            (summary_statistics, _) = self.default_asset_sync.attachment_sync_inputs(
+                default_job_attachment_s3_settings,
+                default_job.attachments,
+                default_queue.queueId,
+                default_job.jobId,
+                tmp_path,
+                incremental=True,
+            )
+
+        # THEN
+        download_kwargs = mock_download_files_from_manifests.call_args.kwargs
+        assert download_kwargs["file_conflict_resolution"] == FileConflictResolution.OVERWRITE
+        assert [path.path for path in download_kwargs["manifests_by_root"][local_root].paths] == [
+            test_manifest.paths[0].path
+        ]
+        assert summary_statistics.total_files == len(unchanged_paths)
+        assert summary_statistics.skipped_files == len(unchanged_paths)
+        assert summary_statistics.skipped_bytes == unchanged_bytes
@@ -0,0 +1,409 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Tests for the asyncio transfer engine. The transfers run against a local S3 emulator, since the
+in-process mocking of moto does not intercept the requests of aiobotocore.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Generator, List
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+
+import deadline
+from deadline.client import config
+from deadline.job_attachments._async_transfer import (
+    ASYNC_UPLOAD_PART_SIZE,
+    _get_aio_session,
+    run_transfers,
+)
+from deadline.job_attachments.asset_manifests import BaseManifestPath, HashAlgorithm, hash_data
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest
+from deadline.job_attachments.caches import S3CheckCache
+from deadline.job_attachments.download import download_files_from_manifests
+from deadline.job_attachments.exceptions import AssetSyncCancelledError, AssetSyncError
+from deadline.job_attachments.progress_tracker import ProgressStatus, ProgressTracker
+from deadline.job_attachments.upload import S3AssetUploader
+
+BUCKET = "test-bucket"
+CAS_PREFIX = "assetRoot/Data"
+ACCOUNT_ID = "123456789012"
+
+
+@pytest.fixture(scope="module")
+def s3_emulator_url() -> Generator[str, None, None]:
+    """
+    Starts a local S3 emulator, and returns its endpoint URL.
+    """
+    pytest.importorskip("aiobotocore")
+    moto_server = pytest.importorskip("moto.server")
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    (_, port) = server.get_host_and_port()
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.stop()
+
+
+@pytest.fixture
+def s3_emulator(s3_emulator_url, boto_config, fresh_deadline_config):
+    """
+    Creates an empty bucket in the S3 emulator, selects the asyncio transfer engine, and points
+    the job attachments S3 clients at the emulator. Returns an S3 client for the emulator.
+    """
+    config.set_setting("settings.transfer_engine", "ASYNCIO")
+    s3 = boto3.client("s3", region_name="us-west-2", endpoint_url=s3_emulator_url)
+    s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "us-west-2"})
+    with patch(
+        f"{deadline.__package__}.job_attachments._async_transfer.get_s3_endpoint_url",
+        return_value=s3_emulator_url,
+    ), patch(
+        f"{deadline.__package__}.job_attachments.upload.get_account_id", return_value=ACCOUNT_ID
+    ), patch(
+        f"{deadline.__package__}.job_attachments.download.get_account_id",
+        return_value=ACCOUNT_ID,
+    ):
+        yield s3
+    for obj in s3.list_objects_v2(Bucket=BUCKET).get("Contents", []):
+        s3.delete_object(Bucket=BUCKET, Key=obj["Key"])
+    s3.delete_bucket(Bucket=BUCKET)
+
+
+def create_asset_uploader(s3) -> S3AssetUploader:
+    uploader = S3AssetUploader(session=boto3.Session(region_name="us-west-2"))
+    # Listing the existing objects uses the synchronous client.
+    uploader._s3 = s3
+    return uploader
+
+
+def create_files(root: Path, contents: Dict[str, bytes]) -> AssetManifest:
+    """
+    Writes the files to the root directory, and returns their manifest.
+    """
+    paths: List[BaseManifestPath] = []
+    for file_path, data in contents.items():
+        local_path = root / file_path
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        local_path.write_bytes(data)
+        paths.append(
+            BaseManifestPath(
+                path=file_path,
+                hash=hash_data(data, HashAlgorithm.XXH128),
+                size=len(data),
+                mtime=1234000000,
+            )
+        )
+    return AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(len(data) for data in contents.values()),
+    )
+
+
+@pytest.fixture
+def contents() -> Dict[str, bytes]:
+    contents = {f"dir{i % 3}/file{i}.txt": f"contents {i}".encode() for i in range(20)}
+    contents["empty.txt"] = b""
+    # Larger than two parts, so it is uploaded with a multi-part upload of several parts.
+    contents["large.bin"] = os.urandom(2 * ASYNC_UPLOAD_PART_SIZE + 1024)
+    return contents
+
+
+def test_run_transfers_without_aiobotocore():
+    """
+    Tests that using the asyncio transfer engine without aiobotocore installed raises an
+    AssetSyncError that explains how to install it.
+    """
+    with patch.dict(
+        sys.modules,
+        {"aiobotocore": None, "aiobotocore.config": None, "aiobotocore.session": None},
+    ):
+        with pytest.raises(AssetSyncError) as err:
+            run_transfers([1], MagicMock(), boto3.Session(region_name="us-west-2"), 10)
+
+    assert 'pip install "deadline[async]"' in str(err.value)
+    # Nothing is imported when there is nothing to transfer.
+    assert run_transfers([], MagicMock(), MagicMock(), 10) == []
+
+
+def test_aio_session_refreshes_credentials():
+    """
+    Tests that the aiobotocore session reads the credentials of the boto3 session again as they
+    get close to the lifetime they're given, rather than keeping the first ones, which expire
+    during long transfers with temporary credentials.
+    """
+    # GIVEN
+    pytest.importorskip("aiobotocore")
+    from aiobotocore.session import get_session
+    from botocore.credentials import ReadOnlyCredentials
+
+    session = MagicMock()
+    session.get_credentials.return_value.get_frozen_credentials.side_effect = [
+        ReadOnlyCredentials("key1", "secret1", "token1"),
+        ReadOnlyCredentials("key2", "secret2", "token2"),
+    ]
+
+    async def get_frozen_credentials_twice():
+        credentials = await _get_aio_session(session, get_session).get_credentials()
+        return [await credentials.get_frozen_credentials() for _ in range(2)]
+
+    # WHEN
+    # Within the 15 minutes before their expiry, aiobotocore refreshes the credentials when used.
+    with patch(
+        f"{deadline.__package__}.job_attachments._async_transfer.ASYNC_CREDENTIALS_LIFETIME_IN_SECS",
+        11 * 60,
+    ):
+        frozen_credentials = asyncio.run(get_frozen_credentials_twice())
+
+    # THEN
+    assert [(c.access_key, c.secret_key, c.token) for c in frozen_credentials] == [
+        ("key1", "secret1", "token1"),
+        ("key2", "secret2", "token2"),
+    ]
+
+
+def test_upload_and_download_files(s3_emulator, tmp_path, contents):
+    """
+    Tests that the asyncio transfer engine uploads files to the CAS, skips objects that already
+    exist in it, and downloads the files back with their contents and modification times.
+    """
+    # GIVEN
+    source_root = tmp_path / "source"
+    manifest = create_files(source_root, contents)
+    uploader = create_asset_uploader(s3_emulator)
+    progress_tracker = ProgressTracker(
+        status=ProgressStatus.UPLOAD_IN_PROGRESS,
+        total_files=len(manifest.paths),
+        total_bytes=manifest.totalSize,
+    )
+
+    # WHEN
+    uploader.upload_input_files(
+        manifest=manifest,
+        s3_bucket=BUCKET,
+        source_root=source_root,
+        s3_cas_prefix=CAS_PREFIX,
+        progress_tracker=progress_tracker,
+        s3_check_cache_dir=str(tmp_path / "cache1"),
+    )
+
+    # THEN
+    keys = {obj["Key"] for obj in s3_emulator.list_objects_v2(Bucket=BUCKET)["Contents"]}
+    assert keys == {f"{CAS_PREFIX}/{file.hash}.xxh128" for file in manifest.paths}
+    assert progress_tracker.processed_files == len(contents)
+    assert progress_tracker.processed_bytes == manifest.totalSize
+    large_file_hash = hash_data(contents["large.bin"], HashAlgorithm.XXH128)
+    assert (
+        s3_emulator.get_object(Bucket=BUCKET, Key=f"{CAS_PREFIX}/{large_file_hash}.xxh128")[
+            "Body"
+        ].read()
+        == contents["large.bin"]
+    )
+
+    # WHEN
+    progress_tracker = ProgressTracker(
+        status=ProgressStatus.UPLOAD_IN_PROGRESS,
+        total_files=len(manifest.paths),
+        total_bytes=manifest.totalSize,
+    )
+    create_asset_uploader(s3_emulator).upload_input_files(
+        manifest=manifest,
+        s3_bucket=BUCKET,
+        source_root=source_root,
+        s3_cas_prefix=CAS_PREFIX,
+        progress_tracker=progress_tracker,
+        s3_check_cache_dir=str(tmp_path / "cache2"),
+    )
+
+    # THEN
+    assert progress_tracker.processed_files == 0
+    assert progress_tracker.skipped_files == len(contents)
+
+    # WHEN
+    download_dir = tmp_path / "download"
+    summary_statistics = download_files_from_manifests(
+        s3_bucket=BUCKET,
+        manifests_by_root={str(download_dir): manifest},
+        cas_prefix=CAS_PREFIX,
+        session=boto3.Session(region_name="us-west-2"),
+    )
+
+    # THEN
+    assert summary_statistics.processed_files == len(contents)
+    for file_path, data in contents.items():
+        local_path = download_dir / file_path
+        assert local_path.read_bytes() == data
+        assert local_path.stat().st_mtime == 1234
+    assert sorted(str(path.relative_to(download_dir)) for path in download_dir.rglob("*.*")) == (
+        sorted(str(Path(file_path)) for file_path in contents)
+    )
+
+
+def test_upload_skips_directories(s3_emulator, tmp_path):
+    """
+    Tests that a manifest path that is a directory is not uploaded, and is not reported as
+    uploaded.
+    """
+    # GIVEN
+    (tmp_path / "dir").mkdir()
+    file = BaseManifestPath(path="dir", hash="a" * 32, size=0, mtime=1234000000)
+    uploader = create_asset_uploader(s3_emulator)
+
+    # WHEN
+    with S3CheckCache(str(tmp_path / "cache")) as s3_check_cache:
+        upload_results = uploader._upload_objects_to_cas_asyncio(
+            [file], HashAlgorithm.XXH128, BUCKET, tmp_path, CAS_PREFIX, s3_check_cache
+        )
+
+    # THEN
+    assert upload_results == [(False, (tmp_path / "dir").stat().st_size)]
+    assert "Contents" not in s3_emulator.list_objects_v2(Bucket=BUCKET)
+
+
+def test_upload_cancelled(s3_emulator, tmp_path, contents):
+    """
+    Tests that cancelling an upload through the progress callback stops the transfers with an
+    AssetSyncCancelledError, and aborts the multi-part upload in progress.
+    """
+    # GIVEN
+    source_root = tmp_path / "source"
+    manifest = create_files(source_root, {"large.bin": contents["large.bin"]})
+    progress_tracker = ProgressTracker(
+        status=ProgressStatus.UPLOAD_IN_PROGRESS,
+        total_files=1,
+        total_bytes=manifest.totalSize,
+        on_progress_callback=MagicMock(return_value=False),
+        # Report after every part, so the upload is cancelled after its first part.
+        callback_interval=0,
+    )
+
+    # WHEN
+    with pytest.raises(AssetSyncCancelledError):
+        create_asset_uploader(s3_emulator).upload_input_files(
+            manifest=manifest,
+            s3_bucket=BUCKET,
+            source_root=source_root,
+            s3_cas_prefix=CAS_PREFIX,
+            progress_tracker=progress_tracker,
+            s3_check_cache_dir=str(tmp_path / "cache"),
+        )
+
+    # THEN
+    assert "Contents" not in s3_emulator.list_objects_v2(Bucket=BUCKET)
+    assert "Uploads" not in s3_emulator.list_multipart_uploads(Bucket=BUCKET)
+
+
+def test_download_cancelled(s3_emulator, tmp_path, contents):
+    """
+    Tests that cancelling a download through the progress callback stops the transfers with an
+    AssetSyncCancelledError, and leaves no partially downloaded files behind.
+    """
+    # GIVEN
+    source_root = tmp_path / "source"
+    manifest = create_files(source_root, contents)
+    create_asset_uploader(s3_emulator).upload_input_files(
+        manifest=manifest,
+        s3_bucket=BUCKET,
+        source_root=source_root,
+        s3_cas_prefix=CAS_PREFIX,
+        s3_check_cache_dir=str(tmp_path / "cache"),
+    )
+    download_dir = tmp_path / "download"
+
+    # WHEN
+    with pytest.raises(AssetSyncCancelledError):
+        download_files_from_manifests(
+            s3_bucket=BUCKET,
+            manifests_by_root={str(download_dir): manifest},
+            cas_prefix=CAS_PREFIX,
+            session=boto3.Session(region_name="us-west-2"),
+            on_downloading_files=MagicMock(return_value=False),
+        )
+
+    # THEN
+    downloaded_files = [path for path in download_dir.rglob("*") if path.is_file()]
+    assert all(
+        path.read_bytes() == contents[path.relative_to(download_dir).as_posix()]
+        for path in downloaded_files
+    )
+    assert len(downloaded_files) < len(contents)
+
+
+def test_download_packed_files(s3_emulator, tmp_path, contents):
+    """
+    Tests that the asyncio transfer engine downloads packed files from their byte ranges of the
+    packs that hold them.
+    """
+    # GIVEN
+    source_root = tmp_path / "source"
+    manifest = create_files(source_root, contents)
+    pack_index = create_asset_uploader(s3_emulator).upload_input_files(
+        manifest=manifest,
+        s3_bucket=BUCKET,
+        source_root=source_root,
+        s3_cas_prefix=CAS_PREFIX,
+        s3_check_cache_dir=str(tmp_path / "cache"),
+        pack_small_files=True,
+    )
+    assert pack_index is not None
+    download_dir = tmp_path / "download"
+
+    # WHEN
+    download_files_from_manifests(
+        s3_bucket=BUCKET,
+        manifests_by_root={str(download_dir): manifest},
+        cas_prefix=CAS_PREFIX,
+        session=boto3.Session(region_name="us-west-2"),
+        pack_index=pack_index,
+    )
+
+    # THEN
+    for file_path, data in contents.items():
+        assert (download_dir / file_path).read_bytes() == data
+
+
+def test_download_files_with_download_cache(s3_emulator, tmp_path, contents):
+    """
+    Tests that the asyncio transfer engine copies cached files from the download cache instead of
+    downloading them again.
+    """
+    # GIVEN
+    config.set_setting("settings.download_cache", "true")
+    config.set_setting("settings.download_cache_dir", str(tmp_path / "cache"))
+    source_root = tmp_path / "source"
+    manifest = create_files(source_root, contents)
+    create_asset_uploader(s3_emulator).upload_input_files(
+        manifest=manifest,
+        s3_bucket=BUCKET,
+        source_root=source_root,
+        s3_cas_prefix=CAS_PREFIX,
+        s3_check_cache_dir=str(tmp_path / "s3_check_cache"),
+    )
+    download_files_from_manifests(
+        s3_bucket=BUCKET,
+        manifests_by_root={str(tmp_path / "session1"): manifest},
+        cas_prefix=CAS_PREFIX,
+        session=boto3.Session(region_name="us-west-2"),
+    )
+    for obj in s3_emulator.list_objects_v2(Bucket=BUCKET)["Contents"]:
+        s3_emulator.delete_object(Bucket=BUCKET, Key=obj["Key"])
+
+    # WHEN
+    summary_statistics = download_files_from_manifests(
+        s3_bucket=BUCKET,
+        manifests_by_root={str(tmp_path / "session2"): manifest},
+        cas_prefix=CAS_PREFIX,
+        session=boto3.Session(region_name="us-west-2"),
+    )
+
+    # THEN
+    assert summary_statistics.cache_hits == len(contents)
+    assert summary_statistics.cache_misses == 0
+    for file_path, data in contents.items():
+        assert (tmp_path / "session2" / file_path).read_bytes() == data
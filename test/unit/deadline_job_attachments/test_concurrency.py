@@ -0,0 +1,221 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the adaptive control of the number of concurrent S3 transfers."""
+
+import concurrent.futures
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.hooks import HierarchicalEmitter
+
+from deadline.job_attachments._concurrency import AdaptiveConcurrencyController
+
+
+def complete_transfers(controller: AdaptiveConcurrencyController, count: int) -> None:
+    for _ in range(count):
+        with controller.slot() as transfer_slot:
+            transfer_slot.transferred(100)
+
+
+def test_initial_concurrency():
+    """
+    Tests that the concurrency starts at half of the max concurrency, within the bounds.
+    """
+    assert AdaptiveConcurrencyController(10).concurrency == 5
+    assert AdaptiveConcurrencyController(1).concurrency == 1
+    assert AdaptiveConcurrencyController(10, initial_concurrency=20).concurrency == 10
+    assert AdaptiveConcurrencyController(10, initial_concurrency=0).concurrency == 1
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyController(0)
+
+
+def test_additive_increase():
+    """
+    Tests that the concurrency grows by one for each window of completed transfers, and never
+    grows beyond the max concurrency.
+    """
+    # GIVEN
+    controller = AdaptiveConcurrencyController(6, initial_concurrency=2)
+
+    # WHEN / THEN
+    complete_transfers(controller, 1)
+    assert controller.concurrency == 2
+    complete_transfers(controller, 1)
+    assert controller.concurrency == 3
+    complete_transfers(controller, 3)
+    assert controller.concurrency == 4
+    complete_transfers(controller, 100)
+    assert controller.concurrency == 6
+    assert controller.peak_concurrency == 6
+    assert controller.completed_transfers == 105
+    assert controller.transferred_bytes == 10500
+
+
+def test_slots_without_transfer_do_not_increase_concurrency():
+    """
+    Tests that slots released without a transfer, or because of an error, don't count towards
+    growing the concurrency.
+    """
+    # GIVEN
+    controller = AdaptiveConcurrencyController(6, initial_concurrency=2)
+
+    # WHEN
+    for _ in range(10):
+        with controller.slot():
+            pass
+    with pytest.raises(RuntimeError):
+        with controller.slot() as transfer_slot:
+            transfer_slot.transferred(100)
+            raise RuntimeError()
+
+    # THEN
+    assert controller.concurrency == 2
+    assert controller.completed_transfers == 0
+
+
+def test_multiplicative_decrease():
+    """
+    Tests that throttling halves the concurrency, down to the min concurrency, and that
+    throttling within the cooldown period counts as the same congestion event.
+    """
+    # GIVEN
+    controller = AdaptiveConcurrencyController(
+        16, initial_concurrency=16, min_concurrency=2, decrease_cooldown=0
+    )
+
+    # WHEN / THEN
+    controller.on_throttled()
+    assert controller.concurrency == 8
+    controller.on_throttled()
+    assert controller.concurrency == 4
+    controller.on_throttled()
+    controller.on_throttled()
+    assert controller.concurrency == 2
+    assert controller.throttled_requests == 4
+
+    controller = AdaptiveConcurrencyController(16, initial_concurrency=16, decrease_cooldown=60)
+    controller.on_throttled()
+    controller.on_throttled()
+    assert controller.concurrency == 8
+    assert controller.throttled_requests == 2
+
+
+def test_high_latency_holds_concurrency(monkeypatch):
+    """
+    Tests that the concurrency stops growing while transfers take much longer than the lowest
+    latency seen.
+    """
+    # GIVEN
+    clock = {"time": 0.0}
+    monkeypatch.setattr(
+        "deadline.job_attachments._concurrency.time.perf_counter", lambda: clock["time"]
+    )
+    controller = AdaptiveConcurrencyController(10, initial_concurrency=1)
+
+    def transfer(latency: float) -> None:
+        with controller.slot() as transfer_slot:
+            clock["time"] += latency
+            transfer_slot.transferred(100)
+
+    transfer(1.0)
+    assert controller.concurrency == 2
+
+    # WHEN
+    for _ in range(20):
+        transfer(100.0)
+
+    # THEN
+    assert controller.concurrency == 2
+    assert controller.average_latency == pytest.approx(2001.0 / 21)
+
+
+def test_large_transfers_do_not_hold_concurrency(monkeypatch):
+    """
+    Tests that transfers that take longer because they move more bytes are not treated as
+    congestion, since the latency is normalized by the number of bytes.
+    """
+    # GIVEN
+    clock = {"time": 0.0}
+    monkeypatch.setattr(
+        "deadline.job_attachments._concurrency.time.perf_counter", lambda: clock["time"]
+    )
+    controller = AdaptiveConcurrencyController(10, initial_concurrency=1)
+
+    def transfer(latency: float, num_bytes: int) -> None:
+        with controller.slot() as transfer_slot:
+            clock["time"] += latency
+            transfer_slot.transferred(num_bytes)
+
+    # WHEN
+    for _ in range(10):
+        transfer(0.05, 100)
+        transfer(5.0, 100 * 1024 * 1024)
+
+    # THEN
+    assert controller.concurrency == 6
+
+
+def test_slots_limit_concurrent_transfers():
+    """
+    Tests that no more transfers than the current concurrency run at the same time.
+    """
+    # GIVEN
+    controller = AdaptiveConcurrencyController(8, initial_concurrency=2)
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def transfer() -> None:
+        with controller.slot():
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            threading.Event().wait(0.01)
+            with lock:
+                active["now"] -= 1
+
+    # WHEN
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        for future in [executor.submit(transfer) for _ in range(20)]:
+            future.result()
+
+    # THEN
+    assert active["max"] == 2
+
+
+@pytest.mark.parametrize(
+    "status_code, error_code, expected_concurrency",
+    [
+        pytest.param(503, "SlowDown", 4, id="SlowDown"),
+        pytest.param(503, None, 4, id="503 without code"),
+        pytest.param(500, "InternalError", 8, id="other error"),
+        pytest.param(200, None, 8, id="success"),
+    ],
+)
+def test_watch_observes_throttled_requests(status_code, error_code, expected_concurrency):
+    """
+    Tests that watching an S3 client decreases the concurrency when a request is throttled, and
+    that the handler is removed when watching stops.
+    """
+    # GIVEN
+    s3_client = MagicMock()
+    s3_client.meta.events = HierarchicalEmitter()
+    controller = AdaptiveConcurrencyController(8, initial_concurrency=8, decrease_cooldown=0)
+    http_response = MagicMock(status_code=status_code)
+    parsed = {"Error": {"Code": error_code}} if error_code else {}
+
+    def emit_needs_retry() -> None:
+        s3_client.meta.events.emit(
+            "needs-retry.s3.PutObject",
+            response=(http_response, parsed),
+            attempts=1,
+            caught_exception=None,
+        )
+
+    # WHEN
+    with controller.watch(s3_client):
+        emit_needs_retry()
+    emit_needs_retry()
+
+    # THEN
+    assert controller.concurrency == expected_concurrency
@@ -0,0 +1,155 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for diffing files with manifests."""
+
+import os
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+from deadline.client.cli._groups.click_logger import ClickLogger
+from deadline.job_attachments import _diff
+from deadline.job_attachments._diff import (
+    _fast_file_list_to_manifest_diff,
+    _iter_file_list_to_manifest_diff,
+)
+from deadline.job_attachments.asset_manifests import (
+    BaseAssetManifest,
+    BaseManifestPath,
+    HashAlgorithm,
+)
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest
+from deadline.job_attachments.models import FileStatus
+
+
+def _make_manifest(paths: List[BaseManifestPath]) -> BaseAssetManifest:
+    return AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(path.size for path in paths),
+    )
+
+
+def _manifest_path(root: Path, path: str) -> BaseManifestPath:
+    file_stat = (root / path).stat()
+    return BaseManifestPath(
+        path=path,
+        hash="hash",
+        size=file_stat.st_size,
+        mtime=file_stat.st_mtime_ns // 1000,
+    )
+
+
+class TestDiff:
+    def test_fast_file_list_to_manifest_diff(self, tmp_path: Path):
+        """
+        Tests that new, modified and deleted files are found with their sizes and modification
+        times, that unchanged files in subdirectories match their manifest paths, and that the new
+        and modified files come first, in the order of the given files.
+        """
+        # GIVEN
+        for path in ["unchanged.txt", "dir/nested.txt", "resized.txt", "touched.txt"]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(path)
+        manifest = _make_manifest(
+            [
+                _manifest_path(tmp_path, "unchanged.txt"),
+                _manifest_path(tmp_path, "dir/nested.txt"),
+                _manifest_path(tmp_path, "resized.txt"),
+                _manifest_path(tmp_path, "touched.txt"),
+                BaseManifestPath(path="deleted.txt", hash="hash", size=1, mtime=1),
+            ]
+        )
+        (tmp_path / "resized.txt").write_text("resized.txt, with more content")
+        touched_stat = (tmp_path / "touched.txt").stat()
+        os.utime(
+            tmp_path / "touched.txt",
+            ns=(touched_stat.st_atime_ns, touched_stat.st_mtime_ns + 5_000_000_000),
+        )
+        (tmp_path / "new.txt").write_text("new")
+        current_files = [
+            str(tmp_path / path)
+            for path in [
+                "unchanged.txt",
+                "touched.txt",
+                "new.txt",
+                "dir/nested.txt",
+                "resized.txt",
+            ]
+        ]
+
+        # WHEN
+        differences = _fast_file_list_to_manifest_diff(
+            root=str(tmp_path),
+            current_files=current_files,
+            diff_manifest=manifest,
+            logger=ClickLogger(False),
+        )
+
+        # THEN
+        assert differences == [
+            ("touched.txt", FileStatus.MODIFIED),
+            ("new.txt", FileStatus.NEW),
+            ("resized.txt", FileStatus.MODIFIED),
+            ("deleted.txt", FileStatus.DELETED),
+        ]
+
+    def test_iter_file_list_to_manifest_diff_streams_in_order(self, tmp_path: Path):
+        """
+        Tests that the differences are yielded lazily, in the order of the given files, when the
+        files are stat-ed in several chunks on the thread pool, and that full paths are returned
+        if asked for.
+        """
+        # GIVEN
+        current_files = []
+        for i in range(25):
+            (tmp_path / f"file{i}.txt").write_text(str(i))
+            current_files.append(str(tmp_path / f"file{i}.txt"))
+        manifest = _make_manifest(
+            [BaseManifestPath(path="deleted.txt", hash="hash", size=1, mtime=1)]
+        )
+
+        # WHEN
+        with patch.object(_diff, "STAT_CHUNK_SIZE", 2), patch.object(_diff, "STAT_MAX_WORKERS", 2):
+            differences = _iter_file_list_to_manifest_diff(
+                root=str(tmp_path),
+                current_files=current_files,
+                diff_manifest=manifest,
+                logger=ClickLogger(False),
+                return_root_relative_path=False,
+            )
+            first_difference = next(differences)
+            other_differences = list(differences)
+
+        # THEN
+        assert first_difference == (current_files[0], FileStatus.NEW)
+        assert other_differences == [
+            *((file, FileStatus.NEW) for file in current_files[1:]),
+            (os.path.join(str(tmp_path), "deleted.txt"), FileStatus.DELETED),
+        ]
+
+    def test_fast_file_list_to_manifest_diff_with_unnormalized_paths(self, tmp_path: Path):
+        """
+        Tests that the paths relative to the root are the same when the root or the files are
+        not normalized.
+        """
+        # GIVEN
+        (tmp_path / "dir").mkdir()
+        (tmp_path / "dir" / "new.txt").write_text("new")
+        (tmp_path / "dir" / "unchanged.txt").write_text("unchanged")
+        manifest = _make_manifest([_manifest_path(tmp_path, "dir/unchanged.txt")])
+        current_files = [
+            os.path.join(str(tmp_path), "dir", ".", "new.txt"),
+            os.path.join(str(tmp_path), "dir", "unchanged.txt"),
+        ]
+
+        # WHEN
+        differences = _fast_file_list_to_manifest_diff(
+            root=os.path.join(str(tmp_path), ""),
+            current_files=current_files,
+            diff_manifest=manifest,
+            logger=ClickLogger(False),
+        )
+
+        # THEN
+        assert differences == [("dir/new.txt", FileStatus.NEW)]
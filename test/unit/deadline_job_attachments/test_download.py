@@ -3,6 +3,7 @@
 """Tests for downloading files from the Job Attachment CAS."""
 from __future__ import annotations
 
+import concurrent.futures
 import os
 import shutil
 
@@ -13,7 +14,7 @@ import json
 from pathlib import Path
 import sys
 import tempfile
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict, List
 from unittest.mock import MagicMock, call, patch
 
 import boto3
@@ -24,12 +25,14 @@ import pytest
 from moto import mock_aws
 
 import deadline
-from deadline.job_attachments.asset_manifests import HashAlgorithm
+from deadline.client import config
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data
 from deadline.job_attachments.asset_manifests.base_manifest import (
     BaseAssetManifest,
     BaseManifestPath as BaseManifestPath,
 )
 from deadline.job_attachments.asset_manifests.v2023_03_03 import (
+    AssetManifest as AssetManifestv2023_03_03,
     ManifestPath as ManifestPathv2023_03_03,
 )
 from deadline.job_attachments.asset_manifests.versions import ManifestVersion
@@ -42,12 +45,16 @@ from deadline.job_attachments.download import (
     get_job_input_paths_by_asset_root,
     get_job_output_paths_by_asset_root,
     get_manifest_from_s3,
+    get_output_manifests_by_asset_root,
     handle_existing_vfs,
     mount_vfs_from_manifests,
     merge_asset_manifests,
     _ensure_paths_within_directory,
     _get_asset_root_from_s3,
+    _get_output_manifest_prefix,
     _get_tasks_manifests_keys_from_s3,
+    _plan_download_workers,
+    _write_manifest_to_temp_file,
     VFS_CACHE_REL_PATH_IN_SESSION,
     VFS_MANIFEST_FOLDER_IN_SESSION,
     VFS_MANIFEST_FOLDER_PERMISSIONS,
@@ -197,7 +204,7 @@ def assert_download_task_output(
     Assert that the expected files are downloaded when download_job_output is called with a task id.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -244,7 +251,7 @@ def assert_download_step_output(
     Assert that the expected files are downloaded when download_job_output is called with a step id.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -291,7 +298,7 @@ def assert_download_job_output(
     Assert that the expected files are downloaded when download_job_output is called.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -339,7 +346,7 @@ def assert_download_files_in_directory(
     Assert that the expected files are downloaded when download_files_in_directory is called.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -498,7 +505,7 @@ def assert_get_job_output_paths_by_asset_root(
     Assert that get_job_output_paths_by_asset_root returns a list of (hash, path) pairs of all output files.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value="/test",
     ):
         paths_by_root = get_job_output_paths_by_asset_root(
@@ -524,7 +531,7 @@ def assert_get_job_output_paths_by_asset_root_when_no_asset_root_throws_error(
     Assert that get_job_output_paths_by_asset_root raises MissingAssetRootError when fail to get manifest.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=None,
     ), pytest.raises(MissingAssetRootError) as raised_err:
         get_job_output_paths_by_asset_root(s3_settings, farm_id, queue_id, "job-1")
@@ -545,7 +552,7 @@ def assert_get_job_input_output_paths_by_asset_root(
     asset files and output files.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value="/tmp",
     ):
         paths_by_root = get_job_input_output_paths_by_asset_root(
@@ -714,6 +721,51 @@ class TestFullDownload:
             farm_id, queue_id, self.job_attachment_settings
         )
 
+    @mock_aws
+    def test_get_output_manifests_by_asset_root_uses_get_object_metadata(self, farm_id, queue_id):
+        """
+        Tests that each output manifest and its asset root are fetched with a single get-object
+        request, and that the manifests of each asset root are in the order of their keys.
+        """
+        # GIVEN
+        bucket = self.job_attachment_settings.s3BucketName
+        s3_client = boto3.client("s3", region_name="us-west-2")
+        manifest_keys = _get_tasks_manifests_keys_from_s3(
+            _get_output_manifest_prefix(self.job_attachment_settings, farm_id, queue_id, "job-1"),
+            bucket,
+        )
+        assert len(manifest_keys) > 2
+        expected_roots: Dict[str, List[BaseAssetManifest]] = {}
+        for i, key in enumerate(manifest_keys):
+            asset_root = "/root-a" if i % 2 == 0 else "/root-b"
+            s3_client.copy_object(
+                Bucket=bucket,
+                Key=key,
+                CopySource={"Bucket": bucket, "Key": key},
+                Metadata={"asset-root-json": json.dumps(asset_root)},
+                MetadataDirective="REPLACE",
+            )
+            expected_roots.setdefault(asset_root, []).append(get_manifest_from_s3(key, bucket))
+        operations: List[str] = []
+
+        def record_operation(model, **kwargs):
+            operations.append(model.name)
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.download.get_s3_client",
+            return_value=s3_client,
+        ):
+            s3_client.meta.events.register("before-call.s3", record_operation)
+            manifests_by_root = get_output_manifests_by_asset_root(
+                self.job_attachment_settings, farm_id, queue_id, "job-1"
+            )
+
+        # THEN
+        assert manifests_by_root == expected_roots
+        assert "HeadObject" not in operations
+        assert operations.count("GetObject") == len(manifest_keys)
+
     @mock_aws
     def test_get_job_input_output_paths_by_asset_root(
         self, farm_id, queue_id, manifest_version: ManifestVersion
@@ -1169,7 +1221,7 @@ class TestFullDownload:
         tmp_path: Path,
     ):
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1203,7 +1255,7 @@ class TestFullDownload:
     @mock_aws
     def test_OutputDownloader_set_root_path(self, farm_id, queue_id, tmp_path: Path):
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1251,7 +1303,7 @@ class TestFullDownload:
         resolving the symlink target, the absolute path with ".." removed is stored.
         """
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1289,7 +1341,7 @@ class TestFullDownload:
         Assert a ValueError is thrown when given a non-existent root path.
         """
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1333,7 +1385,7 @@ class TestFullDownload:
         ]
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1396,7 +1448,7 @@ class TestFullDownload:
         ]
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1475,7 +1527,7 @@ class TestFullDownload:
         expected_files_after_create_copy.extend(expected_files)
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1505,7 +1557,7 @@ class TestFullDownload:
         self, farm_id, queue_id, tmp_path: Path
     ):
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1545,7 +1597,7 @@ class TestFullDownload:
         ]
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value="/test_root",
         ):
             output_downloader = OutputDownloader(
@@ -2404,6 +2456,73 @@ def test_merge_asset_manifest_single(test_manifest_one: dict):
     assert actual_merged_manifest == manifest
 
 
+def test_merge_asset_manifests_unsorted_last_manifest_wins():
+    """
+    Test that merging manifests whose paths aren't in canonical order yields the paths in
+    canonical order, with each path taken from the last manifest that has it
+    """
+    manifests: list[BaseAssetManifest] = [
+        AssetManifestv2023_03_03(
+            hash_alg=HashAlgorithm.XXH128,
+            paths=[
+                ManifestPathv2023_03_03(path=path, hash=f"{path}{index}", size=1, mtime=1)
+                for path in paths
+            ],
+            total_size=len(paths),
+        )
+        for index, paths in enumerate([["c", "a", "b"], ["d", "b"], ["b", "e", "a"]])
+    ]
+
+    merged_manifest = merge_asset_manifests(manifests)
+
+    assert merged_manifest is not None
+    assert [(path.path, path.hash) for path in merged_manifest.paths] == [
+        ("a", "a2"),
+        ("b", "b2"),
+        ("c", "c0"),
+        ("d", "d1"),
+        ("e", "e2"),
+    ]
+    assert merged_manifest.totalSize == 5  # type: ignore[attr-defined]
+    # The manifests that were merged are left as they were.
+    assert [path.path for path in manifests[0].paths] == ["c", "a", "b"]
+
+
+def test_merge_asset_manifests_different_hash_algorithms():
+    """
+    Test that merging manifests with different hash algorithms raises an error
+    """
+    manifest = AssetManifestv2023_03_03(hash_alg=HashAlgorithm.XXH128, paths=[], total_size=0)
+    other_manifest = AssetManifestv2023_03_03(hash_alg=HashAlgorithm.XXH128, paths=[], total_size=0)
+    other_manifest.hashAlg = MagicMock(value="other")
+
+    with pytest.raises(NotImplementedError):
+        merge_asset_manifests([manifest, other_manifest])
+
+
+def test_write_manifest_to_temp_file(
+    tmp_path: Path, test_manifest_one: dict, test_manifest_two: dict
+):
+    """
+    Test that the manifest written straight to a file, whose paths aren't in canonical order, is
+    the same as the encoded manifest, and that the manifest's paths are left in their order
+    """
+    merged_manifest = merge_asset_manifests(
+        [
+            decode_manifest(json.dumps(test_manifest_one)),
+            decode_manifest(json.dumps(test_manifest_two)),
+        ]
+    )
+    assert merged_manifest is not None
+    merged_manifest.paths.reverse()
+    unsorted_paths = list(merged_manifest.paths)
+
+    file_name = _write_manifest_to_temp_file(merged_manifest, dir=tmp_path)
+
+    assert merged_manifest.paths == unsorted_paths
+    assert Path(file_name).read_text() == merged_manifest.encode()
+
+
 def on_downloading_files(progress: ProgressReportMetadata) -> bool:
     return True
 
@@ -2442,6 +2561,192 @@ def test_download_files_from_manifests(
     assert sorted(downloaded_files) == ["a.txt", "b.txt", "c.txt", "d.txt"]
 
 
+@mock_aws
+def test_download_files_from_manifests_with_download_cache(
+    tmp_path: Path, s3, fresh_deadline_config
+):
+    """
+    Tests that with the download cache enabled, files downloaded by one call are copied from the
+    cache by the next, without downloading them from S3 again, and that the cache hits are
+    reported in the summary statistics.
+    """
+    # GIVEN
+    config.set_setting("settings.download_cache", "true")
+    config.set_setting("settings.download_cache_dir", str(tmp_path / "cache"))
+    s3.create_bucket(
+        Bucket="test-bucket", CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+    )
+    contents = {f"dir/file{i}.txt": f"contents {i}".encode() for i in range(5)}
+    paths: List[BaseManifestPath] = []
+    for file_path, data in contents.items():
+        file_hash = hash_data(data, HashAlgorithm.XXH128)
+        s3.put_object(Bucket="test-bucket", Key=f"Data/{file_hash}.xxh128", Body=data)
+        paths.append(
+            ManifestPathv2023_03_03(
+                path=file_path, hash=file_hash, size=len(data), mtime=1234000000
+            )
+        )
+    manifest = AssetManifestv2023_03_03(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(len(data) for data in contents.values()),
+    )
+    first_summary = download_files_from_manifests(
+        s3_bucket="test-bucket",
+        manifests_by_root={str(tmp_path / "session1"): manifest},
+        cas_prefix="Data",
+    )
+    for obj in s3.list_objects_v2(Bucket="test-bucket")["Contents"]:
+        s3.delete_object(Bucket="test-bucket", Key=obj["Key"])
+
+    # WHEN
+    second_summary = download_files_from_manifests(
+        s3_bucket="test-bucket",
+        manifests_by_root={str(tmp_path / "session2"): manifest},
+        cas_prefix="Data",
+    )
+
+    # THEN
+    assert (first_summary.cache_hits, first_summary.cache_misses) == (0, 5)
+    assert (second_summary.cache_hits, second_summary.cache_misses) == (5, 0)
+    assert second_summary.cache_bytes_saved == manifest.totalSize  # type: ignore[attr-defined]
+    assert second_summary.processed_files == 5
+    for file_path, data in contents.items():
+        local_path = tmp_path / "session2" / file_path
+        assert local_path.read_bytes() == data
+        assert local_path.stat().st_mtime == 1234
+
+
+@mock_aws
+def test_download_files_from_manifests_with_ranged_downloads(
+    tmp_path: Path, s3, fresh_deadline_config
+):
+    """
+    Tests that large files are downloaded in parts with ranged requests and written in place,
+    alongside the small files, and that no temporary files are left behind.
+    """
+    # GIVEN
+    s3.create_bucket(
+        Bucket="test-bucket", CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+    )
+    contents = {
+        "large1.bin": os.urandom(2500),
+        "large2.bin": os.urandom(1000),
+        "small.txt": b"small contents",
+    }
+    paths: List[BaseManifestPath] = []
+    for file_path, data in contents.items():
+        file_hash = hash_data(data, HashAlgorithm.XXH128)
+        s3.put_object(Bucket="test-bucket", Key=f"Data/{file_hash}.xxh128", Body=data)
+        paths.append(
+            ManifestPathv2023_03_03(
+                path=file_path, hash=file_hash, size=len(data), mtime=1234000000
+            )
+        )
+    manifest = AssetManifestv2023_03_03(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(len(data) for data in contents.values()),
+    )
+    ranges_requested: list[str] = []
+
+    def record_range(params, **kwargs):
+        if "Range" in params:
+            ranges_requested.append(params["Range"])
+
+    s3_client = boto3.client("s3", region_name="us-west-2")
+    s3_client.meta.events.register("provide-client-params.s3.GetObject", record_range)
+
+    # WHEN
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.RANGED_DOWNLOAD_MIN_SIZE", 1000
+    ), patch(
+        f"{deadline.__package__}.job_attachments.download.RANGED_DOWNLOAD_PART_SIZE", 300
+    ), patch(
+        f"{deadline.__package__}.job_attachments.download.RANGED_DOWNLOAD_CHUNK_SIZE", 128
+    ), patch(
+        f"{deadline.__package__}.job_attachments.download.get_s3_client", return_value=s3_client
+    ):
+        summary = download_files_from_manifests(
+            s3_bucket="test-bucket",
+            manifests_by_root={str(tmp_path): manifest},
+            cas_prefix="Data",
+        )
+
+    # THEN
+    assert summary.processed_files == 3
+    assert summary.processed_bytes == manifest.totalSize  # type: ignore[attr-defined]
+    assert sorted(os.listdir(tmp_path)) == sorted(contents)
+    for file_path, data in contents.items():
+        assert (tmp_path / file_path).read_bytes() == data
+        assert (tmp_path / file_path).stat().st_mtime == 1234
+    # 9 parts of the first large file, and 4 of the second
+    assert len(ranges_requested) == 13
+    assert "bytes=2400-2499" in ranges_requested
+    assert "bytes=900-999" in ranges_requested
+
+
+@mock_aws
+def test_download_file_ranged_download_failure_removes_temporary_file(
+    tmp_path: Path, s3, fresh_deadline_config
+):
+    """
+    Tests that if a part of a ranged download fails, the download fails with the error of the
+    part, and the temporary file the parts were written to is removed.
+    """
+    # GIVEN
+    s3.create_bucket(
+        Bucket="test-bucket", CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+    )
+    file_path = ManifestPathv2023_03_03(
+        path="missing.bin", hash="missing", size=2000, mtime=1234000000
+    )
+
+    # WHEN
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.RANGED_DOWNLOAD_MIN_SIZE", 1000
+    ), patch(
+        f"{deadline.__package__}.job_attachments.download.RANGED_DOWNLOAD_PART_SIZE", 300
+    ), concurrent.futures.ThreadPoolExecutor(
+        max_workers=4
+    ) as ranged_download_executor:
+        with pytest.raises(JobAttachmentsS3ClientError) as exc:
+            download_file(
+                file_path,
+                HashAlgorithm.XXH128,
+                str(tmp_path),
+                "test-bucket",
+                "Data",
+                ranged_download_executor=ranged_download_executor,
+            )
+
+    # THEN
+    assert exc.value.status_code == 404
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize(
+    ("file_sizes", "expected_workers"),
+    [
+        pytest.param([1, 2, 3], (5, 0), id="no large files"),
+        pytest.param([1000, 2000], (5, 50), id="only large files"),
+        pytest.param([1, 1000], (2, 25), id="small and large files"),
+    ],
+)
+def test_plan_download_workers(file_sizes: list[int], expected_workers: tuple[int, int]):
+    files: List[BaseManifestPath] = [
+        ManifestPathv2023_03_03(path=f"file{i}", hash=f"hash{i}", size=size, mtime=1234000000)
+        for i, size in enumerate(file_sizes)
+    ]
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.RANGED_DOWNLOAD_MIN_SIZE", 1000
+    ), patch(
+        f"{deadline.__package__}.job_attachments.download.get_s3_max_pool_connections",
+        return_value=50,
+    ):
+        assert _plan_download_workers(files, 5) == expected_workers
+
+
 def test_handle_existing_vfs_no_mount_returns(test_manifest_one: dict):
     """
     Test that handling an existing manifest for a non existent mount returns the manifest
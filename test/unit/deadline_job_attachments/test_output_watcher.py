@@ -0,0 +1,102 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for watching output directories."""
+
+import concurrent.futures
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock
+
+from deadline.job_attachments._output_watcher import OutputWatcher
+from deadline.job_attachments._scan import ScannedFile
+
+
+class TestOutputWatcher:
+    def _poll(self, watcher: OutputWatcher) -> None:
+        watcher.poll()
+        concurrent.futures.wait(watcher._futures)
+
+    def test_poll_submits_stable_files(self, tmp_path: Path):
+        """
+        Tests that a file is passed to `on_stable_file` once its size and modification time are
+        the same in two consecutive scans, and again after it changes and is stable again.
+        """
+        # GIVEN
+        (tmp_path / "frames").mkdir()
+        frame = tmp_path / "frames" / "frame1.exr"
+        frame.write_text("frame 1")
+        stable_files: List[str] = []
+
+        def on_stable_file(directory: str, file_path: str, scanned_file: ScannedFile) -> None:
+            assert directory == str(tmp_path)
+            assert scanned_file.stat.st_size == os.stat(file_path).st_size
+            stable_files.append(file_path)
+
+        watcher = OutputWatcher([str(tmp_path)], on_stable_file, MagicMock())
+
+        # WHEN
+        self._poll(watcher)
+        after_first_scan = list(stable_files)
+        self._poll(watcher)
+        after_second_scan = list(stable_files)
+        self._poll(watcher)
+        after_third_scan = list(stable_files)
+        frame.write_text("frame 1, rendered again")
+        self._poll(watcher)
+        after_change = list(stable_files)
+        self._poll(watcher)
+        watcher.stop()
+
+        # THEN
+        assert after_first_scan == []
+        assert after_second_scan == [str(frame)]
+        assert after_third_scan == [str(frame)]
+        assert after_change == [str(frame)]
+        assert stable_files == [str(frame), str(frame)]
+
+    def test_poll_logs_errors(self, tmp_path: Path):
+        """
+        Tests that errors of `on_stable_file` are logged, and don't stop the watcher.
+        """
+        # GIVEN
+        (tmp_path / "frame1.exr").write_text("frame 1")
+        (tmp_path / "frame2.exr").write_text("frame 2")
+        on_stable_file = MagicMock(side_effect=OSError("file is locked"))
+        logger = MagicMock()
+        watcher = OutputWatcher([str(tmp_path)], on_stable_file, logger)
+
+        # WHEN
+        self._poll(watcher)
+        self._poll(watcher)
+        watcher.stop()
+
+        # THEN
+        assert on_stable_file.call_count == 2
+        assert logger.warning.call_count == 2
+        assert "file is locked" in logger.warning.call_args.args[0]
+
+    def test_watch_in_background(self, tmp_path: Path):
+        """
+        Tests that the started watcher polls the directories in the background, including the
+        directories created after it started, until it is stopped.
+        """
+        # GIVEN
+        found = threading.Event()
+        on_stable_file = MagicMock(side_effect=lambda *args: found.set())
+
+        # WHEN
+        with OutputWatcher(
+            [str(tmp_path / "outputs")], on_stable_file, MagicMock(), poll_interval=0.01
+        ) as watcher:
+            time.sleep(0.05)
+            (tmp_path / "outputs").mkdir()
+            (tmp_path / "outputs" / "frame1.exr").write_text("frame 1")
+            assert found.wait(timeout=10)
+
+        # THEN
+        assert watcher.is_stopping()
+        on_stable_file.assert_called_once()
+        assert on_stable_file.call_args.args[1] == str(tmp_path / "outputs" / "frame1.exr")
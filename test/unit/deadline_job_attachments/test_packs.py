@@ -0,0 +1,106 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the pack index of the packed CAS layout."""
+
+import json
+
+import pytest
+
+from deadline.job_attachments.asset_manifests import HashAlgorithm
+from deadline.job_attachments.exceptions import JobAttachmentsError
+from deadline.job_attachments.packs import PACK_INDEX_VERSION, PackedObject, PackIndex
+
+
+@pytest.fixture
+def pack_index() -> PackIndex:
+    return PackIndex(
+        HashAlgorithm.XXH128,
+        {
+            "hash2": PackedObject("packs/pack1.pack", 10, 5),
+            "hash1": PackedObject("packs/pack1.pack", 0, 10),
+            "hash3": PackedObject("packs/pack2.pack", 0, 0),
+        },
+    )
+
+
+def test_encode_decode_round_trip(pack_index: PackIndex):
+    """
+    Tests that a pack index is encoded canonically, with its objects grouped by pack in order of
+    their offsets, and decodes back to the same index.
+    """
+    # WHEN
+    encoded = pack_index.encode()
+
+    # THEN
+    assert encoded == (
+        '{"hashAlg":"xxh128","packIndexVersion":"' + PACK_INDEX_VERSION + '",'
+        '"packs":{"packs/pack1.pack":[["hash1",0,10],["hash2",10,5]],'
+        '"packs/pack2.pack":[["hash3",0,0]]}}'
+    )
+    assert PackIndex.decode(encoded) == pack_index
+    assert pack_index.get_name().startswith("packs/")
+    assert pack_index.get_name().endswith(".index")
+
+
+@pytest.mark.parametrize(
+    "version",
+    [
+        pytest.param("1999-01-01", id="other version"),
+        pytest.param(None, id="no version"),
+    ],
+)
+def test_decode_rejects_unknown_version(pack_index: PackIndex, version):
+    """
+    Tests that decoding a pack index with a version other than the supported one fails.
+    """
+    # GIVEN
+    document = json.loads(pack_index.encode())
+    document["packIndexVersion"] = version
+
+    # WHEN
+    with pytest.raises(JobAttachmentsError) as err:
+        PackIndex.decode(json.dumps(document))
+
+    # THEN
+    assert "Unsupported pack index version" in str(err.value)
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        pytest.param("not json", id="not JSON"),
+        pytest.param(
+            '{"packIndexVersion":"' + PACK_INDEX_VERSION + '","hashAlg":"xxh128"}',
+            id="no packs",
+        ),
+        pytest.param(
+            '{"packIndexVersion":"'
+            + PACK_INDEX_VERSION
+            + '","hashAlg":"xxh128","packs":{"p":[["hash1",0]]}}',
+            id="incomplete entry",
+        ),
+    ],
+)
+def test_decode_rejects_malformed_index(index: str):
+    """
+    Tests that decoding a malformed pack index fails with a JobAttachmentsError.
+    """
+    with pytest.raises(JobAttachmentsError):
+        PackIndex.decode(index)
+
+
+def test_update(pack_index: PackIndex):
+    """
+    Tests that updating a pack index adds the objects of the other index.
+    """
+    # GIVEN
+    other = PackIndex(HashAlgorithm.XXH128, {"hash4": PackedObject("packs/pack3.pack", 0, 1)})
+
+    # WHEN
+    pack_index.update(other)
+
+    # THEN
+    assert len(pack_index) == 4
+    assert "hash4" in pack_index
+    assert pack_index.get("hash4") == PackedObject("packs/pack3.pack", 0, 1)
+    assert pack_index.get("hash5") is None
@@ -1,6 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 
+from dataclasses import asdict
 from deadline.job_attachments.progress_tracker import (
     SummaryStatistics,
     DownloadSummaryStatistics,
@@ -84,6 +85,20 @@ class TestSummaryStatistics:
         aggregated = summary1.aggregate(summary2)
         assert aggregated == expected_aggregated_stats
 
+    def test_aggregate_concurrency(self):
+        """
+        Tests that aggregating keeps the highest concurrency, and that the concurrency is only
+        reported when it was adjusted at runtime.
+        """
+        summary1 = SummaryStatistics(concurrency=4)
+        summary2 = SummaryStatistics(concurrency=12)
+
+        aggregated = summary1.aggregate(summary2)
+
+        assert aggregated.concurrency == 12
+        assert "Adjusted concurrency to 12 transfers." in str(aggregated)
+        assert "concurrency" not in str(SummaryStatistics())
+
     def test_aggregate_summary_stats_and_download_summary_stats(self):
         summary1 = SummaryStatistics(
             total_time=10.0,
@@ -191,6 +206,26 @@ class TestDownloadSummaryStatistics:
         aggregated = summary1.aggregate(summary2)
         assert aggregated == expected_aggregated_stats
 
+    def test_aggregate_download_cache_stats(self):
+        """
+        Tests that the download cache hits, misses and bytes saved are summed and reported, and
+        that they aren't part of the hashing and upload summary statistics.
+        """
+        summary1 = DownloadSummaryStatistics(cache_hits=3, cache_misses=1, cache_bytes_saved=300)
+        summary2 = DownloadSummaryStatistics(cache_hits=4, cache_misses=2, cache_bytes_saved=400)
+
+        aggregated = summary1.aggregate(summary2)
+
+        assert aggregated == DownloadSummaryStatistics(
+            cache_hits=7, cache_misses=3, cache_bytes_saved=700
+        )
+        assert "Copied 7 of 10 files totaling 700.0 B from the download cache." in str(aggregated)
+        assert "download cache" not in str(DownloadSummaryStatistics())
+        summary_statistics = aggregated.convert_to_summary_statistics()
+        assert type(summary_statistics) is SummaryStatistics
+        assert "cache_hits" not in asdict(summary_statistics)
+        assert "download cache" not in str(summary_statistics)
+
     def test_aggregate_with_summary_stats(self):
         """
         Tests if it raises exception when DownloadSummaryStatistics calls aggreate function
@@ -0,0 +1,125 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for scanning input directories."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from deadline.job_attachments._scan import (
+    _get_directory_prefix,
+    _is_within_directory_prefix,
+    _scan_directory,
+)
+from ..conftest import is_windows_non_admin
+
+
+def _walk_files(directory: str) -> set[str]:
+    return {
+        os.path.normpath(os.path.join(root, file))
+        for (root, _, files) in os.walk(directory)
+        for file in files
+    }
+
+
+class TestScan:
+    def test_scan_directory(self, tmp_path: Path):
+        """
+        Tests that scanning a directory lists the same files as os.walk, with the resolved path
+        and the stat of each file.
+        """
+        # GIVEN
+        for file_path in ["a.txt", "dir/b.txt", "dir/nested/c.txt", "dir/nested/deeper/d.txt"]:
+            (tmp_path / file_path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / file_path).write_text(file_path)
+        (tmp_path / "empty").mkdir()
+
+        # WHEN
+        scanned_files = _scan_directory(str(tmp_path))
+
+        # THEN
+        assert set(scanned_files) == _walk_files(str(tmp_path))
+        for file_path, scanned_file in scanned_files.items():
+            assert scanned_file is not None
+            assert scanned_file.resolved_path == str(Path(file_path).resolve())
+            assert scanned_file.stat.st_size == Path(file_path).stat().st_size
+            assert scanned_file.stat.st_mtime_ns == Path(file_path).stat().st_mtime_ns
+
+    def test_scan_directory_relative_path(self, tmp_path: Path, monkeypatch):
+        """
+        Tests that the files of a relative directory are listed relative to it, like os.walk.
+        """
+        # GIVEN
+        (tmp_path / "dir" / "sub").mkdir(parents=True)
+        (tmp_path / "dir" / "sub" / "a.txt").write_text("a")
+        monkeypatch.chdir(tmp_path)
+
+        # WHEN
+        scanned_files = _scan_directory("dir")
+
+        # THEN
+        assert set(scanned_files) == {os.path.join("dir", "sub", "a.txt")}
+        scanned_file = scanned_files[os.path.join("dir", "sub", "a.txt")]
+        assert scanned_file is not None
+        assert scanned_file.resolved_path == str((tmp_path / "dir" / "sub" / "a.txt").resolve())
+
+    @pytest.mark.skipif(
+        is_windows_non_admin(),
+        reason="Windows requires Admin to create symlinks, skipping this test.",
+    )
+    def test_scan_directory_with_symlinks(self, tmp_path: Path):
+        """
+        Tests that, like os.walk, symlinks to files are listed as files with the stat of their
+        targets, symlinks to directories are not followed, and broken symlinks are listed without
+        a stat.
+        """
+        # GIVEN
+        outside_dir = tmp_path / "outside"
+        outside_dir.mkdir()
+        (outside_dir / "target.txt").write_text("target")
+        scan_dir = tmp_path / "scan"
+        scan_dir.mkdir()
+        (scan_dir / "file.txt").write_text("file")
+        (scan_dir / "link_to_file.txt").symlink_to(outside_dir / "target.txt")
+        (scan_dir / "link_to_dir").symlink_to(outside_dir, target_is_directory=True)
+        (scan_dir / "broken_link.txt").symlink_to(tmp_path / "missing.txt")
+
+        # WHEN
+        scanned_files = _scan_directory(str(scan_dir))
+
+        # THEN
+        assert set(scanned_files) == _walk_files(str(scan_dir))
+        assert set(scanned_files) == {
+            str(scan_dir / "file.txt"),
+            str(scan_dir / "link_to_file.txt"),
+            str(scan_dir / "broken_link.txt"),
+        }
+        link_to_file = scanned_files[str(scan_dir / "link_to_file.txt")]
+        assert link_to_file is not None
+        assert link_to_file.resolved_path == str((outside_dir / "target.txt").resolve())
+        assert link_to_file.stat.st_size == len("target")
+        assert scanned_files[str(scan_dir / "broken_link.txt")] is None
+
+    def test_is_within_directory_prefix(self, tmp_path: Path):
+        """
+        Tests that the prefix of a directory matches the paths inside of it, but not the paths of
+        a sibling directory whose name starts with the name of the directory.
+        """
+        # GIVEN
+        (tmp_path / "session").mkdir()
+        directory_prefix = _get_directory_prefix(str(tmp_path / "session"))
+
+        # THEN
+        assert directory_prefix.endswith(os.sep)
+        resolved_session = str((tmp_path / "session").resolve())
+        assert _is_within_directory_prefix(
+            os.path.join(resolved_session, "dir", "file.txt"), directory_prefix
+        )
+        assert not _is_within_directory_prefix(resolved_session + "-other", directory_prefix)
+        assert not _is_within_directory_prefix(
+            os.path.join(resolved_session + "-other", "file.txt"), directory_prefix
+        )
+        assert _is_within_directory_prefix(
+            os.path.join(resolved_session, "file.txt"), _get_directory_prefix(os.sep)
+        )
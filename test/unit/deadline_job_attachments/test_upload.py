@@ -4,8 +4,11 @@
 Tests related to the uploading of assets.
 """
 
+import gzip
 import os
 import sys
+import threading
+import time
 from copy import deepcopy
 from datetime import datetime
 from io import BytesIO
@@ -28,9 +31,12 @@ from deadline.job_attachments.asset_manifests import (
     BaseManifestPath,
     HashAlgorithm,
     ManifestVersion,
+    hash_data,
 )
-from deadline.job_attachments.caches import HashCacheEntry, S3CheckCacheEntry
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest
+from deadline.job_attachments.caches import HashCacheEntry, S3CheckCache, S3CheckCacheEntry
 from deadline.job_attachments.exceptions import (
+    AssetSyncCancelledError,
     AssetSyncError,
     JobAttachmentsS3ClientError,
     MisconfiguredInputsError,
@@ -42,17 +48,29 @@ from deadline.job_attachments.models import (
     Attachments,
     FileSystemLocation,
     FileSystemLocationType,
+    HashingEngine,
     ManifestProperties,
     JobAttachmentS3Settings,
+    OutputFile,
     StorageProfileOperatingSystemFamily,
     PathFormat,
     StorageProfile,
 )
+from deadline.job_attachments import upload
+from deadline.job_attachments.download import (
+    download_files_from_manifests,
+    _get_input_manifest_and_pack_index_name_from_s3,
+    get_manifest_from_s3,
+    get_pack_index_from_s3,
+)
+from deadline.job_attachments.packs import PACK_MAX_OBJECT_SIZE
 from deadline.job_attachments.progress_tracker import (
     ProgressStatus,
+    ProgressTracker,
     SummaryStatistics,
 )
 from deadline.job_attachments.upload import FileStatus, S3AssetManager, S3AssetUploader
+from deadline.job_attachments._scan import ScannedFile
 from deadline.job_attachments._utils import _human_readable_file_size
 from ..conftest import is_windows_non_admin
 
@@ -1323,6 +1341,48 @@ class TestUpload:
                 "Failed to parse configuration settings. Please ensure that the following settings in the config file are integers",
                 id="small_file_threshold_multiplier value is not a number.",
             ),
+            pytest.param(
+                "pack_small_files",
+                "maybe",
+                "'pack_small_files' (maybe) must be true or false.",
+                id="pack_small_files value is not a boolean.",
+            ),
+            pytest.param(
+                "compress_manifests",
+                "maybe",
+                "'compress_manifests' (maybe) must be true or false.",
+                id="compress_manifests value is not a boolean.",
+            ),
+            pytest.param(
+                "adaptive_concurrency",
+                "maybe",
+                "'adaptive_concurrency' (maybe) must be true or false.",
+                id="adaptive_concurrency value is not a boolean.",
+            ),
+            pytest.param(
+                "transfer_engine",
+                "GREEN_THREADS",
+                "'transfer_engine' (GREEN_THREADS) must be one of THREAD, ASYNCIO.",
+                id="transfer_engine value is not an engine.",
+            ),
+            pytest.param(
+                "large_file_upload_max_in_flight_mb",
+                "0",
+                "'large_file_upload_max_in_flight_mb' (0) must be positive integer.",
+                id="large_file_upload_max_in_flight_mb value is 0.",
+            ),
+            pytest.param(
+                "large_file_upload_max_parts_in_flight",
+                "-5",
+                "'large_file_upload_max_parts_in_flight' (-5) must be positive integer.",
+                id="large_file_upload_max_parts_in_flight value is negative.",
+            ),
+            pytest.param(
+                "large_file_upload_max_parts_in_flight",
+                "some string",
+                "Failed to parse configuration settings. Please ensure that the following settings in the config file are integers",
+                id="large_file_upload_max_parts_in_flight value is not a number.",
+            ),
         ],
     )
     def test_asset_uploader_constructor_with_nonvalid_config_settings(
@@ -1648,6 +1708,302 @@ class TestUpload:
             assert man_path.hash == "a"
             hash_cache.put_entry.assert_not_called()
 
+    def test_create_manifest_file_with_process_hashing_engine(self, farm_id, queue_id, tmpdir):
+        """
+        Test that hashing the input files on a process pool creates the same manifest as hashing
+        them on a thread pool, and that the new hashes are put into the hash cache.
+        """
+        # GIVEN
+        root_dir = tmpdir.mkdir("root")
+        input_paths = []
+        for i in range(20):
+            test_file = root_dir.join(f"file_{i}.txt")
+            test_file.write("a" * i)
+            input_paths.append(Path(test_file))
+        large_file = root_dir.join("large.bin")
+        large_file.write_binary(b"b" * 1024 * 1024)
+        input_paths.append(Path(large_file))
+
+        thread_hash_cache = MagicMock()
+        thread_hash_cache.get_entry.return_value = None
+        process_hash_cache = MagicMock()
+        process_hash_cache.get_entry.return_value = None
+
+        # WHEN
+        thread_manifest = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+            hashing_engine=HashingEngine.THREAD,
+        )._create_manifest_file(input_paths, root_dir, hash_cache=thread_hash_cache)
+        process_manifest = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+            hashing_engine=HashingEngine.PROCESS,
+        )._create_manifest_file(input_paths, root_dir, hash_cache=process_hash_cache)
+
+        # THEN
+        assert process_manifest.encode() == thread_manifest.encode()
+        assert process_hash_cache.put_entry.call_count == len(input_paths)
+        assert sorted(
+            (call.args[0].file_path, call.args[0].file_hash)
+            for call in process_hash_cache.put_entry.call_args_list
+        ) == sorted(
+            (call.args[0].file_path, call.args[0].file_hash)
+            for call in thread_hash_cache.put_entry.call_args_list
+        )
+
+    def test_create_manifest_file_with_process_hashing_engine_skips_cached_files(
+        self, farm_id, queue_id, tmpdir
+    ):
+        """
+        Test that with the process hashing engine, files that are up to date in the hash cache
+        are not hashed again and are reported as skipped.
+        """
+        # GIVEN
+        root_dir = tmpdir.mkdir("root")
+        test_file = root_dir.join("test.txt")
+        test_file.write("test")
+        file_time = str(datetime.fromtimestamp(os.stat(test_file).st_mtime))
+        hash_cache = MagicMock()
+        hash_cache.get_entry.return_value = HashCacheEntry(
+            str(test_file), HashAlgorithm.XXH128, "a", file_time
+        )
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.PREPARING_IN_PROGRESS, total_files=1, total_bytes=4
+        )
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+            hashing_engine=HashingEngine.PROCESS,
+        )
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.upload.concurrent.futures.ProcessPoolExecutor"
+        ) as mock_executor:
+            manifest = asset_manager._create_manifest_file(
+                [Path(test_file)], root_dir, hash_cache, progress_tracker
+            )
+
+        # THEN
+        mock_executor.assert_not_called()
+        hash_cache.put_entry.assert_not_called()
+        assert [(path.path, path.hash, path.size) for path in manifest.paths] == [
+            ("test.txt", "a", 4)
+        ]
+        assert progress_tracker.skipped_files == 1
+        assert progress_tracker.processed_files == 0
+
+    @pytest.mark.parametrize("hashing_engine", [HashingEngine.THREAD, HashingEngine.PROCESS])
+    def test_hash_assets_and_create_manifest_uses_scanned_files(
+        self, farm_id, queue_id, tmpdir, hashing_engine
+    ):
+        """
+        Test that the input files found by scanning their directories are grouped and counted with
+        the stats taken when they were scanned, without being resolved or stat-ed through pathlib
+        again, and that the manifest has their current stats, from a single `os.stat` right before
+        their hash cache entries are compared.
+        """
+        # GIVEN
+        root_dir = tmpdir.mkdir("root")
+        scanned_file = root_dir.join("scanned.txt")
+        scanned_file.write("scanned")
+        other_file = root_dir.join("other.txt")
+        other_file.write("other file")
+        scanned_stat = os.stat(other_file)
+        resolved_scanned_file = str(Path(scanned_file).resolve())
+        scanned_files = {str(scanned_file): ScannedFile(resolved_scanned_file, scanned_stat)}
+        cached_entry = HashCacheEntry(
+            file_path=resolved_scanned_file,
+            hash_algorithm=HashAlgorithm.XXH128,
+            file_hash="a",
+            last_modified_time=str(datetime.fromtimestamp(os.stat(scanned_file).st_mtime)),
+        )
+        hash_cache = MagicMock()
+        hash_cache.get_entry.side_effect = lambda path, _: (
+            cached_entry if path == resolved_scanned_file else None
+        )
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+            hashing_engine=hashing_engine,
+        )
+
+        # WHEN
+        with patch.object(Path, "stat", autospec=True, side_effect=Path.stat) as mock_stat, patch(
+            f"{deadline.__package__}.job_attachments.upload.os.stat", side_effect=os.stat
+        ) as mock_os_stat, patch(
+            f"{deadline.__package__}.job_attachments.upload.HashCache"
+        ) as mock_hash_cache:
+            mock_hash_cache.return_value.__enter__.return_value = hash_cache
+            upload_group = asset_manager.prepare_paths_for_upload(
+                input_paths=[str(scanned_file), str(other_file)],
+                output_paths=[],
+                referenced_paths=[],
+                scanned_files=scanned_files,
+            )
+            (_, asset_root_manifests) = asset_manager.hash_assets_and_create_manifest(
+                upload_group.asset_groups,
+                upload_group.total_input_files,
+                upload_group.total_input_bytes,
+            )
+
+        # THEN
+        stat_paths = {str(call.args[0]) for call in mock_stat.call_args_list}
+        assert str(scanned_file) not in stat_paths
+        assert str(other_file) in stat_paths
+        assert [call.args[0] for call in mock_os_stat.call_args_list].count(
+            resolved_scanned_file
+        ) == 1
+        assert upload_group.total_input_files == 2
+        assert upload_group.total_input_bytes == scanned_stat.st_size + len("other file")
+        manifest = asset_root_manifests[0].asset_manifest
+        assert manifest is not None
+        assert sorted((path.path, path.hash, path.size, path.mtime) for path in manifest.paths) == [
+            (
+                "other.txt",
+                hash_data(b"other file", HashAlgorithm.XXH128),
+                len("other file"),
+                os.stat(other_file).st_mtime_ns // 1000,
+            ),
+            ("scanned.txt", "a", len("scanned"), os.stat(scanned_file).st_mtime_ns // 1000),
+        ]
+
+    @pytest.mark.parametrize("hashing_engine", [HashingEngine.THREAD, HashingEngine.PROCESS])
+    def test_hash_assets_and_create_manifest_rehashes_scanned_files_saved_after_the_scan(
+        self, farm_id, queue_id, tmpdir, hashing_engine
+    ):
+        """
+        Test that a scanned input file that was saved after the scan (for example, while the
+        submission was being confirmed) is hashed again, even though the hash cache has its hash
+        at the scanned modification time, and that the manifest has the hash, size and
+        modification time of its current contents.
+        """
+        # GIVEN
+        root_dir = tmpdir.mkdir("root")
+        scanned_file = root_dir.join("scanned.txt")
+        scanned_file.write("old")
+        scanned_stat = os.stat(scanned_file)
+        scanned_file.write("contents written after the scan")
+        os.utime(scanned_file, ns=(scanned_stat.st_atime_ns, scanned_stat.st_mtime_ns + 10**9))
+        current_stat = os.stat(scanned_file)
+        resolved_scanned_file = str(Path(scanned_file).resolve())
+        scanned_files = {str(scanned_file): ScannedFile(resolved_scanned_file, scanned_stat)}
+        hash_cache = MagicMock()
+        hash_cache.get_entry.return_value = HashCacheEntry(
+            file_path=resolved_scanned_file,
+            hash_algorithm=HashAlgorithm.XXH128,
+            file_hash=hash_data(b"old", HashAlgorithm.XXH128),
+            last_modified_time=str(datetime.fromtimestamp(scanned_stat.st_mtime)),
+        )
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+            hashing_engine=hashing_engine,
+        )
+
+        # WHEN
+        with patch(f"{deadline.__package__}.job_attachments.upload.HashCache") as mock_hash_cache:
+            mock_hash_cache.return_value.__enter__.return_value = hash_cache
+            upload_group = asset_manager.prepare_paths_for_upload(
+                input_paths=[str(scanned_file)],
+                output_paths=[],
+                referenced_paths=[],
+                scanned_files=scanned_files,
+            )
+            (_, asset_root_manifests) = asset_manager.hash_assets_and_create_manifest(
+                upload_group.asset_groups,
+                upload_group.total_input_files,
+                upload_group.total_input_bytes,
+            )
+
+        # THEN
+        manifest = asset_root_manifests[0].asset_manifest
+        assert manifest is not None
+        assert [(path.path, path.hash, path.size, path.mtime) for path in manifest.paths] == [
+            (
+                "scanned.txt",
+                hash_data(b"contents written after the scan", HashAlgorithm.XXH128),
+                current_stat.st_size,
+                current_stat.st_mtime_ns // 1000,
+            )
+        ]
+
+    def test_batch_files_for_hashing(self):
+        """
+        Test that small files are grouped into batches and large files are put into their own batches.
+        """
+        # GIVEN
+        large_size = upload.HASHING_BATCH_MAX_BYTES
+        files_to_hash = [(f"small_{i}", "", {"size": 1024}) for i in range(1000)] + [
+            (f"large_{i}", "", {"size": large_size}) for i in range(3)
+        ]
+
+        # WHEN
+        batches = S3AssetManager._batch_files_for_hashing(files_to_hash, num_workers=1)
+
+        # THEN
+        assert sorted(file[0] for batch in batches for file in batch) == sorted(
+            file[0] for file in files_to_hash
+        )
+        # The large files come first, each in their own batch.
+        assert [[file[0] for file in batch] for batch in batches[:3]] == [
+            ["large_0"],
+            ["large_1"],
+            ["large_2"],
+        ]
+        # The small files are spread across a few batches per worker.
+        small_batches = batches[3:]
+        assert len(small_batches) == 4
+        assert all(len(batch) <= upload.HASHING_BATCH_MAX_FILES for batch in small_batches)
+
+    def test_batch_files_for_hashing_spreads_small_workloads_across_workers(self):
+        """
+        Test that the batch limits are reduced so that a small number of files is still spread
+        across the available workers.
+        """
+        files_to_hash = [(f"file_{i}", "", {"size": 1024}) for i in range(64)]
+
+        batches = S3AssetManager._batch_files_for_hashing(files_to_hash, num_workers=4)
+
+        assert len(batches) == 16
+        assert all(len(batch) == 4 for batch in batches)
+
+    def test_asset_manager_constructor_with_nonvalid_hashing_engine(
+        self, farm_id, queue_id, fresh_deadline_config
+    ):
+        """
+        Tests that when the asset manager is created with a nonvalid hashing engine config setting,
+        an AssetSyncError is raised.
+        """
+        config.set_setting("settings.hashing_engine", "GPU")
+        with pytest.raises(AssetSyncError) as err:
+            _ = S3AssetManager(
+                farm_id=farm_id,
+                queue_id=queue_id,
+                job_attachment_settings=self.job_attachment_s3_settings,
+            )
+        assert "'hashing_engine' (GPU) must be one of THREAD, PROCESS." in str(err.value)
+
+    def test_asset_manager_constructor_reads_hashing_engine_from_config(
+        self, farm_id, queue_id, fresh_deadline_config
+    ):
+        """
+        Tests that the hashing engine is read from the config, ignoring case.
+        """
+        assert S3AssetManager(farm_id=farm_id, queue_id=queue_id).hashing_engine == (
+            HashingEngine.THREAD
+        )
+        config.set_setting("settings.hashing_engine", "process")
+        assert S3AssetManager(farm_id=farm_id, queue_id=queue_id).hashing_engine == (
+            HashingEngine.PROCESS
+        )
+
     @mock_aws
     def test_asset_management_misconfigured_inputs(self, farm_id, queue_id, tmpdir):
         """
@@ -2494,6 +2850,652 @@ class TestUpload:
         )
         assert actual_queues == expected_queues
 
+    def test_separate_files_by_hash(self):
+        """
+        Tests that a helper method `_separate_files_by_hash` keeps the first file for each hash.
+        """
+        input_files = [
+            BaseManifestPath(path="a", hash="hash1", size=1, mtime=1),
+            BaseManifestPath(path="b", hash="hash2", size=2, mtime=1),
+            BaseManifestPath(path="c", hash="hash1", size=1, mtime=2),
+            BaseManifestPath(path="d", hash="hash1", size=1, mtime=3),
+        ]
+        a3_asset_uploader = S3AssetUploader()
+        actual_files = a3_asset_uploader._separate_files_by_hash(files_to_upload=input_files)
+        assert actual_files == (
+            [input_files[0], input_files[1]],
+            [input_files[2], input_files[3]],
+        )
+
+    @mock_aws
+    def test_upload_input_files_uploads_each_hash_once(
+        self, tmpdir, default_job_attachment_s3_settings
+    ):
+        """
+        Tests that files with the same hash are checked and uploaded once, and that the other
+        files with that hash are reported as skipped.
+        """
+        # Given
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        asset_root = tmpdir.mkdir("test-root")
+        files = []
+        for i in range(5):
+            asset_root.join(f"atlas{i}.png").write("same")
+            files.append(BaseManifestPath(path=f"atlas{i}.png", hash="samehash", size=4, mtime=1))
+        asset_root.join("other.png").write("other")
+        files.append(BaseManifestPath(path="other.png", hash="otherhash", size=5, mtime=1))
+        manifest = AssetManifest(hash_alg=HashAlgorithm.XXH128, paths=files, total_size=25)
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS, total_files=6, total_bytes=25
+        )
+        uploader = S3AssetUploader()
+
+        # When
+        with patch.object(
+            uploader, "file_already_uploaded", return_value=False
+        ) as mock_file_already_uploaded, patch.object(
+            uploader, "upload_file_to_s3"
+        ) as mock_upload_file_to_s3:
+            uploader.upload_input_files(
+                manifest,
+                bucket,
+                Path(asset_root),
+                "prefix",
+                progress_tracker=progress_tracker,
+                s3_check_cache_dir=str(tmpdir.mkdir("cache")),
+            )
+
+        # Then
+        assert mock_file_already_uploaded.call_count == 2
+        assert sorted(
+            call.kwargs["s3_upload_key"] for call in mock_upload_file_to_s3.call_args_list
+        ) == ["prefix/otherhash.xxh128", "prefix/samehash.xxh128"]
+        assert progress_tracker.skipped_files == 4
+        assert progress_tracker.skipped_bytes == 16
+
+    @mock_aws
+    def test_upload_assets_packs_small_files(self, tmpdir, default_job_attachment_s3_settings):
+        """
+        Tests that with packing turned on, small files are uploaded in a pack, that the manifest
+        refers to the pack index, and that the packed files can be downloaded back.
+        """
+        # Given
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        cas_prefix = default_job_attachment_s3_settings.full_cas_prefix()
+        asset_root = tmpdir.mkdir("test-root")
+        contents = {
+            "a.txt": b"a",
+            "b/b.txt": b"bb",
+            "b/copy_of_a.txt": b"a",
+            "empty.txt": b"",
+            "large.bin": b"x" * (PACK_MAX_OBJECT_SIZE + 1),
+        }
+        files = []
+        for file_path, data in contents.items():
+            local_path = Path(asset_root, file_path)
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            local_path.write_bytes(data)
+            files.append(
+                BaseManifestPath(
+                    path=file_path,
+                    hash=hash_data(data, HashAlgorithm.XXH128),
+                    size=len(data),
+                    mtime=1234000000,
+                )
+            )
+        manifest = AssetManifest(
+            hash_alg=HashAlgorithm.XXH128,
+            paths=files,
+            total_size=sum(len(data) for data in contents.values()),
+        )
+        uploader = S3AssetUploader()
+        uploader.pack_small_files = True
+
+        # When
+        (partial_manifest_key, _) = uploader.upload_assets(
+            job_attachment_settings=default_job_attachment_s3_settings,
+            manifest=manifest,
+            source_root=Path(asset_root),
+            partial_manifest_prefix="farm-1234/queue-1234/Inputs/0000",
+            s3_check_cache_dir=str(tmpdir.mkdir("cache")),
+        )
+
+        # Then
+        s3 = boto3.client("s3", region_name="us-west-2")  # pylint: disable=invalid-name
+        keys = [obj["Key"] for obj in s3.list_objects_v2(Bucket=bucket)["Contents"]]
+        manifest_key = default_job_attachment_s3_settings.add_root_and_manifest_folder_prefix(
+            partial_manifest_key
+        )
+        pack_keys = [key for key in keys if key.endswith(".pack")]
+        index_keys = [key for key in keys if key.endswith(".index")]
+        assert len(pack_keys) == 1
+        assert len(index_keys) == 1
+        assert sorted(keys) == sorted(
+            [
+                manifest_key,
+                f"{cas_prefix}/{files[-1].hash}.xxh128",
+                *pack_keys,
+                *index_keys,
+            ]
+        )
+        assert pack_keys[0].startswith(f"{cas_prefix}/packs/")
+
+        metadata = s3.head_object(Bucket=bucket, Key=manifest_key)["Metadata"]
+        assert f"{cas_prefix}/{metadata['pack-index']}" == index_keys[0]
+
+        downloaded_manifest, pack_index_name = _get_input_manifest_and_pack_index_name_from_s3(
+            manifest_key, bucket
+        )
+        assert downloaded_manifest.encode() == manifest.encode()
+        assert pack_index_name == metadata["pack-index"]
+
+        pack_index = get_pack_index_from_s3(metadata["pack-index"], bucket, cas_prefix)
+        assert sorted(pack_index) == sorted({file.hash for file in files[:-1]})
+
+        download_dir = tmpdir.mkdir("download")
+        download_files_from_manifests(
+            s3_bucket=bucket,
+            manifests_by_root={str(download_dir): manifest},
+            cas_prefix=cas_prefix,
+            pack_index=pack_index,
+        )
+        for file_path, data in contents.items():
+            assert Path(download_dir, file_path).read_bytes() == data
+
+    @mock_aws
+    def test_upload_assets_compresses_manifest(self, tmpdir, default_job_attachment_s3_settings):
+        """
+        Tests that with manifest compression turned on, the manifest is uploaded gzip-compressed
+        and marked with its content encoding, that its hash is the hash of the uncompressed
+        manifest, and that it decodes back to the same manifest.
+        """
+        # Given
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        asset_root = tmpdir.mkdir("test-root")
+        asset_root.join("a.txt").write("a")
+        manifest = AssetManifest(
+            hash_alg=HashAlgorithm.XXH128,
+            paths=[
+                BaseManifestPath(
+                    path="a.txt",
+                    hash=hash_data(b"a", HashAlgorithm.XXH128),
+                    size=1,
+                    mtime=1234000000,
+                )
+            ],
+            total_size=1,
+        )
+        uploader = S3AssetUploader()
+        uploader.compress_manifests = True
+
+        # When
+        (partial_manifest_key, manifest_hash) = uploader.upload_assets(
+            job_attachment_settings=default_job_attachment_s3_settings,
+            manifest=manifest,
+            source_root=Path(asset_root),
+            partial_manifest_prefix="farm-1234/queue-1234/Inputs/0000",
+            s3_check_cache_dir=str(tmpdir.mkdir("cache")),
+        )
+
+        # Then
+        manifest_key = default_job_attachment_s3_settings.add_root_and_manifest_folder_prefix(
+            partial_manifest_key
+        )
+        s3 = boto3.client("s3", region_name="us-west-2")  # pylint: disable=invalid-name
+        manifest_object = s3.get_object(Bucket=bucket, Key=manifest_key)
+        assert manifest_object["ContentEncoding"] == "gzip"
+        assert gzip.decompress(manifest_object["Body"].read()) == manifest.encode().encode("utf-8")
+        assert manifest_hash == hash_data(manifest.encode().encode("utf-8"), HashAlgorithm.XXH128)
+        assert get_manifest_from_s3(manifest_key, bucket).encode() == manifest.encode()
+
+    @mock_aws
+    def test_upload_input_files_packs_only_new_small_files(
+        self, tmpdir, default_job_attachment_s3_settings
+    ):
+        """
+        Tests that small files whose objects are in the S3 check cache are not packed, and that
+        a pack that already exists in S3 is not uploaded again.
+        """
+        # Given
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        asset_root = tmpdir.mkdir("test-root")
+        files = []
+        for i in range(3):
+            data = f"contents {i}".encode()
+            asset_root.join(f"file{i}.txt").write_binary(data)
+            files.append(
+                BaseManifestPath(
+                    path=f"file{i}.txt",
+                    hash=hash_data(data, HashAlgorithm.XXH128),
+                    size=len(data),
+                    mtime=1,
+                )
+            )
+        manifest = AssetManifest(hash_alg=HashAlgorithm.XXH128, paths=files, total_size=30)
+        cache_dir = str(tmpdir.mkdir("cache"))
+        with S3CheckCache(cache_dir) as s3_cache:
+            s3_cache.put_entry(
+                S3CheckCacheEntry(
+                    f"{bucket}/prefix/{files[0].hash}.xxh128", str(datetime.now().timestamp())
+                )
+            )
+        uploader = S3AssetUploader()
+
+        # When
+        first_pack_index = uploader.upload_input_files(
+            manifest,
+            bucket,
+            Path(asset_root),
+            "prefix",
+            s3_check_cache_dir=cache_dir,
+            pack_small_files=True,
+        )
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS, total_files=3, total_bytes=30
+        )
+        with patch.object(uploader, "upload_bytes_to_s3") as mock_upload_bytes_to_s3:
+            second_pack_index = uploader.upload_input_files(
+                manifest,
+                bucket,
+                Path(asset_root),
+                "prefix",
+                progress_tracker=progress_tracker,
+                s3_check_cache_dir=cache_dir,
+                pack_small_files=True,
+            )
+
+        # Then
+        assert first_pack_index is not None
+        assert sorted(first_pack_index) == sorted([files[1].hash, files[2].hash])
+        assert second_pack_index == first_pack_index
+        mock_upload_bytes_to_s3.assert_not_called()
+        assert progress_tracker.skipped_files == 3
+
+    @mock_aws
+    @pytest.mark.parametrize("hashing_engine", [HashingEngine.THREAD, HashingEngine.PROCESS])
+    def test_hash_and_upload_assets_matches_hash_then_upload(
+        self, tmpdir, farm_id, queue_id, default_job_attachment_s3_settings, hashing_engine
+    ):
+        """
+        Tests that hashing and uploading as a pipeline uploads the same objects and manifests,
+        and returns the same attachments, as hashing all the files and then uploading them.
+        """
+        # Given
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        asset_root = tmpdir.mkdir("test-root")
+        input_paths = []
+        for i in range(20):
+            input_file = asset_root.join(f"dir{i % 3}", f"file{i}.txt")
+            input_file.write(f"contents {i % 15}", ensure=True)
+            input_paths.append(str(input_file))
+        large_file = asset_root.join("large.bin")
+        large_file.write("large file")
+        input_paths.append(str(large_file))
+        output_paths = [str(asset_root.join("outputs"))]
+        s3 = boto3.client("s3", region_name="us-west-2")  # pylint: disable=invalid-name
+
+        def list_keys() -> list:
+            return sorted(obj["Key"] for obj in s3.list_objects_v2(Bucket=bucket)["Contents"])
+
+        def delete_keys() -> None:
+            for key in list_keys():
+                s3.delete_object(Bucket=bucket, Key=key)
+
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+            hashing_engine=hashing_engine,
+        )
+        # Files larger than the threshold go through the queue of large files.
+        asset_manager.asset_uploader.small_file_threshold = 9
+        upload_group = asset_manager.prepare_paths_for_upload(
+            input_paths=input_paths, output_paths=output_paths, referenced_paths=[]
+        )
+
+        with patch(
+            f"{deadline.__package__}.job_attachments.models._generate_random_guid",
+            return_value="0000",
+        ):
+            (_, asset_root_manifests) = asset_manager.hash_assets_and_create_manifest(
+                asset_groups=upload_group.asset_groups,
+                total_input_files=upload_group.total_input_files,
+                total_input_bytes=upload_group.total_input_bytes,
+                hash_cache_dir=str(tmpdir.mkdir("cache1")),
+            )
+            (_, expected_attachments) = asset_manager.upload_assets(
+                manifests=asset_root_manifests, s3_check_cache_dir=str(tmpdir.join("cache1"))
+            )
+            expected_keys = list_keys()
+            delete_keys()
+
+            # When
+            mock_on_preparing_to_submit = MagicMock(return_value=True)
+            mock_on_uploading_assets = MagicMock(return_value=True)
+            (
+                hash_summary_statistics,
+                upload_summary_statistics,
+                attachments,
+            ) = asset_manager.hash_and_upload_assets(
+                asset_groups=upload_group.asset_groups,
+                total_input_files=upload_group.total_input_files,
+                total_input_bytes=upload_group.total_input_bytes,
+                hash_cache_dir=str(tmpdir.mkdir("cache2")),
+                s3_check_cache_dir=str(tmpdir.join("cache2")),
+                on_preparing_to_submit=mock_on_preparing_to_submit,
+                on_uploading_assets=mock_on_uploading_assets,
+            )
+
+        # Then
+        assert attachments == expected_attachments
+        assert list_keys() == expected_keys
+        assert hash_summary_statistics.processed_files == 21
+        # 15 distinct small files and the large file are uploaded, the others are duplicates.
+        assert upload_summary_statistics.processed_files == 16
+        assert upload_summary_statistics.skipped_files == 5
+        assert upload_summary_statistics.total_bytes == upload_group.total_input_bytes
+        mock_on_preparing_to_submit.assert_called()
+        mock_on_uploading_assets.assert_called()
+        assert mock_on_uploading_assets.call_args[0][0].progress == 100.0
+
+    @mock_aws
+    def test_hash_and_upload_assets_cancelled_by_upload_callback(
+        self, tmpdir, farm_id, queue_id, default_job_attachment_s3_settings
+    ):
+        """
+        Tests that cancelling the upload stage of the pipeline stops hashing too, and raises an
+        AssetSyncCancelledError without uploading a manifest.
+        """
+        # Given
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        asset_root = tmpdir.mkdir("test-root")
+        input_paths = []
+        for i in range(50):
+            input_file = asset_root.join(f"file{i}.txt")
+            input_file.write(f"contents {i}")
+            input_paths.append(str(input_file))
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+        )
+        upload_group = asset_manager.prepare_paths_for_upload(
+            input_paths=input_paths, output_paths=[], referenced_paths=[]
+        )
+        mock_on_preparing_to_submit = MagicMock(return_value=True)
+        mock_on_uploading_assets = MagicMock(return_value=False)
+
+        # When
+        with pytest.raises(AssetSyncCancelledError):
+            asset_manager.hash_and_upload_assets(
+                asset_groups=upload_group.asset_groups,
+                total_input_files=upload_group.total_input_files,
+                total_input_bytes=upload_group.total_input_bytes,
+                hash_cache_dir=str(tmpdir.mkdir("cache")),
+                s3_check_cache_dir=str(tmpdir.join("cache")),
+                on_preparing_to_submit=mock_on_preparing_to_submit,
+                on_uploading_assets=mock_on_uploading_assets,
+            )
+
+        # Then
+        s3 = boto3.client("s3", region_name="us-west-2")  # pylint: disable=invalid-name
+        keys = [obj["Key"] for obj in s3.list_objects_v2(Bucket=bucket).get("Contents", [])]
+        assert not [key for key in keys if "/Manifests/" in key]
+
+    @mock_aws
+    def test_upload_input_files_with_adaptive_concurrency(
+        self, tmpdir, default_job_attachment_s3_settings, fresh_deadline_config
+    ):
+        """
+        Tests that with adaptive concurrency enabled, all the files are uploaded, and the
+        concurrency chosen by the controller is reported in the summary statistics.
+        """
+        # Given
+        config.set_setting("settings.adaptive_concurrency", "true")
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        cas_prefix = default_job_attachment_s3_settings.full_cas_prefix()
+        asset_root = tmpdir.mkdir("test-root")
+        files = []
+        for i in range(30):
+            data = f"contents {i}".encode()
+            asset_root.join(f"file{i}.txt").write_binary(data)
+            files.append(
+                BaseManifestPath(
+                    path=f"file{i}.txt",
+                    hash=hash_data(data, HashAlgorithm.XXH128),
+                    size=len(data),
+                    mtime=1234000000,
+                )
+            )
+        manifest = AssetManifest(
+            hash_alg=HashAlgorithm.XXH128,
+            paths=files,
+            total_size=sum(file.size for file in files),
+        )
+        uploader = S3AssetUploader()
+        assert uploader.concurrency_controller is not None
+        assert uploader.concurrency_controller.max_concurrency == uploader.num_upload_workers
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS,
+            total_files=len(files),
+            total_bytes=manifest.totalSize,  # type: ignore[attr-defined]
+        )
+
+        # When
+        uploader.upload_input_files(
+            manifest=manifest,
+            s3_bucket=bucket,
+            source_root=Path(asset_root),
+            s3_cas_prefix=cas_prefix,
+            progress_tracker=progress_tracker,
+            s3_check_cache_dir=str(tmpdir.mkdir("cache")),
+        )
+
+        # Then
+        s3 = boto3.client("s3", region_name="us-west-2")  # pylint: disable=invalid-name
+        keys = {obj["Key"] for obj in s3.list_objects_v2(Bucket=bucket)["Contents"]}
+        assert keys == {f"{cas_prefix}/{file.hash}.xxh128" for file in files}
+        assert uploader.concurrency_controller.completed_transfers == 30
+        summary_statistics = progress_tracker.get_summary_statistics()
+        assert summary_statistics.processed_files == 30
+        assert summary_statistics.concurrency == uploader.concurrency_controller.concurrency
+        assert summary_statistics.concurrency > 0
+
+    def test_upload_large_files_within_budget(self, fresh_deadline_config):
+        """
+        Tests that large files are uploaded largest first, several at a time, without the bytes in
+        flight exceeding the budget, except for a file larger than the budget which is uploaded
+        on its own.
+        """
+        # Given
+        config.set_setting("settings.large_file_upload_max_in_flight_mb", "10")
+        mb = 1024 * 1024
+        sizes = [3, 12, 4, 1, 6, 2, 5]
+        files = [
+            BaseManifestPath(path=f"file{i}.bin", hash=f"hash{i}", size=size * mb, mtime=1)
+            for (i, size) in enumerate(sizes)
+        ]
+        uploader = S3AssetUploader()
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS,
+            total_files=len(files),
+            total_bytes=sum(file.size for file in files),
+        )
+        lock = threading.Lock()
+        in_flight: List[BaseManifestPath] = []
+        started: List[int] = []
+        max_bytes_in_flight = {"with_large_file": 0, "without_large_file": 0}
+
+        def upload_object_to_cas(file, *args, **kwargs):
+            with lock:
+                in_flight.append(file)
+                started.append(file.size // mb)
+                bytes_in_flight = sum(f.size for f in in_flight)
+                key = "with_large_file" if file.size > 10 * mb else "without_large_file"
+                max_bytes_in_flight[key] = max(max_bytes_in_flight[key], bytes_in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(file)
+            # The smallest file is already in the CAS.
+            return (file.size != 1 * mb, file.size)
+
+        # When
+        with patch.object(uploader, "upload_object_to_cas", side_effect=upload_object_to_cas):
+            uploader.upload_large_files(
+                files,
+                HashAlgorithm.XXH128,
+                "bucket",
+                Path("/root"),
+                "prefix/Data",
+                MagicMock(),
+                progress_tracker,
+            )
+
+        # Then
+        assert started == [12, 6, 5, 4, 3, 2, 1]
+        assert max_bytes_in_flight["with_large_file"] == 12 * mb
+        assert max_bytes_in_flight["without_large_file"] <= 10 * mb
+        assert progress_tracker.skipped_files == 1
+        assert progress_tracker.skipped_bytes == 1 * mb
+
+    def test_upload_large_files_stops_on_error(self, fresh_deadline_config):
+        """
+        Tests that no more large files are started after an upload fails, and that the error is
+        raised.
+        """
+        # Given
+        config.set_setting("settings.large_file_upload_max_parts_in_flight", "1")
+        files = [
+            BaseManifestPath(path=f"file{i}.bin", hash=f"hash{i}", size=100 - i, mtime=1)
+            for i in range(5)
+        ]
+        uploader = S3AssetUploader()
+        upload_object_to_cas = MagicMock(side_effect=AssetSyncError("upload failed"))
+
+        # When
+        with patch.object(uploader, "upload_object_to_cas", upload_object_to_cas):
+            with pytest.raises(AssetSyncError, match="upload failed"):
+                uploader.upload_large_files(
+                    files,
+                    HashAlgorithm.XXH128,
+                    "bucket",
+                    Path("/root"),
+                    "prefix/Data",
+                    MagicMock(),
+                )
+
+        # Then
+        upload_object_to_cas.assert_called_once()
+        assert upload_object_to_cas.call_args.args[0] == files[0]
+
+    @mock_aws
+    def test_upload_output_files(self, tmpdir, default_job_attachment_s3_settings):
+        """
+        Tests that the output files are uploaded in parallel, small and large alike, except for
+        the files already in S3, the files with the same S3 key as another file, and the files
+        outside of their base directory.
+        """
+        # Given
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        cas_prefix = default_job_attachment_s3_settings.full_cas_prefix()
+        session_dir = tmpdir.mkdir("session")
+        outside_dir = tmpdir.mkdir("outside")
+        output_files = []
+        for name, data, in_s3 in [
+            ("small1.txt", b"small 1", False),
+            ("small2.txt", b"small 2", False),
+            ("large1.txt", b"large file 1", False),
+            ("large2.txt", b"large file 2", False),
+            ("uploaded.txt", b"already uploaded", True),
+            ("duplicate.txt", b"small 1", False),
+        ]:
+            session_dir.join(name).write_binary(data)
+            output_files.append(
+                OutputFile(
+                    file_size=len(data),
+                    file_hash=hash_data(data, HashAlgorithm.XXH128),
+                    rel_path=name,
+                    full_path=str(session_dir.join(name)),
+                    s3_key=f"{cas_prefix}/{hash_data(data, HashAlgorithm.XXH128)}.xxh128",
+                    in_s3=in_s3,
+                    base_dir=str(session_dir),
+                )
+            )
+        outside_dir.join("outside.txt").write_binary(b"outside")
+        output_files.append(
+            OutputFile(
+                file_size=len(b"outside"),
+                file_hash=hash_data(b"outside", HashAlgorithm.XXH128),
+                rel_path="outside.txt",
+                full_path=str(outside_dir.join("outside.txt")),
+                s3_key=f"{cas_prefix}/{hash_data(b'outside', HashAlgorithm.XXH128)}.xxh128",
+                in_s3=False,
+                base_dir=str(session_dir),
+            )
+        )
+        uploader = S3AssetUploader()
+        uploader.small_file_threshold = 10
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS,
+            total_files=len(output_files),
+            total_bytes=sum(file.file_size for file in output_files),
+        )
+
+        # When
+        uploader.upload_output_files(output_files, bucket, progress_tracker)
+
+        # Then
+        s3 = boto3.client("s3", region_name="us-west-2")  # pylint: disable=invalid-name
+        keys = {obj["Key"] for obj in s3.list_objects_v2(Bucket=bucket)["Contents"]}
+        assert keys == {file.s3_key for file in output_files[:4]}
+        assert progress_tracker.processed_files == 4
+        assert progress_tracker.skipped_files == 2
+        assert progress_tracker.skipped_bytes == len(b"already uploaded") + len(b"small 1")
+
+    def test_upload_output_files_cancelled(self, fresh_deadline_config):
+        """
+        Tests that uploading the output files raises an AssetSyncCancelledError if the upload is
+        cancelled, and that no large files are started after the cancellation.
+        """
+        # Given
+        output_files = [
+            OutputFile(
+                file_size=size,
+                file_hash=f"hash{size}",
+                rel_path=f"file{size}.bin",
+                full_path=f"/session/file{size}.bin",
+                s3_key=f"prefix/Data/hash{size}.xxh128",
+                in_s3=False,
+                base_dir="/session",
+            )
+            for size in [5, 100, 200]
+        ]
+        uploader = S3AssetUploader()
+        uploader.small_file_threshold = 10
+        uploader.large_file_max_parts_in_flight = 1
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS,
+            total_files=len(output_files),
+            total_bytes=sum(file.file_size for file in output_files),
+        )
+
+        def upload_file_to_s3(**kwargs):
+            if kwargs["local_path"] == Path("/session/file200.bin"):
+                progress_tracker.continue_reporting = False
+
+        # When
+        with patch.object(
+            uploader, "upload_file_to_s3", side_effect=upload_file_to_s3
+        ) as mock_upload_file_to_s3:
+            with pytest.raises(AssetSyncCancelledError):
+                uploader.upload_output_files(output_files, "bucket", progress_tracker)
+
+        # Then
+        assert [call.kwargs["local_path"] for call in mock_upload_file_to_s3.call_args_list] == [
+            Path("/session/file5.bin"),
+            Path("/session/file200.bin"),
+        ]
+
     @mock_aws
     @pytest.mark.parametrize(
         "manifest_version",
@@ -2640,6 +3642,198 @@ class TestUpload:
                 expected_files={"prefix/test-hash.xxh128"},
             )
 
+    @mock_aws
+    def test_list_existing_cas_keys(self, default_job_attachment_s3_settings):
+        """
+        Tests that the objects that exist in the CAS prefix are found by listing the shards of the
+        prefix that the files touch, without any head-object requests.
+        """
+        # Given
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        s3 = boto3.client("s3", region_name="us-west-2")  # pylint: disable=invalid-name
+        existing_hashes = [f"aa{i:030x}" for i in range(20)]
+        missing_hashes = [f"bb{i:030x}" for i in range(20)]
+        for file_hash in existing_hashes:
+            s3.put_object(Bucket=bucket, Key=f"prefix/{file_hash}.xxh128", Body=b"")
+        # Objects in other shards, or for other hashes in the same shards, are not returned
+        s3.put_object(Bucket=bucket, Key=f"prefix/cc{0:030x}.xxh128", Body=b"")
+        s3.put_object(Bucket=bucket, Key=f"prefix/bb{99:030x}.xxh128", Body=b"")
+        files = [
+            BaseManifestPath(path=f"file{i}", hash=file_hash, size=1, mtime=1)
+            for i, file_hash in enumerate(existing_hashes + missing_hashes)
+        ]
+        s3_cache = MagicMock()
+        s3_cache.get_entry.return_value = None
+        uploader = S3AssetUploader()
+
+        # When
+        with patch.object(uploader._s3, "head_object") as mock_head_object:
+            existing_keys = uploader._list_existing_cas_keys(
+                files, HashAlgorithm.XXH128, bucket, "prefix", s3_cache
+            )
+
+        # Then
+        assert existing_keys == {f"prefix/{file_hash}.xxh128" for file_hash in existing_hashes}
+        mock_head_object.assert_not_called()
+
+    @mock_aws
+    def test_list_existing_cas_keys_skips_cached_objects(self, default_job_attachment_s3_settings):
+        """
+        Tests that objects in the S3 check cache are not counted when deciding whether to list the
+        CAS prefix, so that a warm cache falls back to head-object requests for the rest.
+        """
+        files = [
+            BaseManifestPath(path=f"file{i}", hash=f"aa{i:030x}", size=1, mtime=1)
+            for i in range(40)
+        ]
+        s3_cache = MagicMock()
+        s3_cache.get_entry.side_effect = lambda s3_key: (
+            None if s3_key.endswith(f"{0:030x}.xxh128") else S3CheckCacheEntry(s3_key, "123.45")
+        )
+        uploader = S3AssetUploader()
+
+        with patch.object(uploader._s3, "get_paginator") as mock_get_paginator:
+            existing_keys = uploader._list_existing_cas_keys(
+                files,
+                HashAlgorithm.XXH128,
+                default_job_attachment_s3_settings.s3BucketName,
+                "prefix",
+                s3_cache,
+            )
+
+        assert existing_keys is None
+        mock_get_paginator.assert_not_called()
+
+    @mock_aws
+    def test_list_existing_cas_keys_too_few_objects(self, default_job_attachment_s3_settings):
+        """
+        Tests that head-object requests are used when there are too few objects to check for
+        listing the shards of the CAS prefix to pay off.
+        """
+        files = [
+            BaseManifestPath(path=f"file{i}", hash=f"{i:02x}{i:030x}", size=1, mtime=1)
+            for i in range(40)
+        ]
+        s3_cache = MagicMock()
+        s3_cache.get_entry.return_value = None
+        uploader = S3AssetUploader()
+
+        with patch.object(uploader._s3, "get_paginator") as mock_get_paginator:
+            existing_keys = uploader._list_existing_cas_keys(
+                files,
+                HashAlgorithm.XXH128,
+                default_job_attachment_s3_settings.s3BucketName,
+                "prefix",
+                s3_cache,
+            )
+
+        assert existing_keys is None
+        mock_get_paginator.assert_not_called()
+
+    @mock_aws
+    def test_list_existing_cas_keys_over_budget(self, default_job_attachment_s3_settings):
+        """
+        Tests that head-object requests are used when listing the CAS prefix takes more list
+        requests than the cost model allows.
+        """
+        files = [
+            BaseManifestPath(path=f"file{i}", hash=f"aa{i:030x}", size=1, mtime=1)
+            for i in range(40)
+        ]
+        s3_cache = MagicMock()
+        s3_cache.get_entry.return_value = None
+        uploader = S3AssetUploader()
+        truncated_pages = iter([{"Contents": [], "IsTruncated": True} for _ in range(10)])
+
+        with patch.object(uploader._s3, "get_paginator") as mock_get_paginator:
+            mock_get_paginator.return_value.paginate.return_value = truncated_pages
+            existing_keys = uploader._list_existing_cas_keys(
+                files,
+                HashAlgorithm.XXH128,
+                default_job_attachment_s3_settings.s3BucketName,
+                "prefix",
+                s3_cache,
+            )
+
+        assert existing_keys is None
+        # Listing stops once the budget of 40 // 10 = 4 list requests is used up
+        assert len(list(truncated_pages)) == 6
+
+    @mock_aws
+    def test_list_existing_cas_keys_access_denied(self, default_job_attachment_s3_settings):
+        """
+        Tests that head-object requests are used when listing the CAS prefix is not permitted.
+        """
+        files = [
+            BaseManifestPath(path=f"file{i}", hash=f"aa{i:030x}", size=1, mtime=1)
+            for i in range(40)
+        ]
+        s3_cache = MagicMock()
+        s3_cache.get_entry.return_value = None
+        uploader = S3AssetUploader()
+
+        with patch.object(uploader._s3, "get_paginator") as mock_get_paginator:
+            mock_get_paginator.return_value.paginate.side_effect = ClientError(
+                {
+                    "Error": {"Code": "AccessDenied", "Message": "Access Denied"},
+                    "ResponseMetadata": {"HTTPStatusCode": 403},
+                },
+                "ListObjectsV2",
+            )
+            existing_keys = uploader._list_existing_cas_keys(
+                files,
+                HashAlgorithm.XXH128,
+                default_job_attachment_s3_settings.s3BucketName,
+                "prefix",
+                s3_cache,
+            )
+
+        assert existing_keys is None
+
+    @mock_aws
+    def test_upload_input_files_uses_listed_cas_keys(
+        self, tmpdir, default_job_attachment_s3_settings
+    ):
+        """
+        Tests that when the CAS prefix is listed, only the files missing from S3 are uploaded
+        and no head-object requests are made.
+        """
+        # Given
+        bucket = default_job_attachment_s3_settings.s3BucketName
+        s3 = boto3.client("s3", region_name="us-west-2")  # pylint: disable=invalid-name
+        asset_root = tmpdir.mkdir("test-root")
+        files = []
+        for i in range(40):
+            asset_root.join(f"file{i}.txt").write("a")
+            files.append(BaseManifestPath(path=f"file{i}.txt", hash=f"aa{i:030x}", size=1, mtime=1))
+        for file in files[:30]:
+            s3.put_object(Bucket=bucket, Key=f"prefix/{file.hash}.xxh128", Body=b"a")
+        manifest = AssetManifest(hash_alg=HashAlgorithm.XXH128, paths=files, total_size=40)
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS, total_files=40, total_bytes=40
+        )
+        uploader = S3AssetUploader()
+
+        # When
+        with patch.object(uploader._s3, "head_object") as mock_head_object:
+            uploader.upload_input_files(
+                manifest,
+                bucket,
+                Path(asset_root),
+                "prefix",
+                progress_tracker=progress_tracker,
+                s3_check_cache_dir=str(tmpdir.mkdir("cache")),
+            )
+
+        # Then
+        mock_head_object.assert_not_called()
+        assert progress_tracker.processed_files == 10
+        assert progress_tracker.skipped_files == 30
+        listed_keys = {
+            obj["Key"] for obj in s3.list_objects_v2(Bucket=bucket, Prefix="prefix/")["Contents"]
+        }
+        assert listed_keys == {f"prefix/{file.hash}.xxh128" for file in files}
+
 
 def assert_progress_report_last_callback(
     num_input_files: int,